@@ -0,0 +1,107 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { prismaRead } from '@/lib/db';
+import { matchesEtag } from '@/lib/contest-cache';
+import { bracketShape } from '@/lib/bracket-topology';
+import { z } from 'zod';
+
+const querySchema = z.object({
+  type: z.enum(['A', 'B']),
+  round: z.coerce.number().int().min(1).optional(),
+});
+
+/**
+ * Lecture d'un tableau round par round (gros tableaux).
+ *
+ * GET /api/contests/[id]/bracket-matches?type=A
+ * Sans round: la taille du tableau (nombre de qualifiés, null avant la fin du
+ * Tour 1), la liste des rounds créés et leur nombre de matchs (les matchs
+ * sont créés au fil des qualifications).
+ *
+ * GET /api/contests/[id]/bracket-matches?type=A&round=2
+ * Avec round: les matchs de ce seul round, équipes incluses. L'ETag suit la
+ * plus haute version de ligne du round: il reste valide tant qu'aucun de ses
+ * matchs n'est modifié (If-None-Match → 304).
+ */
+export async function GET(
+  request: NextRequest,
+  { params }: { params: Promise<{ id: string }> }
+) {
+  try {
+    const { id } = await params;
+    const { searchParams } = new URL(request.url);
+    const query = querySchema.parse({
+      type: searchParams.get('type') ?? undefined,
+      round: searchParams.get('round') ?? undefined,
+    });
+
+    const bracket = await prismaRead.bracket.findUnique({
+      where: { contestId_type: { contestId: id, type: query.type } },
+      select: {
+        id: true,
+        size: true,
+        rounds: {
+          select: { id: true, roundNumber: true, roundName: true, _count: { select: { matches: true } } },
+          orderBy: { roundNumber: 'asc' },
+        },
+      },
+    });
+
+    if (!bracket) {
+      return NextResponse.json(
+        { error: 'Tableau non trouvé' },
+        { status: 404 }
+      );
+    }
+
+    const rounds = bracket.rounds.map(({ _count, ...round }) => ({ ...round, matchCount: _count.matches }));
+    if (query.round === undefined) {
+      return NextResponse.json({ type: query.type, size: bracket.size, rounds });
+    }
+
+    const round = rounds.find(r => r.roundNumber === query.round);
+    if (!round) {
+      return NextResponse.json(
+        { error: 'Round non trouvé' },
+        { status: 404 }
+      );
+    }
+
+    const matches = await prismaRead.bracketMatch.findMany({
+      where: { roundId: round.id },
+      include: {
+        homeTeam: { include: { players: true } },
+        awayTeam: { include: { players: true } },
+        winnerTeam: true,
+      },
+      orderBy: { matchNumber: 'asc' },
+    });
+
+    const version = matches.reduce((max, m) => Math.max(max, m.version), 0);
+    const etag = `"${query.type}${round.roundNumber}-${version}"`;
+    const headers = { ETag: etag, 'Cache-Control': 'no-cache' };
+    if (matchesEtag(request.headers.get('if-none-match'), etag)) {
+      return new NextResponse(null, { status: 304, headers });
+    }
+
+    return NextResponse.json(
+      {
+        type: query.type,
+        totalRounds: bracket.size ? bracketShape(bracket.size).totalRounds : rounds.length,
+        round: { ...round, matches },
+      },
+      { headers }
+    );
+  } catch (error) {
+    if (error instanceof z.ZodError) {
+      return NextResponse.json(
+        { error: 'Paramètres invalides', details: error.errors },
+        { status: 400 }
+      );
+    }
+    console.error('Error fetching bracket round:', error);
+    return NextResponse.json(
+      { error: 'Erreur lors de la récupération du tableau' },
+      { status: 500 }
+    );
+  }
+}
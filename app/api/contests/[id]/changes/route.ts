@@ -0,0 +1,87 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { prismaRead } from '@/lib/db';
+
+/**
+ * Synchronisation incrémentale d'un concours.
+ *
+ * GET /api/contests/[id]/changes?since=<version>
+ * Retourne uniquement les matchs et équipes modifiés depuis la version donnée
+ * (colonnes plates, sans équipes imbriquées: le client les résout avec sa
+ * liste d'équipes), ainsi que les lignes supprimées.
+ */
+export async function GET(
+  request: NextRequest,
+  { params }: { params: Promise<{ id: string }> }
+) {
+  try {
+    const { id } = await params;
+    const { searchParams } = new URL(request.url);
+    const since = parseInt(searchParams.get('since') ?? '', 10);
+
+    if (isNaN(since) || since < 0) {
+      return NextResponse.json(
+        { error: 'Paramètre since invalide' },
+        { status: 400 }
+      );
+    }
+
+    const contest = await prismaRead.contest.findUnique({
+      where: { id },
+      select: { id: true, status: true, version: true },
+    });
+
+    if (!contest) {
+      return NextResponse.json(
+        { error: 'Concours non trouvé' },
+        { status: 404 }
+      );
+    }
+
+    // Client à jour: rien à transférer
+    if (since >= contest.version) {
+      return NextResponse.json({
+        version: contest.version,
+        status: contest.status,
+        teams: [],
+        qualificationMatches: [],
+        bracketMatches: [],
+        deleted: { qualificationMatches: [], teams: [] },
+      });
+    }
+
+    const [teams, qualificationMatches, bracketMatches, tombstones] = await Promise.all([
+      prismaRead.team.findMany({
+        where: { contestId: id, version: { gt: since } },
+        include: { players: { orderBy: { order: 'asc' } } },
+      }),
+      prismaRead.qualificationMatch.findMany({
+        where: { round: { contestId: id }, version: { gt: since } },
+      }),
+      prismaRead.bracketMatch.findMany({
+        where: { round: { bracket: { contestId: id } }, version: { gt: since } },
+      }),
+      prismaRead.contestTombstone.findMany({
+        where: { contestId: id, version: { gt: since } },
+        select: { entity: true, entityId: true },
+      }),
+    ]);
+
+    return NextResponse.json({
+      version: contest.version,
+      status: contest.status,
+      teams,
+      qualificationMatches,
+      bracketMatches,
+      deleted: {
+        qualificationMatches: tombstones.filter(t => t.entity === 'QUALIFICATION_MATCH').map(t => t.entityId),
+        teams: tombstones.filter(t => t.entity === 'TEAM').map(t => t.entityId),
+      },
+    });
+  } catch (error) {
+    console.error('Error fetching contest changes:', error);
+    return NextResponse.json(
+      { error: 'Erreur lors de la récupération des modifications' },
+      { status: 500 }
+    );
+  }
+}
@@ -0,0 +1,77 @@
+import { NextRequest, NextResponse } from 'next/server';
+import prisma from '@/lib/db';
+import { ResultError } from '@/lib/engine';
+import { commitEngineChanges, WriteConflictError } from '@/lib/contest-state';
+import { requestActor } from '@/lib/result-log';
+import { withContestQueue } from '@/lib/contest-queue';
+import { z } from 'zod';
+
+const correctionSchema = z.object({
+  matchId: z.string().min(1),
+  winnerTeamId: z.string().min(1),
+});
+
+/**
+ * Corrige le vainqueur d'un match terminé (qualification ou bracket).
+ *
+ * POST /api/contests/[id]/corrections
+ * Body: { matchId, winnerTeamId }
+ *
+ * Seules les places en aval des deux équipes sont échangées (Tour 2,
+ * brackets, match suivant); la correction est refusée (409) si l'un de ces
+ * matchs a déjà été joué ou est en cours sur un terrain.
+ */
+async function submitCorrection(
+  request: NextRequest,
+  { params }: { params: Promise<{ id: string }> }
+) {
+  try {
+    const { id } = await params;
+    const body = await request.json();
+    const { matchId, winnerTeamId } = correctionSchema.parse(body);
+
+    const { value, version } = await commitEngineChanges(
+      prisma,
+      id,
+      engine => {
+        const phase = engine.correctResult(matchId, winnerTeamId);
+        const diff = engine.getDiff();
+        return {
+          phase,
+          rowsChanged: diff.qualificationMatches.length + diff.bracketMatches.length + diff.teams.length,
+        };
+      },
+      { actor: requestActor(request) }
+    );
+
+    const match = value.phase === 'QUALIFICATION'
+      ? await prisma.qualificationMatch.findUnique({ where: { id: matchId } })
+      : await prisma.bracketMatch.findUnique({ where: { id: matchId } });
+
+    return NextResponse.json({ ...value, version, match });
+  } catch (error) {
+    if (error instanceof z.ZodError) {
+      return NextResponse.json(
+        { error: 'Données invalides', details: error.errors },
+        { status: 400 }
+      );
+    }
+    if (error instanceof ResultError) {
+      return NextResponse.json({ error: error.message }, { status: error.status });
+    }
+    if (error instanceof WriteConflictError) {
+      return NextResponse.json(
+        { error: 'Trop de saisies simultanées sur ce concours, veuillez réessayer' },
+        { status: 409 }
+      );
+    }
+    console.error('Error correcting result:', error);
+    return NextResponse.json(
+      { error: 'Erreur lors de la correction du résultat' },
+      { status: 500 }
+    );
+  }
+}
+
+// Écritures d'un même concours exécutées une à une (lib/contest-queue.ts)
+export const POST = withContestQueue(submitCorrection);
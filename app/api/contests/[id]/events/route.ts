@@ -0,0 +1,98 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { prismaRead } from '@/lib/db';
+import { contestEvents, ContestEvent } from '@/lib/events';
+
+export const dynamic = 'force-dynamic';
+
+// Commentaire SSE périodique: empêche les proxys de couper une connexion inactive
+const HEARTBEAT_MS = 15000;
+
+/**
+ * Flux en direct d'un concours (Server-Sent Events).
+ *
+ * GET /api/contests/[id]/events
+ * Envoie d'abord un événement "ready" avec la version courante, puis chaque
+ * match-finished / match-corrected / slot-assigned / match-removed /
+ * team-eliminated / team-updated / contest-updated / terrains-updated publié
+ * par les routes d'écriture.
+ */
+export async function GET(
+  request: NextRequest,
+  { params }: { params: Promise<{ id: string }> }
+) {
+  try {
+    const { id } = await params;
+
+    const contest = await prismaRead.contest.findUnique({
+      where: { id },
+      select: { version: true, status: true },
+    });
+
+    if (!contest) {
+      return NextResponse.json(
+        { error: 'Concours non trouvé' },
+        { status: 404 }
+      );
+    }
+
+    const encoder = new TextEncoder();
+    let cleanup = () => {};
+
+    const stream = new ReadableStream<Uint8Array>({
+      start(controller) {
+        let closed = false;
+
+        const write = (chunk: string) => {
+          if (closed) return;
+          try {
+            controller.enqueue(encoder.encode(chunk));
+          } catch {
+            cleanup();
+          }
+        };
+
+        const send = (event: ContestEvent) => {
+          write(`id: ${event.version}\nevent: ${event.type}\ndata: ${JSON.stringify(event)}\n\n`);
+        };
+
+        const unsubscribe = contestEvents.subscribe(id, send);
+        const heartbeat = setInterval(() => write(': ping\n\n'), HEARTBEAT_MS);
+
+        cleanup = () => {
+          if (closed) return;
+          closed = true;
+          clearInterval(heartbeat);
+          unsubscribe();
+          try {
+            controller.close();
+          } catch {
+            // Flux déjà fermé par le client
+          }
+        };
+
+        request.signal.addEventListener('abort', () => cleanup());
+
+        write('retry: 3000\n\n');
+        write(`event: ready\ndata: ${JSON.stringify({ contestId: id, ...contest })}\n\n`);
+      },
+      cancel() {
+        cleanup();
+      },
+    });
+
+    return new Response(stream, {
+      headers: {
+        'Content-Type': 'text/event-stream; charset=utf-8',
+        'Cache-Control': 'no-cache, no-transform',
+        Connection: 'keep-alive',
+        'X-Accel-Buffering': 'no',
+      },
+    });
+  } catch (error) {
+    console.error('Error opening contest events:', error);
+    return NextResponse.json(
+      { error: 'Erreur lors de l\'ouverture du flux' },
+      { status: 500 }
+    );
+  }
+}
@@ -0,0 +1,77 @@
+import { NextRequest, NextResponse } from 'next/server';
+import prisma from '@/lib/db';
+import { contestCache } from '@/lib/contest-cache';
+import { meleePlayersSchema } from '@/lib/teams';
+import { withContestQueue } from '@/lib/contest-queue';
+import { z } from 'zod';
+
+/**
+ * Inscription groupée de joueurs mélée.
+ *
+ * POST /api/contests/[id]/melee-players/bulk
+ * Body: { names: string[] } (5000 max), insérés en une requête
+ */
+async function addMeleePlayers(
+  request: NextRequest,
+  { params }: { params: Promise<{ id: string }> }
+) {
+  try {
+    const { id } = await params;
+    const body = await request.json();
+    const data = meleePlayersSchema.parse(body);
+
+    const contest = await prisma.contest.findUnique({
+      where: { id },
+      select: { gameMode: true, status: true },
+    });
+
+    if (!contest) {
+      return NextResponse.json(
+        { error: 'Concours non trouvé' },
+        { status: 404 }
+      );
+    }
+
+    if (contest.gameMode !== 'MELEE') {
+      return NextResponse.json(
+        { error: 'Ce concours n\'est pas en mode mélée' },
+        { status: 400 }
+      );
+    }
+
+    if (contest.status !== 'DRAFT') {
+      return NextResponse.json(
+        { error: 'Impossible d\'ajouter des joueurs une fois le concours lancé' },
+        { status: 400 }
+      );
+    }
+
+    // Horodatages croissants: l'ordre de la liste est celui de GET /melee-players
+    const now = Date.now();
+    const { count } = await prisma.meleePlayer.createMany({
+      data: data.names.map((name, i) => ({
+        contestId: id,
+        name,
+        createdAt: new Date(now + i),
+      })),
+    });
+    contestCache.invalidate(id);
+
+    return NextResponse.json({ created: count }, { status: 201 });
+  } catch (error) {
+    if (error instanceof z.ZodError) {
+      return NextResponse.json(
+        { error: 'Données invalides', details: error.errors },
+        { status: 400 }
+      );
+    }
+    console.error('Error adding melee players:', error);
+    return NextResponse.json(
+      { error: 'Erreur lors de l\'ajout des joueurs' },
+      { status: 500 }
+    );
+  }
+}
+
+// Écritures d'un même concours exécutées une à une (lib/contest-queue.ts)
+export const POST = withContestQueue(addMeleePlayers);
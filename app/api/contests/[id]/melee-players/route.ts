@@ -1,5 +1,7 @@
 import { NextRequest, NextResponse } from 'next/server';
-import prisma from '@/lib/db';
+import prisma, { prismaRead } from '@/lib/db';
+import { contestCache } from '@/lib/contest-cache';
+import { withContestQueue } from '@/lib/contest-queue';
 import { z } from 'zod';
 
 const addPlayerSchema = z.object({
@@ -14,7 +16,7 @@ export async function GET(
   try {
     const { id } = await params;
 
-    const players = await prisma.meleePlayer.findMany({
+    const players = await prismaRead.meleePlayer.findMany({
       where: { contestId: id },
       orderBy: { createdAt: 'asc' },
     });
@@ -30,7 +32,7 @@ export async function GET(
 }
 
 // POST - Ajouter un joueur
-export async function POST(
+async function addMeleePlayer(
   request: NextRequest,
   { params }: { params: Promise<{ id: string }> }
 ) {
@@ -71,6 +73,7 @@ export async function POST(
         name: data.name,
       },
     });
+    contestCache.invalidate(id);
 
     return NextResponse.json(player, { status: 201 });
   } catch (error) {
@@ -89,7 +92,7 @@ export async function POST(
 }
 
 // DELETE - Supprimer un joueur
-export async function DELETE(
+async function deleteMeleePlayer(
   request: NextRequest,
   { params }: { params: Promise<{ id: string }> }
 ) {
@@ -120,6 +123,7 @@ export async function DELETE(
     await prisma.meleePlayer.delete({
       where: { id: playerId },
     });
+    contestCache.invalidate(id);
 
     return NextResponse.json({ success: true });
   } catch (error) {
@@ -130,3 +134,7 @@ export async function DELETE(
     );
   }
 }
+
+// Écritures d'un même concours exécutées une à une (lib/contest-queue.ts)
+export const POST = withContestQueue(addMeleePlayer);
+export const DELETE = withContestQueue(deleteMeleePlayer);
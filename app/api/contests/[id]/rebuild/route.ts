@@ -0,0 +1,57 @@
+import { NextRequest, NextResponse } from 'next/server';
+import prisma from '@/lib/db';
+import { rebuildContest } from '@/lib/contest-state';
+import { MissingSnapshotError } from '@/lib/result-log';
+import { withContestQueue } from '@/lib/contest-queue';
+import { z } from 'zod';
+
+const rebuildSchema = z.object({
+  dryRun: z.boolean().optional(),
+});
+
+/**
+ * Reconstruit les tables de matchs d'un concours à partir du journal des
+ * résultats (dernier instantané + événements suivants).
+ *
+ * POST /api/contests/[id]/rebuild
+ * Body: { dryRun?: boolean } — dryRun: compte les lignes à réécrire sans écrire
+ */
+async function rebuildFromLog(
+  request: NextRequest,
+  { params }: { params: Promise<{ id: string }> }
+) {
+  try {
+    const { id } = await params;
+    const body = await request.json().catch(() => ({}));
+    const { dryRun = false } = rebuildSchema.parse(body);
+
+    const result = await rebuildContest(prisma, id, { dryRun });
+
+    if (!result) {
+      return NextResponse.json(
+        { error: 'Concours non trouvé' },
+        { status: 404 }
+      );
+    }
+
+    return NextResponse.json({ dryRun, ...result });
+  } catch (error) {
+    if (error instanceof MissingSnapshotError) {
+      return NextResponse.json({ error: error.message }, { status: 409 });
+    }
+    if (error instanceof z.ZodError) {
+      return NextResponse.json(
+        { error: 'Données invalides', details: error.errors },
+        { status: 400 }
+      );
+    }
+    console.error('Error rebuilding contest:', error);
+    return NextResponse.json(
+      { error: 'Erreur lors de la reconstruction du concours' },
+      { status: 500 }
+    );
+  }
+}
+
+// Écritures d'un même concours exécutées une à une (lib/contest-queue.ts)
+export const POST = withContestQueue(rebuildFromLog);
@@ -0,0 +1,64 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { prismaRead } from '@/lib/db';
+
+const DEFAULT_LIMIT = 100;
+const MAX_LIMIT = 1000;
+
+/**
+ * Journal des résultats d'un concours (audit).
+ *
+ * GET /api/contests/[id]/result-events?after=<id>&limit=<n>
+ * Événements dans l'ordre d'écriture, à partir de l'événement qui suit `after`;
+ * `nextCursor` est à repasser en `after` pour la page suivante.
+ */
+export async function GET(
+  request: NextRequest,
+  { params }: { params: Promise<{ id: string }> }
+) {
+  try {
+    const { id } = await params;
+    const { searchParams } = new URL(request.url);
+    const after = parseInt(searchParams.get('after') ?? '0', 10);
+    const limit = parseInt(searchParams.get('limit') ?? String(DEFAULT_LIMIT), 10);
+
+    if (isNaN(after) || after < 0 || isNaN(limit) || limit < 1 || limit > MAX_LIMIT) {
+      return NextResponse.json(
+        { error: 'Paramètres after ou limit invalides' },
+        { status: 400 }
+      );
+    }
+
+    const contest = await prismaRead.contest.findUnique({
+      where: { id },
+      select: { eventCount: true },
+    });
+
+    if (!contest) {
+      return NextResponse.json(
+        { error: 'Concours non trouvé' },
+        { status: 404 }
+      );
+    }
+
+    const rows = await prismaRead.resultEvent.findMany({
+      where: { contestId: id, id: { gt: after } },
+      orderBy: { id: 'asc' },
+      take: limit,
+    });
+
+    return NextResponse.json({
+      total: contest.eventCount,
+      events: rows.map(({ contestId: _contestId, changes, ...event }) => ({
+        ...event,
+        changes: JSON.parse(changes),
+      })),
+      nextCursor: rows.length === limit ? rows[rows.length - 1].id : null,
+    });
+  } catch (error) {
+    console.error('Error fetching result events:', error);
+    return NextResponse.json(
+      { error: 'Erreur lors de la récupération du journal' },
+      { status: 500 }
+    );
+  }
+}
@@ -0,0 +1,106 @@
+import { NextRequest, NextResponse } from 'next/server';
+import prisma from '@/lib/db';
+import { ResultError } from '@/lib/engine';
+import { commitEngineChanges, completeRound2IfReady, WriteConflictError } from '@/lib/contest-state';
+import { requestActor } from '@/lib/result-log';
+import { withContestQueue } from '@/lib/contest-queue';
+import { z } from 'zod';
+
+const batchResultsSchema = z.object({
+  results: z
+    .array(
+      z.object({
+        matchId: z.string().min(1),
+        winnerTeamId: z.string().min(1),
+      })
+    )
+    .min(1, 'Au moins un résultat est requis')
+    .max(500, 'Maximum 500 résultats par envoi'),
+});
+
+type EntryResult =
+  | { matchId: string; ok: true; phase: 'QUALIFICATION' | 'BRACKET' }
+  | { matchId: string; ok: false; error: string; status: number };
+
+/**
+ * Saisie groupée de résultats (feuilles de match d'un tour entier).
+ *
+ * POST /api/contests/[id]/results
+ * Body: { results: [{ matchId, winnerTeamId }, ...] } (qualification et brackets mélangés)
+ *
+ * Les résultats sont appliqués dans l'ordre sur un seul moteur, avec une seule
+ * passe de complétion du Tour 2 à la fin, puis écrits en une transaction
+ * (rejouée en entier en cas de conflit avec une saisie concurrente).
+ * Un résultat invalide est rejeté individuellement sans bloquer les autres.
+ */
+async function recordResults(
+  request: NextRequest,
+  { params }: { params: Promise<{ id: string }> }
+) {
+  try {
+    const { id } = await params;
+    const body = await request.json();
+    const data = batchResultsSchema.parse(body);
+
+    const startedAt = performance.now();
+
+    const { value: entries, version } = await commitEngineChanges(prisma, id, engine => {
+      const entries: EntryResult[] = data.results.map(({ matchId, winnerTeamId }) => {
+        try {
+          const phase = engine.recordResult(matchId, winnerTeamId, { deferCompletion: true });
+          return { matchId, ok: true as const, phase };
+        } catch (error) {
+          if (!(error instanceof ResultError)) throw error;
+          return { matchId, ok: false as const, error: error.message, status: error.status };
+        }
+      });
+
+      // Une seule passe de complétion pour tout le lot (sans effet si aucun résultat appliqué)
+      if (entries.some(entry => entry.ok)) {
+        engine.completeRound2();
+      }
+      return entries;
+    }, { actor: requestActor(request) });
+
+    if (entries.some(entry => entry.ok && entry.phase === 'QUALIFICATION')) {
+      await completeRound2IfReady(prisma, id);
+    }
+
+    const applied = entries.filter(entry => entry.ok).length;
+
+    return NextResponse.json(
+      {
+        applied,
+        failed: entries.length - applied,
+        version,
+        results: entries,
+        durationMs: Math.round(performance.now() - startedAt),
+      },
+      { status: applied > 0 ? 200 : 400 }
+    );
+  } catch (error) {
+    if (error instanceof z.ZodError) {
+      return NextResponse.json(
+        { error: 'Données invalides', details: error.errors },
+        { status: 400 }
+      );
+    }
+    if (error instanceof ResultError) {
+      return NextResponse.json({ error: error.message }, { status: error.status });
+    }
+    if (error instanceof WriteConflictError) {
+      return NextResponse.json(
+        { error: 'Trop de saisies simultanées sur ce concours, veuillez réessayer' },
+        { status: 409 }
+      );
+    }
+    console.error('Error recording batch results:', error);
+    return NextResponse.json(
+      { error: 'Erreur lors de l\'enregistrement des résultats' },
+      { status: 500 }
+    );
+  }
+}
+
+// Écritures d'un même concours exécutées une à une (lib/contest-queue.ts)
+export const POST = withContestQueue(recordResults);
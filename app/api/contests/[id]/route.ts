@@ -1,6 +1,9 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { revalidatePath } from 'next/cache';
-import prisma from '@/lib/db';
+import prisma, { prismaRead } from '@/lib/db';
+import { contestEvents } from '@/lib/events';
+import { contestCache, matchesEtag } from '@/lib/contest-cache';
+import { deleteContestTrees } from '@/lib/purge';
 import { z } from 'zod';
 
 const updateContestSchema = z.object({
@@ -11,6 +14,12 @@ const updateContestSchema = z.object({
   status: z.enum(['DRAFT', 'QUALIFICATION_ROUND_1', 'QUALIFICATION_ROUND_2', 'BRACKETS_GENERATED', 'FINISHED']).optional(),
 });
 
+/**
+ * GET /api/contests/[id]
+ *
+ * Servi depuis le cache en mémoire tant qu'aucune écriture n'a eu lieu;
+ * un client qui renvoie l'ETag reçu (If-None-Match) obtient un 304.
+ */
 export async function GET(
   request: NextRequest,
   { params }: { params: Promise<{ id: string }> }
@@ -18,60 +27,22 @@ export async function GET(
   try {
     const { id } = await params;
 
-    const contest = await prisma.contest.findUnique({
-      where: { id },
-      include: {
-        teams: {
-          include: {
-            players: { orderBy: { order: 'asc' } },
-          },
-          orderBy: { teamNumber: 'asc' },
-        },
-        qualificationRounds: {
-          include: {
-            matches: {
-              include: {
-                homeTeam: { include: { players: true } },
-                awayTeam: { include: { players: true } },
-                winnerTeam: { include: { players: true } },
-                loserTeam: { include: { players: true } },
-              },
-              orderBy: { matchNumber: 'asc' },
-            },
-          },
-          orderBy: { roundNumber: 'asc' },
-        },
-        brackets: {
-          include: {
-            rounds: {
-              include: {
-                matches: {
-                  include: {
-                    homeTeam: { include: { players: true } },
-                    awayTeam: { include: { players: true } },
-                    winnerTeam: true,
-                  },
-                  orderBy: { matchNumber: 'asc' },
-                },
-              },
-              orderBy: { roundNumber: 'asc' },
-            },
-          },
-        },
-        players: {
-          orderBy: { createdAt: 'asc' },
-        },
-      },
-    });
-
-    if (!contest) {
+    const cached = contestCache.get(id) ?? (await loadContest(id));
+    if (!cached) {
       return NextResponse.json(
         { error: 'Concours non trouvé' },
         { status: 404 }
       );
     }
 
-    return NextResponse.json(contest);
+    const headers = { ETag: cached.etag, 'Cache-Control': 'no-cache' };
+    if (matchesEtag(request.headers.get('if-none-match'), cached.etag)) {
+      return new NextResponse(null, { status: 304, headers });
+    }
+
+    return new NextResponse(cached.body, {
+      headers: { ...headers, 'Content-Type': 'application/json' },
+    });
   } catch (error) {
     console.error('Error fetching contest:', error);
     return NextResponse.json(
@@ -81,6 +52,63 @@ export async function GET(
   }
 }
 
+/**
+ * Lit le concours complet en base et le met en cache sérialisé
+ */
+async function loadContest(id: string) {
+  const ticket = contestCache.ticket();
+
+  const contest = await prismaRead.contest.findUnique({
+    where: { id },
+    include: {
+      teams: {
+        include: {
+          players: { orderBy: { order: 'asc' } },
+        },
+        orderBy: { teamNumber: 'asc' },
+      },
+      qualificationRounds: {
+        include: {
+          matches: {
+            include: {
+              homeTeam: { include: { players: true } },
+              awayTeam: { include: { players: true } },
+              winnerTeam: { include: { players: true } },
+              loserTeam: { include: { players: true } },
+            },
+            orderBy: { matchNumber: 'asc' },
+          },
+        },
+        orderBy: { roundNumber: 'asc' },
+      },
+      brackets: {
+        include: {
+          rounds: {
+            include: {
+              matches: {
+                include: {
+                  homeTeam: { include: { players: true } },
+                  awayTeam: { include: { players: true } },
+                  winnerTeam: true,
+                },
+                orderBy: { matchNumber: 'asc' },
+              },
+            },
+            orderBy: { roundNumber: 'asc' },
+          },
+        },
+      },
+      players: {
+        orderBy: { createdAt: 'asc' },
+      },
+    },
+  });
+
+  if (!contest) return null;
+
+  return contestCache.set(id, ticket, contest.version, JSON.stringify(contest));
+}
+
 export async function PATCH(
   request: NextRequest,
   { params }: { params: Promise<{ id: string }> }
@@ -90,13 +118,23 @@ export async function PATCH(
     const body = await request.json();
     const data = updateContestSchema.parse(body);
 
-    const updateData: any = { ...data };
+    const updateData: any = {
+      ...data,
+      version: { increment: 1 },
+      // La clôture met à jour la phase affichée dans la liste des concours
+      ...(data.status === 'FINISHED' ? { phase: 'FINISHED' } : {}),
+    };
 
     const contest = await prisma.contest.update({
       where: { id },
       data: updateData,
     });
 
+    contestCache.invalidate(id);
+    contestEvents.publish([
+      { type: 'contest-updated', contestId: id, version: contest.version, status: contest.status },
+    ]);
+
     return NextResponse.json(contest);
   } catch (error) {
     if (error instanceof z.ZodError) {
@@ -126,40 +164,9 @@ export async function DELETE(
       return NextResponse.json({ error: 'Concours non trouvé' }, { status: 404 });
     }
 
-    // Delete in order to avoid foreign key issues with self-referencing BracketMatch
-    const brackets = await prisma.bracket.findMany({ where: { contestId: id }, select: { id: true } });
-    const bracketIds = brackets.map(b => b.id);
-
-    if (bracketIds.length > 0) {
-      const rounds = await prisma.bracketRound.findMany({ where: { bracketId: { in: bracketIds } }, select: { id: true } });
-      const roundIds = rounds.map(r => r.id);
-      if (roundIds.length > 0) {
-        // Clear self-references first, then delete matches
-        await prisma.bracketMatch.updateMany({ where: { roundId: { in: roundIds } }, data: { nextMatchId: null } });
-        await prisma.bracketMatch.deleteMany({ where: { roundId: { in: roundIds } } });
-      }
-      await prisma.bracketRound.deleteMany({ where: { bracketId: { in: bracketIds } } });
-      await prisma.bracket.deleteMany({ where: { contestId: id } });
-    }
-
-    const qualRounds = await prisma.qualificationRound.findMany({ where: { contestId: id }, select: { id: true } });
-    const qualRoundIds = qualRounds.map(r => r.id);
-    if (qualRoundIds.length > 0) {
-      await prisma.qualificationMatch.deleteMany({ where: { roundId: { in: qualRoundIds } } });
-      await prisma.qualificationRound.deleteMany({ where: { contestId: id } });
-    }
-
-    await prisma.meleePlayer.deleteMany({ where: { contestId: id } });
-
-    // Delete players via teams
-    const teams = await prisma.team.findMany({ where: { contestId: id }, select: { id: true } });
-    if (teams.length > 0) {
-      await prisma.player.deleteMany({ where: { teamId: { in: teams.map(t => t.id) } } });
-    }
-    await prisma.team.deleteMany({ where: { contestId: id } });
-
-    // Finally delete the contest
-    await prisma.contest.delete({ where: { id } });
+    // Même suppression ensembliste que la purge groupée, en une transaction
+    await prisma.$transaction(tx => deleteContestTrees(tx, [id]), { timeout: 60000 });
+    contestCache.invalidate(id);
 
     revalidatePath('/');
     return NextResponse.json({ success: true });
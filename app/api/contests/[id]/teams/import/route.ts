@@ -0,0 +1,125 @@
+import { NextRequest, NextResponse } from 'next/server';
+import prisma from '@/lib/db';
+import { contestCache } from '@/lib/contest-cache';
+import { withContestQueue } from '@/lib/contest-queue';
+import {
+  collectTeamRows,
+  insertTeams,
+  parseTeamRows,
+  readLines,
+  RegistrationClosedError,
+  TeamImportFormat,
+} from '@/lib/teams';
+
+function importFormat(request: NextRequest): TeamImportFormat | null {
+  const format = request.nextUrl.searchParams.get('format');
+  if (format === 'csv' || format === 'ndjson') return format;
+
+  const contentType = request.headers.get('content-type') ?? '';
+  if (contentType.includes('csv')) return 'csv';
+  if (contentType.includes('ndjson') || contentType.includes('jsonl')) return 'ndjson';
+  return null;
+}
+
+/**
+ * Import groupé d'équipes (mode Monté).
+ *
+ * POST /api/contests/[id]/teams/import
+ * Body (lu en flux):
+ *   - CSV (Content-Type: text/csv ou ?format=csv): en-tête name/nom, club, player1..3 (ou joueur1..3)
+ *   - JSON lines (Content-Type: application/x-ndjson ou ?format=ndjson): { name?, club?, players: [{ name, order }] }
+ *
+ * Les lignes valides sont insérées en une transaction, avec des numéros
+ * d'équipe consécutifs; les lignes invalides sont listées dans `errors`.
+ */
+async function importTeams(
+  request: NextRequest,
+  { params }: { params: Promise<{ id: string }> }
+) {
+  try {
+    const { id } = await params;
+    const startedAt = performance.now();
+
+    const format = importFormat(request);
+    if (!format) {
+      return NextResponse.json(
+        { error: 'Format non reconnu (text/csv ou application/x-ndjson)' },
+        { status: 415 }
+      );
+    }
+
+    const contest = await prisma.contest.findUnique({
+      where: { id },
+      select: { status: true, gameMode: true, teamType: true },
+    });
+
+    if (!contest) {
+      return NextResponse.json(
+        { error: 'Concours non trouvé' },
+        { status: 404 }
+      );
+    }
+
+    if (contest.gameMode !== 'MONTE') {
+      return NextResponse.json(
+        { error: 'L\'import d\'équipes est réservé au mode Monté' },
+        { status: 400 }
+      );
+    }
+
+    if (contest.status !== 'DRAFT') {
+      return NextResponse.json(
+        { error: 'Impossible d\'ajouter des équipes après le tirage' },
+        { status: 400 }
+      );
+    }
+
+    if (!request.body) {
+      return NextResponse.json(
+        { error: 'Aucune équipe à importer' },
+        { status: 400 }
+      );
+    }
+
+    const { teams, errors } = await collectTeamRows(
+      parseTeamRows(readLines(request.body), format),
+      contest.teamType
+    );
+
+    if (teams.length === 0) {
+      return NextResponse.json(
+        { error: 'Aucune équipe valide à importer', errors },
+        { status: 400 }
+      );
+    }
+
+    const range = await prisma.$transaction(
+      (tx) => insertTeams(tx, id, teams),
+      { timeout: 60000 }
+    );
+    contestCache.invalidate(id);
+
+    return NextResponse.json(
+      {
+        imported: teams.length,
+        firstTeamNumber: range.firstTeamNumber,
+        lastTeamNumber: range.lastTeamNumber,
+        errors,
+        durationMs: Math.round(performance.now() - startedAt),
+      },
+      { status: 201 }
+    );
+  } catch (error) {
+    if (error instanceof RegistrationClosedError) {
+      return NextResponse.json({ error: error.message }, { status: 400 });
+    }
+    console.error('Error importing teams:', error);
+    return NextResponse.json(
+      { error: 'Erreur lors de l\'import des équipes' },
+      { status: 500 }
+    );
+  }
+}
+
+// Écritures d'un même concours exécutées une à une (lib/contest-queue.ts)
+export const POST = withContestQueue(importTeams);
@@ -1,17 +1,12 @@
 import { NextRequest, NextResponse } from 'next/server';
 import prisma from '@/lib/db';
+import { contestCache } from '@/lib/contest-cache';
+import { bumpContestVersion } from '@/lib/contest-state';
+import { allocateTeamNumbers, checkPlayerCount, createTeamSchema, RegistrationClosedError } from '@/lib/teams';
+import { withContestQueue } from '@/lib/contest-queue';
 import { z } from 'zod';
 
-const playerSchema = z.object({
-  name: z.string().min(1, 'Le nom est requis'),
-  order: z.number().int().min(1).max(3),
-});
-
-const createTeamSchema = z.object({
-  players: z.array(playerSchema).min(1).max(3),
-});
-
-export async function POST(
+async function createTeam(
   request: NextRequest,
   { params }: { params: Promise<{ id: string }> }
 ) {
@@ -43,42 +38,37 @@ export async function POST(
     }
 
     // Vérifier le nombre de joueurs selon le type
-    const expectedPlayers =
-      contest.teamType === 'TETE_A_TETE' ? 1 :
-      contest.teamType === 'DOUBLETTE' ? 2 : 3;
-
-    if (data.players.length !== expectedPlayers) {
-      return NextResponse.json(
-        { error: `Une équipe ${contest.teamType} doit avoir ${expectedPlayers} joueur(s)` },
-        { status: 400 }
-      );
+    const playerCountError = checkPlayerCount(data, contest.teamType);
+    if (playerCountError) {
+      return NextResponse.json({ error: playerCountError }, { status: 400 });
     }
 
-    // Trouver le prochain numéro d'équipe disponible
-    const lastTeam = await prisma.team.findFirst({
-      where: { contestId: id },
-      orderBy: { teamNumber: 'desc' },
-      select: { teamNumber: true },
-    });
-    const teamNumber = (lastTeam?.teamNumber ?? 0) + 1;
-
     // Créer l'équipe avec les joueurs (on stocke name dans firstName pour compatibilité)
-    const team = await prisma.team.create({
-      data: {
-        contestId: id,
-        teamNumber,
-        players: {
-          create: data.players.map(p => ({
-            firstName: p.name,
-            lastName: '',
-            order: p.order,
-          })),
+    // Le numéro est attribué dans la transaction: deux inscriptions simultanées
+    // ne peuvent pas recevoir le même
+    const team = await prisma.$transaction(async (tx) => {
+      const { version, firstTeamNumber } = await allocateTeamNumbers(tx, id, 1);
+      return tx.team.create({
+        data: {
+          contestId: id,
+          teamNumber: firstTeamNumber,
+          name: data.name,
+          club: data.club,
+          version,
+          players: {
+            create: data.players.map(p => ({
+              firstName: p.name,
+              lastName: '',
+              order: p.order,
+            })),
+          },
         },
-      },
-      include: {
-        players: { orderBy: { order: 'asc' } },
-      },
+        include: {
+          players: { orderBy: { order: 'asc' } },
+        },
+      });
     });
+    contestCache.invalidate(id);
 
     return NextResponse.json(team, { status: 201 });
   } catch (error) {
@@ -88,6 +78,9 @@ export async function POST(
         { status: 400 }
       );
     }
+    if (error instanceof RegistrationClosedError) {
+      return NextResponse.json({ error: error.message }, { status: 400 });
+    }
     console.error('Error creating team:', error);
     return NextResponse.json(
       { error: 'Erreur lors de la création de l\'équipe' },
@@ -96,7 +89,7 @@ export async function POST(
   }
 }
 
-export async function DELETE(
+async function deleteTeam(
   request: NextRequest,
   { params }: { params: Promise<{ id: string }> }
 ) {
@@ -131,9 +124,16 @@ export async function DELETE(
       );
     }
 
-    await prisma.team.delete({
-      where: { id: teamId },
+    await prisma.$transaction(async (tx) => {
+      const version = await bumpContestVersion(tx, id, { teamCount: { decrement: 1 } });
+      await tx.team.delete({
+        where: { id: teamId },
+      });
+      await tx.contestTombstone.create({
+        data: { contestId: id, entity: 'TEAM', entityId: teamId, version },
+      });
     });
+    contestCache.invalidate(id);
 
     return NextResponse.json({ success: true });
   } catch (error) {
@@ -144,3 +144,7 @@ export async function DELETE(
     );
   }
 }
+
+// Écritures d'un même concours exécutées une à une (lib/contest-queue.ts)
+export const POST = withContestQueue(createTeam);
+export const DELETE = withContestQueue(deleteTeam);
@@ -0,0 +1,135 @@
+import { NextRequest, NextResponse } from 'next/server';
+import prisma, { prismaRead } from '@/lib/db';
+import { loadContestState } from '@/lib/contest-state';
+import { lockContestRow } from '@/lib/db-provider';
+import { buildTerrainEvents, contestEvents } from '@/lib/events';
+import { loadTerrainBoard, scheduleTerrains } from '@/lib/terrains';
+import { withContestQueue } from '@/lib/contest-queue';
+import { z } from 'zod';
+
+const terrainsSchema = z.object({
+  terrains: z
+    .array(
+      z.object({
+        number: z.number().int().min(1),
+        name: z.string().max(50).nullable().optional(),
+        isMain: z.boolean().optional(),
+        position: z.number().int().min(0).optional(),
+      })
+    )
+    .min(1, 'Au moins un terrain est requis')
+    .max(200, 'Maximum 200 terrains')
+    .refine(
+      terrains => new Set(terrains.map(t => t.number)).size === terrains.length,
+      'Numéros de terrain en double'
+    ),
+});
+
+/**
+ * Tableau des terrains.
+ *
+ * GET /api/contests/[id]/terrains
+ * Pour chaque terrain: le match en cours (appelé sur le terrain) et le
+ * prochain match prévu; `stats`: matchs joués, matchs par heure et occupation
+ * des terrains depuis le premier appel; `teams`: numéro et nom des équipes citées.
+ */
+export async function GET(
+  request: NextRequest,
+  { params }: { params: Promise<{ id: string }> }
+) {
+  try {
+    const { id } = await params;
+
+    const state = await loadContestState(prismaRead, id);
+    if (!state) {
+      return NextResponse.json(
+        { error: 'Concours non trouvé' },
+        { status: 404 }
+      );
+    }
+
+    const board = await loadTerrainBoard(prismaRead, id, state);
+
+    const teamIds = board.terrains.flatMap(t =>
+      [t.current, t.next].flatMap(m => (m ? [m.homeTeamId, m.awayTeamId] : []))
+    ).filter((teamId): teamId is string => Boolean(teamId));
+    const teams = await prismaRead.team.findMany({
+      where: { id: { in: Array.from(new Set(teamIds)) } },
+      select: { id: true, teamNumber: true, name: true },
+    });
+
+    return NextResponse.json({ version: state.version, ...board, teams });
+  } catch (error) {
+    console.error('Error fetching terrains:', error);
+    return NextResponse.json(
+      { error: 'Erreur lors de la récupération des terrains' },
+      { status: 500 }
+    );
+  }
+}
+
+/**
+ * Déclare ou met à jour les terrains du concours (par numéro).
+ *
+ * POST /api/contests/[id]/terrains
+ * Body: { terrains: [{ number, name?, isMain?, position? }] }
+ * `isMain`: terrain d'honneur, réservé à la finale du tableau A quand elle est
+ * prête; `position`: emplacement le long du site (par défaut le numéro).
+ *
+ * Les matchs prêts sont appelés aussitôt sur les terrains libres.
+ */
+async function saveTerrains(
+  request: NextRequest,
+  { params }: { params: Promise<{ id: string }> }
+) {
+  try {
+    const { id } = await params;
+    const body = await request.json();
+    const data = terrainsSchema.parse(body);
+
+    const result = await prisma.$transaction(async (tx) => {
+      await lockContestRow(tx, id);
+      const state = await loadContestState(tx, id);
+      if (!state) return null;
+
+      for (const { number, name = null, isMain = false, position = number } of data.terrains) {
+        await tx.terrain.upsert({
+          where: { contestId_number: { contestId: id, number } },
+          create: { contestId: id, number, name, isMain, position },
+          update: { name, isMain, position },
+        });
+      }
+
+      return { version: state.version ?? 0, schedule: await scheduleTerrains(tx, id, state) };
+    }, { timeout: 30000 });
+
+    if (!result) {
+      return NextResponse.json(
+        { error: 'Concours non trouvé' },
+        { status: 404 }
+      );
+    }
+
+    contestEvents.publish(buildTerrainEvents(id, result.version, result.schedule));
+
+    return NextResponse.json({
+      terrains: data.terrains.length,
+      assigned: result.schedule?.assigned ?? [],
+    });
+  } catch (error) {
+    if (error instanceof z.ZodError) {
+      return NextResponse.json(
+        { error: 'Données invalides', details: error.errors },
+        { status: 400 }
+      );
+    }
+    console.error('Error saving terrains:', error);
+    return NextResponse.json(
+      { error: 'Erreur lors de l\'enregistrement des terrains' },
+      { status: 500 }
+    );
+  }
+}
+
+// Écritures d'un même concours exécutées une à une (lib/contest-queue.ts)
+export const POST = withContestQueue(saveTerrains);
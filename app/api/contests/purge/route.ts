@@ -0,0 +1,65 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { revalidatePath } from 'next/cache';
+import prisma from '@/lib/db';
+import { contestCache } from '@/lib/contest-cache';
+import { purgeContests } from '@/lib/purge';
+import { z } from 'zod';
+
+const purgeSchema = z
+  .object({
+    ids: z.array(z.string().min(1)).min(1).max(10000).optional(),
+    status: z.enum(['DRAFT', 'IN_PROGRESS', 'FINISHED']).optional(),
+    olderThan: z.coerce.date().optional(),
+    compact: z.boolean().default(false),
+  })
+  .refine(data => data.ids || data.status || data.olderThan, {
+    message: 'Préciser des IDs ou un filtre (status, olderThan)',
+  });
+
+/**
+ * Purge groupée de concours.
+ *
+ * POST /api/contests/purge
+ * Body: { ids?: string[], status?: "FINISHED", olderThan?: "2025-01-01", compact?: boolean }
+ *
+ * Les critères se cumulent (ids ET status ET date de création antérieure).
+ * Tout est supprimé en une transaction; compact lance ensuite un VACUUM.
+ */
+export async function POST(request: NextRequest) {
+  try {
+    const body = await request.json();
+    const data = purgeSchema.parse(body);
+
+    const result = await purgeContests(
+      prisma,
+      { ids: data.ids, status: data.status, olderThan: data.olderThan },
+      { compact: data.compact }
+    );
+
+    result.contestIds.forEach(id => contestCache.invalidate(id));
+    if (result.contestIds.length > 0) {
+      revalidatePath('/');
+    }
+
+    return NextResponse.json({
+      contests: result.contestIds.length,
+      contestIds: result.contestIds,
+      rows: result.rows,
+      totalRows: result.totalRows,
+      compacted: result.compacted,
+      durationMs: result.durationMs,
+    });
+  } catch (error) {
+    if (error instanceof z.ZodError) {
+      return NextResponse.json(
+        { error: 'Données invalides', details: error.errors },
+        { status: 400 }
+      );
+    }
+    console.error('Error purging contests:', error);
+    return NextResponse.json(
+      { error: 'Erreur lors de la purge des concours' },
+      { status: 500 }
+    );
+  }
+}
@@ -1,5 +1,7 @@
 import { NextRequest, NextResponse } from 'next/server';
-import prisma from '@/lib/db';
+import prisma, { prismaRead } from '@/lib/db';
+import { contestListQuerySchema, InvalidCursorError, listContests } from '@/lib/contest-list';
+import { generateSeed } from '@/lib/random';
 import { z } from 'zod';
 
 const createContestSchema = z.object({
@@ -7,21 +9,32 @@ const createContestSchema = z.object({
   location: z.string().optional().default(''),
   teamType: z.enum(['TETE_A_TETE', 'DOUBLETTE', 'TRIPLETTE']),
   gameMode: z.enum(['MONTE', 'MELEE']).default('MONTE'),
+  // Graine imposée (rejouer un tirage); tirée au hasard sinon
+  seed: z.number().int().min(0).max(2 ** 31 - 1).optional(),
 });
 
-export async function GET() {
+/**
+ * Liste paginée des concours (du plus récent au plus ancien).
+ *
+ * GET /api/contests?status=&gameMode=&from=&to=&cursor=&limit=
+ * Retourne { items, nextCursor }: passer nextCursor pour la page suivante.
+ */
+export async function GET(request: NextRequest) {
   try {
-    const contests = await prisma.contest.findMany({
-      include: {
-        _count: {
-          select: { teams: true },
-        },
-      },
-      orderBy: { createdAt: 'desc' },
-    });
+    const { searchParams } = new URL(request.url);
+    const query = contestListQuerySchema.parse(Object.fromEntries(searchParams));
 
-    return NextResponse.json(contests);
+    return NextResponse.json(await listContests(prismaRead, query));
   } catch (error) {
+    if (error instanceof z.ZodError) {
+      return NextResponse.json(
+        { error: 'Paramètres invalides', details: error.errors },
+        { status: 400 }
+      );
+    }
+    if (error instanceof InvalidCursorError) {
+      return NextResponse.json({ error: error.message }, { status: 400 });
+    }
     console.error('Error fetching contests:', error);
     return NextResponse.json(
       { error: 'Erreur lors de la récupération des concours' },
@@ -41,6 +54,7 @@ export async function POST(request: NextRequest) {
         location: data.location || null,
         teamType: data.teamType,
         gameMode: data.gameMode,
+        seed: data.seed ?? generateSeed(),
       },
     });
 
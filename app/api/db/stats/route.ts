@@ -0,0 +1,33 @@
+import { NextResponse } from 'next/server';
+import { dbStats, readSqliteConfig } from '@/lib/sqlite';
+import { contestQueue } from '@/lib/contest-queue';
+import { databaseProvider } from '@/lib/db-provider';
+
+export const dynamic = 'force-dynamic';
+
+/**
+ * Statistiques du stockage depuis le démarrage du serveur.
+ *
+ * GET /api/db/stats
+ * Moteur (sqlite ou postgresql), durée des requêtes par client (lecture /
+ * écriture), attente de la connexion d'écriture, conflits rejoués et derniers
+ * checkpoints du WAL.
+ * `queues`: files d'écriture par concours (profondeur, attente avant
+ * exécution et durée des écritures).
+ */
+export async function GET() {
+  try {
+    const { enabled, busyTimeoutMs, synchronous, readConnections, checkpointIntervalMs } = readSqliteConfig();
+    return NextResponse.json({
+      config: { provider: databaseProvider(), tuning: enabled, busyTimeoutMs, synchronous, readConnections, checkpointIntervalMs },
+      ...dbStats.snapshot(),
+      queues: contestQueue.snapshot(),
+    });
+  } catch (error) {
+    console.error('Error fetching database stats:', error);
+    return NextResponse.json(
+      { error: 'Erreur lors de la récupération des statistiques' },
+      { status: 500 }
+    );
+  }
+}
@@ -1,9 +1,12 @@
 'use client';
 
-import { useState, useEffect, use } from 'react';
+import { useState, useEffect, useRef, useCallback, use } from 'react';
 import Link from 'next/link';
 import { QualificationRound } from '@/components/QualificationRound';
 import { BracketTree } from '@/components/BracketTree';
+import { TerrainBoard } from '@/components/TerrainBoard';
+import { applyContestChanges, applyContestEvent } from '@/lib/live';
+import type { ContestEvent } from '@/lib/events';
 import { ArrowLeft, CheckCircle, XCircle } from 'lucide-react';
 import { BouleIcon, CochonnetIcon, TrophyPetanqueIcon } from '@/components/icons/PetanqueIcons';
 
@@ -11,6 +14,7 @@ interface Contest {
   id: string;
   name: string;
   status: string;
+  version: number;
   qualificationRounds: any[];
   brackets: any[];
   teams: any[];
@@ -21,13 +25,23 @@ export default function LivePage({ params }: { params: Promise<{ id: string }> }
   const [contest, setContest] = useState<Contest | null>(null);
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState('');
+  // Incrémenté à chaque attribution de terrains: le tableau des terrains se recharge
+  const [terrainsKey, setTerrainsKey] = useState(0);
+  const contestRef = useRef<Contest | null>(null);
+  // Vrai tant que le flux en direct est connecté
+  const liveRef = useRef(false);
+
+  const updateContest = (data: Contest) => {
+    contestRef.current = data;
+    setContest(data);
+  };
 
   const fetchContest = async () => {
     try {
       const response = await fetch(`/api/contests/${id}`);
       if (!response.ok) throw new Error('Erreur lors du chargement');
       const data = await response.json();
-      setContest(data);
+      updateContest(data);
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Erreur');
     } finally {
@@ -35,10 +49,88 @@ export default function LivePage({ params }: { params: Promise<{ id: string }> }
     }
   };
 
+  // Ne récupère que les matchs et équipes modifiés depuis la version connue
+  const syncContest = async () => {
+    const current = contestRef.current;
+    if (!current) return fetchContest();
+
+    try {
+      const response = await fetch(`/api/contests/${id}/changes?since=${current.version}`);
+      if (!response.ok) throw new Error('Erreur lors du chargement');
+      const changes = await response.json();
+      const merged = applyContestChanges(contestRef.current ?? current, changes);
+      if (merged) {
+        updateContest(merged);
+      } else {
+        await fetchContest();
+      }
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Erreur');
+    }
+  };
+
   useEffect(() => {
     fetchContest();
   }, [id]);
 
+  // Flux en direct: chaque événement est fusionné sans recharger le concours
+  useEffect(() => {
+    const source = new EventSource(`/api/contests/${id}/events`);
+
+    const handleEvent = (message: MessageEvent) => {
+      const event = JSON.parse(message.data) as ContestEvent;
+      const current = contestRef.current;
+      if (!current) return;
+
+      if (event.type === 'terrains-updated') {
+        setTerrainsKey(key => key + 1);
+        return;
+      }
+
+      // Tirage, clôture, renommage: rechargement complet (rare)
+      if (event.type === 'contest-updated') {
+        fetchContest();
+        return;
+      }
+
+      const merged = applyContestEvent(current, event);
+      if (!merged) {
+        syncContest();
+      } else if (merged !== current) {
+        updateContest(merged);
+      }
+    };
+
+    const eventTypes: ContestEvent['type'][] = [
+      'match-finished', 'match-corrected', 'slot-assigned', 'match-removed', 'team-eliminated', 'team-updated',
+      'contest-updated', 'terrains-updated',
+    ];
+    eventTypes.forEach(type => source.addEventListener(type, handleEvent as EventListener));
+
+    // À chaque (re)connexion: rattraper ce qui a été manqué pendant la coupure
+    source.addEventListener('ready', (message) => {
+      liveRef.current = true;
+      const { version } = JSON.parse((message as MessageEvent).data);
+      if (contestRef.current && version > contestRef.current.version) {
+        syncContest();
+      }
+    });
+    source.onerror = () => {
+      liveRef.current = false;
+    };
+
+    return () => {
+      liveRef.current = false;
+      source.close();
+    };
+  }, [id]);
+
+  // Après une saisie locale: le flux apporte déjà les modifications, sinon on interroge /changes.
+  // Référence stable: les tours et tableaux mémoïsés ne sont pas rendus à nouveau pour rien
+  const handleMatchUpdate = useCallback(() => {
+    if (!liveRef.current) syncContest();
+  }, [id]);
+
   const handleFinishContest = async () => {
     if (!confirm('Clôturer définitivement le concours ?')) return;
 
@@ -48,7 +140,7 @@ export default function LivePage({ params }: { params: Promise<{ id: string }> }
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ status: 'FINISHED' }),
       });
-      fetchContest();
+      syncContest();
     } catch (err) {
       alert('Erreur lors de la clôture');
     }
@@ -105,11 +197,14 @@ export default function LivePage({ params }: { params: Promise<{ id: string }> }
   const showRound2 = (isInProgress || isFinished) && round2 !== undefined;
   const showBrackets = (isInProgress || isFinished) && (bracketA !== undefined || bracketB !== undefined);
 
-  // Plus besoin de boutons pour générer le Tour 2 ou les brackets
-  // car tout est généré automatiquement au tirage
+  // Plus besoin de boutons pour générer le Tour 2 ou les brackets:
+  // le Tour 2 est créé au tirage, les brackets se remplissent d'eux-mêmes
 
+  // Matchs créés au fil des qualifications: un bracket sans match n'est
+  // terminé que s'il n'a aucun qualifié
   const allBracketMatchesFinished = (bracket: any) => {
     if (!bracket) return true;
+    if (bracket.rounds.length === 0) return bracket.size === 0;
     return bracket.rounds.every((round: any) =>
       round.matches.every((match: any) => match.status === 'FINISHED' || match.isBye)
     );
@@ -186,6 +281,11 @@ export default function LivePage({ params }: { params: Promise<{ id: string }> }
         )}
 
         <div className="max-w-6xl mx-auto space-y-8">
+          {/* Terrains: match appelé et prochain match */}
+          {isInProgress && (
+            <TerrainBoard contestId={id} refreshKey={terrainsKey} canEdit />
+          )}
+
           {/* Phase de qualification */}
           {(showRound1 || showRound2) && (
             <div className="space-y-6">
@@ -201,7 +301,7 @@ export default function LivePage({ params }: { params: Promise<{ id: string }> }
                     roundNumber={1}
                     matches={round1.matches}
                     allTeams={contest.teams}
-                    onMatchUpdate={fetchContest}
+                    onMatchUpdate={handleMatchUpdate}
                     contestId={id}
                     canEdit={isInProgress}
                   />
@@ -213,7 +313,7 @@ export default function LivePage({ params }: { params: Promise<{ id: string }> }
                     roundNumber={2}
                     matches={round2.matches}
                     allTeams={contest.teams}
-                    onMatchUpdate={fetchContest}
+                    onMatchUpdate={handleMatchUpdate}
                     contestId={id}
                     canEdit={isInProgress}
                   />
@@ -260,9 +360,10 @@ export default function LivePage({ params }: { params: Promise<{ id: string }> }
               {bracketA && (
                 <BracketTree
                   type="A"
+                  size={bracketA.size}
                   rounds={bracketA.rounds}
                   allTeams={contest.teams}
-                  onMatchUpdate={fetchContest}
+                  onMatchUpdate={handleMatchUpdate}
                   contestId={id}
                   canEdit={contest.status !== 'FINISHED'}
                 />
@@ -271,9 +372,10 @@ export default function LivePage({ params }: { params: Promise<{ id: string }> }
               {bracketB && (
                 <BracketTree
                   type="B"
+                  size={bracketB.size}
                   rounds={bracketB.rounds}
                   allTeams={contest.teams}
-                  onMatchUpdate={fetchContest}
+                  onMatchUpdate={handleMatchUpdate}
                   contestId={id}
                   canEdit={contest.status !== 'FINISHED'}
                 />
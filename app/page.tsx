@@ -1,29 +1,29 @@
 import Link from 'next/link';
 import { Plus } from 'lucide-react';
 import { BouleIcon, CochonnetIcon, TrophyPetanqueIcon } from '@/components/icons/PetanqueIcons';
-import { ContestCard } from '@/components/ContestCard';
+import { ContestList } from '@/components/ContestList';
 
-import prisma from '@/lib/db';
+import { prismaRead } from '@/lib/db';
+import { DEFAULT_PAGE_SIZE, listContests } from '@/lib/contest-list';
 
 export const dynamic = 'force-dynamic';
 
+// Première page seulement: le temps de chargement ne dépend pas de l'historique
 async function getContests() {
   try {
-    const contests = await prisma.contest.findMany({
-      include: {
-        _count: { select: { teams: true } },
-      },
-      orderBy: { createdAt: 'desc' },
-    });
-    return contests;
+    const page = await listContests(prismaRead, { limit: DEFAULT_PAGE_SIZE });
+    return {
+      items: page.items.map(contest => ({ ...contest, createdAt: contest.createdAt.toISOString() })),
+      nextCursor: page.nextCursor,
+    };
   } catch (error) {
     console.error('Error fetching contests:', error);
-    return [];
+    return { items: [], nextCursor: null };
   }
 }
 
 export default async function HomePage() {
-  const contests = await getContests();
+  const { items: contests, nextCursor } = await getContests();
 
   return (
     <div className="min-h-screen">
@@ -76,19 +76,7 @@ export default async function HomePage() {
             </Link>
           </div>
         ) : (
-          <>
-            <div className="flex items-center justify-between mb-6">
-              <h2 className="text-xl font-semibold text-gray-800">
-                Vos concours ({contests.length})
-              </h2>
-            </div>
-
-            <div className="grid gap-6 md:grid-cols-2 lg:grid-cols-3">
-              {contests.map((contest: any, index: number) => (
-                <ContestCard key={contest.id} contest={contest} index={index} />
-              ))}
-            </div>
-          </>
+          <ContestList initialItems={contests} initialCursor={nextCursor} />
         )}
       </main>
 
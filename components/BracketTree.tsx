@@ -1,8 +1,10 @@
 'use client';
 
-import { useState } from 'react';
+import { memo, useCallback, useEffect, useMemo, useRef, useState } from 'react';
 import { Trophy, Crown, X, Check, Search } from 'lucide-react';
 import { BouleIcon, TrophyPetanqueIcon } from '@/components/icons/PetanqueIcons';
+import { bracketShape, getRoundName } from '@/lib/bracket-topology';
+import { visibleRange } from '@/lib/virtual-window';
 
 interface Player {
   firstName: string;
@@ -23,6 +25,7 @@ interface Match {
   winnerTeamId?: string;
   status: string;
   isBye: boolean;
+  version?: number;
 }
 
 interface Round {
@@ -33,6 +36,8 @@ interface Round {
 
 interface BracketTreeProps {
   type: 'A' | 'B';
+  // Nombre de qualifiés, fixé à la fin du Tour 1 (null: pas encore connu)
+  size?: number | null;
   rounds: Round[];
   allTeams: Team[];
   onMatchUpdate: () => void;
@@ -40,19 +45,257 @@ interface BracketTreeProps {
   canEdit: boolean;
 }
 
-export function BracketTree({ type, rounds, allTeams, onMatchUpdate, contestId, canEdit }: BracketTreeProps) {
+// ============================================================
+// RENDU VIRTUALISÉ
+// ============================================================
+//
+// Colonnes de largeur fixe et cartes de hauteur fixe: au Tour 1 chaque match
+// occupe ROUND1_SLOT_HEIGHT, puis la hauteur d'un emplacement double à chaque
+// tour (la carte est centrée entre les deux matchs qui l'alimentent). Seules
+// les colonnes et les cartes visibles sont rendues (lib/virtual-window.ts).
+//
+// Les matchs sont créés au fil des qualifications: chaque carte est placée
+// par son numéro de match, les positions encore sans match restent vides.
+
+const COLUMN_WIDTH = 240;
+const COLUMN_GAP = 24;
+const HEADER_HEIGHT = 56;
+const CARD_HEIGHT = 152;
+const ROUND1_SLOT_HEIGHT = 168;
+const VIEWPORT_HEIGHT = 720;
+
+interface Column {
+  roundNumber: number;
+  roundName: string;
+  // Un emplacement par position du tour (null: match pas encore créé)
+  slots: (Match | null)[];
+}
+
+/**
+ * Colonnes du tableau: tous les tours d'après la taille du bracket, ou les
+ * tours existants pour un tableau créé en entier au tirage
+ */
+function bracketColumns(rounds: Round[], size: number | null | undefined): Column[] {
+  const shape = size ? bracketShape(size) : null;
+  const totalRounds = shape ? shape.totalRounds : rounds.length;
+
+  return Array.from({ length: totalRounds }, (_, i) => {
+    const round = shape ? rounds.find(r => r.roundNumber === i + 1) : rounds[i];
+    const slots: (Match | null)[] = new Array(
+      shape ? shape.firstRoundMatches / 2 ** i : round?.matches.length ?? 0
+    ).fill(null);
+    for (const match of round?.matches ?? []) slots[match.matchNumber - 1] = match;
+    return {
+      roundNumber: round?.roundNumber ?? i + 1,
+      roundName: round?.roundName ?? getRoundName(i + 1, totalRounds),
+      slots,
+    };
+  });
+}
+
+const getTeamDisplay = (team: Team) => {
+  if (team.name) return team.name;
+  return team.players.map(p => p.firstName).join(' / ');
+};
+
+interface BracketMatchCardProps {
+  match: Match;
+  top: number;
+  canEdit: boolean;
+  onSelect: (match: Match) => void;
+}
+
+/**
+ * Carte d'un match: rendue à nouveau seulement si la version du match change
+ * (le flux en direct ne remplace que les matchs modifiés)
+ */
+const BracketMatchCard = memo(function BracketMatchCard({ match, top, canEdit, onSelect }: BracketMatchCardProps) {
+  const isReady = match.homeTeam && match.awayTeam && match.status !== 'FINISHED' && !match.isBye;
+
+  return (
+    <div
+      className={`bracket-match p-3 absolute inset-x-0 overflow-hidden ${
+        match.isBye
+          ? 'bg-gray-100 border-gray-300'
+          : match.status === 'FINISHED'
+          ? 'bg-gradient-to-r from-[#f0fdf4] to-[#dcfce7] border-green-300'
+          : isReady
+          ? 'bg-blue-50 border-blue-400 border-[3px] shadow-md cursor-pointer hover:border-[#2D5A27] transition-all'
+          : 'bg-gray-50 border-gray-200'
+      }`}
+      style={{ top, height: CARD_HEIGHT }}
+      onClick={() => match.status !== 'FINISHED' && onSelect(match)}
+    >
+      {match.isBye ? (
+        <div className="text-center py-2">
+          <div className="flex items-center justify-center gap-2 text-gray-500">
+            <div className="team-number text-xs w-6 h-6">
+              {match.homeTeam?.teamNumber || '?'}
+            </div>
+            <span className="text-sm">Exempt</span>
+          </div>
+        </div>
+      ) : (
+        <div className="space-y-2">
+          {/* Badge "Prêt à jouer" si le match est prêt */}
+          {isReady && (
+            <div className="flex items-center justify-center mb-1">
+              <span className="px-2 py-0.5 bg-blue-100 text-blue-700 rounded-full text-xs font-bold uppercase tracking-wide animate-pulse">
+                Prêt
+              </span>
+            </div>
+          )}
+
+          {/* Équipe domicile */}
+          <div className="flex items-center justify-between">
+            <div className="flex items-center gap-2">
+              {match.homeTeam ? (
+                <>
+                  <div className={`team-number text-xs w-6 h-6 ${
+                    match.winnerTeamId === match.homeTeam.id
+                      ? 'bg-[#2D5A27]'
+                      : isReady
+                      ? 'bg-blue-600'
+                      : ''
+                  }`}>
+                    {match.homeTeam.teamNumber}
+                  </div>
+                  <span className={`text-sm ${
+                    match.winnerTeamId === match.homeTeam.id
+                      ? 'font-bold text-[#2D5A27]'
+                      : isReady
+                      ? 'font-bold text-blue-800'
+                      : 'text-gray-700'
+                  }`}>
+                    {getTeamDisplay(match.homeTeam)}
+                  </span>
+                </>
+              ) : (
+                <span className="text-sm text-gray-400 italic">À déterminer</span>
+              )}
+            </div>
+            {match.winnerTeamId === match.homeTeam?.id && (
+              <Check className="w-4 h-4 text-green-600" />
+            )}
+          </div>
+
+          {/* Séparateur */}
+          <div className={`border-t border-dashed ${isReady ? 'border-blue-300' : 'border-gray-200'}`} />
+
+          {/* Équipe extérieur */}
+          <div className="flex items-center justify-between">
+            <div className="flex items-center gap-2">
+              {match.awayTeam ? (
+                <>
+                  <div className={`team-number text-xs w-6 h-6 ${
+                    match.winnerTeamId === match.awayTeam.id
+                      ? 'bg-[#2D5A27]'
+                      : isReady
+                      ? 'bg-blue-600'
+                      : ''
+                  }`}>
+                    {match.awayTeam.teamNumber}
+                  </div>
+                  <span className={`text-sm ${
+                    match.winnerTeamId === match.awayTeam.id
+                      ? 'font-bold text-[#2D5A27]'
+                      : isReady
+                      ? 'font-bold text-blue-800'
+                      : 'text-gray-700'
+                  }`}>
+                    {getTeamDisplay(match.awayTeam)}
+                  </span>
+                </>
+              ) : (
+                <span className="text-sm text-gray-400 italic">À déterminer</span>
+              )}
+            </div>
+            {match.winnerTeamId === match.awayTeam?.id && (
+              <Check className="w-4 h-4 text-green-600" />
+            )}
+          </div>
+
+          {/* Indicateur cliquable */}
+          {canEdit && isReady && (
+            <div className="text-center pt-1">
+              <span className="text-xs text-blue-500 font-medium">Cliquer pour saisir le résultat</span>
+            </div>
+          )}
+        </div>
+      )}
+    </div>
+  );
+}, (prev, next) =>
+  prev.top === next.top &&
+  prev.canEdit === next.canEdit &&
+  prev.onSelect === next.onSelect &&
+  (prev.match === next.match ||
+    (prev.match.id === next.match.id && prev.match.version !== undefined && prev.match.version === next.match.version))
+);
+
+/**
+ * Tableau A ou B: mémoïsé, il n'est rendu à nouveau que si ses rounds changent
+ */
+export const BracketTree = memo(function BracketTree({ type, size, rounds, allTeams, onMatchUpdate, contestId, canEdit }: BracketTreeProps) {
   const [selectedMatch, setSelectedMatch] = useState<Match | null>(null);
   const [pendingWinner, setPendingWinner] = useState<Team | null>(null);
   const [pendingMatch, setPendingMatch] = useState<Match | null>(null);
   const [isSubmitting, setIsSubmitting] = useState(false);
   const [error, setError] = useState('');
   const [quickInput, setQuickInput] = useState('');
+  const [viewport, setViewport] = useState({ top: 0, left: 0, width: 1200, height: VIEWPORT_HEIGHT });
+  const scrollRef = useRef<HTMLDivElement>(null);
+  const frameRef = useRef<number | null>(null);
+  const columns = useMemo(() => bracketColumns(rounds, size), [rounds, size]);
+  const isEmpty = columns.length === 0;
+
+  // Position et taille de la zone de défilement (au plus une mise à jour par image)
+  const measure = useCallback(() => {
+    frameRef.current = null;
+    const el = scrollRef.current;
+    if (!el) return;
+    setViewport({
+      top: el.scrollTop,
+      left: el.scrollLeft,
+      width: el.clientWidth,
+      height: Math.max(0, el.clientHeight - HEADER_HEIGHT),
+    });
+  }, []);
+
+  const handleScroll = useCallback(() => {
+    if (frameRef.current === null) frameRef.current = requestAnimationFrame(measure);
+  }, [measure]);
+
+  // Zone de défilement absente tant que le tableau n'est pas constitué
+  useEffect(() => {
+    const el = scrollRef.current;
+    if (!el) return;
+    measure();
+    const observer = new ResizeObserver(handleScroll);
+    observer.observe(el);
+    return () => {
+      observer.disconnect();
+      if (frameRef.current !== null) cancelAnimationFrame(frameRef.current);
+    };
+  }, [measure, handleScroll, isEmpty]);
+
+  // Flux en direct: si un autre poste vient de saisir le match ouvert, fermer la saisie
+  useEffect(() => {
+    const isFinished = (match: Match | null) =>
+      match !== null &&
+      rounds.some((round) => round.matches.some((m) => m.id === match.id && m.status === 'FINISHED'));
+    if (isFinished(selectedMatch)) setSelectedMatch(null);
+    if (isFinished(pendingMatch)) {
+      setPendingMatch(null);
+      setPendingWinner(null);
+    }
+  }, [rounds]);
 
-  const handleMatchClick = (match: Match) => {
+  const handleMatchClick = useCallback((match: Match) => {
     if (!canEdit || !match.homeTeam || !match.awayTeam || match.isBye || match.status === 'FINISHED') return;
     setSelectedMatch(match);
     setError('');
-  };
+  }, [canEdit]);
 
   const handleSelectWinner = (team: Team, match: Match) => {
     setPendingWinner(team);
@@ -136,25 +379,39 @@ export function BracketTree({ type, rounds, allTeams, onMatchUpdate, contestId,
     return null;
   };
 
-  const getTeamDisplay = (team: Team) => {
-    if (team.name) return team.name;
-    return team.players.map(p => p.firstName).join(' / ');
-  };
-
-  // Statistiques
-  const pendingMatches = rounds.flatMap(r => r.matches).filter(m =>
+  // Statistiques (les positions sans match comptent dans le total)
+  const positions = columns.flatMap(c => c.slots);
+  const matches = positions.filter((m): m is Match => m !== null);
+  const pendingMatches = matches.filter(m =>
     m.status !== 'FINISHED' && !m.isBye && m.homeTeam && m.awayTeam
   ).length;
-  const finishedMatches = rounds.flatMap(r => r.matches).filter(m => m.status === 'FINISHED').length;
-  const totalMatches = rounds.flatMap(r => r.matches).filter(m => !m.isBye || m.status === 'FINISHED').length;
+  const finishedMatches = matches.filter(m => m.status === 'FINISHED').length;
+  const totalMatches = positions.filter(m => !m?.isBye || m.status === 'FINISHED').length;
   const progress = totalMatches > 0 ? Math.round((finishedMatches / totalMatches) * 100) : 0;
 
   // Déterminer le vainqueur
-  const finalMatch = rounds.length > 0 ? rounds[rounds.length - 1].matches[0] : null;
+  const finalMatch = columns.length > 0 ? columns[columns.length - 1].slots[0] : null;
   const winner = finalMatch?.status === 'FINISHED'
     ? (finalMatch.winnerTeamId === finalMatch.homeTeam?.id ? finalMatch.homeTeam : finalMatch.awayTeam)
     : null;
 
+  // Géométrie du tableau et fenêtre visible
+  const slotCount = Math.max(1, ...columns.map(c => c.slots.length));
+  const contentHeight = slotCount * ROUND1_SLOT_HEIGHT;
+  const contentWidth = Math.max(0, columns.length * (COLUMN_WIDTH + COLUMN_GAP) - COLUMN_GAP);
+  const columnRange = visibleRange(viewport.left, viewport.width, COLUMN_WIDTH + COLUMN_GAP, columns.length, 1);
+  const visibleColumns = columns.slice(columnRange.start, columnRange.end).map((column, i) => {
+    const roundIndex = columnRange.start + i;
+    const slotHeight = contentHeight / Math.max(1, column.slots.length);
+    return {
+      column,
+      roundIndex,
+      left: roundIndex * (COLUMN_WIDTH + COLUMN_GAP),
+      slotHeight,
+      range: visibleRange(viewport.top, viewport.height, slotHeight, column.slots.length),
+    };
+  });
+
   return (
     <>
       <div className="card-petanque overflow-hidden">
@@ -215,145 +472,66 @@ export function BracketTree({ type, rounds, allTeams, onMatchUpdate, contestId,
 
         {/* Bracket */}
         <div className="p-5">
-          <div className="overflow-x-auto">
-            <div className="flex gap-6 min-w-max pb-4">
-              {rounds.map((round, roundIndex) => (
-                <div key={round.roundNumber} className="flex-shrink-0" style={{ width: '240px' }}>
-                  {/* Round header */}
-                  <div className="text-center mb-4">
-                    <span className={`inline-block px-4 py-2 rounded-xl text-sm font-semibold ${
-                      roundIndex === rounds.length - 1
-                        ? 'bg-gradient-to-r from-[#D4AF37] to-[#F4D03F] text-white'
-                        : 'bg-[#F5EFE0] text-gray-700'
-                    }`}>
-                      {round.roundName}
-                    </span>
-                  </div>
+          {isEmpty ? (
+            <p className="text-center text-gray-500 py-6">
+              Tableau constitué à la fin du Tour 1, d&apos;après le nombre exact de qualifiés
+            </p>
+          ) : (
+            <div
+              ref={scrollRef}
+              onScroll={handleScroll}
+              className="overflow-auto"
+              style={{ maxHeight: HEADER_HEIGHT + VIEWPORT_HEIGHT }}
+            >
+              <div className="relative" style={{ width: contentWidth, height: HEADER_HEIGHT + contentHeight }}>
+                {/* En-têtes des rounds (restent visibles au défilement vertical) */}
+                <div className="sticky top-0 z-10 bg-white" style={{ height: HEADER_HEIGHT, width: contentWidth }}>
+                  {visibleColumns.map(({ column, roundIndex, left }) => (
+                    <div key={column.roundNumber} className="absolute text-center" style={{ left, width: COLUMN_WIDTH }}>
+                      <span className={`inline-block px-4 py-2 rounded-xl text-sm font-semibold ${
+                        roundIndex === columns.length - 1
+                          ? 'bg-gradient-to-r from-[#D4AF37] to-[#F4D03F] text-white'
+                          : 'bg-[#F5EFE0] text-gray-700'
+                      }`}>
+                        {column.roundName}
+                      </span>
+                    </div>
+                  ))}
+                </div>
 
-                  {/* Matches */}
-                  <div className="space-y-4">
-                    {round.matches.map((match) => {
-                      const isReady = match.homeTeam && match.awayTeam && match.status !== 'FINISHED' && !match.isBye;
-
-                      return (
-                      <div
-                        key={match.id}
-                        className={`bracket-match p-3 ${
-                          match.isBye
-                            ? 'bg-gray-100 border-gray-300'
-                            : match.status === 'FINISHED'
-                            ? 'bg-gradient-to-r from-[#f0fdf4] to-[#dcfce7] border-green-300'
-                            : isReady
-                            ? 'bg-blue-50 border-blue-400 border-[3px] shadow-md cursor-pointer hover:border-[#2D5A27] transition-all'
-                            : 'bg-gray-50 border-gray-200'
-                        }`}
-                        onClick={() => match.status !== 'FINISHED' && handleMatchClick(match)}
-                      >
-                        {match.isBye ? (
-                          <div className="text-center py-2">
-                            <div className="flex items-center justify-center gap-2 text-gray-500">
-                              <div className="team-number text-xs w-6 h-6">
-                                {match.homeTeam?.teamNumber || '?'}
-                              </div>
-                              <span className="text-sm">Exempt</span>
-                            </div>
-                          </div>
-                        ) : (
-                          <div className="space-y-2">
-                            {/* Badge "Prêt à jouer" si le match est prêt */}
-                            {isReady && (
-                              <div className="flex items-center justify-center mb-1">
-                                <span className="px-2 py-0.5 bg-blue-100 text-blue-700 rounded-full text-xs font-bold uppercase tracking-wide animate-pulse">
-                                  Prêt
-                                </span>
-                              </div>
-                            )}
-
-                            {/* Équipe domicile */}
-                            <div className="flex items-center justify-between">
-                              <div className="flex items-center gap-2">
-                                {match.homeTeam ? (
-                                  <>
-                                    <div className={`team-number text-xs w-6 h-6 ${
-                                      match.winnerTeamId === match.homeTeam.id
-                                        ? 'bg-[#2D5A27]'
-                                        : isReady
-                                        ? 'bg-blue-600'
-                                        : ''
-                                    }`}>
-                                      {match.homeTeam.teamNumber}
-                                    </div>
-                                    <span className={`text-sm ${
-                                      match.winnerTeamId === match.homeTeam.id
-                                        ? 'font-bold text-[#2D5A27]'
-                                        : isReady
-                                        ? 'font-bold text-blue-800'
-                                        : 'text-gray-700'
-                                    }`}>
-                                      {getTeamDisplay(match.homeTeam)}
-                                    </span>
-                                  </>
-                                ) : (
-                                  <span className="text-sm text-gray-400 italic">À déterminer</span>
-                                )}
-                              </div>
-                              {match.winnerTeamId === match.homeTeam?.id && (
-                                <Check className="w-4 h-4 text-green-600" />
-                              )}
-                            </div>
-
-                            {/* Séparateur */}
-                            <div className={`border-t border-dashed ${isReady ? 'border-blue-300' : 'border-gray-200'}`} />
-
-                            {/* Équipe extérieur */}
-                            <div className="flex items-center justify-between">
-                              <div className="flex items-center gap-2">
-                                {match.awayTeam ? (
-                                  <>
-                                    <div className={`team-number text-xs w-6 h-6 ${
-                                      match.winnerTeamId === match.awayTeam.id
-                                        ? 'bg-[#2D5A27]'
-                                        : isReady
-                                        ? 'bg-blue-600'
-                                        : ''
-                                    }`}>
-                                      {match.awayTeam.teamNumber}
-                                    </div>
-                                    <span className={`text-sm ${
-                                      match.winnerTeamId === match.awayTeam.id
-                                        ? 'font-bold text-[#2D5A27]'
-                                        : isReady
-                                        ? 'font-bold text-blue-800'
-                                        : 'text-gray-700'
-                                    }`}>
-                                      {getTeamDisplay(match.awayTeam)}
-                                    </span>
-                                  </>
-                                ) : (
-                                  <span className="text-sm text-gray-400 italic">À déterminer</span>
-                                )}
-                              </div>
-                              {match.winnerTeamId === match.awayTeam?.id && (
-                                <Check className="w-4 h-4 text-green-600" />
-                              )}
-                            </div>
-
-                            {/* Indicateur cliquable */}
-                            {canEdit && isReady && (
-                              <div className="text-center pt-1">
-                                <span className="text-xs text-blue-500 font-medium">Cliquer pour saisir le résultat</span>
-                              </div>
-                            )}
-                          </div>
-                        )}
-                      </div>
-                    );
+                {/* Matchs visibles */}
+                {visibleColumns.map(({ column, left, slotHeight, range }) => (
+                  <div
+                    key={column.roundNumber}
+                    className="absolute"
+                    style={{ left, top: HEADER_HEIGHT, width: COLUMN_WIDTH, height: contentHeight }}
+                  >
+                    {column.slots.slice(range.start, range.end).map((match, i) => {
+                      const top = (range.start + i) * slotHeight + (slotHeight - CARD_HEIGHT) / 2;
+                      return match ? (
+                        <BracketMatchCard
+                          key={match.id}
+                          match={match}
+                          top={top}
+                          canEdit={canEdit}
+                          onSelect={handleMatchClick}
+                        />
+                      ) : (
+                        // Position sans match: créé avec sa première équipe
+                        <div
+                          key={`position-${range.start + i}`}
+                          className="bracket-match absolute inset-x-0 bg-gray-50 border-gray-200 border-dashed flex items-center justify-center"
+                          style={{ top, height: CARD_HEIGHT }}
+                        >
+                          <span className="text-sm text-gray-400 italic">À déterminer</span>
+                        </div>
+                      );
                     })}
                   </div>
-                </div>
-              ))}
+                ))}
+              </div>
             </div>
-          </div>
+          )}
 
           {/* Récapitulatif */}
           <div className="mt-6 p-4 bg-[#F5EFE0] rounded-xl">
@@ -534,4 +712,4 @@ export function BracketTree({ type, rounds, allTeams, onMatchUpdate, contestId,
       )}
     </>
   );
-}
+});
@@ -11,11 +11,12 @@ interface ContestCardProps {
   contest: {
     id: string;
     name: string;
-    date: string;
-    location: string;
+    createdAt: string;
+    location: string | null;
     teamType: string;
-    status: string;
-    _count: { teams: number };
+    phase: string;
+    teamCount: number;
+    finishedMatchCount: number;
   };
   index: number;
 }
@@ -120,19 +121,19 @@ export function ContestCard({ contest, index }: ContestCardProps) {
           {/* Contenu de la carte */}
           <div className="p-4 space-y-3">
             <div className="flex items-center justify-between">
-              <span className={`badge-status ${statusColors[contest.status]}`}>
-                {statusLabels[contest.status]}
+              <span className={`badge-status ${statusColors[contest.phase]}`}>
+                {statusLabels[contest.phase]}
               </span>
               <div className="flex items-center gap-1 text-gray-600">
                 <Users className="w-4 h-4" />
-                <span className="font-semibold">{contest._count.teams}</span>
+                <span className="font-semibold">{contest.teamCount}</span>
                 <span className="text-sm">équipes</span>
               </div>
             </div>
 
             <div className="flex items-center text-sm text-gray-600 gap-2">
               <Calendar className="w-4 h-4 text-[#2D5A27]" />
-              <span>{formatDate(contest.date)}</span>
+              <span>{formatDate(contest.createdAt)}</span>
             </div>
 
             <div className="flex items-center text-sm text-gray-600 gap-2">
@@ -140,16 +141,23 @@ export function ContestCard({ contest, index }: ContestCardProps) {
               <span>{contest.location}</span>
             </div>
 
+            {contest.finishedMatchCount > 0 && (
+              <div className="flex items-center text-sm text-gray-600 gap-2">
+                <BouleIcon className="w-4 h-4" />
+                <span>{contest.finishedMatchCount} matchs joués</span>
+              </div>
+            )}
+
             {/* Barre de progression visuelle */}
             <div className="pt-2">
               <div className="h-2 bg-gray-100 rounded-full overflow-hidden">
                 <div
                   className="h-full bg-gradient-to-r from-[#2D5A27] to-[#4A7C43] transition-all duration-500"
                   style={{
-                    width: contest.status === 'DRAFT' ? '10%' :
-                           contest.status === 'QUALIFICATION_ROUND_1' ? '35%' :
-                           contest.status === 'QUALIFICATION_ROUND_2' ? '60%' :
-                           contest.status === 'BRACKETS_GENERATED' ? '85%' :
+                    width: contest.phase === 'DRAFT' ? '10%' :
+                           contest.phase === 'QUALIFICATION_ROUND_1' ? '35%' :
+                           contest.phase === 'QUALIFICATION_ROUND_2' ? '60%' :
+                           contest.phase === 'BRACKETS_GENERATED' ? '85%' :
                            '100%'
                   }}
                 />
@@ -0,0 +1,130 @@
+'use client';
+
+import { useEffect, useState } from 'react';
+import { ContestCard } from '@/components/ContestCard';
+import { BouleIcon } from '@/components/icons/PetanqueIcons';
+
+export interface ContestListItem {
+  id: string;
+  name: string;
+  createdAt: string;
+  location: string | null;
+  teamType: string;
+  phase: string;
+  teamCount: number;
+  finishedMatchCount: number;
+}
+
+interface ContestListProps {
+  initialItems: ContestListItem[];
+  initialCursor: string | null;
+}
+
+const statusFilters = [
+  { value: '', label: 'Tous' },
+  { value: 'DRAFT', label: 'Brouillons' },
+  { value: 'IN_PROGRESS', label: 'En cours' },
+  { value: 'FINISHED', label: 'Terminés' },
+];
+
+/**
+ * Liste des concours chargée page par page (la première page est rendue par le serveur)
+ */
+export function ContestList({ initialItems, initialCursor }: ContestListProps) {
+  const [items, setItems] = useState(initialItems);
+  const [cursor, setCursor] = useState(initialCursor);
+  const [status, setStatus] = useState('');
+  const [isLoading, setIsLoading] = useState(false);
+
+  // Rechargement serveur (après une suppression): repartir de la première page
+  useEffect(() => {
+    setItems(initialItems);
+    setCursor(initialCursor);
+    setStatus('');
+  }, [initialItems, initialCursor]);
+
+  const fetchPage = async (nextStatus: string, nextCursor: string | null) => {
+    const params = new URLSearchParams();
+    if (nextStatus) params.set('status', nextStatus);
+    if (nextCursor) params.set('cursor', nextCursor);
+
+    setIsLoading(true);
+    try {
+      const response = await fetch(`/api/contests?${params}`);
+      if (!response.ok) throw new Error('Erreur de chargement');
+      return (await response.json()) as { items: ContestListItem[]; nextCursor: string | null };
+    } finally {
+      setIsLoading(false);
+    }
+  };
+
+  const changeStatus = async (nextStatus: string) => {
+    if (nextStatus === status) return;
+    try {
+      const page = await fetchPage(nextStatus, null);
+      setStatus(nextStatus);
+      setItems(page.items);
+      setCursor(page.nextCursor);
+    } catch (error) {
+      console.error('Error fetching contests:', error);
+    }
+  };
+
+  const loadMore = async () => {
+    if (!cursor) return;
+    try {
+      const page = await fetchPage(status, cursor);
+      setItems(current => [...current, ...page.items]);
+      setCursor(page.nextCursor);
+    } catch (error) {
+      console.error('Error fetching contests:', error);
+    }
+  };
+
+  return (
+    <>
+      <div className="flex items-center justify-between mb-6">
+        <h2 className="text-xl font-semibold text-gray-800">Vos concours</h2>
+        <div className="flex gap-2">
+          {statusFilters.map(filter => (
+            <button
+              key={filter.value}
+              onClick={() => changeStatus(filter.value)}
+              disabled={isLoading}
+              className={`px-3 py-1 rounded-xl text-sm font-medium transition-colors ${
+                status === filter.value
+                  ? 'bg-[#2D5A27] text-white'
+                  : 'bg-gray-100 text-gray-700 hover:bg-gray-200'
+              }`}
+            >
+              {filter.label}
+            </button>
+          ))}
+        </div>
+      </div>
+
+      {items.length === 0 ? (
+        <p className="text-center text-gray-500 py-12">Aucun concours pour ce filtre</p>
+      ) : (
+        <div className="grid gap-6 md:grid-cols-2 lg:grid-cols-3">
+          {items.map((contest, index) => (
+            <ContestCard key={contest.id} contest={contest} index={index % 12} />
+          ))}
+        </div>
+      )}
+
+      {cursor && (
+        <div className="flex justify-center mt-8">
+          <button
+            onClick={loadMore}
+            disabled={isLoading}
+            className="btn-petanque inline-flex items-center gap-2 disabled:opacity-50"
+          >
+            {isLoading && <BouleIcon className="w-5 h-5 animate-spin" />}
+            {isLoading ? 'Chargement...' : 'Voir plus de concours'}
+          </button>
+        </div>
+      )}
+    </>
+  );
+}
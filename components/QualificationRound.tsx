@@ -1,6 +1,6 @@
 'use client';
 
-import { useState } from 'react';
+import { memo, useState, useEffect } from 'react';
 import { Trophy, Check, X, Search, AlertCircle } from 'lucide-react';
 import { BouleIcon, CochonnetIcon } from '@/components/icons/PetanqueIcons';
 
@@ -42,7 +42,10 @@ interface QualificationRoundProps {
   pendingTeams?: PendingTeam[]; // Équipes en attente d'assignation (pour le Tour 2)
 }
 
-export function QualificationRound({
+/**
+ * Tour de qualification: mémoïsé, il n'est rendu à nouveau que si ses matchs changent
+ */
+export const QualificationRound = memo(function QualificationRound({
   roundNumber,
   matches,
   allTeams,
@@ -58,6 +61,17 @@ export function QualificationRound({
   const [isSubmitting, setIsSubmitting] = useState(false);
   const [error, setError] = useState('');
 
+  // Flux en direct: si un autre poste vient de saisir le match ouvert, fermer la saisie
+  useEffect(() => {
+    const isFinished = (match: Match | null) =>
+      match !== null && matches.find((m) => m.id === match.id)?.status === 'FINISHED';
+    if (isFinished(selectedMatch)) setSelectedMatch(null);
+    if (isFinished(pendingMatch)) {
+      setPendingMatch(null);
+      setPendingWinner(null);
+    }
+  }, [matches]);
+
   const getTeamDisplay = (team: Team) => {
     if (team.name) return team.name;
     return team.players.map((p) => p.firstName).join(' / ');
@@ -585,4 +599,4 @@ export function QualificationRound({
       )}
     </>
   );
-}
+});
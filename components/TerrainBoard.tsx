@@ -0,0 +1,159 @@
+'use client';
+
+import { useState, useEffect } from 'react';
+import { MapPin, Crown, Timer } from 'lucide-react';
+
+interface BoardMatch {
+  id: string;
+  label: string;
+  homeTeamId: string | null;
+  awayTeamId: string | null;
+}
+
+interface BoardTerrain {
+  id: string;
+  number: number;
+  name: string | null;
+  isMain: boolean;
+  current: BoardMatch | null;
+  next: BoardMatch | null;
+}
+
+interface Board {
+  terrains: BoardTerrain[];
+  stats: { playedMatches: number; matchesPerHour: number; utilisation: number };
+  teams: { id: string; teamNumber: number; name: string | null }[];
+}
+
+interface TerrainBoardProps {
+  contestId: string;
+  // Change à chaque événement terrains-updated du flux en direct
+  refreshKey: number;
+  canEdit: boolean;
+}
+
+/**
+ * Tableau des terrains: match appelé et prochain match prévu sur chaque terrain
+ */
+export function TerrainBoard({ contestId, refreshKey, canEdit }: TerrainBoardProps) {
+  const [board, setBoard] = useState<Board | null>(null);
+  const [terrainCount, setTerrainCount] = useState('8');
+  const [isSaving, setIsSaving] = useState(false);
+
+  const fetchBoard = async () => {
+    try {
+      const response = await fetch(`/api/contests/${contestId}/terrains`);
+      if (response.ok) setBoard(await response.json());
+    } catch {
+      // Tableau secondaire: la page reste utilisable sans lui
+    }
+  };
+
+  useEffect(() => {
+    fetchBoard();
+  }, [contestId, refreshKey]);
+
+  // Terrains alignés, le n°1 est le terrain d'honneur
+  const handleCreateTerrains = async () => {
+    const count = parseInt(terrainCount, 10);
+    if (isNaN(count) || count < 1) return;
+
+    setIsSaving(true);
+    try {
+      await fetch(`/api/contests/${contestId}/terrains`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+          terrains: Array.from({ length: count }, (_, i) => ({ number: i + 1, isMain: i === 0 })),
+        }),
+      });
+      await fetchBoard();
+    } finally {
+      setIsSaving(false);
+    }
+  };
+
+  if (!board) return null;
+
+  if (board.terrains.length === 0) {
+    if (!canEdit) return null;
+    return (
+      <div className="card-petanque p-5 flex flex-wrap items-center gap-3">
+        <MapPin className="w-5 h-5 text-[#2D5A27]" />
+        <span className="font-semibold text-gray-700">Attribuer les matchs aux terrains</span>
+        <input
+          type="number"
+          min={1}
+          max={200}
+          value={terrainCount}
+          onChange={(e) => setTerrainCount(e.target.value)}
+          className="w-20 px-3 py-1 border-2 border-gray-200 rounded-lg"
+        />
+        <span className="text-sm text-gray-500">terrains (le n°1 est le terrain d'honneur)</span>
+        <button onClick={handleCreateTerrains} disabled={isSaving} className="btn-petanque py-1 px-4">
+          Créer
+        </button>
+      </div>
+    );
+  }
+
+  const teamsById = new Map(board.teams.map(t => [t.id, t]));
+  const teamLabel = (teamId: string | null) => {
+    const team = teamId ? teamsById.get(teamId) : undefined;
+    return team ? `${team.teamNumber}${team.name ? ` ${team.name}` : ''}` : '?';
+  };
+  const renderMatch = (match: BoardMatch) => (
+    <>
+      <div className="text-xs text-gray-500">{match.label}</div>
+      <div className="font-semibold text-gray-800">
+        {teamLabel(match.homeTeamId)} <span className="text-gray-400">vs</span> {teamLabel(match.awayTeamId)}
+      </div>
+    </>
+  );
+
+  return (
+    <div className="card-petanque overflow-hidden">
+      <div className="bg-gradient-to-r from-[#2D5A27] to-[#4A7C43] p-5 text-white flex items-center justify-between">
+        <div className="flex items-center gap-3">
+          <MapPin className="w-6 h-6" />
+          <h3 className="text-xl font-bold">Terrains</h3>
+        </div>
+        <div className="flex items-center gap-4 text-sm text-white/90">
+          <span className="flex items-center gap-1">
+            <Timer className="w-4 h-4" />
+            {board.stats.matchesPerHour} matchs/h
+          </span>
+          <span>Occupation {Math.round(board.stats.utilisation * 100)} %</span>
+          <span>{board.stats.playedMatches} joués</span>
+        </div>
+      </div>
+
+      <div className="grid gap-3 p-4 sm:grid-cols-2 lg:grid-cols-4">
+        {board.terrains.map((terrain) => (
+          <div
+            key={terrain.id}
+            className={`p-3 rounded-xl border-2 ${
+              terrain.current ? 'bg-blue-50 border-blue-300' : 'bg-gray-50 border-gray-200'
+            }`}
+          >
+            <div className="flex items-center gap-2 mb-2">
+              <span className="font-bold text-gray-800">
+                {terrain.name || `Terrain ${terrain.number}`}
+              </span>
+              {terrain.isMain && <Crown className="w-4 h-4 text-[#D4AF37]" />}
+            </div>
+            {terrain.current ? renderMatch(terrain.current) : (
+              <div className="text-sm text-gray-400">Libre</div>
+            )}
+            {terrain.next && (
+              <div className="mt-2 pt-2 border-t border-gray-200">
+                <div className="text-xs font-bold uppercase tracking-wide text-amber-600">Ensuite</div>
+                {renderMatch(terrain.next)}
+              </div>
+            )}
+          </div>
+        ))}
+      </div>
+    </div>
+  );
+}
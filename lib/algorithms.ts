@@ -1,4 +1,8 @@
 import { Team } from '@prisma/client';
+import { getRoundName } from './bracket-topology';
+
+// Nom des tours: calculé avec la topologie des brackets
+export { getRoundName };
 
 // ============================================================
 // TYPES POUR LE SYSTÈME DE QUALIFICATION
@@ -24,11 +28,14 @@ export interface QualificationResult {
 
 /**
  * Mélange aléatoirement un tableau (Fisher-Yates shuffle)
+ * Chaque permutation est équiprobable, en temps linéaire.
+ *
+ * @param random Générateur dans [0, 1) (graine du concours, voir lib/random.ts)
  */
-function shuffleArray<T>(array: T[]): T[] {
+export function shuffleArray<T>(array: T[], random: () => number = Math.random): T[] {
   const arr = [...array];
   for (let i = arr.length - 1; i > 0; i--) {
-    const j = Math.floor(Math.random() * (i + 1));
+    const j = Math.floor(random() * (i + 1));
     [arr[i], arr[j]] = [arr[j], arr[i]];
   }
   return arr;
@@ -44,14 +51,15 @@ function shuffleArray<T>(array: T[]): T[] {
  * - Si nombre impair: une équipe est exemptée (considérée gagnante)
  *
  * @param teams Liste de toutes les équipes
+ * @param random Générateur utilisé pour le tirage
  * @returns Liste des matchs avec les exemptions
  */
-export function generateQualificationRound1(teams: Team[]): QualificationMatchInfo[] {
+export function generateQualificationRound1(teams: Team[], random: () => number = Math.random): QualificationMatchInfo[] {
   if (teams.length < 2) {
     throw new Error('Au moins 2 équipes sont nécessaires');
   }
 
-  const shuffled = shuffleArray(teams);
+  const shuffled = shuffleArray(teams, random);
   const matches: QualificationMatchInfo[] = [];
   let matchNumber = 1;
 
@@ -141,9 +149,13 @@ export function getRound1Results(
  * - Règle anti-double exemption: une équipe exemptée au Tour 1 ne peut pas l'être au Tour 2
  *
  * @param round1Results Résultats du Tour 1
+ * @param random Générateur utilisé pour le tirage
  * @returns Liste des matchs du Tour 2 (gagnants + perdants)
  */
-export function generateQualificationRound2(round1Results: Round1Results): QualificationMatchInfo[] {
+export function generateQualificationRound2(
+  round1Results: Round1Results,
+  random: () => number = Math.random
+): QualificationMatchInfo[] {
   const { winners, losers, exemptedTeamId } = round1Results;
   const matches: QualificationMatchInfo[] = [];
   let matchNumber = 1;
@@ -153,7 +165,8 @@ export function generateQualificationRound2(round1Results: Round1Results): Quali
     winners,
     'WINNERS',
     matchNumber,
-    exemptedTeamId
+    exemptedTeamId,
+    random
   );
   matches.push(...winnerMatches);
   matchNumber += winnerMatches.length;
@@ -163,7 +176,8 @@ export function generateQualificationRound2(round1Results: Round1Results): Quali
     losers,
     'LOSERS',
     matchNumber,
-    exemptedTeamId
+    exemptedTeamId,
+    random
   );
   matches.push(...loserMatches);
 
@@ -178,7 +192,8 @@ function generateGroupMatches(
   teams: Team[],
   groupType: 'WINNERS' | 'LOSERS',
   startMatchNumber: number,
-  exemptedInRound1?: string
+  exemptedInRound1: string | undefined,
+  random: () => number
 ): QualificationMatchInfo[] {
   if (teams.length === 0) return [];
   if (teams.length === 1) {
@@ -191,7 +206,7 @@ function generateGroupMatches(
     }];
   }
 
-  const shuffled = shuffleArray(teams);
+  const shuffled = shuffleArray(teams, random);
   const matches: QualificationMatchInfo[] = [];
   let matchNumber = startMatchNumber;
 
@@ -211,7 +226,7 @@ function generateGroupMatches(
 
       if (eligibleIndices.length > 0) {
         // Prendre aléatoirement parmi les équipes éligibles
-        const randomIndex = Math.floor(Math.random() * eligibleIndices.length);
+        const randomIndex = Math.floor(random() * eligibleIndices.length);
         exemptIndex = eligibleIndices[randomIndex];
       }
       // Si toutes les équipes sont la même (ne devrait pas arriver), on garde le comportement par défaut
@@ -361,13 +376,12 @@ export interface BracketMatchStructure {
   homeTeamId?: string;
   awayTeamId?: string;
   isBye: boolean;
-  nextMatchId?: string;
 }
 
 /**
  * Trouve la prochaine puissance de 2 supérieure ou égale à n
  */
-function nextPowerOfTwo(n: number): number {
+export function nextPowerOfTwo(n: number): number {
   if (n <= 1) return 1;
   let power = 1;
   while (power < n) {
@@ -376,20 +390,6 @@ function nextPowerOfTwo(n: number): number {
   return power;
 }
 
-/**
- * Retourne le nom du round selon le numéro et le total
- */
-function getRoundName(roundNumber: number, totalRounds: number): string {
-  const fromEnd = totalRounds - roundNumber + 1;
-
-  if (fromEnd === 1) return 'Finale';
-  if (fromEnd === 2) return 'Demi-finales';
-  if (fromEnd === 3) return 'Quarts de finale';
-  if (fromEnd === 4) return 'Huitièmes de finale';
-
-  return `Tour ${roundNumber}`;
-}
-
 /**
  * Construit la structure d'un tableau à élimination directe
  *
@@ -399,9 +399,10 @@ function getRoundName(roundNumber: number, totalRounds: number): string {
  * - Au 1er tour, les matchs bye (une seule équipe) permettent à l'équipe de passer automatiquement
  *
  * @param teams Équipes qualifiées pour ce tableau
+ * @param random Générateur utilisé pour le placement
  * @returns Structure du bracket avec rounds et matchs
  */
-export function buildBracket(teams: Team[]): BracketStructure {
+export function buildBracket(teams: Team[], random: () => number = Math.random): BracketStructure {
   if (teams.length === 0) {
     return { rounds: [] };
   }
@@ -425,7 +426,7 @@ export function buildBracket(teams: Team[]): BracketStructure {
   }
 
   // Mélanger les équipes
-  const shuffledTeams = shuffleArray(teams);
+  const shuffledTeams = shuffleArray(teams, random);
   const n = teams.length;
 
   // Trouver la prochaine puissance de 2 supérieure ou égale
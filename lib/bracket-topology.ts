@@ -0,0 +1,75 @@
+// ============================================================
+// TOPOLOGIE POSITIONNELLE DES BRACKETS
+// ============================================================
+//
+// Un bracket est un arbre complet: sa structure se calcule, elle n'est pas
+// stockée. Le match j (0-indexé) d'un tour alimente le match floor(j/2) du
+// tour suivant, côté home si j est pair, away sinon. Le match suivant se
+// retrouve donc par sa position (type, tour, numéro), sans lien en base, et
+// l'ordre home/away ne dépend plus de l'ordre de fin des matchs.
+//
+// La forme de l'arbre ne dépend que du nombre de qualifiés, connu exactement
+// à la fin du Tour 1: les lignes sont créées à la demande (lib/engine.ts).
+
+import type { Slot } from './slot-index';
+
+export interface BracketPosition {
+  roundNumber: number;
+  // 1-indexé, comme BracketMatch.matchNumber
+  matchNumber: number;
+}
+
+/**
+ * Position alimentée par le vainqueur d'un match, et côté occupé
+ * (le match suivant n'existe pas pour la finale: à vérifier par l'appelant)
+ */
+export function nextBracketPosition({ roundNumber, matchNumber }: BracketPosition): BracketPosition & { slot: Slot } {
+  const index = matchNumber - 1;
+  return {
+    roundNumber: roundNumber + 1,
+    matchNumber: Math.floor(index / 2) + 1,
+    slot: index % 2 === 0 ? 'home' : 'away',
+  };
+}
+
+/**
+ * Clé d'un match de bracket par position (index du moteur)
+ */
+export function bracketPositionKey(bracketType: string, { roundNumber, matchNumber }: BracketPosition): string {
+  return `${bracketType}:${roundNumber}:${matchNumber}`;
+}
+
+export interface BracketShape {
+  totalRounds: number;
+  firstRoundMatches: number;
+  // Les derniers matchs du premier tour sont des exemptions
+  byes: number;
+}
+
+/**
+ * Forme d'un bracket de `qualified` équipes (au moins une): arbre de la
+ * puissance de 2 supérieure ou égale, les places en trop sont des exemptions
+ */
+export function bracketShape(qualified: number): BracketShape {
+  let slots = 2;
+  while (slots < qualified) slots *= 2;
+  return {
+    totalRounds: Math.log2(slots),
+    firstRoundMatches: slots / 2,
+    byes: slots - qualified,
+  };
+}
+
+/**
+ * Retourne le nom du round selon le numéro et le total
+ */
+export function getRoundName(roundNumber: number, totalRounds: number): string {
+  const fromEnd = totalRounds - roundNumber + 1;
+
+  if (fromEnd === 1) return 'Finale';
+  if (fromEnd === 2) return 'Demi-finales';
+  if (fromEnd === 3) return 'Quarts de finale';
+  if (fromEnd === 4) return 'Huitièmes de finale';
+
+  return `Tour ${roundNumber}`;
+}
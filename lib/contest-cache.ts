@@ -0,0 +1,111 @@
+// ============================================================
+// CACHE DES LECTURES DE CONCOURS
+// ============================================================
+//
+// GET /api/contests/[id] est interrogé en boucle par les écrans de suivi.
+// Le concours sérialisé est gardé en mémoire du processus (LRU sur les
+// concours) jusqu'à la prochaine écriture: chaque route d'écriture appelle
+// invalidate() après son commit. La base n'est relue qu'une fois par écriture,
+// quel que soit le nombre de spectateurs.
+
+import { createHash } from 'crypto';
+
+const DEFAULT_MAX_ENTRIES = 50;
+
+export interface CachedContest {
+  version: number;
+  body: string;
+  etag: string;
+}
+
+export class ContestCache {
+  // Ordre d'insertion de la Map = ordre d'utilisation (le plus ancien en tête)
+  private readonly entries = new Map<string, CachedContest>();
+  // Horloge des invalidations: une lecture commencée avant une écriture
+  // ne doit pas remettre en cache un état périmé
+  private clock = 0;
+  private readonly invalidatedAt = new Map<string, number>();
+
+  hits = 0;
+  misses = 0;
+
+  constructor(private readonly maxEntries: number = DEFAULT_MAX_ENTRIES) {}
+
+  get(contestId: string): CachedContest | undefined {
+    const entry = this.entries.get(contestId);
+    if (!entry) {
+      this.misses++;
+      return undefined;
+    }
+    this.hits++;
+    this.entries.delete(contestId);
+    this.entries.set(contestId, entry);
+    return entry;
+  }
+
+  /**
+   * À appeler avant de lire la base: le jeton est passé à set()
+   */
+  ticket(): number {
+    return this.clock;
+  }
+
+  /**
+   * Met en cache le concours sérialisé, sauf si une écriture l'a invalidé
+   * depuis la prise du jeton. L'entrée est renvoyée dans tous les cas.
+   */
+  set(contestId: string, ticket: number, version: number, body: string): CachedContest {
+    const entry = { version, body, etag: buildEtag(version, body) };
+    if ((this.invalidatedAt.get(contestId) ?? -1) >= ticket) {
+      return entry;
+    }
+
+    this.entries.delete(contestId);
+    this.entries.set(contestId, entry);
+    if (this.entries.size > this.maxEntries) {
+      const oldest = this.entries.keys().next().value as string;
+      this.entries.delete(oldest);
+    }
+    return entry;
+  }
+
+  invalidate(contestId: string) {
+    this.invalidatedAt.set(contestId, this.clock++);
+    this.entries.delete(contestId);
+  }
+
+  get size(): number {
+    return this.entries.size;
+  }
+}
+
+/**
+ * ETag fort: version du concours et empreinte du contenu (certaines écritures,
+ * comme les inscriptions en mêlée, ne changent pas la version)
+ */
+function buildEtag(version: number, body: string): string {
+  const hash = createHash('sha1').update(body).digest('base64url').slice(0, 16);
+  return `"${version}-${hash}"`;
+}
+
+/**
+ * Indique si l'en-tête If-None-Match du client correspond à l'ETag courant
+ */
+export function matchesEtag(ifNoneMatch: string | null, etag: string): boolean {
+  if (!ifNoneMatch) return false;
+  return ifNoneMatch
+    .split(',')
+    .map(tag => tag.trim().replace(/^W\//, ''))
+    .some(tag => tag === etag || tag === '*');
+}
+
+// Singleton partagé par toutes les routes (et conservé au rechargement à chaud)
+declare global {
+  var contestCacheGlobal: undefined | ContestCache
+}
+
+export const contestCache =
+  globalThis.contestCacheGlobal ??
+  new ContestCache(parseInt(process.env.CONTEST_CACHE_SIZE ?? '', 10) || DEFAULT_MAX_ENTRIES);
+
+globalThis.contestCacheGlobal = contestCache;
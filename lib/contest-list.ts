@@ -0,0 +1,104 @@
+// ============================================================
+// LISTE PAGINÉE DES CONCOURS
+// ============================================================
+//
+// Pagination par curseur sur (createdAt, id), du plus récent au plus ancien:
+// chaque page est une lecture d'index bornée, quel que soit l'historique.
+// Les compteurs viennent des colonnes dénormalisées du concours (aucun
+// comptage de lignes à la lecture).
+
+import { Prisma, PrismaClient } from '@prisma/client';
+import { z } from 'zod';
+
+export const DEFAULT_PAGE_SIZE = 24;
+const MAX_PAGE_SIZE = 100;
+
+export const contestListQuerySchema = z.object({
+  status: z.enum(['DRAFT', 'IN_PROGRESS', 'FINISHED']).optional(),
+  gameMode: z.enum(['MONTE', 'MELEE']).optional(),
+  from: z.coerce.date().optional(),
+  to: z.coerce.date().optional(),
+  cursor: z.string().min(1).optional(),
+  limit: z.coerce.number().int().min(1).max(MAX_PAGE_SIZE).default(DEFAULT_PAGE_SIZE),
+});
+
+export type ContestListQuery = z.infer<typeof contestListQuerySchema>;
+
+// Projection légère: ce qu'affiche une carte de concours
+export const contestSummarySelect = {
+  id: true,
+  name: true,
+  location: true,
+  teamType: true,
+  gameMode: true,
+  status: true,
+  phase: true,
+  teamCount: true,
+  finishedMatchCount: true,
+  createdAt: true,
+} satisfies Prisma.ContestSelect;
+
+export type ContestSummary = Prisma.ContestGetPayload<{ select: typeof contestSummarySelect }>;
+
+export interface ContestPage {
+  items: ContestSummary[];
+  nextCursor: string | null;
+}
+
+export class InvalidCursorError extends Error {
+  constructor() {
+    super('Curseur invalide');
+    this.name = 'InvalidCursorError';
+  }
+}
+
+export function encodeCursor(contest: { createdAt: Date; id: string }): string {
+  return Buffer.from(`${contest.createdAt.toISOString()}|${contest.id}`).toString('base64url');
+}
+
+export function decodeCursor(cursor: string): { createdAt: Date; id: string } {
+  const [date, id] = Buffer.from(cursor, 'base64url').toString().split('|');
+  const createdAt = new Date(date);
+  if (!id || isNaN(createdAt.getTime())) {
+    throw new InvalidCursorError();
+  }
+  return { createdAt, id };
+}
+
+export function contestListWhere(query: ContestListQuery): Prisma.ContestWhereInput {
+  const conditions: Prisma.ContestWhereInput[] = [];
+
+  if (query.status) conditions.push({ status: query.status });
+  if (query.gameMode) conditions.push({ gameMode: query.gameMode });
+  if (query.from) conditions.push({ createdAt: { gte: query.from } });
+  if (query.to) conditions.push({ createdAt: { lte: query.to } });
+
+  if (query.cursor) {
+    // Après le dernier élément de la page précédente, dans l'ordre (createdAt, id) décroissant
+    const { createdAt, id } = decodeCursor(query.cursor);
+    conditions.push({
+      OR: [{ createdAt: { lt: createdAt } }, { createdAt, id: { lt: id } }],
+    });
+  }
+
+  return conditions.length > 0 ? { AND: conditions } : {};
+}
+
+/**
+ * Une page de concours (un élément de plus est lu pour savoir s'il y a une suite)
+ */
+export async function listContests(db: PrismaClient, query: ContestListQuery): Promise<ContestPage> {
+  const rows = await db.contest.findMany({
+    where: contestListWhere(query),
+    select: contestSummarySelect,
+    orderBy: [{ createdAt: 'desc' }, { id: 'desc' }],
+    take: query.limit + 1,
+  });
+
+  const items = rows.slice(0, query.limit);
+  const hasMore = rows.length > query.limit;
+  return {
+    items,
+    nextCursor: hasMore ? encodeCursor(items[items.length - 1]) : null,
+  };
+}
@@ -0,0 +1,168 @@
+// ============================================================
+// FILE D'ÉCRITURE PAR CONCOURS
+// ============================================================
+//
+// Lors des journées fédérales, plusieurs concours tournent sur le même
+// serveur. Les écritures d'un même concours passent une à une dans sa propre
+// file (elles ne se disputent plus les versions de ligne ni la connexion
+// d'écriture), les files de concours différents avancent en parallèle: un
+// tirage lent du concours A ne retarde plus la saisie des résultats du B.
+
+import { NextRequest, NextResponse } from 'next/server';
+import { DurationStats } from './sqlite';
+
+const DEFAULT_MAX_DEPTH = 200;
+// Files inactives gardées pour les statistiques
+const DEFAULT_MAX_LANES = 100;
+
+interface Lane {
+  // Fin de la dernière écriture mise en file
+  tail: Promise<unknown>;
+  // Écritures en attente ou en cours
+  depth: number;
+  maxDepth: number;
+  processed: number;
+  rejected: number;
+  readonly wait: DurationStats;
+  readonly run: DurationStats;
+}
+
+export class QueueFullError extends Error {
+  constructor(readonly depth: number) {
+    super(`Trop d'écritures en attente sur ce concours (${depth}), réessayer dans un instant`);
+    this.name = 'QueueFullError';
+  }
+}
+
+export class ContestQueue {
+  private readonly lanes = new Map<string, Lane>();
+
+  constructor(
+    private readonly maxDepth = DEFAULT_MAX_DEPTH,
+    private readonly maxLanes = DEFAULT_MAX_LANES
+  ) {}
+
+  /**
+   * Exécute `task` après les écritures déjà en file pour ce concours
+   *
+   * @throws QueueFullError si `maxDepth` écritures sont déjà en file
+   */
+  run<T>(contestId: string, task: () => Promise<T>): Promise<T> {
+    const lane = this.lane(contestId);
+    if (lane.depth >= this.maxDepth) {
+      lane.rejected++;
+      return Promise.reject(new QueueFullError(lane.depth));
+    }
+
+    lane.depth++;
+    lane.maxDepth = Math.max(lane.maxDepth, lane.depth);
+    const enqueuedAt = performance.now();
+
+    const result = lane.tail.then(async () => {
+      const startedAt = performance.now();
+      lane.wait.record(startedAt - enqueuedAt);
+      try {
+        return await task();
+      } finally {
+        lane.run.record(performance.now() - startedAt);
+        lane.processed++;
+        lane.depth--;
+        if (lane.depth === 0) this.release(contestId, lane);
+      }
+    });
+    // Une écriture en échec ne bloque pas les suivantes
+    lane.tail = result.catch(() => undefined);
+    return result;
+  }
+
+  /**
+   * Écritures en attente ou en cours pour un concours
+   */
+  depth(contestId: string): number {
+    return this.lanes.get(contestId)?.depth ?? 0;
+  }
+
+  /**
+   * Profondeur et temps d'attente par concours (files actives en premier)
+   */
+  snapshot() {
+    return Array.from(this.lanes.entries())
+      .map(([contestId, lane]) => ({
+        contestId,
+        depth: lane.depth,
+        maxDepth: lane.maxDepth,
+        processed: lane.processed,
+        rejected: lane.rejected,
+        waitMs: lane.wait.snapshot(),
+        runMs: lane.run.snapshot(),
+      }))
+      .sort((a, b) => b.depth - a.depth);
+  }
+
+  private lane(contestId: string): Lane {
+    let lane = this.lanes.get(contestId);
+    if (!lane) {
+      lane = {
+        tail: Promise.resolve(),
+        depth: 0,
+        maxDepth: 0,
+        processed: 0,
+        rejected: 0,
+        wait: new DurationStats(),
+        run: new DurationStats(),
+      };
+      this.lanes.set(contestId, lane);
+    }
+    return lane;
+  }
+
+  /**
+   * File vidée: passée en fin de liste, les plus anciennes files inactives
+   * sont oubliées au-delà de `maxLanes`
+   */
+  private release(contestId: string, lane: Lane) {
+    this.lanes.delete(contestId);
+    this.lanes.set(contestId, lane);
+    for (const [id, candidate] of this.lanes) {
+      if (this.lanes.size <= this.maxLanes) break;
+      if (candidate.depth === 0) this.lanes.delete(id);
+    }
+  }
+}
+
+// Singleton partagé par toutes les routes (et conservé au rechargement à chaud)
+declare global {
+  var contestQueueGlobal: undefined | ContestQueue
+}
+
+export const contestQueue =
+  globalThis.contestQueueGlobal ??
+  new ContestQueue(parseInt(process.env.CONTEST_QUEUE_MAX_DEPTH ?? '', 10) || DEFAULT_MAX_DEPTH);
+
+globalThis.contestQueueGlobal = contestQueue;
+
+type ContestRouteHandler<P extends { id: string }> = (
+  request: NextRequest,
+  context: { params: Promise<P> }
+) => Promise<Response>;
+
+/**
+ * Fait passer un handler de route par la file d'écriture de son concours
+ * (503 si la file est pleine)
+ */
+export function withContestQueue<P extends { id: string }>(handler: ContestRouteHandler<P>): ContestRouteHandler<P> {
+  return async (request, context) => {
+    const { id } = await context.params;
+    try {
+      return await contestQueue.run(id, () => handler(request, context));
+    } catch (error) {
+      if (error instanceof QueueFullError) {
+        return NextResponse.json(
+          { error: error.message },
+          { status: 503, headers: { 'Retry-After': '1' } }
+        );
+      }
+      throw error;
+    }
+  };
+}
@@ -0,0 +1,445 @@
+import { Prisma, PrismaClient } from '@prisma/client';
+import { ContestDiff, ContestEngine, ContestState, ResultError, isEmptyDiff } from '@/lib/engine';
+import { buildContestEvents, buildTerrainEvents, contestEvents, ContestEvent } from '@/lib/events';
+import { contestCache } from '@/lib/contest-cache';
+import { appendResultEvents, diffContestStates, loadReplayedState } from '@/lib/result-log';
+import { dbStats } from '@/lib/sqlite';
+import { lockContestRow } from '@/lib/db-provider';
+import { scheduleTerrains } from '@/lib/terrains';
+
+type Db = PrismaClient | Prisma.TransactionClient;
+
+/**
+ * Une ligne a été modifiée par une autre écriture entre la lecture de l'état
+ * et l'écriture du diff (la transaction est annulée puis rejouée)
+ */
+export class WriteConflictError extends Error {
+  constructor(entity: string, id: string) {
+    super(`Conflit d'écriture sur ${entity} ${id}`);
+    this.name = 'WriteConflictError';
+  }
+}
+
+/**
+ * Charge l'état d'un concours nécessaire au moteur de progression
+ * (colonnes plates, sans les équipes/joueurs imbriqués)
+ *
+ * @returns L'état du concours, ou null si le concours n'existe pas
+ */
+export async function loadContestState(db: Db, contestId: string): Promise<ContestState | null> {
+  const contest = await db.contest.findUnique({
+    where: { id: contestId },
+    select: {
+      id: true,
+      seed: true,
+      version: true,
+      teams: { select: { id: true, status: true, version: true } },
+      qualificationRounds: {
+        select: {
+          roundNumber: true,
+          matches: {
+            select: {
+              id: true,
+              roundId: true,
+              matchNumber: true,
+              groupType: true,
+              homeTeamId: true,
+              awayTeamId: true,
+              winnerTeamId: true,
+              loserTeamId: true,
+              status: true,
+              isBye: true,
+              version: true,
+            },
+          },
+        },
+      },
+      brackets: {
+        select: {
+          id: true,
+          type: true,
+          size: true,
+          rounds: {
+            select: {
+              id: true,
+              roundNumber: true,
+              roundName: true,
+              matches: {
+                select: {
+                  id: true,
+                  roundId: true,
+                  matchNumber: true,
+                  homeTeamId: true,
+                  awayTeamId: true,
+                  winnerTeamId: true,
+                  loserTeamId: true,
+                  status: true,
+                  isBye: true,
+                  version: true,
+                },
+              },
+            },
+          },
+        },
+      },
+      // Matchs en cours sur un terrain (garde des corrections)
+      terrainAssignments: { where: { releasedAt: null }, select: { matchId: true } },
+    },
+  });
+
+  if (!contest) return null;
+
+  return {
+    contestId: contest.id,
+    seed: contest.seed,
+    version: contest.version,
+    teams: contest.teams,
+    qualificationMatches: contest.qualificationRounds.flatMap(round =>
+      round.matches.map(match => ({ ...match, roundNumber: round.roundNumber }))
+    ),
+    bracketMatches: contest.brackets.flatMap(bracket =>
+      bracket.rounds.flatMap(round =>
+        round.matches.map(match => ({
+          ...match,
+          bracketType: bracket.type,
+          roundNumber: round.roundNumber,
+        }))
+      )
+    ),
+    brackets: contest.brackets.map(({ id, type, size, rounds }) => ({
+      id,
+      type,
+      size,
+      rounds: rounds.map(({ id, roundNumber, roundName }) => ({ id, roundNumber, roundName })),
+    })),
+    calledMatchIds: contest.terrainAssignments.map(a => a.matchId),
+  };
+}
+
+/**
+ * Incrémente la version du concours (à appeler dans la transaction d'écriture),
+ * avec la mise à jour éventuelle des compteurs dénormalisés
+ *
+ * @returns La nouvelle version, à reporter sur chaque ligne écrite
+ */
+export async function bumpContestVersion(
+  tx: Prisma.TransactionClient,
+  contestId: string,
+  counters: Prisma.ContestUpdateInput = {}
+): Promise<number> {
+  const contest = await tx.contest.update({
+    where: { id: contestId },
+    data: { ...counters, version: { increment: 1 } },
+    select: { version: true },
+  });
+  return contest.version;
+}
+
+/**
+ * Persiste un diff produit par le moteur (à appeler dans une transaction)
+ * Chaque ligne écrite porte la version du concours, les suppressions
+ * laissent une trace pour la synchronisation incrémentale.
+ *
+ * Chaque écriture est conditionnée à la version de la ligne lue par le moteur
+ * (« mettre homeTeamId seulement si la ligne n'a pas bougé »): si une autre
+ * écriture est passée entre-temps, WriteConflictError annule la transaction.
+ * Les tours et matchs de brackets créés à la demande sont insérés: deux
+ * écritures qui créent la même position se heurtent à la contrainte d'unicité
+ * (tour, numéro) et la seconde est rejouée.
+ *
+ * @returns Nombre de lignes écrites
+ */
+export async function persistContestDiff(
+  tx: Prisma.TransactionClient,
+  contestId: string,
+  diff: ContestDiff,
+  version: number
+): Promise<number> {
+  let rowsWritten = 0;
+
+  for (const { id, version: expected } of diff.deletedQualificationMatches) {
+    const deleted = await tx.qualificationMatch.deleteMany({ where: { id, version: expected } });
+    if (deleted.count === 0) throw new WriteConflictError('QUALIFICATION_MATCH', id);
+    rowsWritten++;
+  }
+  if (diff.deletedQualificationMatches.length > 0) {
+    await tx.contestTombstone.createMany({
+      data: diff.deletedQualificationMatches.map(({ id: entityId }) => ({
+        contestId,
+        entity: 'QUALIFICATION_MATCH',
+        entityId,
+        version,
+      })),
+    });
+    rowsWritten += diff.deletedQualificationMatches.length;
+  }
+
+  for (const { id, version: expected, changes } of diff.qualificationMatches) {
+    const updated = await tx.qualificationMatch.updateMany({
+      where: { id, version: expected },
+      data: { ...changes, version },
+    });
+    if (updated.count === 0) throw new WriteConflictError('QUALIFICATION_MATCH', id);
+    rowsWritten++;
+  }
+
+  for (const { id, size: expected, changes } of diff.brackets) {
+    const updated = await tx.bracket.updateMany({ where: { id, size: expected }, data: changes });
+    if (updated.count === 0) throw new WriteConflictError('BRACKET', id);
+    rowsWritten++;
+  }
+  if (diff.createdBracketRounds.length > 0) {
+    const created = await tx.bracketRound.createMany({ data: diff.createdBracketRounds });
+    rowsWritten += created.count;
+  }
+  if (diff.createdBracketMatches.length > 0) {
+    const created = await tx.bracketMatch.createMany({
+      data: diff.createdBracketMatches.map(m => ({
+        id: m.id,
+        roundId: m.roundId,
+        matchNumber: m.matchNumber,
+        homeTeamId: m.homeTeamId,
+        awayTeamId: m.awayTeamId,
+        winnerTeamId: m.winnerTeamId,
+        loserTeamId: m.loserTeamId,
+        status: m.status,
+        isBye: m.isBye,
+        version,
+      })),
+    });
+    rowsWritten += created.count;
+  }
+
+  for (const { id, version: expected, changes } of diff.bracketMatches) {
+    const updated = await tx.bracketMatch.updateMany({
+      where: { id, version: expected },
+      data: { ...changes, version },
+    });
+    if (updated.count === 0) throw new WriteConflictError('BRACKET_MATCH', id);
+    rowsWritten++;
+  }
+
+  for (const { id, version: expected, changes } of diff.teams) {
+    const updated = await tx.team.updateMany({
+      where: { id, version: expected },
+      data: { ...changes, version },
+    });
+    if (updated.count === 0) throw new WriteConflictError('TEAM', id);
+    rowsWritten++;
+  }
+
+  return rowsWritten;
+}
+
+// ============================================================
+// ÉCRITURE CONCURRENTE (CONCURRENCE OPTIMISTE)
+// ============================================================
+
+const MAX_ATTEMPTS = 20;
+const MAX_RETRY_DELAY_MS = 50;
+
+export interface EngineCommit<T> {
+  value: T;
+  // null: rien à écrire, la version du concours n'a pas bougé
+  version: number | null;
+  attempts: number;
+}
+
+/**
+ * Charge l'état, applique une opération du moteur et persiste le diff dans une
+ * transaction; en cas de conflit avec une écriture concurrente, tout est
+ * rejoué sur un état relu (l'opération doit donc être pure vis-à-vis du moteur).
+ * Sous PostgreSQL, la ligne du concours est verrouillée avant la lecture:
+ * les écritures d'un même concours s'attendent au lieu d'entrer en conflit.
+ *
+ * Les modifications sont ajoutées au journal des résultats dans la même
+ * transaction (avec l'opérateur de saisie s'il est connu), et les terrains
+ * libérés reçoivent les matchs devenus prêts (lib/scheduler.ts). Après le commit,
+ * le cache de lecture du concours est invalidé et les événements en direct
+ * sont publiés.
+ */
+export async function commitEngineChanges<T>(
+  db: PrismaClient,
+  contestId: string,
+  apply: (engine: ContestEngine) => T,
+  { actor = null }: { actor?: string | null } = {}
+): Promise<EngineCommit<T>> {
+  for (let attempt = 1; ; attempt++) {
+    try {
+      const requestedAt = performance.now();
+      const { value, version, events } = await db.$transaction(async (tx) => {
+        await lockContestRow(tx, contestId);
+        dbStats.recordLockWait(performance.now() - requestedAt);
+        const state = await loadContestState(tx, contestId);
+        if (!state) {
+          throw new ResultError('Concours non trouvé', 404);
+        }
+
+        const engine = new ContestEngine(state);
+        const value = apply(engine);
+        const diff = engine.getDiff();
+        if (isEmptyDiff(diff)) {
+          return { value, version: null, events: [] as ContestEvent[] };
+        }
+
+        const version = await bumpContestVersion(tx, contestId, engine.getProgress());
+        await persistContestDiff(tx, contestId, diff, version);
+        await appendResultEvents(tx, contestId, version, engine, actor);
+        const schedule = await scheduleTerrains(tx, contestId, committedState(engine.getState(), diff, version));
+        return {
+          value,
+          version: version as number | null,
+          events: [
+            ...buildContestEvents(contestId, engine, version),
+            ...buildTerrainEvents(contestId, version, schedule),
+          ],
+        };
+      }, { timeout: 30000 });
+
+      if (version !== null) {
+        contestCache.invalidate(contestId);
+      }
+      contestEvents.publish(events);
+      return { value, version, attempts: attempt };
+    } catch (error) {
+      if (attempt >= MAX_ATTEMPTS || !isRetryableError(error)) throw error;
+      dbStats.recordRetry();
+      // Attente aléatoire croissante: les écritures en conflit ne se relancent pas ensemble
+      const delay = Math.random() * Math.min(MAX_RETRY_DELAY_MS, 2 ** attempt);
+      await new Promise(resolve => setTimeout(resolve, delay));
+    }
+  }
+}
+
+export interface RebuildResult {
+  snapshotVersion: number;
+  replayedEvents: number;
+  rowsWritten: number;
+  // null: tables déjà conformes au journal (ou simulation), rien d'écrit
+  version: number | null;
+  durationMs: number;
+}
+
+/**
+ * Réécrit les tables de matchs et d'équipes d'après le journal des résultats
+ * (dernier instantané + événements suivants); seules les lignes qui diffèrent
+ * sont réécrites, avec les compteurs du concours et les terrains. dryRun:
+ * compte seulement les lignes à réécrire.
+ *
+ * @returns null si le concours n'existe pas
+ */
+export async function rebuildContest(
+  db: PrismaClient,
+  contestId: string,
+  { dryRun = false }: { dryRun?: boolean } = {}
+): Promise<RebuildResult | null> {
+  const startedAt = performance.now();
+
+  const result = await db.$transaction(async (tx) => {
+    await lockContestRow(tx, contestId);
+    const current = await loadContestState(tx, contestId);
+    if (!current) return null;
+
+    const { state, snapshotVersion, replayedEvents } = await loadReplayedState(tx, contestId);
+    const { diff, missingQualificationMatches } = diffContestStates(current, state);
+    const rowsToWrite =
+      diff.qualificationMatches.length + diff.deletedQualificationMatches.length +
+      diff.bracketMatches.length + diff.teams.length + missingQualificationMatches.length +
+      diff.brackets.length + diff.createdBracketRounds.length + diff.createdBracketMatches.length;
+
+    if (dryRun || rowsToWrite === 0) {
+      return { snapshotVersion, replayedEvents, rowsWritten: rowsToWrite, version: null, events: [] as ContestEvent[] };
+    }
+
+    // Compteurs dénormalisés (phase, matchs terminés) recalculés sur l'état reconstruit
+    const version = await bumpContestVersion(tx, contestId, new ContestEngine(state).getProgress());
+    let rowsWritten = await persistContestDiff(tx, contestId, diff, version);
+    if (missingQualificationMatches.length > 0) {
+      const created = await tx.qualificationMatch.createMany({
+        data: missingQualificationMatches.map(m => ({
+          id: m.id,
+          roundId: m.roundId,
+          matchNumber: m.matchNumber,
+          groupType: m.groupType,
+          homeTeamId: m.homeTeamId,
+          awayTeamId: m.awayTeamId,
+          winnerTeamId: m.winnerTeamId,
+          loserTeamId: m.loserTeamId,
+          status: m.status,
+          isBye: m.isBye,
+          version,
+        })),
+      });
+      rowsWritten += created.count;
+    }
+
+    // Matchs réécrits terminés: terrain libéré; matchs devenus prêts: appelés
+    const rebuilt = committedState(state, diff, version, missingQualificationMatches.map(m => m.id));
+    const schedule = await scheduleTerrains(tx, contestId, rebuilt);
+
+    const { status } = await tx.contest.findUniqueOrThrow({ where: { id: contestId }, select: { status: true } });
+    const events: ContestEvent[] = [
+      // Les clients connectés se resynchronisent via /changes
+      { type: 'contest-updated', contestId, version, status },
+      ...buildTerrainEvents(contestId, version, schedule),
+    ];
+    return { snapshotVersion, replayedEvents, rowsWritten, version: version as number | null, events };
+  }, { timeout: 60000 });
+
+  if (!result) return null;
+  const { events, ...rebuild } = result;
+  if (rebuild.version !== null) {
+    contestCache.invalidate(contestId);
+    contestEvents.publish(events);
+  }
+  return { ...rebuild, durationMs: Math.round(performance.now() - startedAt) };
+}
+
+/**
+ * Termine le Tour 2 si le Tour 1 vient de se terminer.
+ *
+ * Deux derniers résultats du Tour 1 saisis en même temps voient chacun l'autre
+ * match encore en cours: aucun ne déclenche la complétion. Vérifiée après
+ * commit, la condition est vue par au moins l'un des deux.
+ */
+export async function completeRound2IfReady(db: PrismaClient, contestId: string): Promise<void> {
+  const pendingRound1 = await db.qualificationMatch.count({
+    where: { round: { contestId, roundNumber: 1 }, status: { not: 'FINISHED' } },
+  });
+  if (pendingRound1 > 0) return;
+
+  await commitEngineChanges(db, contestId, engine => engine.completeRound2());
+}
+
+/**
+ * État après écriture: les lignes modifiées portent la nouvelle version
+ * (ordre d'arrivée des matchs prêts pour l'attribution des terrains)
+ */
+function committedState(
+  state: ContestState,
+  diff: ContestDiff,
+  version: number,
+  createdIds: string[] = []
+): ContestState {
+  const changed = new Set([
+    ...[...diff.qualificationMatches, ...diff.bracketMatches, ...diff.createdBracketMatches].map(d => d.id),
+    ...createdIds,
+  ]);
+  for (const match of [...state.qualificationMatches, ...state.bracketMatches]) {
+    if (changed.has(match.id)) match.version = version;
+  }
+  return state;
+}
+
+/**
+ * Conflit de version, ou verrou SQLite / conflit de sérialisation signalé par la base
+ */
+function isRetryableError(error: unknown): boolean {
+  if (error instanceof WriteConflictError) return true;
+  if (error instanceof Prisma.PrismaClientKnownRequestError) {
+    // P2034: conflit d'écriture ou deadlock, P2028: transaction non démarrée à temps,
+    // P2002: ligne de bracket créée entre-temps par une autre écriture
+    return error.code === 'P2034' || error.code === 'P2028' || error.code === 'P2002';
+  }
+  return error instanceof Error && /database is locked|SQLITE_BUSY/i.test(error.message);
+}
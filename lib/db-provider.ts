@@ -0,0 +1,37 @@
+// ============================================================
+// MOTEUR DE BASE DE DONNÉES (SQLITE OU POSTGRESQL)
+// ============================================================
+//
+// Le moteur est déduit de DATABASE_URL: `file:` pour SQLite (par défaut),
+// `postgres://` ou `postgresql://` pour PostgreSQL (schéma
+// prisma/postgresql/schema.prisma, mêmes modèles).
+//
+// SQLite n'a qu'un écrivain pour toute la base: les transactions d'écriture
+// s'enchaînent sur la connexion unique (lib/db.ts). PostgreSQL verrouille par
+// ligne: une écriture ne bloque que les autres écritures du même concours.
+
+import { Prisma } from '@prisma/client';
+
+export type DatabaseProvider = 'sqlite' | 'postgresql';
+
+export function databaseProvider(env: Record<string, string | undefined> = process.env): DatabaseProvider {
+  const url = env.DATABASE_URL ?? '';
+  return /^postgres(ql)?:\/\//.test(url) ? 'postgresql' : 'sqlite';
+}
+
+/**
+ * Verrouille la ligne du concours jusqu'à la fin de la transaction
+ * (SELECT ... FOR UPDATE): les écritures d'un même concours s'attendent au
+ * lieu d'entrer en conflit, celles des autres concours ne sont pas bloquées.
+ *
+ * Sans effet sous SQLite, où la transaction détient déjà le seul verrou
+ * d'écriture de la base.
+ */
+export async function lockContestRow(
+  tx: Prisma.TransactionClient,
+  contestId: string,
+  provider: DatabaseProvider = databaseProvider()
+): Promise<void> {
+  if (provider !== 'postgresql') return;
+  await tx.$queryRaw`SELECT id FROM "Contest" WHERE id = ${contestId} FOR UPDATE`;
+}
@@ -1,15 +1,71 @@
 import { PrismaClient } from '@prisma/client'
+import { dbStats, readSqliteConfig, sqliteUrl, writerPragmas } from './sqlite'
+
+const config = readSqliteConfig()
+
+const createClient = (role: 'read' | 'write') => {
+  const url = process.env.DATABASE_URL
+  const connections = role === 'write' ? 1 : config.readConnections
+  const client = new PrismaClient({
+    log: [{ emit: 'event' as const, level: 'query' as const }],
+    ...(config.enabled && url ? { datasourceUrl: sqliteUrl(url, connections, config.busyTimeoutMs) } : {}),
+  })
+  client.$on('query', (event) => dbStats.recordQuery(role, event.duration))
+  return client
+}
+
+/**
+ * Réglages de la connexion d'écriture et checkpoints périodiques du WAL
+ */
+const configureWriter = (client: ReturnType<typeof createClient>) => {
+  if (!config.enabled) return
+
+  void (async () => {
+    for (const pragma of writerPragmas(config)) {
+      await client.$queryRawUnsafe(pragma)
+    }
+  })().catch((error) => console.error('SQLite configuration failed:', error))
+
+  if (config.checkpointIntervalMs > 0) {
+    const timer = setInterval(async () => {
+      try {
+        const [row] = await client.$queryRawUnsafe<Record<string, unknown>[]>('PRAGMA wal_checkpoint(PASSIVE)')
+        dbStats.recordCheckpoint({
+          busy: Number(row?.busy ?? 0),
+          log: Number(row?.log ?? 0),
+          checkpointed: Number(row?.checkpointed ?? 0),
+          at: new Date().toISOString(),
+        })
+      } catch (error) {
+        dbStats.checkpointErrors++
+        console.error('WAL checkpoint failed:', error)
+      }
+    }, config.checkpointIntervalMs)
+    // Le timer ne doit pas empêcher le processus de s'arrêter
+    timer.unref?.()
+  }
+}
 
 const prismaClientSingleton = () => {
-  return new PrismaClient()
+  const client = createClient('write')
+  configureWriter(client)
+  return client
 }
 
 declare global {
   var prismaGlobal: undefined | ReturnType<typeof prismaClientSingleton>
+  var prismaReadGlobal: undefined | ReturnType<typeof prismaClientSingleton>
 }
 
+// Client d'écriture: une seule connexion SQLite, les transactions s'y succèdent
 const prisma = globalThis.prismaGlobal ?? prismaClientSingleton()
 
+// Client de lecture (WAL): les GET ne passent jamais derrière une écriture
+export const prismaRead = globalThis.prismaReadGlobal ?? (config.enabled ? createClient('read') : prisma)
+
 export default prisma
 
-if (process.env.NODE_ENV !== 'production') globalThis.prismaGlobal = prisma
+if (process.env.NODE_ENV !== 'production') {
+  globalThis.prismaGlobal = prisma
+  globalThis.prismaReadGlobal = prismaRead
+}
@@ -0,0 +1,256 @@
+import { randomUUID } from 'crypto';
+import { MeleePlayer, Prisma, Team } from '@prisma/client';
+import { generateQualificationRound1 } from '@/lib/algorithms';
+import type { ContestState } from '@/lib/engine';
+import { createRandom } from '@/lib/random';
+import { formMeleeTeams, getPlayersPerTeam, MeleeTeamFormation } from '@/lib/teams';
+
+// ============================================================
+// PLAN DE TIRAGE (construit entièrement en mémoire)
+// ============================================================
+
+export interface DrawSummary {
+  tour1Matches: number;
+  tour2WinnersMatches: number;
+  tour2LosersMatches: number;
+  estimatedQualifiedA: number;
+  estimatedQualifiedB: number;
+}
+
+/**
+ * Lignes à insérer pour un tirage complet.
+ * Tous les IDs sont attribués à l'avance, ce qui permet d'écrire le tirage
+ * avec un createMany par table.
+ */
+export interface DrawPlan {
+  qualificationRounds: Prisma.QualificationRoundCreateManyInput[];
+  qualificationMatches: Prisma.QualificationMatchCreateManyInput[];
+  // Tours et matchs des brackets créés au fil des qualifications (lib/engine.ts)
+  brackets: Prisma.BracketCreateManyInput[];
+  summary: DrawSummary;
+}
+
+/**
+ * Construit le tirage complet du concours en mémoire:
+ * - Tour 1 de qualification (matchs générés)
+ * - Tour 2 de qualification (structure vide, les byes du Tour 1 y sont déjà placés)
+ * - Brackets A et B, sans tours ni matchs: leur taille n'est connue qu'à la
+ *   fin du Tour 1, le moteur crée alors les matchs à mesure des qualifications
+ *
+ * @param contestId ID du concours
+ * @param teams Équipes participant au tirage (dans un ordre stable, par numéro)
+ * @param random Générateur du tirage (dérivé de la graine du concours)
+ * @returns Lignes à insérer et résumé du tirage
+ */
+export function planDraw(contestId: string, teams: Team[], random: () => number = Math.random): DrawPlan {
+  const n = teams.length;
+
+  const plan: DrawPlan = {
+    qualificationRounds: [],
+    qualificationMatches: [],
+    brackets: [],
+    summary: {
+      tour1Matches: 0,
+      tour2WinnersMatches: 0,
+      tour2LosersMatches: 0,
+      estimatedQualifiedA: 0,
+      estimatedQualifiedB: 0,
+    },
+  };
+
+  // ============================================================
+  // TOUR 1 DE QUALIFICATION
+  // ============================================================
+  const round1Matches = generateQualificationRound1(teams, random);
+  const round1Id = randomUUID();
+  plan.qualificationRounds.push({ id: round1Id, contestId, roundNumber: 1 });
+
+  for (const match of round1Matches) {
+    plan.qualificationMatches.push({
+      id: randomUUID(),
+      roundId: round1Id,
+      matchNumber: match.matchNumber,
+      homeTeamId: match.homeTeamId,
+      awayTeamId: match.awayTeamId || null,
+      isBye: match.isBye,
+      status: match.isBye ? 'FINISHED' : 'SCHEDULED',
+      winnerTeamId: match.isBye ? match.homeTeamId : null,
+    });
+  }
+
+  // ============================================================
+  // TOUR 2 DE QUALIFICATION (structure vide)
+  // ============================================================
+  // Gagnants du Tour 1: ceil(n/2) équipes
+  // Perdants du Tour 1: floor(n/2) équipes
+  const winnersCount = Math.ceil(n / 2);
+  const losersCount = Math.floor(n / 2);
+  const winnersMatchCount = Math.ceil(winnersCount / 2);
+  const losersMatchCount = Math.ceil(losersCount / 2);
+
+  const round2Id = randomUUID();
+  plan.qualificationRounds.push({ id: round2Id, contestId, roundNumber: 2 });
+
+  const round2Winners: Prisma.QualificationMatchCreateManyInput[] = [];
+  let matchNumber = 1;
+
+  for (let i = 0; i < winnersMatchCount; i++) {
+    const match: Prisma.QualificationMatchCreateManyInput = {
+      id: randomUUID(),
+      roundId: round2Id,
+      matchNumber: matchNumber++,
+      groupType: 'WINNERS',
+      isBye: false,
+      status: 'SCHEDULED',
+    };
+    round2Winners.push(match);
+    plan.qualificationMatches.push(match);
+  }
+
+  for (let i = 0; i < losersMatchCount; i++) {
+    plan.qualificationMatches.push({
+      id: randomUUID(),
+      roundId: round2Id,
+      matchNumber: matchNumber++,
+      groupType: 'LOSERS',
+      isBye: false,
+      status: 'SCHEDULED',
+    });
+  }
+
+  // Placer immédiatement les byes du Tour 1 dans un slot aléatoire des gagnants du Tour 2
+  for (const byeMatch of round1Matches.filter(m => m.isBye)) {
+    if (byeMatch.homeTeamId) {
+      assignToRandomSlot(round2Winners, byeMatch.homeTeamId, random);
+    }
+  }
+
+  // ============================================================
+  // BRACKETS A ET B (taille fixée à la fin du Tour 1)
+  // ============================================================
+  // Estimation (résumé du tirage): les byes et les matchs vides du Tour 2 ne
+  // sont connus qu'une fois le Tour 1 terminé
+  // Tour 2 Winners: ceil(winnersCount/2) gagnants → A, reste → B
+  // Tour 2 Losers: ceil(losersCount/2) gagnants → B, reste → éliminés
+  const estimatedQualifiedA = Math.ceil(winnersCount / 2);
+  const estimatedQualifiedB = (winnersCount - estimatedQualifiedA) + Math.ceil(losersCount / 2);
+
+  for (const type of ['A', 'B']) {
+    plan.brackets.push({ id: randomUUID(), contestId, type });
+  }
+
+  plan.summary = {
+    tour1Matches: round1Matches.length,
+    tour2WinnersMatches: winnersMatchCount,
+    tour2LosersMatches: losersMatchCount,
+    estimatedQualifiedA,
+    estimatedQualifiedB,
+  };
+
+  return plan;
+}
+
+/**
+ * Assigne une équipe à un slot aléatoire disponible parmi des matchs planifiés
+ */
+function assignToRandomSlot(
+  matches: Prisma.QualificationMatchCreateManyInput[],
+  teamId: string,
+  random: () => number
+) {
+  const availableSlots: { match: Prisma.QualificationMatchCreateManyInput; slot: 'home' | 'away' }[] = [];
+
+  for (const match of matches) {
+    if (!match.homeTeamId) availableSlots.push({ match, slot: 'home' });
+    if (!match.awayTeamId) availableSlots.push({ match, slot: 'away' });
+  }
+
+  if (availableSlots.length === 0) return;
+
+  const chosenSlot = availableSlots[Math.floor(random() * availableSlots.length)];
+  if (chosenSlot.slot === 'home') {
+    chosenSlot.match.homeTeamId = teamId;
+  } else {
+    chosenSlot.match.awayTeamId = teamId;
+  }
+}
+
+/**
+ * Nombre total de lignes d'un plan de tirage
+ */
+export function countDrawRows(plan: DrawPlan): number {
+  return (
+    plan.qualificationRounds.length +
+    plan.qualificationMatches.length +
+    plan.brackets.length
+  );
+}
+
+export interface SeededDrawInput {
+  id: string;
+  gameMode: string;
+  teamType: string;
+  seed: number;
+  // Équipes inscrites, par numéro croissant (mode Monté)
+  teams: Team[];
+  // Joueurs inscrits, par ordre d'inscription (mode Mélée)
+  meleePlayers: MeleePlayer[];
+}
+
+export interface SeededDraw {
+  teams: Team[];
+  meleeTeams: MeleeTeamFormation | null;
+  // null: moins de 3 équipes, pas de tirage possible
+  plan: DrawPlan | null;
+}
+
+/**
+ * Tirage reproductible: formation des équipes mélée puis plan de tirage,
+ * avec un seul générateur issu de la graine du concours. Mêmes inscrits
+ * (dans le même ordre) et même graine → mêmes équipes et mêmes matchs.
+ *
+ * @param version Version portée par les lignes créées
+ */
+export function planSeededDraw(input: SeededDrawInput, version: number): SeededDraw {
+  const random = createRandom(input.seed);
+
+  const meleeTeams = input.gameMode === 'MELEE'
+    ? formMeleeTeams(input.id, input.meleePlayers, getPlayersPerTeam(input.teamType), version, random)
+    : null;
+  const teams = meleeTeams ? meleeTeams.teams : input.teams;
+
+  return {
+    teams,
+    meleeTeams,
+    plan: teams.length >= 3 ? planDraw(input.id, teams, random) : null,
+  };
+}
+
+/**
+ * État du concours juste après le tirage (premier instantané du journal des
+ * résultats), construit à partir du plan sans relire les tables
+ */
+export function drawState(contestId: string, plan: DrawPlan, teams: Team[]): ContestState {
+  const qualificationRounds = new Map(plan.qualificationRounds.map(r => [r.id!, r.roundNumber]));
+
+  return {
+    contestId,
+    teams: teams.map(t => ({ id: t.id, status: t.status, version: 0 })),
+    qualificationMatches: plan.qualificationMatches.map(m => ({
+      id: m.id!,
+      roundId: m.roundId,
+      roundNumber: qualificationRounds.get(m.roundId)!,
+      matchNumber: m.matchNumber,
+      groupType: m.groupType ?? null,
+      homeTeamId: m.homeTeamId ?? null,
+      awayTeamId: m.awayTeamId ?? null,
+      winnerTeamId: m.winnerTeamId ?? null,
+      loserTeamId: m.loserTeamId ?? null,
+      status: m.status ?? 'SCHEDULED',
+      isBye: m.isBye ?? false,
+      version: 0,
+    })),
+    bracketMatches: [],
+    brackets: plan.brackets.map(b => ({ id: b.id!, type: b.type, size: null, rounds: [] })),
+  };
+}
@@ -0,0 +1,909 @@
+// ============================================================
+// MOTEUR DE PROGRESSION DU CONCOURS (pur, sans base de données)
+// ============================================================
+//
+// Le moteur reçoit l'état courant d'un concours et un résultat, applique
+// les règles de progression (Tour 1 → Tour 2 → Brackets) en mémoire et
+// renvoie le diff minimal des lignes modifiées. Les routes persistent ce
+// diff en une seule transaction.
+//
+// Les brackets sont créés à la demande: leur taille est fixée à la fin du
+// Tour 1 (nombre exact de qualifiés), une ligne de match n'est écrite qu'au
+// premier placement d'une équipe, et un tour qu'avec son premier match.
+
+import { randomUUID } from 'crypto';
+import { BracketPosition, bracketPositionKey, bracketShape, getRoundName, nextBracketPosition } from './bracket-topology';
+import { contestRandom } from './random';
+import { Slot, SlotIndex } from './slot-index';
+import type { ContestPhase } from './types';
+
+export type GroupType = 'WINNERS' | 'LOSERS';
+
+export interface QualificationMatchState {
+  id: string;
+  roundId: string;
+  roundNumber: number;
+  matchNumber: number;
+  groupType: string | null;
+  homeTeamId: string | null;
+  awayTeamId: string | null;
+  winnerTeamId: string | null;
+  loserTeamId: string | null;
+  status: string;
+  isBye: boolean;
+  version: number;
+}
+
+export interface BracketMatchState {
+  id: string;
+  roundId: string;
+  bracketType: string;
+  roundNumber: number;
+  matchNumber: number;
+  homeTeamId: string | null;
+  awayTeamId: string | null;
+  winnerTeamId: string | null;
+  loserTeamId: string | null;
+  status: string;
+  isBye: boolean;
+  version: number;
+}
+
+export interface TeamState {
+  id: string;
+  status: string;
+  version: number;
+}
+
+export interface BracketRoundState {
+  id: string;
+  roundNumber: number;
+  roundName: string;
+}
+
+export interface BracketState {
+  id: string;
+  type: string;
+  // Nombre de qualifiés, fixé à la fin du Tour 1 (null: pas encore connu)
+  size: number | null;
+  // Tours existants (créés avec leur premier match)
+  rounds: BracketRoundState[];
+}
+
+export interface ContestState {
+  contestId: string;
+  qualificationMatches: QualificationMatchState[];
+  bracketMatches: BracketMatchState[];
+  teams: TeamState[];
+  // Absent (instantanés antérieurs) ou taille null avec des matchs: brackets
+  // complets créés au tirage, leurs lignes sont la structure
+  brackets?: BracketState[];
+  // Graine et version du concours: sans générateur fourni, le moteur en dérive
+  // le sien (mêmes écritures rejouées dans le même ordre → mêmes placements)
+  seed?: number | null;
+  version?: number;
+  // Matchs appelés sur un terrain et pas encore libérés (lib/terrains.ts):
+  // une correction ne change pas les équipes d'un match en cours de jeu
+  calledMatchIds?: string[];
+}
+
+type MatchFields = 'homeTeamId' | 'awayTeamId' | 'winnerTeamId' | 'loserTeamId' | 'status' | 'isBye';
+
+export type QualificationMatchChanges = Partial<Pick<QualificationMatchState, MatchFields>>;
+export type BracketMatchChanges = Partial<Pick<BracketMatchState, MatchFields>>;
+export type TeamChanges = Partial<Pick<TeamState, 'status'>>;
+
+// Chaque entrée porte la version de la ligne lue: l'écriture n'est appliquée
+// que si la ligne n'a pas changé entre-temps (concurrence optimiste)
+export interface ContestDiff {
+  qualificationMatches: { id: string; version: number; changes: QualificationMatchChanges }[];
+  deletedQualificationMatches: { id: string; version: number }[];
+  bracketMatches: { id: string; version: number; changes: BracketMatchChanges }[];
+  teams: { id: string; version: number; changes: TeamChanges }[];
+  // Taille fixée une seule fois: `size` est la valeur lue (null)
+  brackets: { id: string; size: number | null; changes: { size: number } }[];
+  // Lignes créées (lignes complètes, écrites avec la version du concours)
+  createdBracketRounds: (BracketRoundState & { bracketId: string })[];
+  createdBracketMatches: BracketMatchState[];
+}
+
+/**
+ * Erreur de validation d'un résultat (renvoyée telle quelle au client)
+ */
+export class ResultError extends Error {
+  constructor(message: string, public status: number = 400) {
+    super(message);
+    this.name = 'ResultError';
+  }
+}
+
+export interface EngineOptions {
+  random?: () => number;
+}
+
+export interface QualificationResultOptions {
+  // En saisie groupée, la gestion des byes du Tour 2 est faite une seule fois à la fin
+  deferCompletion?: boolean;
+}
+
+export class ContestEngine {
+  private readonly contestId: string;
+  private readonly qualificationMatches: QualificationMatchState[];
+  private readonly bracketMatches: BracketMatchState[];
+  private readonly qualificationById = new Map<string, QualificationMatchState>();
+  private readonly bracketById = new Map<string, BracketMatchState>();
+  private readonly bracketByPosition = new Map<string, BracketMatchState>();
+  private readonly teamById = new Map<string, TeamState>();
+  private readonly calledMatchIds: Set<string>;
+
+  private readonly qualificationChanges = new Map<string, QualificationMatchChanges>();
+  private readonly bracketChanges = new Map<string, BracketMatchChanges>();
+  private readonly teamChanges = new Map<string, TeamChanges>();
+  private readonly deletedQualificationMatchIds = new Set<string>();
+
+  // Index maintenus à chaque modification (placements et doublons en O(1))
+  private readonly round2Slots = new SlotIndex<QualificationMatchState>(
+    m => (m.roundNumber === 2 ? m.groupType : null)
+  );
+  private readonly bracketSlots = new SlotIndex<BracketMatchState>(m => m.bracketType);
+  private readonly qualificationByRound = new Map<number, QualificationMatchState[]>();
+
+  // Brackets par type, et ceux dont le premier tour est connu (lignes ou positions en mémoire)
+  private readonly brackets = new Map<string, BracketState>();
+  private readonly bracketTypes = new Set<string>();
+  private readonly bracketRounds = new Map<string, { round: BracketRoundState & { bracketId: string }; persisted: boolean }>();
+  // Positions sans ligne: créées à la première écriture (updateBracketMatch)
+  private readonly pendingBracketMatchIds = new Set<string>();
+  private readonly createdBracketMatchIds = new Set<string>();
+  private readonly createdBracketRounds: (BracketRoundState & { bracketId: string })[] = [];
+  private readonly sizedBrackets = new Set<string>();
+
+  private readonly random: () => number;
+
+  constructor(state: ContestState, options: EngineOptions = {}) {
+    this.contestId = state.contestId;
+    this.calledMatchIds = new Set(state.calledMatchIds);
+    this.random =
+      options.random ??
+      (state.seed != null ? contestRandom(state.seed, state.version ?? 0) : Math.random);
+
+    // Copie de travail: l'état fourni n'est jamais modifié
+    this.qualificationMatches = state.qualificationMatches
+      .map(m => ({ ...m }))
+      .sort((a, b) => a.roundNumber - b.roundNumber || a.matchNumber - b.matchNumber);
+    this.bracketMatches = state.bracketMatches
+      .map(m => ({ ...m }))
+      .sort((a, b) => a.roundNumber - b.roundNumber || a.matchNumber - b.matchNumber);
+
+    for (const match of this.qualificationMatches) {
+      this.qualificationById.set(match.id, match);
+      pushTo(this.qualificationByRound, match.roundNumber, match);
+      this.round2Slots.add(match);
+    }
+    for (const match of this.bracketMatches) {
+      this.bracketById.set(match.id, match);
+      this.bracketByPosition.set(bracketPositionKey(match.bracketType, match), match);
+      this.bracketTypes.add(match.bracketType);
+      this.bracketSlots.add(match);
+    }
+    for (const team of state.teams) this.teamById.set(team.id, { ...team });
+
+    for (const bracket of state.brackets ?? []) {
+      const copy = { ...bracket, rounds: bracket.rounds.map(r => ({ ...r })) };
+      this.brackets.set(bracket.type, copy);
+      for (const round of copy.rounds) {
+        this.bracketRounds.set(roundKey(bracket.type, round.roundNumber), {
+          round: { ...round, bracketId: bracket.id },
+          persisted: true,
+        });
+      }
+      if (copy.size !== null) this.addFirstRound(copy);
+    }
+  }
+
+  // ============================================================
+  // SAISIE DES RÉSULTATS
+  // ============================================================
+
+  /**
+   * Enregistre le résultat d'un match de qualification.
+   *
+   * - Tour 1: le gagnant et le perdant sont immédiatement assignés à un slot
+   *   aléatoire du Tour 2 (groupes WINNERS / LOSERS)
+   * - Tour 2: les équipes sont assignées aux Brackets dès que leur taille est
+   *   fixée, c'est-à-dire immédiatement une fois le Tour 1 terminé
+   *   (WINNERS: gagnant → A, perdant → B ; LOSERS: gagnant → B, perdant éliminé)
+   */
+  recordQualificationResult(
+    matchId: string,
+    winnerTeamId: string | undefined | null,
+    options: QualificationResultOptions = {}
+  ): QualificationMatchState {
+    const match = this.qualificationById.get(matchId);
+    if (!match || this.deletedQualificationMatchIds.has(matchId)) {
+      throw new ResultError('Match non trouvé', 404);
+    }
+
+    const loserTeamId = this.validateResult(match, winnerTeamId);
+    const winnerId = winnerTeamId as string;
+
+    this.updateQualificationMatch(match, {
+      winnerTeamId: winnerId,
+      loserTeamId,
+      status: 'FINISHED',
+    });
+
+    if (match.roundNumber === 1) {
+      this.assignTeamToRound2(winnerId, 'WINNERS');
+      if (loserTeamId) {
+        this.assignTeamToRound2(loserTeamId, 'LOSERS');
+      }
+      if (!options.deferCompletion) {
+        this.completeRound2();
+      }
+    } else if (match.roundNumber === 2) {
+      this.qualifyFromRound2(match);
+    }
+
+    return match;
+  }
+
+  /**
+   * Enregistre le résultat d'un match de bracket et propage le vainqueur
+   * au match suivant (match floor(j/2) du tour suivant, côté fixé par j).
+   */
+  recordBracketResult(matchId: string, winnerTeamId: string | undefined | null): BracketMatchState {
+    const match = this.bracketById.get(matchId);
+    if (!match) {
+      throw new ResultError('Match non trouvé', 404);
+    }
+
+    const loserTeamId = this.validateResult(match, winnerTeamId);
+    const winnerId = winnerTeamId as string;
+
+    this.updateBracketMatch(match, {
+      winnerTeamId: winnerId,
+      loserTeamId,
+      status: 'FINISHED',
+    });
+
+    this.advanceInBracket(match, winnerId);
+
+    return match;
+  }
+
+  /**
+   * Enregistre un résultat sans connaître la phase du match (saisie groupée)
+   */
+  recordResult(
+    matchId: string,
+    winnerTeamId: string | undefined | null,
+    options: QualificationResultOptions = {}
+  ): 'QUALIFICATION' | 'BRACKET' {
+    if (this.qualificationById.has(matchId)) {
+      this.recordQualificationResult(matchId, winnerTeamId, options);
+      return 'QUALIFICATION';
+    }
+    this.recordBracketResult(matchId, winnerTeamId);
+    return 'BRACKET';
+  }
+
+  // ============================================================
+  // CORRECTION D'UN RÉSULTAT
+  // ============================================================
+
+  /**
+   * Corrige le vainqueur d'un match terminé (l'ancien perdant devient vainqueur).
+   *
+   * Seules les lignes qui dépendent du résultat sont modifiées: les deux
+   * équipes échangent les places qu'elles occupent en aval (slots du Tour 2,
+   * des brackets et exemptions traversées), et le statut éliminé suit le
+   * nouveau perdant d'un match LOSERS. La correction est refusée (409) si un
+   * match en aval a déjà été joué ou est appelé sur un terrain.
+   */
+  correctResult(matchId: string, winnerTeamId: string | undefined | null): 'QUALIFICATION' | 'BRACKET' {
+    const qualificationMatch = this.deletedQualificationMatchIds.has(matchId)
+      ? undefined
+      : this.qualificationById.get(matchId);
+    const match = qualificationMatch ?? this.bracketById.get(matchId);
+    if (!match) {
+      throw new ResultError('Match non trouvé', 404);
+    }
+
+    const newWinner = this.validateCorrection(match, winnerTeamId);
+    const newLoser = match.winnerTeamId as string;
+
+    // Places en aval de chaque équipe, toutes vérifiées avant la moindre modification
+    const moves: { from: string; to: string; placements: Placement[] }[] = [];
+    if (qualificationMatch) {
+      if (qualificationMatch.roundNumber === 1) {
+        moves.push({ from: newLoser, to: newWinner, placements: this.round2Placements(newLoser, 'WINNERS') });
+        moves.push({ from: newWinner, to: newLoser, placements: this.round2Placements(newWinner, 'LOSERS') });
+      } else if (qualificationMatch.groupType === 'WINNERS') {
+        moves.push({ from: newLoser, to: newWinner, placements: this.bracketPlacements(newLoser, 'A') });
+        moves.push({ from: newWinner, to: newLoser, placements: this.bracketPlacements(newWinner, 'B') });
+      } else if (qualificationMatch.groupType === 'LOSERS') {
+        moves.push({ from: newLoser, to: newWinner, placements: this.bracketPlacements(newLoser, 'B') });
+      }
+    } else {
+      const next = this.nextBracketSlot(match as BracketMatchState);
+      if (next && next.match[next.slot === 'home' ? 'homeTeamId' : 'awayTeamId'] === newLoser) {
+        moves.push({ from: newLoser, to: newWinner, placements: [{ phase: 'BRACKET', match: next.match }] });
+      }
+    }
+
+    for (const { placements } of moves) {
+      const played = placements.find(({ match: m }) => m.status === 'FINISHED' && !m.isBye);
+      if (played) {
+        throw new ResultError(`Correction impossible: un match en aval a déjà été joué (${describeMatch(played)})`, 409);
+      }
+      const called = placements.find(({ match: m }) => this.calledMatchIds.has(m.id));
+      if (called) {
+        throw new ResultError(`Correction impossible: un match en aval est en cours sur un terrain (${describeMatch(called)})`, 409);
+      }
+    }
+
+    if (qualificationMatch) {
+      this.updateQualificationMatch(qualificationMatch, { winnerTeamId: newWinner, loserTeamId: newLoser });
+    } else {
+      this.updateBracketMatch(match as BracketMatchState, { winnerTeamId: newWinner, loserTeamId: newLoser });
+    }
+
+    for (const { from, to, placements } of moves) {
+      for (const placement of placements) {
+        const changes = substituteTeam(placement.match, from, to);
+        if (placement.phase === 'QUALIFICATION') {
+          this.updateQualificationMatch(placement.match, changes);
+        } else {
+          this.updateBracketMatch(placement.match, changes);
+        }
+      }
+    }
+
+    // Groupe LOSERS du Tour 2: le perdant est éliminé
+    if (qualificationMatch?.roundNumber === 2 && qualificationMatch.groupType === 'LOSERS') {
+      this.updateTeam(newWinner, { status: 'REGISTERED' });
+      this.updateTeam(newLoser, { status: 'ELIMINATED' });
+    }
+
+    return qualificationMatch ? 'QUALIFICATION' : 'BRACKET';
+  }
+
+  /**
+   * Vérifie si le Tour 1 est terminé et nettoie le Tour 2:
+   * - suppression des matchs complètement vides
+   * - conversion des matchs à une seule équipe en byes
+   * - taille des brackets fixée, les équipes déjà qualifiées y sont placées
+   *   (dans l'ordre des matchs du Tour 2)
+   */
+  completeRound2(): void {
+    const round1 = this.activeQualificationMatches(1);
+    if (round1.length === 0) return;
+    if (!round1.every(m => m.status === 'FINISHED')) return;
+
+    const round2 = this.activeQualificationMatches(2);
+    if (round2.length === 0) return;
+
+    for (const match of round2) {
+      // Supprimer les matchs complètement vides
+      if (!match.homeTeamId && !match.awayTeamId && !match.isBye) {
+        this.deleteQualificationMatch(match);
+        continue;
+      }
+
+      // Convertir les matchs avec une seule équipe en byes
+      const isIncomplete = !match.homeTeamId !== !match.awayTeamId;
+      if (isIncomplete && !match.isBye && match.status !== 'FINISHED') {
+        const teamId = (match.homeTeamId || match.awayTeamId) as string;
+
+        this.updateQualificationMatch(match, {
+          isBye: true,
+          homeTeamId: teamId, // L'équipe est toujours en home pour cohérence
+          awayTeamId: null,
+          winnerTeamId: teamId,
+          status: 'FINISHED',
+        });
+      }
+    }
+
+    const remaining = this.activeQualificationMatches(2);
+    this.sizeBrackets(remaining);
+
+    for (const match of remaining) {
+      if (match.status === 'FINISHED') this.qualifyFromRound2(match);
+    }
+  }
+
+  // ============================================================
+  // DIFF
+  // ============================================================
+
+  /**
+   * Diff minimal des modifications appliquées depuis la création du moteur
+   */
+  getDiff(): ContestDiff {
+    return {
+      qualificationMatches: Array.from(this.qualificationChanges, ([id, changes]) => ({
+        id,
+        version: this.qualificationById.get(id)!.version,
+        changes,
+      })),
+      deletedQualificationMatches: Array.from(this.deletedQualificationMatchIds, id => ({
+        id,
+        version: this.qualificationById.get(id)!.version,
+      })),
+      bracketMatches: Array.from(this.bracketChanges)
+        .filter(([id]) => !this.createdBracketMatchIds.has(id))
+        .map(([id, changes]) => ({
+          id,
+          version: this.bracketById.get(id)!.version,
+          changes,
+        })),
+      teams: Array.from(this.teamChanges, ([id, changes]) => ({
+        id,
+        version: this.teamById.get(id)!.version,
+        changes,
+      })),
+      brackets: Array.from(this.sizedBrackets, type => {
+        const bracket = this.brackets.get(type)!;
+        return { id: bracket.id, size: null, changes: { size: bracket.size! } };
+      }),
+      createdBracketRounds: this.createdBracketRounds.map(r => ({ ...r })),
+      createdBracketMatches: Array.from(this.createdBracketMatchIds, id => ({ ...this.bracketById.get(id)! })),
+    };
+  }
+
+  /**
+   * Phase en cours et nombre de matchs joués (hors exemptions), recalculés sur
+   * l'état courant: les compteurs du concours ne peuvent pas dériver
+   */
+  getProgress(): { phase: ContestPhase; finishedMatchCount: number } {
+    const isPlayed = (m: { status: string; isBye: boolean }) => m.status === 'FINISHED' && !m.isBye;
+    const finishedMatchCount =
+      this.qualificationMatches.filter(m => !this.deletedQualificationMatchIds.has(m.id) && isPlayed(m)).length +
+      this.bracketMatches.filter(isPlayed).length;
+
+    const isRoundDone = (round: number) =>
+      this.activeQualificationMatches(round).every(m => m.status === 'FINISHED');
+    const phase: ContestPhase = !isRoundDone(1)
+      ? 'QUALIFICATION_ROUND_1'
+      : !isRoundDone(2)
+        ? 'QUALIFICATION_ROUND_2'
+        : 'BRACKETS_GENERATED';
+
+    return { phase, finishedMatchCount };
+  }
+
+  /**
+   * Vue courante (après modifications) de l'état du concours
+   */
+  getState(): ContestState {
+    return {
+      contestId: this.contestId,
+      qualificationMatches: this.qualificationMatches
+        .filter(m => !this.deletedQualificationMatchIds.has(m.id))
+        .map(m => ({ ...m })),
+      bracketMatches: this.bracketMatches.map(m => ({ ...m })),
+      teams: Array.from(this.teamById.values(), t => ({ ...t })),
+      brackets: Array.from(this.brackets.values(), b => ({ ...b, rounds: b.rounds.map(r => ({ ...r })) })),
+    };
+  }
+
+  /**
+   * État courant des seuls matchs modifiés (pour la diffusion en direct)
+   */
+  getChangedMatches(): { qualificationMatches: QualificationMatchState[]; bracketMatches: BracketMatchState[] } {
+    return {
+      qualificationMatches: Array.from(this.qualificationChanges.keys(), id => ({ ...this.qualificationById.get(id)! })),
+      bracketMatches: Array.from(this.bracketChanges.keys(), id => ({ ...this.bracketById.get(id)! })),
+    };
+  }
+
+  // ============================================================
+  // ASSIGNATIONS
+  // ============================================================
+
+  /**
+   * Assigne une équipe à un slot aléatoire disponible dans le Tour 2
+   */
+  private assignTeamToRound2(teamId: string, groupType: GroupType) {
+    const chosenSlot = this.round2Slots.pickSlot(groupType, 2, this.random);
+    if (!chosenSlot) return;
+
+    this.updateQualificationMatch(
+      chosenSlot.match,
+      chosenSlot.slot === 'home' ? { homeTeamId: teamId } : { awayTeamId: teamId }
+    );
+  }
+
+  /**
+   * Qualifiés d'un match terminé du Tour 2
+   * (WINNERS: gagnant → A, perdant → B ; LOSERS: gagnant → B, perdant éliminé)
+   */
+  private qualifyFromRound2(match: QualificationMatchState) {
+    if (!match.winnerTeamId) return;
+
+    if (match.groupType === 'WINNERS') {
+      this.assignTeamToBracket(match.winnerTeamId, 'A');
+      if (match.loserTeamId) {
+        this.assignTeamToBracket(match.loserTeamId, 'B');
+      }
+    } else if (match.groupType === 'LOSERS') {
+      this.assignTeamToBracket(match.winnerTeamId, 'B');
+      if (match.loserTeamId) {
+        this.updateTeam(match.loserTeamId, { status: 'ELIMINATED' });
+      }
+    }
+  }
+
+  /**
+   * Assigne une équipe à un slot aléatoire disponible dans un Bracket
+   *
+   * - On priorise les matchs non-bye du premier tour
+   * - Sinon on assigne à un match bye, l'équipe passe alors au tour suivant
+   * Tant que la taille du bracket n'est pas fixée, l'équipe attend la fin du
+   * Tour 1 (completeRound2). La taille étant exacte, chaque qualifié a sa place.
+   */
+  private assignTeamToBracket(teamId: string, bracketType: 'A' | 'B') {
+    if (!this.bracketTypes.has(bracketType)) return;
+
+    // Vérifier si l'équipe est déjà dans le bracket
+    if (this.bracketSlots.isPlaced(bracketType, teamId)) return;
+
+    // Priorité 1: matchs normaux du premier tour
+    const chosenSlot = this.bracketSlots.pickSlot(bracketType, 1, this.random);
+    if (chosenSlot) {
+      this.updateBracketMatch(
+        chosenSlot.match,
+        chosenSlot.slot === 'home' ? { homeTeamId: teamId } : { awayTeamId: teamId }
+      );
+      return;
+    }
+
+    // Priorité 2: matchs bye du premier tour (l'équipe passe au tour suivant)
+    const byeMatch = this.bracketSlots.pickBye(bracketType, 1, this.random);
+    if (byeMatch) {
+      this.updateBracketMatch(byeMatch, { homeTeamId: teamId, winnerTeamId: teamId });
+      this.advanceInBracket(byeMatch, teamId);
+      return;
+    }
+
+    // Premier tour complet (ne devrait pas arriver)
+    console.warn(`Bracket ${bracketType} is full, team ${teamId} not placed`);
+  }
+
+  /**
+   * Fixe la taille des brackets à la fin du Tour 1: les byes et les matchs
+   * vides du Tour 2 sont alors connus, le nombre de qualifiés est exact
+   * (A: un par match WINNERS ; B: un par match WINNERS joué et par match LOSERS)
+   */
+  private sizeBrackets(round2: QualificationMatchState[]) {
+    const winners = round2.filter(m => m.groupType === 'WINNERS');
+    const sizes: Record<'A' | 'B', number> = {
+      A: winners.length,
+      B: winners.filter(m => !m.isBye).length + round2.filter(m => m.groupType === 'LOSERS').length,
+    };
+
+    for (const type of ['A', 'B'] as const) {
+      const bracket = this.brackets.get(type);
+      // Déjà fixée, ou bracket complet créé au tirage
+      if (!bracket || bracket.size !== null || this.bracketTypes.has(type)) continue;
+      bracket.size = sizes[type];
+      this.sizedBrackets.add(type);
+      this.addFirstRound(bracket);
+    }
+  }
+
+  /**
+   * Positions du premier tour d'un bracket dimensionné: celles qui n'ont pas
+   * encore de ligne restent en mémoire jusqu'au premier placement
+   */
+  private addFirstRound(bracket: BracketState) {
+    if (!bracket.size) return;
+    this.bracketTypes.add(bracket.type);
+
+    const { firstRoundMatches, byes } = bracketShape(bracket.size);
+    for (let matchNumber = 1; matchNumber <= firstRoundMatches; matchNumber++) {
+      const position = { roundNumber: 1, matchNumber };
+      if (this.bracketByPosition.has(bracketPositionKey(bracket.type, position))) continue;
+      // Au premier tour, les derniers matchs sont des byes
+      this.addBracketPosition(bracket.type, position, matchNumber > firstRoundMatches - byes);
+    }
+  }
+
+  /**
+   * Match suivant de `match` (null pour la finale). Avec `create`, la
+   * position est ajoutée si elle n'existe pas encore: un match des tours
+   * suivants naît avec le premier vainqueur qui l'alimente.
+   */
+  private nextBracketSlot(
+    match: BracketMatchState,
+    create = false
+  ): { match: BracketMatchState; slot: Slot } | null {
+    const { slot, ...position } = nextBracketPosition(match);
+    const nextMatch =
+      this.bracketByPosition.get(bracketPositionKey(match.bracketType, position)) ??
+      (create && position.roundNumber <= this.totalBracketRounds(match.bracketType)
+        ? this.addBracketPosition(match.bracketType, position, false)
+        : undefined);
+    return nextMatch ? { match: nextMatch, slot } : null;
+  }
+
+  /**
+   * Fait passer le vainqueur d'un match (ou d'une exemption) au côté qui lui
+   * revient dans le match suivant
+   */
+  private advanceInBracket(match: BracketMatchState, teamId: string) {
+    const next = this.nextBracketSlot(match, true);
+    if (!next) return;
+
+    const field = next.slot === 'home' ? 'homeTeamId' : 'awayTeamId';
+    if (next.match[field] && next.match[field] !== teamId) {
+      // Côté déjà pris par une autre équipe (ne devrait pas arriver)
+      console.warn(`Match ${next.match.id} already has a ${next.slot} team assigned`);
+      return;
+    }
+    this.updateBracketMatch(next.match, { [field]: teamId });
+  }
+
+  /**
+   * Nombre de tours d'un bracket dimensionné (0 pour un bracket créé au
+   * tirage: ses lignes existent déjà toutes)
+   */
+  private totalBracketRounds(bracketType: string): number {
+    const size = this.brackets.get(bracketType)?.size;
+    return size ? bracketShape(size).totalRounds : 0;
+  }
+
+  /**
+   * Ajoute une position de bracket sans ligne en base (créée à sa première écriture)
+   */
+  private addBracketPosition(bracketType: string, position: BracketPosition, isBye: boolean): BracketMatchState {
+    const match: BracketMatchState = {
+      id: randomUUID(),
+      roundId: this.bracketRound(bracketType, position.roundNumber).round.id,
+      bracketType,
+      roundNumber: position.roundNumber,
+      matchNumber: position.matchNumber,
+      homeTeamId: null,
+      awayTeamId: null,
+      winnerTeamId: null,
+      loserTeamId: null,
+      status: isBye ? 'FINISHED' : 'SCHEDULED',
+      isBye,
+      version: 0,
+    };
+    this.bracketById.set(match.id, match);
+    this.bracketByPosition.set(bracketPositionKey(bracketType, match), match);
+    this.bracketSlots.add(match);
+    this.pendingBracketMatchIds.add(match.id);
+    return match;
+  }
+
+  /**
+   * Tour d'un bracket dimensionné, réservé en mémoire s'il n'existe pas encore
+   */
+  private bracketRound(bracketType: string, roundNumber: number) {
+    const key = roundKey(bracketType, roundNumber);
+    let entry = this.bracketRounds.get(key);
+    if (!entry) {
+      const bracket = this.brackets.get(bracketType)!;
+      entry = {
+        round: {
+          id: randomUUID(),
+          bracketId: bracket.id,
+          roundNumber,
+          roundName: getRoundName(roundNumber, this.totalBracketRounds(bracketType)),
+        },
+        persisted: false,
+      };
+      this.bracketRounds.set(key, entry);
+    }
+    return entry;
+  }
+
+  /**
+   * Première écriture d'une position: la ligne (et son tour) sera créée
+   */
+  private createBracketMatch(match: BracketMatchState) {
+    this.pendingBracketMatchIds.delete(match.id);
+    this.createdBracketMatchIds.add(match.id);
+    this.bracketMatches.push(match);
+
+    const entry = this.bracketRound(match.bracketType, match.roundNumber);
+    if (!entry.persisted) {
+      entry.persisted = true;
+      this.createdBracketRounds.push(entry.round);
+      const { bracketId: _bracketId, ...round } = entry.round;
+      this.brackets.get(match.bracketType)!.rounds.push(round);
+    }
+  }
+
+  // ============================================================
+  // UTILITAIRES
+  // ============================================================
+
+  /**
+   * Valide le gagnant d'un match et retourne le perdant
+   */
+  private validateResult(
+    match: QualificationMatchState | BracketMatchState,
+    winnerTeamId: string | undefined | null
+  ): string | null {
+    if (match.isBye) {
+      throw new ResultError('Impossible de modifier un match d\'exemption');
+    }
+
+    if (!winnerTeamId) {
+      throw new ResultError('ID de l\'équipe gagnante requis');
+    }
+
+    if (match.status === 'FINISHED') {
+      throw new ResultError('Ce match est déjà terminé');
+    }
+
+    if (winnerTeamId !== match.homeTeamId && winnerTeamId !== match.awayTeamId) {
+      throw new ResultError('L\'équipe gagnante doit faire partie du match');
+    }
+
+    return winnerTeamId === match.homeTeamId ? match.awayTeamId : match.homeTeamId;
+  }
+
+  /**
+   * Valide une correction et retourne le nouveau vainqueur
+   */
+  private validateCorrection(
+    match: QualificationMatchState | BracketMatchState,
+    winnerTeamId: string | undefined | null
+  ): string {
+    if (match.isBye) {
+      throw new ResultError('Impossible de modifier un match d\'exemption');
+    }
+
+    if (!winnerTeamId) {
+      throw new ResultError('ID de l\'équipe gagnante requis');
+    }
+
+    if (match.status !== 'FINISHED' || !match.winnerTeamId) {
+      throw new ResultError('Ce match n\'est pas encore terminé');
+    }
+
+    if (winnerTeamId !== match.homeTeamId && winnerTeamId !== match.awayTeamId) {
+      throw new ResultError('L\'équipe gagnante doit faire partie du match');
+    }
+
+    if (winnerTeamId === match.winnerTeamId) {
+      throw new ResultError('Cette équipe est déjà le vainqueur du match');
+    }
+
+    return winnerTeamId;
+  }
+
+  /**
+   * Places d'une équipe dans un groupe du Tour 2, et au-delà d'une exemption
+   * du Tour 2, dans le bracket qu'elle alimente
+   */
+  private round2Placements(teamId: string, groupType: GroupType): Placement[] {
+    const placements: Placement[] = [];
+    for (const id of this.round2Slots.positionsOf(groupType, teamId)) {
+      const match = this.qualificationById.get(id)!;
+      placements.push({ phase: 'QUALIFICATION', match });
+      if (match.isBye) {
+        placements.push(...this.bracketPlacements(teamId, groupType === 'WINNERS' ? 'A' : 'B'));
+      }
+    }
+    return placements;
+  }
+
+  /**
+   * Places d'une équipe dans un bracket (exemption et match suivant compris)
+   */
+  private bracketPlacements(teamId: string, bracketType: 'A' | 'B'): Placement[] {
+    return this.bracketSlots
+      .positionsOf(bracketType, teamId)
+      .map(id => ({ phase: 'BRACKET' as const, match: this.bracketById.get(id)! }));
+  }
+
+  private activeQualificationMatches(roundNumber: number): QualificationMatchState[] {
+    return (this.qualificationByRound.get(roundNumber) ?? []).filter(
+      m => !this.deletedQualificationMatchIds.has(m.id)
+    );
+  }
+
+  // Toute modification de match passe par ces méthodes: les index restent à jour
+  private updateQualificationMatch(match: QualificationMatchState, data: QualificationMatchChanges) {
+    this.round2Slots.remove(match);
+    recordChanges<QualificationMatchState>(match, data, this.qualificationChanges);
+    this.round2Slots.add(match);
+  }
+
+  private updateBracketMatch(match: BracketMatchState, data: BracketMatchChanges) {
+    if (this.pendingBracketMatchIds.has(match.id)) this.createBracketMatch(match);
+    this.bracketSlots.remove(match);
+    recordChanges<BracketMatchState>(match, data, this.bracketChanges);
+    this.bracketSlots.add(match);
+  }
+
+  private deleteQualificationMatch(match: QualificationMatchState) {
+    this.round2Slots.remove(match);
+    this.deletedQualificationMatchIds.add(match.id);
+    this.qualificationChanges.delete(match.id);
+  }
+
+  private updateTeam(teamId: string, data: TeamChanges) {
+    const team = this.teamById.get(teamId);
+    if (!team) return;
+    recordChanges<TeamState>(team, data, this.teamChanges);
+  }
+}
+
+/**
+ * Applique des modifications à une ligne en mémoire et n'enregistre dans le
+ * diff que les champs dont la valeur change réellement
+ */
+function recordChanges<T extends { id: string }>(
+  row: T,
+  data: Partial<T>,
+  changes: Map<string, Partial<T>>
+) {
+  for (const key of Object.keys(data) as (keyof T)[]) {
+    const value = data[key] as T[keyof T];
+    if (row[key] === value) continue;
+    row[key] = value;
+    const entry: Partial<T> = changes.get(row.id) ?? {};
+    entry[key] = value;
+    changes.set(row.id, entry);
+  }
+}
+
+type Placement =
+  | { phase: 'QUALIFICATION'; match: QualificationMatchState }
+  | { phase: 'BRACKET'; match: BracketMatchState };
+
+/**
+ * Remplace une équipe par une autre dans les champs d'un match
+ */
+function substituteTeam(
+  match: QualificationMatchState | BracketMatchState,
+  from: string,
+  to: string
+): Partial<Pick<QualificationMatchState, 'homeTeamId' | 'awayTeamId' | 'winnerTeamId' | 'loserTeamId'>> {
+  const changes: Partial<Pick<QualificationMatchState, 'homeTeamId' | 'awayTeamId' | 'winnerTeamId' | 'loserTeamId'>> = {};
+  for (const field of ['homeTeamId', 'awayTeamId', 'winnerTeamId', 'loserTeamId'] as const) {
+    if (match[field] === from) changes[field] = to;
+  }
+  return changes;
+}
+
+function describeMatch({ phase, match }: Placement): string {
+  return phase === 'QUALIFICATION'
+    ? `Tour ${match.roundNumber}, match ${match.matchNumber}`
+    : `Tableau ${match.bracketType}, tour ${match.roundNumber}, match ${match.matchNumber}`;
+}
+
+/**
+ * Indique si un diff ne contient aucune modification
+ */
+export function isEmptyDiff(diff: ContestDiff): boolean {
+  return (
+    diff.qualificationMatches.length === 0 &&
+    diff.deletedQualificationMatches.length === 0 &&
+    diff.bracketMatches.length === 0 &&
+    diff.teams.length === 0 &&
+    diff.brackets.length === 0 &&
+    diff.createdBracketMatches.length === 0
+  );
+}
+
+function roundKey(bracketType: string, roundNumber: number): string {
+  return `${bracketType}:${roundNumber}`;
+}
+
+function pushTo<K, V>(groups: Map<K, V[]>, key: K, value: V) {
+  const group = groups.get(key);
+  if (group) {
+    group.push(value);
+  } else {
+    groups.set(key, [value]);
+  }
+}
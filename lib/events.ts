@@ -0,0 +1,189 @@
+// ============================================================
+// ÉVÉNEMENTS EN DIRECT D'UN CONCOURS
+// ============================================================
+//
+// Bus d'événements en mémoire du processus: les routes d'écriture publient,
+// après commit, les lignes modifiées; /api/contests/[id]/events les relaie en
+// Server-Sent Events. Chaque événement porte la version du concours qui l'a
+// produit: un client qui détecte un trou de version se resynchronise via
+// /api/contests/[id]/changes.
+
+import { EventEmitter } from 'events';
+import type { ContestEngine } from './engine';
+import type { TerrainSchedule } from './scheduler';
+
+export type ContestEventType =
+  | 'match-finished'
+  | 'match-corrected'
+  | 'slot-assigned'
+  | 'match-removed'
+  | 'team-eliminated'
+  | 'team-updated'
+  | 'contest-updated'
+  | 'terrains-updated';
+
+export interface EventMatch {
+  id: string;
+  roundId: string;
+  matchNumber: number;
+  groupType?: string | null;
+  homeTeamId: string | null;
+  awayTeamId: string | null;
+  winnerTeamId: string | null;
+  loserTeamId: string | null;
+  status: string;
+  isBye: boolean;
+  version: number;
+}
+
+interface BaseEvent {
+  contestId: string;
+  version: number;
+}
+
+export type ContestEvent =
+  | (BaseEvent & { type: 'match-finished' | 'match-corrected' | 'slot-assigned'; phase: 'QUALIFICATION' | 'BRACKET'; match: EventMatch })
+  | (BaseEvent & { type: 'match-removed'; matchId: string })
+  | (BaseEvent & { type: 'team-eliminated' | 'team-updated'; team: { id: string; status: string; version: number } })
+  | (BaseEvent & { type: 'contest-updated'; status: string })
+  | (BaseEvent & { type: 'terrains-updated'; released: string[]; assigned: { matchId: string; terrainId: string }[] });
+
+type Listener = (event: ContestEvent) => void;
+
+class ContestEventBus {
+  private readonly emitter = new EventEmitter();
+
+  constructor() {
+    // Un abonné par spectateur connecté: pas de limite arbitraire
+    this.emitter.setMaxListeners(0);
+  }
+
+  publish(events: ContestEvent[]) {
+    for (const event of events) {
+      this.emitter.emit(event.contestId, event);
+    }
+  }
+
+  /**
+   * @returns La fonction de désabonnement
+   */
+  subscribe(contestId: string, listener: Listener): () => void {
+    this.emitter.on(contestId, listener);
+    return () => {
+      this.emitter.off(contestId, listener);
+    };
+  }
+
+  subscriberCount(contestId: string): number {
+    return this.emitter.listenerCount(contestId);
+  }
+}
+
+// Singleton partagé par toutes les routes (et conservé au rechargement à chaud)
+declare global {
+  var contestEventsGlobal: undefined | ContestEventBus
+}
+
+export const contestEvents = globalThis.contestEventsGlobal ?? new ContestEventBus();
+
+globalThis.contestEventsGlobal = contestEvents;
+
+/**
+ * Traduit les modifications d'un moteur en événements, dans l'ordre où un
+ * client doit les appliquer: résultats (et corrections), placements,
+ * suppressions, statuts d'équipes.
+ */
+export function buildContestEvents(contestId: string, engine: ContestEngine, version: number): ContestEvent[] {
+  const diff = engine.getDiff();
+  const changed = engine.getChangedMatches();
+  const finished = new Set(
+    [...diff.qualificationMatches, ...diff.bracketMatches]
+      .filter(d => d.changes.status === 'FINISHED')
+      .map(d => d.id)
+  );
+  // Vainqueur modifié sur un match déjà terminé (hors exemptions): correction
+  const changedMatches = [...changed.qualificationMatches, ...changed.bracketMatches];
+  const corrected = new Set(
+    [...diff.qualificationMatches, ...diff.bracketMatches]
+      .filter(d => d.changes.winnerTeamId !== undefined && d.changes.status === undefined)
+      .map(d => d.id)
+      .filter(id => !changedMatches.find(m => m.id === id)?.isBye)
+  );
+
+  const matchEvents = [
+    ...changed.qualificationMatches.map(m => ({
+      phase: 'QUALIFICATION' as const,
+      match: {
+        id: m.id,
+        roundId: m.roundId,
+        matchNumber: m.matchNumber,
+        groupType: m.groupType,
+        homeTeamId: m.homeTeamId,
+        awayTeamId: m.awayTeamId,
+        winnerTeamId: m.winnerTeamId,
+        loserTeamId: m.loserTeamId,
+        status: m.status,
+        isBye: m.isBye,
+        version,
+      },
+    })),
+    ...changed.bracketMatches.map(m => ({
+      phase: 'BRACKET' as const,
+      match: {
+        id: m.id,
+        roundId: m.roundId,
+        matchNumber: m.matchNumber,
+        homeTeamId: m.homeTeamId,
+        awayTeamId: m.awayTeamId,
+        winnerTeamId: m.winnerTeamId,
+        loserTeamId: m.loserTeamId,
+        status: m.status,
+        isBye: m.isBye,
+        version,
+      },
+    })),
+  ];
+
+  const events: ContestEvent[] = [];
+  for (const { phase, match } of matchEvents) {
+    if (finished.has(match.id)) {
+      events.push({ type: 'match-finished', contestId, version, phase, match });
+    } else if (corrected.has(match.id)) {
+      events.push({ type: 'match-corrected', contestId, version, phase, match });
+    }
+  }
+  for (const { phase, match } of matchEvents) {
+    if (!finished.has(match.id) && !corrected.has(match.id)) {
+      events.push({ type: 'slot-assigned', contestId, version, phase, match });
+    }
+  }
+  for (const { id: matchId } of diff.deletedQualificationMatches) {
+    events.push({ type: 'match-removed', contestId, version, matchId });
+  }
+  for (const { id, changes } of diff.teams) {
+    if (changes.status === 'ELIMINATED') {
+      events.push({ type: 'team-eliminated', contestId, version, team: { id, status: changes.status, version } });
+    } else if (changes.status) {
+      events.push({ type: 'team-updated', contestId, version, team: { id, status: changes.status, version } });
+    }
+  }
+  return events;
+}
+
+/**
+ * Terrains libérés et matchs appelés par une écriture (tableau des terrains)
+ */
+export function buildTerrainEvents(
+  contestId: string,
+  version: number,
+  schedule: TerrainSchedule | null
+): ContestEvent[] {
+  if (!schedule || (schedule.released.length === 0 && schedule.assigned.length === 0)) return [];
+  return [{
+    type: 'terrains-updated',
+    contestId,
+    version,
+    released: schedule.released,
+    assigned: schedule.assigned.map(({ matchId, terrainId }) => ({ matchId, terrainId })),
+  }];
+}
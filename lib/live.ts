@@ -0,0 +1,186 @@
+// ============================================================
+// SYNCHRONISATION INCRÉMENTALE CÔTÉ CLIENT
+// ============================================================
+//
+// Fusionne les modifications renvoyées par /api/contests/[id]/changes, ou les
+// événements du flux /api/contests/[id]/events, dans l'arbre complet chargé par
+// GET /api/contests/[id]. Module pur, utilisable côté client comme dans les tests.
+
+import type { ContestEvent } from './events';
+
+export interface LiveTeam {
+  id: string;
+  teamNumber: number;
+  status?: string;
+  [key: string]: any;
+}
+
+export interface LiveMatch {
+  id: string;
+  roundId: string;
+  matchNumber: number;
+  homeTeamId?: string | null;
+  awayTeamId?: string | null;
+  winnerTeamId?: string | null;
+  loserTeamId?: string | null;
+  [key: string]: any;
+}
+
+export interface LiveRound {
+  id: string;
+  matches: LiveMatch[];
+}
+
+export interface LiveContest {
+  id: string;
+  status: string;
+  version: number;
+  teams: LiveTeam[];
+  qualificationRounds: LiveRound[];
+  brackets: { rounds: LiveRound[] }[];
+}
+
+export interface ContestChanges {
+  version: number;
+  status: string;
+  teams: LiveTeam[];
+  qualificationMatches: LiveMatch[];
+  bracketMatches: LiveMatch[];
+  deleted: { qualificationMatches: string[]; teams: string[] };
+}
+
+/**
+ * Applique un lot de modifications à un concours chargé côté client.
+ *
+ * @returns Le nouveau concours (les rounds et la liste des équipes non modifiés
+ *          gardent leur référence),
+ *          ou null si les modifications concernent un round inconnu du client
+ *          (il faut alors recharger le concours complet)
+ */
+export function applyContestChanges<T extends LiveContest>(contest: T, changes: ContestChanges): T | null {
+  if (changes.version <= contest.version) return contest;
+  return mergeChanges(contest, changes);
+}
+
+/**
+ * Applique un événement du flux en direct.
+ *
+ * Les événements d'une même écriture partagent la même version: on accepte la
+ * version courante (suite du lot) et la suivante.
+ *
+ * @returns Le nouveau concours, le même s'il est périmé, ou null si des
+ *          événements ont été manqués (il faut alors se resynchroniser)
+ */
+export function applyContestEvent<T extends LiveContest>(contest: T, event: ContestEvent): T | null {
+  if (event.version < contest.version) return contest;
+  if (event.version > contest.version + 1) return null;
+
+  const changes: ContestChanges = {
+    version: event.version,
+    status: contest.status,
+    teams: [],
+    qualificationMatches: [],
+    bracketMatches: [],
+    deleted: { qualificationMatches: [], teams: [] },
+  };
+
+  switch (event.type) {
+    case 'match-finished':
+    case 'match-corrected':
+    case 'slot-assigned':
+      if (event.phase === 'QUALIFICATION') {
+        changes.qualificationMatches.push({ ...event.match });
+      } else {
+        changes.bracketMatches.push({ ...event.match });
+      }
+      break;
+    case 'match-removed':
+      changes.deleted.qualificationMatches.push(event.matchId);
+      break;
+    case 'team-eliminated':
+    case 'team-updated': {
+      const team = contest.teams.find(t => t.id === event.team.id);
+      if (!team) return null;
+      changes.teams.push({ ...team, ...event.team });
+      break;
+    }
+    case 'contest-updated':
+      changes.status = event.status;
+      break;
+    case 'terrains-updated':
+      // Attributions de terrains: hors de l'arbre du concours (tableau des terrains)
+      return contest;
+  }
+
+  return mergeChanges(contest, changes);
+}
+
+function mergeChanges<T extends LiveContest>(contest: T, changes: ContestChanges): T | null {
+  // Liste des équipes conservée telle quelle si aucune n'a changé (composants mémoïsés)
+  const deletedTeams = new Set(changes.deleted.teams);
+  const teams = changes.teams.length === 0 && deletedTeams.size === 0
+    ? contest.teams
+    : mergeRows(contest.teams, changes.teams, deletedTeams).sort((a, b) => a.teamNumber - b.teamNumber);
+  const teamsById = new Map(teams.map(t => [t.id, t]));
+
+  const hydrate = (match: LiveMatch): LiveMatch => ({
+    ...match,
+    homeTeam: match.homeTeamId ? teamsById.get(match.homeTeamId) ?? null : null,
+    awayTeam: match.awayTeamId ? teamsById.get(match.awayTeamId) ?? null : null,
+    winnerTeam: match.winnerTeamId ? teamsById.get(match.winnerTeamId) ?? null : null,
+    loserTeam: match.loserTeamId ? teamsById.get(match.loserTeamId) ?? null : null,
+  });
+
+  const qualificationRoundIds = new Set(contest.qualificationRounds.map(r => r.id));
+  const bracketRoundIds = new Set(contest.brackets.flatMap(b => b.rounds.map(r => r.id)));
+  if (
+    changes.qualificationMatches.some(m => !qualificationRoundIds.has(m.roundId)) ||
+    changes.bracketMatches.some(m => !bracketRoundIds.has(m.roundId))
+  ) {
+    return null;
+  }
+
+  const deletedMatches = new Set(changes.deleted.qualificationMatches);
+  const qualificationMatches = changes.qualificationMatches.map(hydrate);
+  const bracketMatches = changes.bracketMatches.map(hydrate);
+
+  const qualificationRounds = contest.qualificationRounds.map(round =>
+    mergeRound(round, qualificationMatches, deletedMatches)
+  );
+  const brackets = contest.brackets.map(bracket => {
+    const rounds = bracket.rounds.map(round => mergeRound(round, bracketMatches, deletedMatches));
+    return rounds.every((round, i) => round === bracket.rounds[i]) ? bracket : { ...bracket, rounds };
+  });
+
+  return {
+    ...contest,
+    version: changes.version,
+    status: changes.status,
+    teams,
+    qualificationRounds,
+    brackets,
+  };
+}
+
+/**
+ * Fusionne les matchs modifiés d'un round (le round est conservé tel quel s'il n'est pas touché)
+ */
+function mergeRound(round: LiveRound, matches: LiveMatch[], deleted: Set<string>): LiveRound {
+  const updates = matches.filter(m => m.roundId === round.id);
+  const hasDeletions = round.matches.some(m => deleted.has(m.id));
+  if (updates.length === 0 && !hasDeletions) return round;
+
+  return {
+    ...round,
+    matches: mergeRows(round.matches, updates, deleted).sort((a, b) => a.matchNumber - b.matchNumber),
+  };
+}
+
+function mergeRows<R extends { id: string }>(rows: R[], updates: R[], deleted: Set<string>): R[] {
+  const byId = new Map(rows.map(r => [r.id, r]));
+  for (const update of updates) {
+    byId.set(update.id, { ...byId.get(update.id), ...update });
+  }
+  deleted.forEach(id => byId.delete(id));
+  return Array.from(byId.values());
+}
@@ -0,0 +1,106 @@
+// ============================================================
+// PURGE GROUPÉE DE CONCOURS
+// ============================================================
+//
+// Supprime des concours entiers (brackets, tours, matchs, équipes, joueurs)
+// en une transaction: une requête ensembliste par table, quel que soit le
+// nombre de concours, au lieu d'une dizaine de requêtes par concours.
+
+import { Prisma, PrismaClient } from '@prisma/client';
+
+type Db = PrismaClient | Prisma.TransactionClient;
+
+export interface PurgeSelection {
+  ids?: string[];
+  status?: string;
+  // Concours créés avant cette date
+  olderThan?: Date;
+}
+
+export interface PurgeResult {
+  contestIds: string[];
+  rows: Record<string, number>;
+  totalRows: number;
+  durationMs: number;
+  compacted: boolean;
+}
+
+function contestWhere(selection: PurgeSelection): Prisma.ContestWhereInput {
+  return {
+    ...(selection.ids ? { id: { in: selection.ids } } : {}),
+    ...(selection.status ? { status: selection.status } : {}),
+    ...(selection.olderThan ? { createdAt: { lt: selection.olderThan } } : {}),
+  };
+}
+
+/**
+ * Supprime les concours sélectionnés et tout leur contenu, dans l'ordre des
+ * clés étrangères (les matchs avant les équipes qu'ils référencent).
+ *
+ * @param compact Compacte le fichier SQLite après la purge (VACUUM)
+ */
+export async function purgeContests(
+  db: PrismaClient,
+  selection: PurgeSelection,
+  options: { compact?: boolean } = {}
+): Promise<PurgeResult> {
+  const startedAt = performance.now();
+
+  const { contestIds, rows } = await db.$transaction(async (tx) => {
+    const contests = await tx.contest.findMany({
+      where: contestWhere(selection),
+      select: { id: true },
+    });
+    const contestIds = contests.map(c => c.id);
+    if (contestIds.length === 0) {
+      return { contestIds, rows: {} };
+    }
+    return { contestIds, rows: await deleteContestTrees(tx, contestIds) };
+  }, { timeout: 60000 });
+
+  // VACUUM est impossible dans une transaction
+  const compacted = Boolean(options.compact) && contestIds.length > 0;
+  if (compacted) {
+    await db.$executeRawUnsafe('VACUUM');
+  }
+
+  return {
+    contestIds,
+    rows,
+    totalRows: Object.values(rows).reduce((sum, count) => sum + count, 0),
+    durationMs: Math.round(performance.now() - startedAt),
+    compacted,
+  };
+}
+
+/**
+ * Suppressions ensemblistes de tous les sous-arbres des concours donnés
+ *
+ * @returns Nombre de lignes supprimées par table
+ */
+export async function deleteContestTrees(db: Db, contestIds: string[]): Promise<Record<string, number>> {
+  const inContests = { contestId: { in: contestIds } };
+  const rows: Record<string, number> = {};
+  const count = (table: string, result: { count: number }) => {
+    rows[table] = result.count;
+  };
+
+  count('bracketMatch', await db.bracketMatch.deleteMany({ where: { round: { bracket: inContests } } }));
+  count('bracketRound', await db.bracketRound.deleteMany({ where: { bracket: inContests } }));
+  count('bracket', await db.bracket.deleteMany({ where: inContests }));
+
+  count('qualificationMatch', await db.qualificationMatch.deleteMany({ where: { round: inContests } }));
+  count('qualificationRound', await db.qualificationRound.deleteMany({ where: inContests }));
+
+  count('meleePlayer', await db.meleePlayer.deleteMany({ where: inContests }));
+  count('player', await db.player.deleteMany({ where: { team: inContests } }));
+  count('team', await db.team.deleteMany({ where: inContests }));
+  count('contestTombstone', await db.contestTombstone.deleteMany({ where: inContests }));
+  count('resultEvent', await db.resultEvent.deleteMany({ where: inContests }));
+  count('contestSnapshot', await db.contestSnapshot.deleteMany({ where: inContests }));
+  count('terrainAssignment', await db.terrainAssignment.deleteMany({ where: inContests }));
+  count('terrain', await db.terrain.deleteMany({ where: inContests }));
+
+  count('contest', await db.contest.deleteMany({ where: { id: { in: contestIds } } }));
+  return rows;
+}
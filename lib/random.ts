@@ -0,0 +1,40 @@
+// ============================================================
+// HASARD REPRODUCTIBLE
+// ============================================================
+//
+// Chaque concours porte une graine (Contest.seed). Toute écriture qui tire au
+// sort (tirage, placement d'un qualifié) utilise un générateur dérivé de la
+// graine et de la version du concours dont elle part: rejouer les mêmes
+// écritures dans le même ordre redonne exactement les mêmes placements.
+
+import { randomInt } from 'crypto';
+
+/**
+ * Générateur pseudo-aléatoire (mulberry32) : nombres dans [0, 1),
+ * même suite pour une même graine
+ */
+export function createRandom(seed: number): () => number {
+  let state = seed >>> 0;
+  return () => {
+    state = (state + 0x6d2b79f5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+/**
+ * Nouvelle graine de concours (entier positif sur 31 bits)
+ */
+export function generateSeed(): number {
+  return randomInt(0, 2 ** 31 - 1);
+}
+
+/**
+ * Générateur d'une écriture: dérivé de la graine du concours et de la version
+ * lue avant l'écriture (deux écritures successives n'ont pas la même suite)
+ */
+export function contestRandom(seed: number, version: number): () => number {
+  return createRandom(seed ^ Math.imul(version + 1, 0x9e3779b1));
+}
@@ -0,0 +1,444 @@
+// ============================================================
+// JOURNAL DES RÉSULTATS (APPEND-ONLY) ET INSTANTANÉS
+// ============================================================
+//
+// Chaque écriture du moteur ajoute ses modifications au journal ResultEvent,
+// dans la même transaction que le diff: résultats, corrections, exemptions,
+// placements, éliminations et suppressions de matchs, créations de tours et
+// de matchs de brackets, avec la version du concours et l'opérateur de
+// saisie. Le tirage écrit un premier instantané (état complet compact), puis
+// un nouvel instantané est écrit tous les N événements.
+//
+// Reconstruction (rebuildContest, lib/contest-state.ts): dernier instantané
+// + événements suivants, rejoués en mémoire, puis comparés aux tables de
+// matchs; seules les lignes qui diffèrent sont réécrites.
+
+import { Prisma, PrismaClient } from '@prisma/client';
+import {
+  BracketMatchChanges,
+  BracketMatchState,
+  BracketRoundState,
+  BracketState,
+  ContestDiff,
+  ContestEngine,
+  ContestState,
+  QualificationMatchChanges,
+  QualificationMatchState,
+  TeamChanges,
+  TeamState,
+} from '@/lib/engine';
+
+type Db = PrismaClient | Prisma.TransactionClient;
+
+export type ResultEventType =
+  | 'RESULT'
+  | 'CORRECTION'
+  | 'BYE'
+  | 'SLOT_ASSIGNED'
+  | 'ELIMINATION'
+  | 'MATCH_REMOVED'
+  | 'MATCH_UPDATED'
+  | 'BRACKET_SIZED'
+  | 'ROUND_CREATED'
+  | 'MATCH_CREATED';
+
+export type ResultEventEntity = 'QUALIFICATION_MATCH' | 'BRACKET_MATCH' | 'TEAM' | 'BRACKET' | 'BRACKET_ROUND';
+
+// Créations: ligne complète (hors id et version)
+type BracketRoundCreation = Omit<BracketRoundState, 'id'> & { bracketId: string };
+type BracketMatchCreation = Omit<BracketMatchState, 'id' | 'version'>;
+
+export interface ResultEventEntry {
+  type: ResultEventType;
+  entity: ResultEventEntity;
+  entityId: string;
+  changes:
+    | QualificationMatchChanges
+    | BracketMatchChanges
+    | TeamChanges
+    | { size: number }
+    | BracketRoundCreation
+    | BracketMatchCreation;
+}
+
+const DEFAULT_SNAPSHOT_INTERVAL = 200;
+
+/**
+ * Nombre d'événements entre deux instantanés (RESULT_SNAPSHOT_INTERVAL)
+ */
+export function snapshotInterval(env: Record<string, string | undefined> = process.env): number {
+  const parsed = parseInt(env.RESULT_SNAPSHOT_INTERVAL ?? '', 10);
+  return isNaN(parsed) || parsed < 1 ? DEFAULT_SNAPSHOT_INTERVAL : parsed;
+}
+
+/**
+ * Opérateur de saisie déclaré par le client (en-tête X-Operator)
+ */
+export function requestActor(request: Request): string | null {
+  const actor = request.headers.get('x-operator')?.trim();
+  return actor ? actor.slice(0, 100) : null;
+}
+
+// ============================================================
+// ÉVÉNEMENTS D'UNE ÉCRITURE
+// ============================================================
+
+function matchEventType(match: { isBye: boolean }, changes: QualificationMatchChanges): ResultEventType {
+  if (changes.status === 'FINISHED') return match.isBye ? 'BYE' : 'RESULT';
+  if (changes.isBye) return 'BYE';
+  if (changes.winnerTeamId !== undefined && !match.isBye) return 'CORRECTION';
+  if (changes.homeTeamId !== undefined || changes.awayTeamId !== undefined) return 'SLOT_ASSIGNED';
+  return 'MATCH_UPDATED';
+}
+
+/**
+ * Traduit le diff d'un moteur en événements du journal, dans l'ordre où ils
+ * se rejouent: créations de brackets, résultats et placements, suppressions,
+ * éliminations
+ */
+export function resultEventsFromDiff(diff: ContestDiff, state: ContestState): ResultEventEntry[] {
+  const qualificationById = new Map(state.qualificationMatches.map(m => [m.id, m]));
+  const bracketById = new Map(state.bracketMatches.map(m => [m.id, m]));
+  const events: ResultEventEntry[] = [];
+
+  for (const { id, changes } of diff.brackets) {
+    events.push({ type: 'BRACKET_SIZED', entity: 'BRACKET', entityId: id, changes });
+  }
+  for (const { id, ...round } of diff.createdBracketRounds) {
+    events.push({ type: 'ROUND_CREATED', entity: 'BRACKET_ROUND', entityId: id, changes: round });
+  }
+  for (const { id, version: _version, ...match } of diff.createdBracketMatches) {
+    events.push({ type: 'MATCH_CREATED', entity: 'BRACKET_MATCH', entityId: id, changes: match });
+  }
+
+  for (const { id, changes } of diff.qualificationMatches) {
+    const match = qualificationById.get(id) ?? { isBye: changes.isBye ?? false };
+    events.push({ type: matchEventType(match, changes), entity: 'QUALIFICATION_MATCH', entityId: id, changes });
+  }
+  for (const { id, changes } of diff.bracketMatches) {
+    const match = bracketById.get(id) ?? { isBye: changes.isBye ?? false };
+    events.push({ type: matchEventType(match, changes), entity: 'BRACKET_MATCH', entityId: id, changes });
+  }
+  for (const { id } of diff.deletedQualificationMatches) {
+    events.push({ type: 'MATCH_REMOVED', entity: 'QUALIFICATION_MATCH', entityId: id, changes: {} });
+  }
+  for (const { id, changes } of diff.teams) {
+    events.push({
+      type: changes.status === 'ELIMINATED' ? 'ELIMINATION' : 'MATCH_UPDATED',
+      entity: 'TEAM',
+      entityId: id,
+      changes,
+    });
+  }
+  return events;
+}
+
+// ============================================================
+// INSTANTANÉS COMPACTS
+// ============================================================
+//
+// Une ligne par match sous forme de tableau (colonnes fixes, sans les
+// versions de ligne): environ trois fois plus court que les objets JSON.
+
+// Format 3: avec les brackets (taille et tours existants), créés à la demande.
+// Format 2: sans lien nextMatchId (progression positionnelle). Le format 1
+// portait ce lien en dernière colonne des brackets: il est ignoré à la lecture.
+const SNAPSHOT_FORMAT = 3;
+const READABLE_FORMATS = [1, 2, 3];
+
+type QualificationRow = [string, string, number, number, string | null, string | null, string | null, string | null, string | null, string, 0 | 1];
+type BracketRow = [string, string, string, number, number, string | null, string | null, string | null, string | null, string, 0 | 1];
+type BracketInfoRow = [string, string, number | null, [string, number, string][]];
+
+interface SnapshotPayload {
+  format: number;
+  q: QualificationRow[];
+  b: BracketRow[];
+  t: [string, string][];
+  // Absent avant le format 3
+  br?: BracketInfoRow[];
+}
+
+export function encodeSnapshot(state: ContestState): string {
+  const payload: SnapshotPayload = {
+    format: SNAPSHOT_FORMAT,
+    q: state.qualificationMatches.map(m => [
+      m.id, m.roundId, m.roundNumber, m.matchNumber, m.groupType,
+      m.homeTeamId, m.awayTeamId, m.winnerTeamId, m.loserTeamId, m.status, m.isBye ? 1 : 0,
+    ]),
+    b: state.bracketMatches.map(m => [
+      m.id, m.roundId, m.bracketType, m.roundNumber, m.matchNumber,
+      m.homeTeamId, m.awayTeamId, m.winnerTeamId, m.loserTeamId, m.status, m.isBye ? 1 : 0,
+    ]),
+    t: state.teams.map(t => [t.id, t.status]),
+    br: (state.brackets ?? []).map(b => [
+      b.id, b.type, b.size, b.rounds.map(r => [r.id, r.roundNumber, r.roundName] as [string, number, string]),
+    ]),
+  };
+  return JSON.stringify(payload);
+}
+
+export function decodeSnapshot(contestId: string, encoded: string): ContestState {
+  const payload = JSON.parse(encoded) as SnapshotPayload;
+  if (!READABLE_FORMATS.includes(payload.format)) {
+    throw new Error(`Format d'instantané inconnu: ${payload.format}`);
+  }
+
+  return {
+    contestId,
+    qualificationMatches: payload.q.map(([id, roundId, roundNumber, matchNumber, groupType, homeTeamId, awayTeamId, winnerTeamId, loserTeamId, status, isBye]) => ({
+      id, roundId, roundNumber, matchNumber, groupType,
+      homeTeamId, awayTeamId, winnerTeamId, loserTeamId, status, isBye: isBye === 1, version: 0,
+    })),
+    bracketMatches: payload.b.map(([id, roundId, bracketType, roundNumber, matchNumber, homeTeamId, awayTeamId, winnerTeamId, loserTeamId, status, isBye]) => ({
+      id, roundId, bracketType, roundNumber, matchNumber,
+      homeTeamId, awayTeamId, winnerTeamId, loserTeamId, status, isBye: isBye === 1, version: 0,
+    })),
+    teams: payload.t.map(([id, status]) => ({ id, status, version: 0 })),
+    brackets: (payload.br ?? []).map(([id, type, size, rounds]) => ({
+      id, type, size,
+      rounds: rounds.map(([roundId, roundNumber, roundName]) => ({ id: roundId, roundNumber, roundName })),
+    })),
+  };
+}
+
+// ============================================================
+// REJEU
+// ============================================================
+
+/**
+ * Applique les événements (dans l'ordre du journal) à un état, sans le modifier
+ */
+export function replayResultEvents(state: ContestState, events: ResultEventEntry[]): ContestState {
+  const qualification = new Map(state.qualificationMatches.map(m => [m.id, { ...m }]));
+  const brackets = new Map(state.bracketMatches.map(m => [m.id, { ...m }]));
+  const teams = new Map(state.teams.map(t => [t.id, { ...t }]));
+  const bracketInfo = new Map<string, BracketState>(
+    (state.brackets ?? []).map(b => [b.id, { ...b, rounds: b.rounds.map(r => ({ ...r })) }])
+  );
+
+  for (const event of events) {
+    if (event.entity === 'QUALIFICATION_MATCH') {
+      if (event.type === 'MATCH_REMOVED') {
+        qualification.delete(event.entityId);
+      } else {
+        const match = qualification.get(event.entityId);
+        if (match) Object.assign(match, event.changes);
+      }
+    } else if (event.entity === 'BRACKET_MATCH') {
+      if (event.type === 'MATCH_CREATED') {
+        brackets.set(event.entityId, { id: event.entityId, ...(event.changes as BracketMatchCreation), version: 0 });
+      } else {
+        const match = brackets.get(event.entityId);
+        if (match) Object.assign(match, event.changes);
+      }
+    } else if (event.entity === 'BRACKET') {
+      const bracket = bracketInfo.get(event.entityId);
+      if (bracket) Object.assign(bracket, event.changes);
+    } else if (event.entity === 'BRACKET_ROUND') {
+      const { bracketId, ...round } = event.changes as BracketRoundCreation;
+      bracketInfo.get(bracketId)?.rounds.push({ id: event.entityId, ...round });
+    } else {
+      const team = teams.get(event.entityId);
+      if (team) Object.assign(team, event.changes);
+    }
+  }
+
+  return {
+    contestId: state.contestId,
+    qualificationMatches: Array.from(qualification.values()),
+    bracketMatches: Array.from(brackets.values()),
+    teams: Array.from(teams.values()),
+    brackets: Array.from(bracketInfo.values()),
+  };
+}
+
+const matchFields = ['homeTeamId', 'awayTeamId', 'winnerTeamId', 'loserTeamId', 'status', 'isBye'] as const;
+
+function changedFields<T extends QualificationMatchState | BracketMatchState>(current: T, rebuilt: T) {
+  const changes: Partial<Pick<T, (typeof matchFields)[number]>> = {};
+  for (const field of matchFields) {
+    if (current[field] !== rebuilt[field]) {
+      (changes as Record<string, unknown>)[field] = rebuilt[field];
+    }
+  }
+  return changes;
+}
+
+export interface StateDifference {
+  diff: ContestDiff;
+  // Matchs de qualification supprimés à tort des tables (à recréer)
+  missingQualificationMatches: QualificationMatchState[];
+}
+
+/**
+ * Écritures qui ramènent l'état courant (tables) à l'état reconstruit
+ * (versions de ligne de l'état courant, pour l'écriture conditionnelle)
+ */
+export function diffContestStates(current: ContestState, rebuilt: ContestState): StateDifference {
+  const rebuiltQualification = new Map(rebuilt.qualificationMatches.map(m => [m.id, m]));
+  const rebuiltBrackets = new Map(rebuilt.bracketMatches.map(m => [m.id, m]));
+  const rebuiltTeams = new Map(rebuilt.teams.map(t => [t.id, t]));
+  const currentQualificationIds = new Set(current.qualificationMatches.map(m => m.id));
+  const currentBracketIds = new Set(current.bracketMatches.map(m => m.id));
+  const currentBrackets = new Map((current.brackets ?? []).map(b => [b.id, b]));
+
+  const diff: ContestDiff = {
+    qualificationMatches: [],
+    deletedQualificationMatches: [],
+    bracketMatches: [],
+    teams: [],
+    brackets: [],
+    createdBracketRounds: [],
+    createdBracketMatches: [],
+  };
+
+  for (const match of current.qualificationMatches) {
+    const target = rebuiltQualification.get(match.id);
+    if (!target) {
+      diff.deletedQualificationMatches.push({ id: match.id, version: match.version });
+      continue;
+    }
+    const changes = changedFields(match, target);
+    if (Object.keys(changes).length > 0) {
+      diff.qualificationMatches.push({ id: match.id, version: match.version, changes });
+    }
+  }
+  for (const match of current.bracketMatches) {
+    const target = rebuiltBrackets.get(match.id);
+    const changes = target ? changedFields(match, target) : {};
+    if (Object.keys(changes).length > 0) {
+      diff.bracketMatches.push({ id: match.id, version: match.version, changes });
+    }
+  }
+  for (const team of current.teams) {
+    const target: TeamState | undefined = rebuiltTeams.get(team.id);
+    if (target && target.status !== team.status) {
+      diff.teams.push({ id: team.id, version: team.version, changes: { status: target.status } });
+    }
+  }
+
+  // Brackets créés à la demande: taille, tours et matchs absents des tables
+  for (const bracket of rebuilt.brackets ?? []) {
+    const existing = currentBrackets.get(bracket.id);
+    if (!existing) continue;
+    if (bracket.size !== null && bracket.size !== existing.size) {
+      diff.brackets.push({ id: bracket.id, size: existing.size, changes: { size: bracket.size } });
+    }
+    const roundIds = new Set(existing.rounds.map(r => r.id));
+    for (const round of bracket.rounds) {
+      if (!roundIds.has(round.id)) diff.createdBracketRounds.push({ ...round, bracketId: bracket.id });
+    }
+  }
+  diff.createdBracketMatches = rebuilt.bracketMatches.filter(m => !currentBracketIds.has(m.id));
+
+  return {
+    diff,
+    missingQualificationMatches: rebuilt.qualificationMatches.filter(m => !currentQualificationIds.has(m.id)),
+  };
+}
+
+// ============================================================
+// ÉCRITURE
+// ============================================================
+
+/**
+ * Écrit un instantané de l'état du concours (à appeler dans une transaction)
+ */
+export async function writeSnapshot(
+  tx: Prisma.TransactionClient,
+  contestId: string,
+  version: number,
+  state: ContestState
+): Promise<void> {
+  await tx.contestSnapshot.create({
+    data: { contestId, version, state: encodeSnapshot(state) },
+  });
+}
+
+/**
+ * Ajoute au journal les modifications d'un moteur (dans la transaction qui
+ * persiste son diff), et un instantané tous les `snapshotInterval()` événements
+ *
+ * @returns Nombre d'événements ajoutés
+ */
+export async function appendResultEvents(
+  tx: Prisma.TransactionClient,
+  contestId: string,
+  version: number,
+  engine: ContestEngine,
+  actor: string | null = null
+): Promise<number> {
+  const state = engine.getState();
+  const events = resultEventsFromDiff(engine.getDiff(), state);
+  if (events.length === 0) return 0;
+
+  await tx.resultEvent.createMany({
+    data: events.map(event => ({
+      contestId,
+      version,
+      type: event.type,
+      entity: event.entity,
+      entityId: event.entityId,
+      changes: JSON.stringify(event.changes),
+      actor,
+    })),
+  });
+
+  const { eventCount } = await tx.contest.update({
+    where: { id: contestId },
+    data: { eventCount: { increment: events.length } },
+    select: { eventCount: true },
+  });
+
+  const interval = snapshotInterval();
+  if (Math.floor(eventCount / interval) > Math.floor((eventCount - events.length) / interval)) {
+    await writeSnapshot(tx, contestId, version, state);
+  }
+  return events.length;
+}
+
+// ============================================================
+// RECONSTRUCTION
+// ============================================================
+
+export class MissingSnapshotError extends Error {
+  constructor() {
+    super('Aucun instantané pour ce concours (tirage antérieur au journal des résultats)');
+    this.name = 'MissingSnapshotError';
+  }
+}
+
+/**
+ * État reconstruit: dernier instantané + événements suivants
+ */
+export async function loadReplayedState(
+  db: Db,
+  contestId: string
+): Promise<{ state: ContestState; snapshotVersion: number; replayedEvents: number }> {
+  const snapshot = await db.contestSnapshot.findFirst({
+    where: { contestId },
+    orderBy: { version: 'desc' },
+  });
+  if (!snapshot) {
+    throw new MissingSnapshotError();
+  }
+
+  const rows = await db.resultEvent.findMany({
+    where: { contestId, version: { gt: snapshot.version } },
+    orderBy: { id: 'asc' },
+    select: { type: true, entity: true, entityId: true, changes: true },
+  });
+  const events = rows.map(row => ({
+    type: row.type as ResultEventType,
+    entity: row.entity as ResultEventEntity,
+    entityId: row.entityId,
+    changes: JSON.parse(row.changes),
+  }));
+
+  return {
+    state: replayResultEvents(decodeSnapshot(contestId, snapshot.state), events),
+    snapshotVersion: snapshot.version,
+    replayedEvents: events.length,
+  };
+}
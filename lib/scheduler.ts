@@ -0,0 +1,287 @@
+// ============================================================
+// ATTRIBUTION DES MATCHS AUX TERRAINS (pur, sans base de données)
+// ============================================================
+//
+// À chaque écriture, les terrains dont le match est terminé sont libérés et
+// les matchs prêts (deux équipes, pas encore joués) sont appelés sur les
+// terrains libres, par ordre de priorité:
+// - la finale du tableau A d'abord, et seulement sur le terrain d'honneur
+// - puis le match prêt depuis le plus longtemps: la version d'une ligne est
+//   celle de sa dernière écriture, qui pour un match prêt est le placement de
+//   sa deuxième équipe
+// Parmi les terrains libres, on retient celui qui minimise la marche des deux
+// équipes depuis leur dernier terrain.
+
+import { bracketShape } from './bracket-topology';
+import type { BracketMatchState, ContestState, QualificationMatchState } from './engine';
+
+export type MatchPhase = 'QUALIFICATION' | 'BRACKET';
+
+export interface TerrainState {
+  id: string;
+  number: number;
+  isMain: boolean;
+  position: number;
+}
+
+export interface AssignmentState {
+  terrainId: string;
+  matchId: string;
+  phase: string;
+  released: boolean;
+}
+
+export interface TerrainSchedule {
+  // Matchs terminés (ou supprimés) dont le terrain est libéré
+  released: string[];
+  assigned: { matchId: string; terrainId: string; phase: MatchPhase }[];
+}
+
+interface ReadyMatch {
+  id: string;
+  phase: MatchPhase;
+  readyVersion: number;
+  roundNumber: number;
+  matchNumber: number;
+  teamIds: [string, string];
+  // Finale du tableau A: réservée au terrain d'honneur
+  isMainEvent: boolean;
+}
+
+/**
+ * File de priorité (tas binaire): ajout et retrait du plus prioritaire en O(log n)
+ */
+export class PriorityQueue<T> {
+  private readonly heap: T[] = [];
+
+  /**
+   * @param compare Négatif si a passe avant b
+   */
+  constructor(private readonly compare: (a: T, b: T) => number) {}
+
+  get size(): number {
+    return this.heap.length;
+  }
+
+  push(item: T) {
+    this.heap.push(item);
+    let i = this.heap.length - 1;
+    while (i > 0) {
+      const parent = (i - 1) >> 1;
+      if (this.compare(this.heap[i], this.heap[parent]) >= 0) break;
+      [this.heap[i], this.heap[parent]] = [this.heap[parent], this.heap[i]];
+      i = parent;
+    }
+  }
+
+  pop(): T | undefined {
+    if (this.heap.length === 0) return undefined;
+    const top = this.heap[0];
+    const last = this.heap.pop() as T;
+    if (this.heap.length > 0) {
+      this.heap[0] = last;
+      let i = 0;
+      for (;;) {
+        const left = 2 * i + 1;
+        const right = left + 1;
+        let smallest = i;
+        if (left < this.heap.length && this.compare(this.heap[left], this.heap[smallest]) < 0) smallest = left;
+        if (right < this.heap.length && this.compare(this.heap[right], this.heap[smallest]) < 0) smallest = right;
+        if (smallest === i) break;
+        [this.heap[i], this.heap[smallest]] = [this.heap[smallest], this.heap[i]];
+        i = smallest;
+      }
+    }
+    return top;
+  }
+}
+
+/**
+ * Un match peut être appelé sur un terrain: deux équipes, pas encore joué,
+ * pas une exemption
+ */
+export function isMatchReady(match: {
+  homeTeamId: string | null;
+  awayTeamId: string | null;
+  status: string;
+  isBye: boolean;
+}): boolean {
+  return Boolean(match.homeTeamId && match.awayTeamId) && match.status !== 'FINISHED' && !match.isBye;
+}
+
+/**
+ * Libère les terrains des matchs terminés et appelle les matchs prêts sur
+ * les terrains libres.
+ *
+ * @param assignments Attributions du concours, dans l'ordre où elles ont été faites
+ */
+export function scheduleMatches(
+  state: ContestState,
+  terrains: TerrainState[],
+  assignments: AssignmentState[]
+): TerrainSchedule {
+  const matches = indexMatches(state);
+
+  const released: string[] = [];
+  const active = new Map<string, string>(); // terrain → match
+  for (const assignment of assignments) {
+    if (assignment.released) continue;
+    const match = matches.get(assignment.matchId);
+    if (!match || match.status === 'FINISHED') {
+      released.push(assignment.matchId);
+    } else {
+      active.set(assignment.terrainId, assignment.matchId);
+    }
+  }
+
+  const free = terrains.filter(t => !active.has(t.id));
+  const assigned = assignMatches(state, terrains, free, assignments, matches, new Set(active.values()));
+  return { released, assigned };
+}
+
+/**
+ * Prochain match de chaque terrain: ce qui serait appelé si tous les matchs
+ * en cours se terminaient maintenant (tableau d'affichage)
+ *
+ * @param assignments Attributions à jour (après scheduleMatches)
+ * @returns terrain → match
+ */
+export function previewNextMatches(
+  state: ContestState,
+  terrains: TerrainState[],
+  assignments: AssignmentState[]
+): Map<string, string> {
+  const matches = indexMatches(state);
+  const playing = new Set(assignments.filter(a => !a.released).map(a => a.matchId));
+  const next = assignMatches(state, terrains, terrains, assignments, matches, playing);
+  return new Map(next.map(a => [a.terrainId, a.matchId]));
+}
+
+function assignMatches(
+  state: ContestState,
+  terrains: TerrainState[],
+  freeTerrains: TerrainState[],
+  assignments: AssignmentState[],
+  matches: Map<string, QualificationMatchState | BracketMatchState>,
+  playing: Set<string>
+): TerrainSchedule['assigned'] {
+  if (freeTerrains.length === 0) return [];
+
+  // Dernier terrain de chaque équipe (attributions dans l'ordre) et équipes sur le terrain
+  const positionOf = new Map(terrains.map(t => [t.id, t.position]));
+  const lastPosition = new Map<string, number>();
+  const busyTeams = new Set<string>();
+  for (const { terrainId, matchId } of assignments) {
+    const match = matches.get(matchId);
+    const position = positionOf.get(terrainId);
+    if (!match || position === undefined) continue;
+    for (const teamId of [match.homeTeamId, match.awayTeamId]) {
+      if (!teamId) continue;
+      lastPosition.set(teamId, position);
+      if (playing.has(matchId)) busyTeams.add(teamId);
+    }
+  }
+
+  // Un match libéré puis redevenu prêt (reconstruction depuis le journal) est rappelé
+  const queue = new PriorityQueue<ReadyMatch>(compareReadyMatches);
+  for (const match of readyMatches(state)) {
+    if (!playing.has(match.id)) queue.push(match);
+  }
+
+  const free = new Set(freeTerrains);
+  const assigned: TerrainSchedule['assigned'] = [];
+  const mainTerrains = terrains.filter(t => t.isMain);
+
+  while (free.size > 0 && queue.size > 0) {
+    const match = queue.pop()!;
+    if (match.teamIds.some(teamId => busyTeams.has(teamId))) continue;
+
+    // Finale A: attend le terrain d'honneur s'il existe
+    const candidates = match.isMainEvent && mainTerrains.length > 0
+      ? mainTerrains.filter(t => free.has(t))
+      : Array.from(free);
+    if (candidates.length === 0) continue;
+
+    const walk = (terrain: TerrainState) =>
+      match.teamIds.reduce((sum, teamId) => {
+        const last = lastPosition.get(teamId);
+        return sum + (last === undefined ? 0 : Math.abs(terrain.position - last));
+      }, 0);
+
+    // Moins de marche, puis terrain d'honneur gardé libre, puis numéro
+    let best = candidates[0];
+    let bestWalk = walk(best);
+    for (const terrain of candidates.slice(1)) {
+      const distance = walk(terrain);
+      if (
+        distance < bestWalk ||
+        (distance === bestWalk &&
+          (Number(terrain.isMain) - Number(best.isMain) || terrain.number - best.number) < 0)
+      ) {
+        best = terrain;
+        bestWalk = distance;
+      }
+    }
+
+    free.delete(best);
+    match.teamIds.forEach(teamId => busyTeams.add(teamId));
+    assigned.push({ matchId: match.id, terrainId: best.id, phase: match.phase });
+  }
+
+  return assigned;
+}
+
+function readyMatches(state: ContestState): ReadyMatch[] {
+  // Tours créés à la demande: le dernier tour se déduit de la taille du bracket
+  const sizeA = state.brackets?.find(b => b.type === 'A')?.size;
+  const lastRoundA = sizeA
+    ? bracketShape(sizeA).totalRounds
+    : state.bracketMatches
+        .filter(m => m.bracketType === 'A')
+        .reduce((max, m) => Math.max(max, m.roundNumber), 0);
+
+  const ready: ReadyMatch[] = [];
+  for (const match of state.qualificationMatches) {
+    if (!isMatchReady(match)) continue;
+    ready.push({
+      id: match.id,
+      phase: 'QUALIFICATION',
+      readyVersion: match.version,
+      roundNumber: match.roundNumber,
+      matchNumber: match.matchNumber,
+      teamIds: [match.homeTeamId!, match.awayTeamId!],
+      isMainEvent: false,
+    });
+  }
+  for (const match of state.bracketMatches) {
+    if (!isMatchReady(match)) continue;
+    ready.push({
+      id: match.id,
+      phase: 'BRACKET',
+      readyVersion: match.version,
+      roundNumber: match.roundNumber,
+      matchNumber: match.matchNumber,
+      teamIds: [match.homeTeamId!, match.awayTeamId!],
+      isMainEvent: match.bracketType === 'A' && match.roundNumber === lastRoundA,
+    });
+  }
+  return ready;
+}
+
+function compareReadyMatches(a: ReadyMatch, b: ReadyMatch): number {
+  return (
+    Number(b.isMainEvent) - Number(a.isMainEvent) ||
+    a.readyVersion - b.readyVersion ||
+    // À égalité: qualification avant brackets, puis ordre du tableau
+    (a.phase === b.phase ? 0 : a.phase === 'QUALIFICATION' ? -1 : 1) ||
+    a.roundNumber - b.roundNumber ||
+    a.matchNumber - b.matchNumber
+  );
+}
+
+function indexMatches(state: ContestState): Map<string, QualificationMatchState | BracketMatchState> {
+  const matches = new Map<string, QualificationMatchState | BracketMatchState>();
+  for (const match of state.qualificationMatches) matches.set(match.id, match);
+  for (const match of state.bracketMatches) matches.set(match.id, match);
+  return matches;
+}
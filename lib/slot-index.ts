@@ -0,0 +1,174 @@
+// ============================================================
+// INDEX DES SLOTS LIBRES
+// ============================================================
+//
+// Maintenu par le moteur à chaque modification de match: le placement
+// aléatoire d'une équipe et la vérification « déjà placée ? » deviennent des
+// accès en O(1) au lieu d'un parcours de tout le Tour 2 ou de tout le bracket.
+
+export type Slot = 'home' | 'away';
+
+export interface SlotMatch {
+  id: string;
+  roundNumber: number;
+  homeTeamId: string | null;
+  awayTeamId: string | null;
+  status: string;
+  isBye: boolean;
+}
+
+/**
+ * Ensemble avec ajout, retrait et tirage uniforme en O(1)
+ * (tableau dense + position de chaque élément, retrait par échange avec le dernier)
+ */
+export class RandomSet<T> {
+  private readonly items: T[] = [];
+  private readonly positions = new Map<T, number>();
+
+  get size(): number {
+    return this.items.length;
+  }
+
+  has(item: T): boolean {
+    return this.positions.has(item);
+  }
+
+  add(item: T) {
+    if (this.positions.has(item)) return;
+    this.positions.set(item, this.items.length);
+    this.items.push(item);
+  }
+
+  delete(item: T) {
+    const position = this.positions.get(item);
+    if (position === undefined) return;
+    const last = this.items.pop() as T;
+    this.positions.delete(item);
+    if (position < this.items.length) {
+      this.items[position] = last;
+      this.positions.set(last, position);
+    }
+  }
+
+  pick(random: () => number): T | undefined {
+    if (this.items.length === 0) return undefined;
+    return this.items[Math.floor(random() * this.items.length)];
+  }
+}
+
+/**
+ * Index des slots libres d'une famille de matchs (Tour 2 ou brackets).
+ *
+ * - slots réguliers libres par (groupe, tour): groupe = WINNERS / LOSERS ou A / B
+ * - matchs bye sans équipe par (groupe, tour)
+ * - position de chaque équipe par groupe (équipe → matchs où elle figure; un
+ *   bye de bracket et le match suivant contiennent tous deux l'équipe)
+ */
+export class SlotIndex<M extends SlotMatch> {
+  private readonly openSlots = new Map<string, RandomSet<string>>();
+  private readonly openByes = new Map<string, RandomSet<string>>();
+  private readonly positions = new Map<string, Map<string, Set<string>>>();
+  private readonly matches = new Map<string, M>();
+
+  /**
+   * @param groupOf Groupe d'un match (null: match non indexé)
+   */
+  constructor(private readonly groupOf: (match: M) => string | null) {}
+
+  add(match: M) {
+    const group = this.groupOf(match);
+    if (group === null) return;
+    this.matches.set(match.id, match);
+
+    const key = scopeKey(group, match.roundNumber);
+    if (match.isBye) {
+      if (!match.homeTeamId) setFor(this.openByes, key).add(match.id);
+    } else if (match.status !== 'FINISHED') {
+      if (!match.homeTeamId) setFor(this.openSlots, key).add(slotKey(match.id, 'home'));
+      if (!match.awayTeamId) setFor(this.openSlots, key).add(slotKey(match.id, 'away'));
+    }
+
+    const teams = this.positions.get(group) ?? new Map<string, Set<string>>();
+    this.positions.set(group, teams);
+    for (const teamId of [match.homeTeamId, match.awayTeamId]) {
+      if (!teamId) continue;
+      const matchIds = teams.get(teamId) ?? new Set<string>();
+      teams.set(teamId, matchIds.add(match.id));
+    }
+  }
+
+  /**
+   * Retire un match de l'index (à appeler avant toute modification du match)
+   */
+  remove(match: M) {
+    const group = this.groupOf(match);
+    if (group === null || !this.matches.has(match.id)) return;
+    this.matches.delete(match.id);
+
+    const key = scopeKey(group, match.roundNumber);
+    this.openByes.get(key)?.delete(match.id);
+    this.openSlots.get(key)?.delete(slotKey(match.id, 'home'));
+    this.openSlots.get(key)?.delete(slotKey(match.id, 'away'));
+
+    const teams = this.positions.get(group);
+    for (const teamId of [match.homeTeamId, match.awayTeamId]) {
+      const matchIds = teamId ? teams?.get(teamId) : undefined;
+      if (!matchIds) continue;
+      matchIds.delete(match.id);
+      if (matchIds.size === 0) teams!.delete(teamId!);
+    }
+  }
+
+  /**
+   * Tire uniformément un slot régulier libre d'un tour
+   */
+  pickSlot(group: string, roundNumber: number, random: () => number): { match: M; slot: Slot } | null {
+    const picked = this.openSlots.get(scopeKey(group, roundNumber))?.pick(random);
+    if (!picked) return null;
+    const separator = picked.lastIndexOf(':');
+    return {
+      match: this.matches.get(picked.slice(0, separator)) as M,
+      slot: picked.slice(separator + 1) as Slot,
+    };
+  }
+
+  /**
+   * Tire uniformément un match bye encore sans équipe d'un tour
+   */
+  pickBye(group: string, roundNumber: number, random: () => number): M | null {
+    const picked = this.openByes.get(scopeKey(group, roundNumber))?.pick(random);
+    return picked ? (this.matches.get(picked) as M) : null;
+  }
+
+  /**
+   * Matchs du groupe où l'équipe est placée (vide si absente)
+   */
+  positionsOf(group: string, teamId: string): string[] {
+    return Array.from(this.positions.get(group)?.get(teamId) ?? []);
+  }
+
+  isPlaced(group: string, teamId: string): boolean {
+    return this.positions.get(group)?.has(teamId) ?? false;
+  }
+
+  openSlotCount(group: string, roundNumber: number): number {
+    return this.openSlots.get(scopeKey(group, roundNumber))?.size ?? 0;
+  }
+}
+
+function scopeKey(group: string, roundNumber: number): string {
+  return `${group}:${roundNumber}`;
+}
+
+function slotKey(matchId: string, slot: Slot): string {
+  return `${matchId}:${slot}`;
+}
+
+function setFor(sets: Map<string, RandomSet<string>>, key: string): RandomSet<string> {
+  let set = sets.get(key);
+  if (!set) {
+    set = new RandomSet<string>();
+    sets.set(key, set);
+  }
+  return set;
+}
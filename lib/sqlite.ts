@@ -0,0 +1,170 @@
+// ============================================================
+// CONFIGURATION ET STATISTIQUES DU STOCKAGE SQLITE
+// ============================================================
+//
+// - WAL: les lectures ne sont jamais bloquées par une écriture en cours
+// - un client d'écriture à connexion unique: les transactions s'attendent
+//   dans le pool au lieu de se heurter à "database is locked"
+// - un client de lecture séparé (plusieurs connexions) pour les GET
+// - checkpoints du WAL périodiques, pour que le fichier -wal ne grossisse pas
+// - statistiques: durée des requêtes par client, attente du verrou d'écriture,
+//   conflits rejoués, résultats des checkpoints
+
+export type SynchronousLevel = 'OFF' | 'NORMAL' | 'FULL' | 'EXTRA';
+
+export interface SqliteConfig {
+  enabled: boolean;
+  busyTimeoutMs: number;
+  synchronous: SynchronousLevel;
+  readConnections: number;
+  checkpointIntervalMs: number;
+}
+
+/**
+ * Lit la configuration depuis l'environnement (DB_TUNING=off pour revenir au
+ * client unique sans réglages, par exemple pour une mesure de référence)
+ */
+export function readSqliteConfig(env: Record<string, string | undefined> = process.env): SqliteConfig {
+  const url = env.DATABASE_URL ?? '';
+  const int = (value: string | undefined, fallback: number) => {
+    const parsed = parseInt(value ?? '', 10);
+    return isNaN(parsed) ? fallback : parsed;
+  };
+  const synchronous = (env.DB_SYNCHRONOUS ?? 'NORMAL').toUpperCase();
+
+  return {
+    enabled: url.startsWith('file:') && env.DB_TUNING !== 'off',
+    busyTimeoutMs: int(env.DB_BUSY_TIMEOUT_MS, 10000),
+    synchronous: (['OFF', 'NORMAL', 'FULL', 'EXTRA'].includes(synchronous) ? synchronous : 'NORMAL') as SynchronousLevel,
+    readConnections: int(env.DB_READ_CONNECTIONS, 4),
+    checkpointIntervalMs: int(env.DB_CHECKPOINT_INTERVAL_MS, 30000),
+  };
+}
+
+/**
+ * Ajoute les paramètres de connexion Prisma à l'URL SQLite
+ * (socket_timeout, en secondes, est le busy_timeout de chaque connexion)
+ */
+export function sqliteUrl(url: string, connectionLimit: number, busyTimeoutMs: number): string {
+  const [path, query = ''] = url.split('?');
+  const params = new URLSearchParams(query);
+  params.set('connection_limit', String(connectionLimit));
+  params.set('socket_timeout', String(Math.max(1, Math.ceil(busyTimeoutMs / 1000))));
+  return `${path}?${params.toString()}`;
+}
+
+/**
+ * PRAGMAs appliqués à la connexion d'écriture au démarrage
+ * (journal_mode est persistant dans le fichier, les autres sont par connexion)
+ */
+export function writerPragmas(config: SqliteConfig): string[] {
+  return [
+    'PRAGMA journal_mode = WAL',
+    `PRAGMA busy_timeout = ${config.busyTimeoutMs}`,
+    `PRAGMA synchronous = ${config.synchronous}`,
+  ];
+}
+
+// ============================================================
+// STATISTIQUES
+// ============================================================
+
+const RECENT_SAMPLES = 1000;
+const SLOW_QUERY_MS = 100;
+
+export class DurationStats {
+  count = 0;
+  totalMs = 0;
+  maxMs = 0;
+  slow = 0;
+  // Derniers échantillons (tampon circulaire) pour les percentiles
+  private readonly recent: number[] = [];
+  private next = 0;
+
+  record(ms: number) {
+    this.count++;
+    this.totalMs += ms;
+    this.maxMs = Math.max(this.maxMs, ms);
+    if (ms >= SLOW_QUERY_MS) this.slow++;
+    if (this.recent.length < RECENT_SAMPLES) {
+      this.recent.push(ms);
+    } else {
+      this.recent[this.next] = ms;
+      this.next = (this.next + 1) % RECENT_SAMPLES;
+    }
+  }
+
+  snapshot() {
+    const sorted = [...this.recent].sort((a, b) => a - b);
+    const at = (p: number) => (sorted.length ? sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * p))] : 0);
+    const round = (ms: number) => Math.round(ms * 100) / 100;
+    return {
+      count: this.count,
+      slow: this.slow,
+      meanMs: this.count ? round(this.totalMs / this.count) : 0,
+      p50Ms: round(at(0.5)),
+      p95Ms: round(at(0.95)),
+      p99Ms: round(at(0.99)),
+      maxMs: round(this.maxMs),
+    };
+  }
+}
+
+export interface CheckpointResult {
+  busy: number;
+  log: number;
+  checkpointed: number;
+  at: string;
+}
+
+export class DbStats {
+  readonly startedAt = new Date();
+  readonly queries = { read: new DurationStats(), write: new DurationStats() };
+  // Attente de la connexion d'écriture (SQLite) ou du verrou de la ligne du concours
+  // (PostgreSQL) avant le début d'une transaction
+  readonly writeLockWait = new DurationStats();
+  retries = 0;
+  checkpoints = 0;
+  checkpointErrors = 0;
+  lastCheckpoint: CheckpointResult | null = null;
+
+  recordQuery(client: 'read' | 'write', ms: number) {
+    this.queries[client].record(ms);
+  }
+
+  recordLockWait(ms: number) {
+    this.writeLockWait.record(ms);
+  }
+
+  recordRetry() {
+    this.retries++;
+  }
+
+  recordCheckpoint(result: CheckpointResult) {
+    this.checkpoints++;
+    this.lastCheckpoint = result;
+  }
+
+  snapshot() {
+    return {
+      since: this.startedAt.toISOString(),
+      queries: { read: this.queries.read.snapshot(), write: this.queries.write.snapshot() },
+      writeLockWait: this.writeLockWait.snapshot(),
+      retries: this.retries,
+      checkpoints: {
+        count: this.checkpoints,
+        errors: this.checkpointErrors,
+        last: this.lastCheckpoint,
+      },
+    };
+  }
+}
+
+// Singleton partagé par toutes les routes (et conservé au rechargement à chaud)
+declare global {
+  var dbStatsGlobal: undefined | DbStats
+}
+
+export const dbStats = globalThis.dbStatsGlobal ?? new DbStats();
+
+globalThis.dbStatsGlobal = dbStats;
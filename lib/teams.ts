@@ -0,0 +1,379 @@
+// ============================================================
+// INSCRIPTION DES ÉQUIPES (UNITAIRE ET IMPORT GROUPÉ)
+// ============================================================
+//
+// - schémas de validation partagés par POST /teams et l'import
+// - attribution des numéros d'équipe dans la transaction d'écriture:
+//   le concours est modifié en premier (verrou d'écriture), la plage de
+//   numéros lue ensuite ne peut donc pas être attribuée deux fois
+// - import CSV / JSON lines lu en flux, ligne par ligne, avec un rapport
+//   d'erreurs par ligne; les équipes valides sont insérées par lots
+// - mode Mélée: inscription groupée des joueurs et formation des équipes
+//   en mémoire, écrites par le tirage dans sa transaction
+
+import { randomUUID } from 'crypto';
+import { MeleePlayer, Prisma, Team } from '@prisma/client';
+import { z } from 'zod';
+import { shuffleArray } from '@/lib/algorithms';
+
+export const playerSchema = z.object({
+  name: z.string().trim().min(1, 'Le nom est requis'),
+  order: z.number().int().min(1).max(3),
+});
+
+export const createTeamSchema = z.object({
+  name: z.string().trim().min(1).optional(),
+  club: z.string().trim().min(1).optional(),
+  players: z.array(playerSchema).min(1).max(3),
+});
+
+export type TeamInput = z.infer<typeof createTeamSchema>;
+
+export const meleePlayersSchema = z.object({
+  names: z.array(z.string().trim().min(1, 'Le nom est requis')).min(1).max(5000),
+});
+
+export type TeamImportFormat = 'csv' | 'ndjson';
+
+export const MAX_IMPORT_ROWS = 5000;
+const INSERT_BATCH_SIZE = 500;
+
+/**
+ * Les inscriptions sont fermées (le tirage a eu lieu entre la lecture et l'écriture)
+ */
+export class RegistrationClosedError extends Error {
+  constructor() {
+    super('Impossible d\'ajouter des équipes après le tirage');
+    this.name = 'RegistrationClosedError';
+  }
+}
+
+// Helper pour calculer le nombre de joueurs par équipe
+export function getPlayersPerTeam(teamType: string): number {
+  switch (teamType) {
+    case 'TETE_A_TETE': return 1;
+    case 'DOUBLETTE': return 2;
+    case 'TRIPLETTE': return 3;
+    default: return 2;
+  }
+}
+
+/**
+ * Vérifie le nombre de joueurs selon le type d'équipe
+ *
+ * @returns Le message d'erreur, ou null si l'équipe est complète
+ */
+export function checkPlayerCount(team: TeamInput, teamType: string): string | null {
+  const expectedPlayers = getPlayersPerTeam(teamType);
+  if (team.players.length !== expectedPlayers) {
+    return `Une équipe ${teamType} doit avoir ${expectedPlayers} joueur(s)`;
+  }
+  return null;
+}
+
+/**
+ * Réserve `count` numéros d'équipe consécutifs (à appeler dans une transaction)
+ * Incrémente la version et le compteur d'équipes du concours.
+ */
+export async function allocateTeamNumbers(
+  tx: Prisma.TransactionClient,
+  contestId: string,
+  count: number
+): Promise<{ version: number; firstTeamNumber: number }> {
+  // Écriture d'abord: la transaction détient le verrou jusqu'au commit
+  const contest = await tx.contest.update({
+    where: { id: contestId },
+    data: { version: { increment: 1 }, teamCount: { increment: count } },
+    select: { version: true, status: true },
+  });
+  if (contest.status !== 'DRAFT') {
+    throw new RegistrationClosedError();
+  }
+
+  const lastTeam = await tx.team.findFirst({
+    where: { contestId },
+    orderBy: { teamNumber: 'desc' },
+    select: { teamNumber: true },
+  });
+  return { version: contest.version, firstTeamNumber: (lastTeam?.teamNumber ?? 0) + 1 };
+}
+
+// ============================================================
+// LECTURE EN FLUX
+// ============================================================
+
+/**
+ * Découpe un flux d'octets en lignes (sans les fins de ligne \n ou \r\n)
+ */
+export async function* readLines(stream: AsyncIterable<Uint8Array> | ReadableStream<Uint8Array>) {
+  const decoder = new TextDecoder();
+  let pending = '';
+
+  for await (const chunk of stream as AsyncIterable<Uint8Array>) {
+    pending += decoder.decode(chunk, { stream: true });
+    const lines = pending.split('\n');
+    pending = lines.pop()!;
+    for (const line of lines) {
+      yield line.endsWith('\r') ? line.slice(0, -1) : line;
+    }
+  }
+
+  pending += decoder.decode();
+  if (pending) {
+    yield pending.endsWith('\r') ? pending.slice(0, -1) : pending;
+  }
+}
+
+/**
+ * Découpe une ligne CSV (champs entre guillemets, "" pour un guillemet)
+ */
+export function parseCsvLine(line: string, separator: string): string[] {
+  const fields: string[] = [];
+  let field = '';
+  let quoted = false;
+
+  for (let i = 0; i < line.length; i++) {
+    const char = line[i];
+    if (quoted) {
+      if (char === '"' && line[i + 1] === '"') {
+        field += '"';
+        i++;
+      } else if (char === '"') {
+        quoted = false;
+      } else {
+        field += char;
+      }
+    } else if (char === '"') {
+      quoted = true;
+    } else if (char === separator) {
+      fields.push(field);
+      field = '';
+    } else {
+      field += char;
+    }
+  }
+  fields.push(field);
+  return fields.map(f => f.trim());
+}
+
+// En-têtes CSV reconnus (les exports de tableur en français sont acceptés)
+const csvColumns: Record<string, string> = {
+  name: 'name',
+  nom: 'name',
+  equipe: 'name',
+  club: 'club',
+  player1: 'player1',
+  joueur1: 'player1',
+  player2: 'player2',
+  joueur2: 'player2',
+  player3: 'player3',
+  joueur3: 'player3',
+};
+
+function normalizeHeader(header: string): string {
+  return header.toLowerCase().normalize('NFD').replace(/[\u0300-\u036f\s_]/g, '');
+}
+
+function csvRowToTeam(columns: (string | undefined)[], fields: string[]): unknown {
+  const row: Record<string, string> = {};
+  columns.forEach((column, i) => {
+    if (column && fields[i]) row[column] = fields[i];
+  });
+
+  return {
+    name: row.name,
+    club: row.club,
+    players: [row.player1, row.player2, row.player3]
+      .map((name, i) => (name ? { name, order: i + 1 } : null))
+      .filter(player => player !== null),
+  };
+}
+
+export type ParsedTeamRow =
+  | { line: number; team: TeamInput }
+  | { line: number; error: string };
+
+function describeZodError(error: z.ZodError): string {
+  return error.errors
+    .map(issue => (issue.path.length > 0 ? `${issue.path.join('.')}: ${issue.message}` : issue.message))
+    .join(', ');
+}
+
+/**
+ * Lit les équipes ligne par ligne
+ *
+ * CSV: une ligne d'en-tête (name/nom, club, player1..3/joueur1..3),
+ * séparateur `,` ou `;` détecté sur l'en-tête.
+ * JSON lines: un objet par ligne, au format de POST /teams.
+ * Les lignes vides sont ignorées; les numéros de ligne sont ceux du fichier.
+ */
+export async function* parseTeamRows(
+  lines: AsyncIterable<string>,
+  format: TeamImportFormat
+): AsyncGenerator<ParsedTeamRow> {
+  let lineNumber = 0;
+  let separator = ',';
+  let columns: (string | undefined)[] | null = null;
+
+  for await (const rawLine of lines) {
+    lineNumber++;
+    const line = lineNumber === 1 ? rawLine.replace(/^\uFEFF/, '') : rawLine;
+    if (!line.trim()) continue;
+
+    let candidate: unknown;
+    if (format === 'csv') {
+      if (!columns) {
+        separator = line.split(';').length > line.split(',').length ? ';' : ',';
+        columns = parseCsvLine(line, separator).map(header => csvColumns[normalizeHeader(header)]);
+        if (!columns.some(column => column?.startsWith('player'))) {
+          yield { line: lineNumber, error: 'En-tête CSV sans colonne de joueur (player1 ou joueur1)' };
+          return;
+        }
+        continue;
+      }
+      candidate = csvRowToTeam(columns, parseCsvLine(line, separator));
+    } else {
+      try {
+        candidate = JSON.parse(line);
+      } catch {
+        yield { line: lineNumber, error: 'JSON invalide' };
+        continue;
+      }
+    }
+
+    const result = createTeamSchema.safeParse(candidate);
+    yield result.success
+      ? { line: lineNumber, team: result.data }
+      : { line: lineNumber, error: describeZodError(result.error) };
+  }
+}
+
+// ============================================================
+// IMPORT
+// ============================================================
+
+export interface TeamImportError {
+  line: number;
+  error: string;
+}
+
+/**
+ * Garde les équipes complètes pour le type du concours, les autres lignes
+ * vont dans le rapport d'erreurs (arrêt au-delà de MAX_IMPORT_ROWS équipes)
+ */
+export async function collectTeamRows(
+  rows: AsyncIterable<ParsedTeamRow>,
+  teamType: string
+): Promise<{ teams: TeamInput[]; errors: TeamImportError[] }> {
+  const teams: TeamInput[] = [];
+  const errors: TeamImportError[] = [];
+
+  for await (const row of rows) {
+    if ('error' in row) {
+      errors.push(row);
+      continue;
+    }
+    const playerCountError = checkPlayerCount(row.team, teamType);
+    if (playerCountError) {
+      errors.push({ line: row.line, error: playerCountError });
+      continue;
+    }
+    if (teams.length >= MAX_IMPORT_ROWS) {
+      errors.push({ line: row.line, error: `Import limité à ${MAX_IMPORT_ROWS} équipes` });
+      break;
+    }
+    teams.push(row.team);
+  }
+
+  return { teams, errors };
+}
+
+/**
+ * Insère les équipes et leurs joueurs par lots (à appeler dans une transaction)
+ * Les IDs sont générés ici pour insérer les joueurs sans relire les équipes.
+ */
+export async function insertTeams(
+  tx: Prisma.TransactionClient,
+  contestId: string,
+  teams: TeamInput[]
+): Promise<{ firstTeamNumber: number; lastTeamNumber: number }> {
+  const { version, firstTeamNumber } = await allocateTeamNumbers(tx, contestId, teams.length);
+
+  for (let start = 0; start < teams.length; start += INSERT_BATCH_SIZE) {
+    const batch = teams.slice(start, start + INSERT_BATCH_SIZE).map((team, i) => ({
+      id: randomUUID(),
+      teamNumber: firstTeamNumber + start + i,
+      team,
+    }));
+
+    await tx.team.createMany({
+      data: batch.map(({ id, teamNumber, team }) => ({
+        id,
+        contestId,
+        teamNumber,
+        name: team.name ?? null,
+        club: team.club ?? null,
+        version,
+      })),
+    });
+    await tx.player.createMany({
+      data: batch.flatMap(({ id, team }) =>
+        team.players.map(p => ({ teamId: id, firstName: p.name, lastName: '', order: p.order }))
+      ),
+    });
+  }
+
+  return { firstTeamNumber, lastTeamNumber: firstTeamNumber + teams.length - 1 };
+}
+
+// ============================================================
+// MODE MÉLÉE
+// ============================================================
+
+export interface MeleeTeamFormation {
+  teams: Team[];
+  players: Prisma.PlayerCreateManyInput[];
+  // Joueurs restants quand le nombre d'inscrits n'est pas un multiple de la taille d'équipe
+  unassignedPlayers: MeleePlayer[];
+}
+
+/**
+ * Forme les équipes mélée au hasard, sans écrire en base: les IDs sont
+ * générés ici pour que le tirage puisse être planifié avant l'insertion
+ */
+export function formMeleeTeams(
+  contestId: string,
+  meleePlayers: MeleePlayer[],
+  playersPerTeam: number,
+  version: number,
+  random: () => number = Math.random
+): MeleeTeamFormation {
+  const shuffledPlayers = shuffleArray(meleePlayers, random);
+  const numTeams = Math.floor(shuffledPlayers.length / playersPerTeam);
+  const createdAt = new Date();
+
+  const teams: Team[] = [];
+  const players: Prisma.PlayerCreateManyInput[] = [];
+
+  for (let i = 0; i < numTeams; i++) {
+    const teamPlayers = shuffledPlayers.slice(i * playersPerTeam, (i + 1) * playersPerTeam);
+    const teamId = randomUUID();
+
+    teams.push({
+      id: teamId,
+      contestId,
+      teamNumber: i + 1,
+      // Nom de l'équipe généré à partir des joueurs
+      name: teamPlayers.map(p => p.name).join(' & '),
+      club: null,
+      status: 'REGISTERED',
+      version,
+      createdAt,
+    });
+    teamPlayers.forEach((p, idx) => {
+      players.push({ teamId, firstName: p.name, lastName: '', order: idx + 1 });
+    });
+  }
+
+  return { teams, players, unassignedPlayers: shuffledPlayers.slice(numTeams * playersPerTeam) };
+}
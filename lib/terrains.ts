@@ -0,0 +1,191 @@
+// ============================================================
+// TERRAINS: ATTRIBUTIONS EN BASE ET TABLEAU D'AFFICHAGE
+// ============================================================
+//
+// Persiste les décisions de lib/scheduler.ts dans la transaction d'écriture
+// qui les provoque (tirage, résultats, corrections), et construit le tableau
+// des terrains (match en cours, prochain match, débit en matchs par heure).
+
+import { Prisma, PrismaClient } from '@prisma/client';
+import type { ContestState } from './engine';
+import { AssignmentState, previewNextMatches, scheduleMatches, TerrainSchedule } from './scheduler';
+
+type Db = PrismaClient | Prisma.TransactionClient;
+
+const terrainSelect = { id: true, number: true, name: true, isMain: true, position: true } as const;
+const assignmentSelect = {
+  id: true,
+  terrainId: true,
+  matchId: true,
+  phase: true,
+  assignedAt: true,
+  releasedAt: true,
+} as const;
+
+/**
+ * Met à jour les attributions de terrains d'après l'état du concours
+ * (à appeler dans la transaction d'écriture, avec l'état après écriture)
+ *
+ * @returns Les terrains libérés et les matchs appelés, ou null si le concours n'a pas de terrains
+ */
+export async function scheduleTerrains(
+  tx: Prisma.TransactionClient,
+  contestId: string,
+  state: ContestState,
+  now: Date = new Date()
+): Promise<TerrainSchedule | null> {
+  const terrains = await tx.terrain.findMany({ where: { contestId }, select: terrainSelect });
+  if (terrains.length === 0) return null;
+
+  const assignments = await tx.terrainAssignment.findMany({
+    where: { contestId },
+    select: assignmentSelect,
+    orderBy: { id: 'asc' },
+  });
+
+  const schedule = scheduleMatches(state, terrains, assignments.map(toAssignmentState));
+
+  if (schedule.released.length > 0) {
+    await tx.terrainAssignment.updateMany({
+      where: { contestId, matchId: { in: schedule.released }, releasedAt: null },
+      data: { releasedAt: now },
+    });
+  }
+  if (schedule.assigned.length > 0) {
+    await tx.terrainAssignment.createMany({
+      data: schedule.assigned.map(a => ({ contestId, ...a, assignedAt: now })),
+    });
+  }
+
+  return schedule;
+}
+
+export interface TerrainStats {
+  playedMatches: number;
+  matchesPerHour: number;
+  // Part du temps où les terrains sont occupés, depuis le premier appel
+  utilisation: number;
+}
+
+/**
+ * Débit des terrains: matchs terminés par heure, et occupation, entre le
+ * premier appel et maintenant
+ */
+export function terrainStats(
+  assignments: { assignedAt: Date; releasedAt: Date | null }[],
+  terrainCount: number,
+  now: Date = new Date()
+): TerrainStats {
+  if (assignments.length === 0 || terrainCount === 0) {
+    return { playedMatches: 0, matchesPerHour: 0, utilisation: 0 };
+  }
+
+  const start = Math.min(...assignments.map(a => a.assignedAt.getTime()));
+  const elapsedMs = Math.max(now.getTime() - start, 1);
+  let busyMs = 0;
+  let playedMatches = 0;
+  for (const { assignedAt, releasedAt } of assignments) {
+    busyMs += (releasedAt ?? now).getTime() - assignedAt.getTime();
+    if (releasedAt) playedMatches++;
+  }
+
+  return {
+    playedMatches,
+    matchesPerHour: Math.round((playedMatches / (elapsedMs / 3_600_000)) * 10) / 10,
+    utilisation: Math.round((busyMs / (elapsedMs * terrainCount)) * 1000) / 1000,
+  };
+}
+
+export interface BoardMatch {
+  id: string;
+  phase: string;
+  label: string;
+  homeTeamId: string | null;
+  awayTeamId: string | null;
+  assignedAt?: Date;
+}
+
+export interface TerrainBoard {
+  terrains: {
+    id: string;
+    number: number;
+    name: string | null;
+    isMain: boolean;
+    position: number;
+    current: BoardMatch | null;
+    next: BoardMatch | null;
+  }[];
+  stats: TerrainStats;
+}
+
+/**
+ * Tableau des terrains: match en cours et prochain match prévu sur chacun
+ */
+export async function loadTerrainBoard(
+  db: Db,
+  contestId: string,
+  state: ContestState,
+  now: Date = new Date()
+): Promise<TerrainBoard> {
+  const [terrains, assignments] = await Promise.all([
+    db.terrain.findMany({ where: { contestId }, select: terrainSelect, orderBy: { number: 'asc' } }),
+    db.terrainAssignment.findMany({ where: { contestId }, select: assignmentSelect, orderBy: { id: 'asc' } }),
+  ]);
+
+  const labels = matchLabels(state);
+  const boardMatch = (matchId: string, assignedAt?: Date): BoardMatch | null => {
+    const match = labels.get(matchId);
+    return match ? { id: matchId, ...match, ...(assignedAt ? { assignedAt } : {}) } : null;
+  };
+
+  const current = new Map(assignments.filter(a => !a.releasedAt).map(a => [a.terrainId, a]));
+  const next = previewNextMatches(state, terrains, assignments.map(toAssignmentState));
+
+  return {
+    terrains: terrains.map(terrain => {
+      const playing = current.get(terrain.id);
+      const nextId = next.get(terrain.id);
+      return {
+        ...terrain,
+        current: playing ? boardMatch(playing.matchId, playing.assignedAt) : null,
+        next: nextId ? boardMatch(nextId) : null,
+      };
+    }),
+    stats: terrainStats(assignments, terrains.length, now),
+  };
+}
+
+function toAssignmentState(assignment: {
+  terrainId: string;
+  matchId: string;
+  phase: string;
+  releasedAt: Date | null;
+}): AssignmentState {
+  return {
+    terrainId: assignment.terrainId,
+    matchId: assignment.matchId,
+    phase: assignment.phase,
+    released: assignment.releasedAt !== null,
+  };
+}
+
+function matchLabels(state: ContestState) {
+  const labels = new Map<string, { phase: string; label: string; homeTeamId: string | null; awayTeamId: string | null }>();
+  for (const m of state.qualificationMatches) {
+    labels.set(m.id, {
+      phase: 'QUALIFICATION',
+      label: `Tour ${m.roundNumber}, match ${m.matchNumber}`,
+      homeTeamId: m.homeTeamId,
+      awayTeamId: m.awayTeamId,
+    });
+  }
+  for (const m of state.bracketMatches) {
+    labels.set(m.id, {
+      phase: 'BRACKET',
+      label: `Tableau ${m.bracketType}, tour ${m.roundNumber}, match ${m.matchNumber}`,
+      homeTeamId: m.homeTeamId,
+      awayTeamId: m.awayTeamId,
+    });
+  }
+  return labels;
+}
@@ -8,6 +8,14 @@ export type ContestStatus =
   | 'BRACKETS_GENERATED'
   | 'FINISHED';
 
+// Phase courante, maintenue par les routes d'écriture (liste des concours)
+export type ContestPhase =
+  | 'DRAFT'
+  | 'QUALIFICATION_ROUND_1'
+  | 'QUALIFICATION_ROUND_2'
+  | 'BRACKETS_GENERATED'
+  | 'FINISHED';
+
 export type TeamType = 
   | 'TETE_A_TETE'
   | 'DOUBLETTE'
@@ -0,0 +1,36 @@
+// ============================================================
+// FENÊTRAGE DES LISTES (RENDU VIRTUALISÉ)
+// ============================================================
+//
+// Un tableau de 1024 équipes compte plus de 1000 cartes de match: seules les
+// colonnes et les cartes visibles dans la zone de défilement sont rendues.
+// Module pur (éléments de taille fixe), utilisé par components/BracketTree.tsx.
+
+export interface VisibleRange {
+  start: number; // premier indice rendu
+  end: number; // indice suivant le dernier rendu (exclu)
+}
+
+/**
+ * Indices des éléments visibles dans une zone de défilement
+ *
+ * @param offset - Position de défilement (scrollTop ou scrollLeft)
+ * @param viewport - Taille visible de la zone
+ * @param itemSize - Taille d'un élément (marge comprise)
+ * @param count - Nombre d'éléments
+ * @param overscan - Éléments rendus en plus de chaque côté (défilement fluide)
+ */
+export function visibleRange(
+  offset: number,
+  viewport: number,
+  itemSize: number,
+  count: number,
+  overscan = 2
+): VisibleRange {
+  if (count <= 0 || itemSize <= 0) return { start: 0, end: 0 };
+
+  const first = Math.floor(Math.max(0, offset) / itemSize);
+  const last = Math.ceil((Math.max(0, offset) + Math.max(0, viewport)) / itemSize);
+  const start = Math.min(count, Math.max(0, first - overscan));
+  return { start, end: Math.max(start, Math.min(count, last + overscan)) };
+}
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Benchmark comparatif SQLite / PostgreSQL
+
+Joue le même tournoi concurrent (scénario de load-test.py: K concours,
+N tablettes de saisie et M spectateurs par concours, même graine) contre deux
+serveurs, l'un sur SQLite, l'autre sur PostgreSQL, puis compare:
+- le débit de saisie des résultats (matchs joués par seconde, PATCH/s)
+- la latence des GET (concours complet et synchronisation incrémentale)
+- l'attente du verrou d'écriture et les conflits rejoués côté serveur
+
+Lancer les deux serveurs au préalable (voir README, section PostgreSQL):
+  DATABASE_URL="file:./bench.db" npm run start -- -p 3000
+  DATABASE_URL="postgresql://..." npm run start -- -p 3001
+
+Usage:
+  python3 backend-bench.py
+  python3 backend-bench.py --contests 16 --teams 128 --tablets 6 --pollers 20
+  python3 backend-bench.py --sqlite-url http://localhost:3000 --postgres-url http://localhost:3001 --output bench.json
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+# load-test.py (nom avec tiret: chargé depuis son chemin)
+_spec = importlib.util.spec_from_file_location('load_test', Path(__file__).with_name('load-test.py'))
+load_test = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(load_test)
+
+BACKENDS = ('sqlite', 'postgresql')
+WRITE_ENDPOINTS = ('PATCH qualification-match', 'PATCH bracket-match')
+READ_ENDPOINTS = ('GET contest', 'GET changes')
+
+
+# ============================================================
+# EXÉCUTION
+# ============================================================
+
+
+async def server_provider(base_url):
+    """Moteur déclaré par le serveur (GET /api/db/stats), None si inconnu"""
+    pool = load_test.HttpPool(base_url, 1)
+    try:
+        status, stats = await pool.request('GET', '/api/db/stats')
+    finally:
+        await pool.close()
+    if status != 200 or not stats:
+        return None
+    return stats.get('config', {}).get('provider', 'sqlite')
+
+
+def run_backend(args, backend, base_url):
+    provider = asyncio.run(server_provider(base_url))
+    if provider != backend:
+        raise RuntimeError(f'{base_url} tourne sur {provider or "un moteur inconnu"}, {backend} attendu')
+
+    print(f'▶ {backend} ({base_url}) ...', flush=True)
+    workload = argparse.Namespace(**vars(args), base_url=base_url, output=None, compare=None)
+    return asyncio.run(load_test.run(workload))
+
+
+# ============================================================
+# RAPPORT
+# ============================================================
+
+
+def summarize(result):
+    """Indicateurs comparés d'une exécution"""
+    endpoints = result['endpoints']
+    play_s = result['phases'].get('play_s') or 0
+    writes = [endpoints[e] for e in WRITE_ENDPOINTS if e in endpoints]
+    database = result.get('database') or {}
+
+    summary = {
+        'matches_per_s': round(result['matchesPlayed'] / play_s, 2) if play_s else None,
+        'patch_rps': round(sum(w['throughput_rps'] or 0 for w in writes), 2),
+        'patch_p95_ms': max((w['p95_ms'] for w in writes), default=None),
+        'patch_errors': sum(w['errors'] for w in writes),
+        'draw_s': result['phases'].get('draw_s'),
+        'write_wait_p95_ms': database.get('writeLockWait', {}).get('p95Ms'),
+        'retries': database.get('retries'),
+    }
+    for endpoint in READ_ENDPOINTS:
+        stats = endpoints.get(endpoint)
+        key = endpoint.split()[1]
+        for p in ('p50', 'p95', 'p99'):
+            summary[f'get_{key}_{p}_ms'] = stats[f'{p}_ms'] if stats else None
+    return summary
+
+
+LABELS = [
+    ('matches_per_s', 'Saisie: matchs joués / s', True),
+    ('patch_rps', 'Saisie: PATCH / s', True),
+    ('patch_p95_ms', 'Saisie: PATCH p95 (ms)', False),
+    ('patch_errors', 'Saisie: erreurs', False),
+    ('draw_s', 'Tirages (s)', False),
+    ('get_contest_p50_ms', 'GET concours p50 (ms)', False),
+    ('get_contest_p95_ms', 'GET concours p95 (ms)', False),
+    ('get_contest_p99_ms', 'GET concours p99 (ms)', False),
+    ('get_changes_p50_ms', 'GET changes p50 (ms)', False),
+    ('get_changes_p95_ms', 'GET changes p95 (ms)', False),
+    ('write_wait_p95_ms', 'Attente écriture p95 (ms)', False),
+    ('retries', 'Conflits rejoués', False),
+]
+
+
+def print_comparison(args, summaries):
+    print(f"\n{'=' * 78}")
+    print(f"  {args.contests} concours × {args.teams} équipes, {args.tablets} tablettes et "
+          f"{args.pollers} spectateurs par concours (graine {args.seed})")
+    print(f"{'=' * 78}")
+    print(f"  {'':<30}{'SQLite':>14}{'PostgreSQL':>14}{'écart':>12}")
+    print(f"  {'-' * 68}")
+
+    sqlite, postgres = summaries['sqlite'], summaries['postgresql']
+    for key, label, higher_is_better in LABELS:
+        a, b = sqlite.get(key), postgres.get(key)
+        delta = ''
+        if isinstance(a, (int, float)) and isinstance(b, (int, float)) and a:
+            change = (b - a) / a * 100
+            better = change > 0 if higher_is_better else change < 0
+            delta = f"{change:+.0f}%{' ✓' if better and abs(change) >= 5 else ''}"
+        fmt = lambda v: '-' if v is None else str(v)
+        print(f"  {label:<30}{fmt(a):>14}{fmt(b):>14}{delta:>12}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark comparatif SQLite / PostgreSQL')
+    parser.add_argument('--sqlite-url', default='http://localhost:3000', help='Serveur sur SQLite')
+    parser.add_argument('--postgres-url', default='http://localhost:3001', help='Serveur sur PostgreSQL')
+    parser.add_argument('--contests', type=int, default=8, help='Concours simultanés (K)')
+    parser.add_argument('--teams', type=int, default=64, help='Équipes par concours')
+    parser.add_argument('--tablets', type=int, default=4, help='Tablettes de saisie par concours (N)')
+    parser.add_argument('--pollers', type=int, default=10, help='Spectateurs par concours (M)')
+    parser.add_argument('--poll-interval', type=float, default=2.0, help='Secondes entre deux GET d\'un spectateur')
+    parser.add_argument('--think-time', type=float, default=0.05, help='Délai max avant une saisie (secondes)')
+    parser.add_argument('--pool-size', type=int, default=32, help='Connexions HTTP simultanées')
+    parser.add_argument('--seed', type=int, default=42, help='Graine commune aux deux exécutions')
+    parser.add_argument('--output', help='Fichier JSON des résultats des deux moteurs')
+    args = parser.parse_args()
+
+    if args.teams < 4:
+        parser.error('--teams doit être au moins 4')
+
+    urls = {'sqlite': args.sqlite_url, 'postgresql': args.postgres_url}
+    workload = {k: v for k, v in vars(args).items() if k not in ('sqlite_url', 'postgres_url', 'output')}
+    workload['keep'] = False
+
+    results = {}
+    try:
+        for backend in BACKENDS:
+            results[backend] = run_backend(argparse.Namespace(**workload), backend, urls[backend])
+    except (OSError, RuntimeError) as e:
+        print(f'Erreur: {e}', file=sys.stderr)
+        sys.exit(1)
+
+    summaries = {backend: summarize(result) for backend, result in results.items()}
+    print_comparison(args, summaries)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'summary': summaries, 'runs': results}, f, indent=2, ensure_ascii=False)
+        print(f'Résultats écrits dans {args.output}')
+
+
+if __name__ == '__main__':
+    main()
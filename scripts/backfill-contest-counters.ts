@@ -0,0 +1,51 @@
+#!/usr/bin/env npx tsx
+
+/**
+ * Recalcule les compteurs dénormalisés des concours existants
+ * (teamCount, finishedMatchCount, phase), à lancer une fois après `db:push`
+ * sur une base créée avant leur ajout.
+ *
+ * Usage: npx tsx scripts/backfill-contest-counters.ts
+ */
+
+import { PrismaClient } from '@prisma/client';
+import { loadContestState } from '../lib/contest-state';
+import { ContestEngine } from '../lib/engine';
+
+const prisma = new PrismaClient();
+
+async function main() {
+  const contests = await prisma.contest.findMany({
+    select: { id: true, name: true, status: true, _count: { select: { teams: true } } },
+  });
+
+  for (const contest of contests) {
+    let progress = { phase: contest.status === 'FINISHED' ? 'FINISHED' : 'DRAFT', finishedMatchCount: 0 };
+
+    if (contest.status !== 'DRAFT') {
+      const state = await loadContestState(prisma, contest.id);
+      if (state) {
+        const computed = new ContestEngine(state).getProgress();
+        progress = {
+          phase: contest.status === 'FINISHED' ? 'FINISHED' : computed.phase,
+          finishedMatchCount: computed.finishedMatchCount,
+        };
+      }
+    }
+
+    await prisma.contest.update({
+      where: { id: contest.id },
+      data: { teamCount: contest._count.teams, ...progress },
+    });
+    console.log(`✅ ${contest.name}: ${contest._count.teams} équipes, ${progress.finishedMatchCount} matchs joués, ${progress.phase}`);
+  }
+
+  console.log(`\n${contests.length} concours mis à jour`);
+}
+
+main()
+  .catch((error) => {
+    console.error(error);
+    process.exit(1);
+  })
+  .finally(() => prisma.$disconnect());
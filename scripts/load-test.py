@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+"""
+Test de charge de l'API (asyncio, bibliothèque standard uniquement)
+
+Simule K concours joués en même temps:
+- N tablettes de saisie par concours (PATCH des résultats, en parallèle)
+- M spectateurs par concours (GET du concours complet à intervalle régulier)
+
+Les requêtes passent par un pool de connexions HTTP/1.1 persistantes
+(keep-alive): pas de processus curl ni de poignée de main TCP par appel.
+Le rapport donne p50/p95/p99, débit et erreurs par endpoint et peut être
+écrit en JSON pour comparer deux versions.
+
+Usage:
+  python3 load-test.py                                  # 4 concours de 64 équipes
+  python3 load-test.py --contests 8 --teams 128 --tablets 6 --pollers 20
+  python3 load-test.py --output avant.json
+  python3 load-test.py --output apres.json --compare avant.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+# ============================================================
+# CLIENT HTTP (pool de connexions keep-alive)
+# ============================================================
+
+
+class HttpError(Exception):
+    pass
+
+
+class Connection:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    def close(self):
+        self.writer.close()
+
+
+class HttpPool:
+    """Pool borné de connexions HTTP/1.1 réutilisées d'une requête à l'autre"""
+
+    def __init__(self, base_url, size):
+        url = urlsplit(base_url)
+        if url.scheme != 'http':
+            raise ValueError('Seul http:// est supporté')
+        self.host = url.hostname
+        self.port = url.port or 80
+        self.prefix = url.path.rstrip('/')
+        self.idle = []
+        self.slots = asyncio.Semaphore(size)
+        self.opened = 0
+
+    async def _acquire(self):
+        await self.slots.acquire()
+        if self.idle:
+            return self.idle.pop()
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        self.opened += 1
+        return Connection(reader, writer)
+
+    def _release(self, conn, reusable):
+        if reusable:
+            self.idle.append(conn)
+        else:
+            conn.close()
+        self.slots.release()
+
+    async def request(self, method, path, data=None):
+        """Retourne (status, corps JSON décodé ou None)"""
+        body = json.dumps(data).encode() if data is not None else b''
+        head = (
+            f'{method} {self.prefix}{path} HTTP/1.1\r\n'
+            f'Host: {self.host}:{self.port}\r\n'
+            'Connection: keep-alive\r\n'
+            'Accept: application/json\r\n'
+            'Content-Type: application/json\r\n'
+            f'Content-Length: {len(body)}\r\n\r\n'
+        ).encode()
+
+        # Une connexion inactive peut avoir été fermée par le serveur: un nouvel essai
+        for attempt in range(2):
+            conn = await self._acquire()
+            try:
+                conn.writer.write(head + body)
+                await conn.writer.drain()
+                status, keep_alive, payload = await self._read_response(conn.reader)
+            except (ConnectionError, asyncio.IncompleteReadError, HttpError):
+                self._release(conn, False)
+                if attempt == 1:
+                    raise
+                continue
+            self._release(conn, keep_alive)
+            try:
+                return status, json.loads(payload) if payload else None
+            except ValueError:
+                return status, None
+
+    async def _read_response(self, reader):
+        status_line = await reader.readline()
+        if not status_line:
+            raise HttpError('Connexion fermée par le serveur')
+        status = int(status_line.split()[1])
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            payload = b''.join(chunks)
+        else:
+            payload = await reader.readexactly(int(headers.get('content-length', 0)))
+
+        keep_alive = headers.get('connection', '').lower() != 'close'
+        return status, keep_alive, payload
+
+    async def close(self):
+        for conn in self.idle:
+            conn.close()
+        self.idle.clear()
+
+
+# ============================================================
+# MESURES
+# ============================================================
+
+
+def percentile(sorted_values, p):
+    """Percentile par rang le plus proche"""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[int(rank) - 1]
+
+
+class Metrics:
+    def __init__(self):
+        self.latencies = {}
+        self.statuses = {}
+        self.windows = {}
+
+    async def timed(self, pool, endpoint, method, path, data=None):
+        """Exécute une requête et enregistre sa latence sous le nom de l'endpoint"""
+        started = time.perf_counter()
+        try:
+            status, body = await pool.request(method, path, data)
+        except (OSError, asyncio.IncompleteReadError, HttpError):
+            status, body = 'network', None
+        ended = time.perf_counter()
+
+        self.latencies.setdefault(endpoint, []).append((ended - started) * 1000)
+        counts = self.statuses.setdefault(endpoint, {})
+        counts[str(status)] = counts.get(str(status), 0) + 1
+        first, last = self.windows.get(endpoint, (started, ended))
+        self.windows[endpoint] = (min(first, started), max(last, ended))
+        return status, body
+
+    def summary(self):
+        result = {}
+        for endpoint in sorted(self.latencies):
+            values = sorted(self.latencies[endpoint])
+            first, last = self.windows[endpoint]
+            statuses = self.statuses[endpoint]
+            errors = sum(n for s, n in statuses.items() if not s.isdigit() or int(s) >= 400)
+            result[endpoint] = {
+                'count': len(values),
+                'errors': errors,
+                'statuses': dict(sorted(statuses.items())),
+                'throughput_rps': round(len(values) / (last - first), 2) if last > first else None,
+                'mean_ms': round(sum(values) / len(values), 2),
+                'p50_ms': round(percentile(values, 50), 2),
+                'p95_ms': round(percentile(values, 95), 2),
+                'p99_ms': round(percentile(values, 99), 2),
+                'max_ms': round(values[-1], 2),
+            }
+        return result
+
+
+# ============================================================
+# SCÉNARIO
+# ============================================================
+
+
+def is_playable(match):
+    return (
+        match['status'] != 'FINISHED'
+        and not match['isBye']
+        and match['homeTeamId']
+        and match['awayTeamId']
+    )
+
+
+class ContestRun:
+    """Un concours joué par N tablettes qui se partagent les matchs jouables"""
+
+    def __init__(self, args, pool, metrics, rng, index):
+        self.args = args
+        self.pool = pool
+        self.metrics = metrics
+        self.rng = rng
+        self.index = index
+        self.id = None
+        self.version = 0
+        self.matches = {}  # id → (phase, ligne plate de /changes)
+        self.claimed = set()
+        self.in_flight = 0
+        self.sync_lock = asyncio.Lock()
+        self.done = asyncio.Event()
+        self.played = 0
+
+    async def setup(self):
+        contest_data = {
+            'name': f'Charge {self.index + 1} - {self.args.teams} équipes',
+            'teamType': 'DOUBLETTE',
+            'gameMode': 'MONTE',
+        }
+        if self.args.seed is not None:
+            # Graine du concours: même tirage d'une exécution à l'autre
+            contest_data['seed'] = self.args.seed + self.index
+        status, contest = await self.metrics.timed(self.pool, 'POST contest', 'POST', '/api/contests', contest_data)
+        if status != 201 and status != 200:
+            raise RuntimeError(f'Création du concours impossible ({status})')
+        self.id = contest['id']
+
+        def register(n):
+            return self.metrics.timed(self.pool, 'POST team', 'POST', f'/api/contests/{self.id}/teams', {
+                'players': [
+                    {'name': f'Joueur {n}-1', 'order': 1},
+                    {'name': f'Joueur {n}-2', 'order': 2},
+                ],
+            })
+
+        if self.args.seed is not None:
+            # Inscriptions dans l'ordre: l'équipe n reçoit le numéro n
+            for n in range(1, self.args.teams + 1):
+                await register(n)
+        else:
+            await asyncio.gather(*(register(n) for n in range(1, self.args.teams + 1)))
+
+    async def draw(self):
+        status, _ = await self.metrics.timed(self.pool, 'POST draw', 'POST', f'/api/contests/{self.id}/draw')
+        if status != 200:
+            raise RuntimeError(f'Tirage impossible pour le concours {self.id} ({status})')
+
+    async def sync(self):
+        """Récupère les lignes modifiées depuis la dernière synchronisation"""
+        async with self.sync_lock:
+            status, changes = await self.metrics.timed(
+                self.pool, 'GET changes', 'GET', f'/api/contests/{self.id}/changes?since={self.version}'
+            )
+            if status != 200 or changes is None:
+                return
+            for match in changes['qualificationMatches']:
+                self.matches[match['id']] = ('qualification', match)
+            for match in changes['bracketMatches']:
+                self.matches[match['id']] = ('bracket', match)
+            for match_id in changes['deleted']['qualificationMatches']:
+                self.matches.pop(match_id, None)
+            self.version = max(self.version, changes['version'])
+
+    def claim(self):
+        for match_id, (phase, match) in self.matches.items():
+            if match_id not in self.claimed and is_playable(match):
+                self.claimed.add(match_id)
+                return phase, match
+        return None
+
+    async def tablet(self):
+        while not self.done.is_set():
+            work = self.claim()
+            if work is None:
+                if self.in_flight == 0:
+                    await self.sync()
+                    if self.claim_available() or self.in_flight > 0:
+                        continue
+                    # Rien de jouable et aucune saisie en cours: concours terminé
+                    self.done.set()
+                    return
+                await asyncio.sleep(self.args.think_time / 4)
+                await self.sync()
+                continue
+
+            phase, match = work
+            self.in_flight += 1
+            try:
+                await asyncio.sleep(self.rng.uniform(0, self.args.think_time))
+                winner = self.rng.choice([match['homeTeamId'], match['awayTeamId']])
+                path = f'/api/contests/{self.id}/{phase}-matches/{match["id"]}'
+                status, _ = await self.metrics.timed(
+                    self.pool, f'PATCH {phase}-match', 'PATCH', path, {'winnerTeamId': winner}
+                )
+                if status == 200:
+                    self.played += 1
+                else:
+                    # Conflit ou erreur: le match sera rejoué après resynchronisation
+                    self.claimed.discard(match['id'])
+            finally:
+                self.in_flight -= 1
+            await self.sync()
+
+    def claim_available(self):
+        return any(
+            match_id not in self.claimed and is_playable(match)
+            for match_id, (_, match) in self.matches.items()
+        )
+
+    async def spectator(self):
+        # Départs étalés pour ne pas synchroniser tous les spectateurs
+        await asyncio.sleep(self.rng.uniform(0, self.args.poll_interval))
+        while not self.done.is_set():
+            await self.metrics.timed(self.pool, 'GET contest', 'GET', f'/api/contests/{self.id}')
+            try:
+                await asyncio.wait_for(self.done.wait(), self.args.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def play(self):
+        await self.sync()
+        await asyncio.gather(
+            *(self.tablet() for _ in range(self.args.tablets)),
+            *(self.spectator() for _ in range(self.args.pollers)),
+        )
+
+
+async def run(args):
+    rng = random.Random(args.seed)
+    pool = HttpPool(args.base_url, args.pool_size)
+    metrics = Metrics()
+    runs = [ContestRun(args, pool, metrics, rng, i) for i in range(args.contests)]
+    phases = {}
+
+    try:
+        started = time.perf_counter()
+        await asyncio.gather(*(r.setup() for r in runs))
+        phases['setup_s'] = round(time.perf_counter() - started, 3)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(r.draw() for r in runs))
+        phases['draw_s'] = round(time.perf_counter() - started, 3)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(r.play() for r in runs))
+        phases['play_s'] = round(time.perf_counter() - started, 3)
+
+        # Statistiques du stockage côté serveur (attente du verrou d'écriture, conflits)
+        status, database = await pool.request('GET', '/api/db/stats')
+        if status != 200:
+            database = None
+    finally:
+        created = [r.id for r in runs if r.id]
+        if created and not args.keep:
+            # Une seule purge transactionnelle pour tous les concours créés
+            await pool.request('POST', '/api/contests/purge', {'ids': created})
+        await pool.close()
+
+    return {
+        'meta': {
+            'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'baseUrl': args.base_url,
+            'python': platform.python_version(),
+        },
+        'config': {
+            'contests': args.contests,
+            'teams': args.teams,
+            'tablets': args.tablets,
+            'pollers': args.pollers,
+            'pollInterval': args.poll_interval,
+            'thinkTime': args.think_time,
+            'poolSize': args.pool_size,
+            'seed': args.seed,
+        },
+        'phases': phases,
+        'connectionsOpened': pool.opened,
+        'matchesPlayed': sum(r.played for r in runs),
+        'endpoints': metrics.summary(),
+        'database': database,
+    }
+
+
+# ============================================================
+# RAPPORT
+# ============================================================
+
+
+def print_report(result, baseline=None):
+    config = result['config']
+    print(f"\n{'=' * 78}")
+    print(f"  {config['contests']} concours × {config['teams']} équipes, "
+          f"{config['tablets']} tablettes et {config['pollers']} spectateurs par concours")
+    print(f"{'=' * 78}")
+    print(f"  Phases: " + ', '.join(f'{k[:-2]} {v}s' for k, v in result['phases'].items()))
+    print(f"  Matchs joués: {result['matchesPlayed']}  |  connexions ouvertes: {result['connectionsOpened']}\n")
+
+    header = f"  {'Endpoint':<26}{'n':>7}{'err':>6}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}"
+    print(header)
+    print(f"  {'-' * (len(header) - 2)}")
+    for endpoint, stats in result['endpoints'].items():
+        rps = stats['throughput_rps'] if stats['throughput_rps'] is not None else '-'
+        print(f"  {endpoint:<26}{stats['count']:>7}{stats['errors']:>6}{rps:>9}"
+              f"{stats['p50_ms']:>9}{stats['p95_ms']:>9}{stats['p99_ms']:>9}")
+
+    database = result.get('database')
+    if database and 'writeLockWait' in database:
+        wait = database['writeLockWait']
+        print(f"\n  Stockage: WAL {'activé' if database['config']['tuning'] else 'désactivé'}, "
+              f"attente écriture p95 {wait['p95Ms']} ms (max {wait['maxMs']}), "
+              f"{database['retries']} conflits rejoués, {database['checkpoints']['count']} checkpoints")
+
+    if baseline:
+        print(f"\n  Comparaison avec {baseline['meta']['date']} (p95, débit):")
+        for endpoint, stats in result['endpoints'].items():
+            old = baseline['endpoints'].get(endpoint)
+            if not old:
+                continue
+            delta = (stats['p95_ms'] - old['p95_ms']) / old['p95_ms'] * 100 if old['p95_ms'] else 0
+            print(f"  {endpoint:<26}{old['p95_ms']:>9} → {stats['p95_ms']:<9}({delta:+.1f}%)"
+                  f"  {old['throughput_rps']} → {stats['throughput_rps']} req/s")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Test de charge de l\'API de concours')
+    parser.add_argument('--base-url', default='http://localhost:3000')
+    parser.add_argument('--contests', type=int, default=4, help='Concours simultanés (K)')
+    parser.add_argument('--teams', type=int, default=64, help='Équipes par concours')
+    parser.add_argument('--tablets', type=int, default=4, help='Tablettes de saisie par concours (N)')
+    parser.add_argument('--pollers', type=int, default=10, help='Spectateurs par concours (M)')
+    parser.add_argument('--poll-interval', type=float, default=2.0, help='Secondes entre deux GET d\'un spectateur')
+    parser.add_argument('--think-time', type=float, default=0.05, help='Délai max avant une saisie (secondes)')
+    parser.add_argument('--pool-size', type=int, default=32, help='Connexions HTTP simultanées')
+    parser.add_argument('--seed', type=int, default=None, help='Graine des tirages et des choix de vainqueurs')
+    parser.add_argument('--output', help='Fichier JSON des résultats')
+    parser.add_argument('--compare', help='Résultats JSON d\'une exécution précédente')
+    parser.add_argument('--keep', action='store_true', help='Ne pas supprimer les concours créés')
+    args = parser.parse_args()
+
+    if args.teams < 4:
+        parser.error('--teams doit être au moins 4')
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    try:
+        result = asyncio.run(run(args))
+    except (OSError, RuntimeError) as e:
+        print(f'Erreur: {e}', file=sys.stderr)
+        sys.exit(1)
+
+    print_report(result, baseline)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print(f'Résultats écrits dans {args.output}')
+
+
+if __name__ == '__main__':
+    main()
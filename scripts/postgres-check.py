@@ -0,0 +1,625 @@
+#!/usr/bin/env python3
+"""
+Vérification du port PostgreSQL et mesure SQLite / PostgreSQL au niveau SQL
+
+Contrôles, contre une base PostgreSQL dont le schéma est poussé
+(npm run db:push:pg):
+- verrou de ligne du concours (lockContestRow): une deuxième écriture du même
+  concours attend la première, celle d'un autre concours passe aussitôt
+- match de bracket créé deux fois en même temps: la seconde transaction attend
+  puis échoue en 23505 (P2002 côté Prisma, rejoué par commitEngineChanges)
+- VACUUM de la purge (--compact): accepté hors transaction
+- sous charge: ni impasse (40P01) ni échec de sérialisation (40001), les deux
+  codes que Prisma remonte en P2034
+
+Mesure: les transactions de commitEngineChanges pour un résultat (verrou du
+concours, lecture de l'état, mise à jour conditionnelle du match, version et
+compteurs du concours, journal) jouées par N écrivains sur K concours, pendant
+que M lecteurs par concours relisent l'état (GET du concours), contre
+PostgreSQL et contre un fichier SQLite (schéma poussé par npm run db:push)
+configuré comme lib/sqlite.ts: WAL, une connexion d'écriture, connexions de
+lecture séparées. Avec --sqlite-baseline, le même fichier est aussi mesuré
+comme avec DB_TUNING=off (client Prisma par défaut): journal DELETE,
+synchronous FULL, busy_timeout de 5 s, transactions BEGIN différées et un seul
+pool de connexions partagé par les lectures et les écritures. Sans le serveur
+Next ni Prisma: écart de moteur seul, à compléter par backend-bench.py et
+load-test.py (requêtes HTTP de bout en bout).
+
+Les concours de mesure (nom « postgres-check ») sont supprimés à la fin.
+
+Usage:
+  python3 postgres-check.py --postgres postgresql://postgres@localhost/concours --sqlite prisma/dev.db
+  python3 postgres-check.py ... --contests 16 --teams 64 --writers 4 --readers 4 --duration 20 --output pg.json
+  python3 postgres-check.py --sqlite prisma/dev.db --sqlite-baseline --output sqlite-avant-apres.json
+
+Dépendance: psycopg2 (pip install psycopg2-binary), seulement avec --postgres
+"""
+
+import argparse
+import json
+import os
+import queue
+import random
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from contextlib import nullcontext
+
+# Importé par PostgresBackend: la mesure SQLite seule n'a pas besoin du pilote
+psycopg2 = None
+
+CONTEST_NAME = 'postgres-check'
+
+
+def percentile(sorted_values, p):
+    """Percentile par rang le plus proche"""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[int(rank) - 1]
+
+
+# ============================================================
+# ACCÈS AUX DEUX MOTEURS
+# ============================================================
+
+
+class Backend:
+    """Connexions d'un moteur: écriture et lecture, paramètres en %s"""
+
+    name = None
+    errors = (sqlite3.Error,)
+
+    def connect(self):
+        raise NotImplementedError
+
+    def writer(self):
+        """Connexion d'écriture et verrou à prendre autour de la transaction"""
+        raise NotImplementedError
+
+    def lock_contest(self, cur, contest_id):
+        pass
+
+
+class PostgresBackend(Backend):
+    name = 'postgresql'
+
+    def __init__(self, dsn):
+        global psycopg2
+        try:
+            import psycopg2
+            import psycopg2.errorcodes
+        except ImportError:
+            print('--postgres nécessite psycopg2: pip install psycopg2-binary', file=sys.stderr)
+            sys.exit(1)
+        self.dsn = dsn
+        self.errors = (psycopg2.Error,)
+        # Codes que commitEngineChanges rejoue (P2034, P2002)
+        self.retryable = {
+            psycopg2.errorcodes.SERIALIZATION_FAILURE,
+            psycopg2.errorcodes.DEADLOCK_DETECTED,
+            psycopg2.errorcodes.UNIQUE_VIOLATION,
+        }
+
+    def connect(self):
+        return psycopg2.connect(self.dsn)
+
+    def writer(self):
+        # Pool Prisma: une connexion par transaction en cours
+        return self.connect(), None
+
+    def lock_contest(self, cur, contest_id):
+        cur.execute('SELECT id FROM "Contest" WHERE id = %s FOR UPDATE', (contest_id,))
+
+
+class SqliteCursor:
+    """Curseur sqlite3 avec des paramètres en %s, comme psycopg2"""
+
+    def __init__(self, conn):
+        self.cur = conn.cursor()
+
+    def execute(self, sql, params=()):
+        self.cur.execute(sql.replace('%s', '?'), params)
+
+    def fetchall(self):
+        return self.cur.fetchall()
+
+    def fetchone(self):
+        return self.cur.fetchone()
+
+    @property
+    def rowcount(self):
+        return self.cur.rowcount
+
+
+class SqliteConnection:
+    def __init__(self, path, pragmas, begin_sql='BEGIN IMMEDIATE'):
+        self.conn = sqlite3.connect(path, timeout=10, isolation_level=None, check_same_thread=False)
+        self.begin_sql = begin_sql
+        for pragma in pragmas:
+            self.conn.execute(pragma)
+
+    def cursor(self):
+        return SqliteCursor(self.conn)
+
+    def begin(self):
+        self.conn.execute(self.begin_sql)
+
+    def commit(self):
+        self.conn.execute('COMMIT')
+
+    def rollback(self):
+        if self.conn.in_transaction:
+            self.conn.execute('ROLLBACK')
+
+    def close(self):
+        self.conn.close()
+
+
+class PooledConnection:
+    """Connexion empruntée au pool le temps d'une transaction ou d'une lecture"""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.conn = None
+
+    def acquire(self):
+        if self.conn is None:
+            self.conn = self.pool.get()
+        return self.conn
+
+    def release(self):
+        if self.conn is not None:
+            self.pool.put(self.conn)
+            self.conn = None
+
+    def cursor(self):
+        return self.acquire().cursor()
+
+    def begin(self):
+        self.acquire().begin()
+
+    def commit(self):
+        self.conn.commit()
+        self.release()
+
+    def rollback(self):
+        if self.conn is not None:
+            self.conn.rollback()
+            self.release()
+
+    def close(self):
+        self.rollback()
+
+
+class SqliteBaselineBackend(Backend):
+    """SQLite sans réglages (DB_TUNING=off): client Prisma unique, pool par défaut"""
+
+    name = 'sqlite-off'
+
+    def __init__(self, path):
+        pragmas = ['PRAGMA journal_mode = DELETE', 'PRAGMA busy_timeout = 5000',
+                   'PRAGMA synchronous = FULL', 'PRAGMA foreign_keys = ON']
+        # connection_limit par défaut de Prisma: 2 × processeurs + 1
+        self.pool = queue.Queue()
+        for _ in range(2 * (os.cpu_count() or 1) + 1):
+            self.pool.put(SqliteConnection(path, pragmas, begin_sql='BEGIN'))
+
+    def connect(self):
+        return PooledConnection(self.pool)
+
+    def writer(self):
+        return self.connect(), None
+
+    def close(self):
+        while not self.pool.empty():
+            self.pool.get().close()
+
+
+class SqliteBackend(Backend):
+    name = 'sqlite'
+
+    def __init__(self, path):
+        self.path = path
+        self.pragmas = ['PRAGMA journal_mode = WAL', 'PRAGMA busy_timeout = 10000',
+                        'PRAGMA synchronous = NORMAL', 'PRAGMA foreign_keys = ON']
+        self.shared = None
+        self.shared_lock = threading.Lock()
+
+    def connect(self):
+        return SqliteConnection(self.path, self.pragmas)
+
+    def writer(self):
+        # Client d'écriture à connexion unique (lib/db.ts): les transactions s'attendent
+        if self.shared is None:
+            self.shared = self.connect()
+        return self.shared, self.shared_lock
+
+
+def begin(conn):
+    if isinstance(conn, (SqliteConnection, PooledConnection)):
+        conn.begin()
+
+
+# ============================================================
+# DONNÉES DE MESURE
+# ============================================================
+
+
+def create_contest(backend, conn, teams):
+    """Concours tiré: équipes, Tour 1 et Tour 2, Tour 1 avec ses équipes"""
+    contest_id = str(uuid.uuid4())
+    cur = conn.cursor()
+    begin(conn)
+    cur.execute(
+        'INSERT INTO "Contest" (id, name, "teamType", status, phase, "teamCount", "updatedAt") '
+        "VALUES (%s, %s, 'DOUBLETTE', 'IN_PROGRESS', 'QUALIFICATION_ROUND_1', %s, CURRENT_TIMESTAMP)",
+        (contest_id, CONTEST_NAME, teams),
+    )
+    team_ids = [str(uuid.uuid4()) for _ in range(teams)]
+    for number, team_id in enumerate(team_ids, 1):
+        cur.execute('INSERT INTO "Team" (id, "contestId", "teamNumber") VALUES (%s, %s, %s)',
+                    (team_id, contest_id, number))
+    rounds = {}
+    for round_number in (1, 2):
+        rounds[round_number] = str(uuid.uuid4())
+        cur.execute('INSERT INTO "QualificationRound" (id, "contestId", "roundNumber") VALUES (%s, %s, %s)',
+                    (rounds[round_number], contest_id, round_number))
+    matches = []
+    for number in range(teams // 2):
+        match_id = str(uuid.uuid4())
+        home, away = team_ids[2 * number], team_ids[2 * number + 1]
+        cur.execute(
+            'INSERT INTO "QualificationMatch" (id, "roundId", "matchNumber", "homeTeamId", "awayTeamId", "updatedAt") '
+            'VALUES (%s, %s, %s, %s, %s, CURRENT_TIMESTAMP)',
+            (match_id, rounds[1], number + 1, home, away),
+        )
+        matches.append((match_id, home, away))
+    conn.commit()
+    return contest_id, matches
+
+
+def delete_contests(conn):
+    cur = conn.cursor()
+    begin(conn)
+    cur.execute('DELETE FROM "Contest" WHERE name = %s', (CONTEST_NAME,))
+    conn.commit()
+
+
+def load_state(cur, contest_id):
+    """Lectures de loadContestState (concours, équipes, matchs par tour)"""
+    cur.execute('SELECT id, seed, version FROM "Contest" WHERE id = %s', (contest_id,))
+    cur.fetchone()
+    cur.execute('SELECT id, status, version FROM "Team" WHERE "contestId" = %s', (contest_id,))
+    cur.fetchall()
+    cur.execute(
+        'SELECT m.id, m."homeTeamId", m."awayTeamId", m."winnerTeamId", m.status, m."isBye", m.version, r."roundNumber" '
+        'FROM "QualificationMatch" m JOIN "QualificationRound" r ON m."roundId" = r.id '
+        'WHERE r."contestId" = %s',
+        (contest_id,),
+    )
+    return {row[0]: row for row in cur.fetchall()}
+
+
+def record_result(backend, conn, contest_id, match):
+    """Transaction d'une saisie (commitEngineChanges): retourne la version écrite"""
+    match_id, home, away = match
+    cur = conn.cursor()
+    begin(conn)
+    backend.lock_contest(cur, contest_id)
+    state = load_state(cur, contest_id)
+    expected = state[match_id][6]
+
+    cur.execute(
+        'UPDATE "Contest" SET version = version + 1, "finishedMatchCount" = "finishedMatchCount" + 1, '
+        '"updatedAt" = CURRENT_TIMESTAMP WHERE id = %s RETURNING version',
+        (contest_id,),
+    )
+    version = cur.fetchone()[0]
+    cur.execute(
+        'UPDATE "QualificationMatch" SET "winnerTeamId" = %s, "loserTeamId" = %s, status = \'FINISHED\', '
+        'version = %s, "updatedAt" = CURRENT_TIMESTAMP WHERE id = %s AND version = %s',
+        (home, away, version, match_id, expected),
+    )
+    if cur.rowcount == 0:
+        raise RuntimeError(f'Conflit d\'écriture sur {match_id} malgré le verrou du concours')
+    cur.execute(
+        'INSERT INTO "ResultEvent" ("contestId", version, type, entity, "entityId", changes) '
+        "VALUES (%s, %s, 'RESULT', 'QUALIFICATION_MATCH', %s, %s)",
+        (contest_id, version, match_id, json.dumps({'winnerTeamId': home, 'status': 'FINISHED'})),
+    )
+    cur.execute('UPDATE "Contest" SET "eventCount" = "eventCount" + 1 WHERE id = %s', (contest_id,))
+    conn.commit()
+    return version
+
+
+# ============================================================
+# CONTRÔLES POSTGRESQL
+# ============================================================
+
+
+def check_row_lock(backend, contests):
+    """Même concours: attend le premier écrivain; autre concours: pas d'attente"""
+    holder = backend.connect()
+    cur = holder.cursor()
+    backend.lock_contest(cur, contests[0])
+
+    waits = {}
+
+    def lock(name, contest_id):
+        conn = backend.connect()
+        started = time.perf_counter()
+        backend.lock_contest(conn.cursor(), contest_id)
+        waits[name] = (time.perf_counter() - started) * 1000
+        conn.rollback()
+        conn.close()
+
+    hold_ms = 300
+    threads = [threading.Thread(target=lock, args=('same', contests[0])),
+               threading.Thread(target=lock, args=('other', contests[1]))]
+    for t in threads:
+        t.start()
+    time.sleep(hold_ms / 1000)
+    holder.commit()
+    holder.close()
+    for t in threads:
+        t.join()
+    return {
+        'hold_ms': hold_ms,
+        'same_contest_wait_ms': round(waits['same'], 1),
+        'other_contest_wait_ms': round(waits['other'], 1),
+        'ok': waits['same'] >= hold_ms * 0.8 and waits['other'] < hold_ms / 3,
+    }
+
+
+def check_unique_violation(backend, contest_id):
+    """Deux écritures créent la même position de bracket: 23505 pour la seconde"""
+    setup = backend.connect()
+    cur = setup.cursor()
+    bracket_id, round_id = str(uuid.uuid4()), str(uuid.uuid4())
+    cur.execute('INSERT INTO "Bracket" (id, "contestId", type, size) VALUES (%s, %s, \'A\', 8)', (bracket_id, contest_id))
+    cur.execute('INSERT INTO "BracketRound" (id, "bracketId", "roundNumber", "roundName") VALUES (%s, %s, 2, \'Demi-finales\')',
+                (round_id, bracket_id))
+    setup.commit()
+
+    def insert(conn):
+        conn.cursor().execute(
+            'INSERT INTO "BracketMatch" (id, "roundId", "matchNumber", "updatedAt") VALUES (%s, %s, 1, CURRENT_TIMESTAMP)',
+            (str(uuid.uuid4()), round_id),
+        )
+
+    first, second = backend.connect(), backend.connect()
+    insert(first)
+    outcome = {}
+
+    def concurrent():
+        started = time.perf_counter()
+        try:
+            insert(second)
+            outcome['code'] = None
+        except psycopg2.Error as e:
+            outcome['code'] = e.pgcode
+        outcome['wait_ms'] = (time.perf_counter() - started) * 1000
+        second.rollback()
+
+    thread = threading.Thread(target=concurrent)
+    thread.start()
+    time.sleep(0.2)
+    first.commit()
+    thread.join()
+    first.close()
+    second.close()
+    setup.close()
+    return {
+        'sqlstate': outcome['code'],
+        'waited_ms': round(outcome['wait_ms'], 1),
+        'ok': outcome['code'] == psycopg2.errorcodes.UNIQUE_VIOLATION,
+    }
+
+
+def check_vacuum(backend):
+    """VACUUM hors transaction (purge), refusé dans une transaction (25001)"""
+    conn = backend.connect()
+    conn.autocommit = True
+    started = time.perf_counter()
+    conn.cursor().execute('VACUUM')
+    duration = (time.perf_counter() - started) * 1000
+    conn.autocommit = False
+    try:
+        conn.cursor().execute('VACUUM')
+        in_transaction = None
+    except psycopg2.Error as e:
+        in_transaction = e.pgcode
+    conn.rollback()
+    conn.close()
+    return {
+        'duration_ms': round(duration, 1),
+        'in_transaction_sqlstate': in_transaction,
+        'ok': in_transaction == psycopg2.errorcodes.ACTIVE_SQL_TRANSACTION,
+    }
+
+
+# ============================================================
+# MESURE
+# ============================================================
+
+
+def run_load(backend, args):
+    setup = backend.connect()
+    contests = [create_contest(backend, setup, args.teams) for _ in range(args.contests)]
+
+    writes, reads, errors = [], [], {}
+    record = threading.Lock()
+    deadline = time.perf_counter() + args.duration
+
+    def writer(contest_id, matches, seed):
+        rng = random.Random(seed)
+        conn, serial = backend.writer()
+        while time.perf_counter() < deadline:
+            match = rng.choice(matches)
+            started = time.perf_counter()
+            try:
+                with serial or nullcontext():
+                    try:
+                        record_result(backend, conn, contest_id, match)
+                    except Exception:
+                        conn.rollback()
+                        raise
+            except backend.errors as e:
+                code = getattr(e, 'pgcode', None) or type(e).__name__
+                with record:
+                    errors[code] = errors.get(code, 0) + 1
+                continue
+            with record:
+                writes.append((time.perf_counter() - started) * 1000)
+            time.sleep(rng.random() * args.think_time)
+        if serial is None:
+            conn.close()
+
+    def reader(contest_id, seed):
+        rng = random.Random(seed)
+        conn = backend.connect()
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            load_state(conn.cursor(), contest_id)
+            conn.rollback()
+            with record:
+                reads.append((time.perf_counter() - started) * 1000)
+            time.sleep(rng.random() * args.poll_interval)
+        conn.close()
+
+    threads = []
+    for index, (contest_id, matches) in enumerate(contests):
+        threads += [threading.Thread(target=writer, args=(contest_id, matches, args.seed + 100 * index + w))
+                    for w in range(args.writers)]
+        threads += [threading.Thread(target=reader, args=(contest_id, args.seed + 100 * index + 50 + r))
+                    for r in range(args.readers)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    delete_contests(setup)
+    setup.close()
+
+    writes.sort()
+    reads.sort()
+    summary = {'writes_per_s': round(len(writes) / elapsed, 1), 'writes': len(writes), 'errors': errors}
+    for label, values in (('patch', writes), ('get', reads)):
+        for p in (50, 95, 99):
+            value = percentile(values, p)
+            summary[f'{label}_p{p}_ms'] = None if value is None else round(value, 2)
+    return summary
+
+
+LABELS = [
+    ('writes_per_s', 'Saisies / s'),
+    ('patch_p50_ms', 'Saisie p50 (ms)'),
+    ('patch_p95_ms', 'Saisie p95 (ms)'),
+    ('patch_p99_ms', 'Saisie p99 (ms)'),
+    ('get_p50_ms', 'GET concours p50 (ms)'),
+    ('get_p95_ms', 'GET concours p95 (ms)'),
+    ('get_p99_ms', 'GET concours p99 (ms)'),
+]
+
+
+def print_report(args, checks, results):
+    if checks:
+        print(f"\n{'=' * 70}")
+        print('  Contrôles PostgreSQL')
+        print(f"{'=' * 70}")
+        for name, check in checks.items():
+            details = ', '.join(f'{k}={v}' for k, v in check.items() if k != 'ok')
+            print(f"  {'OK ' if check['ok'] else 'ÉCHEC'} {name:<18} {details}")
+
+    print(f"\n{'=' * 70}")
+    print(f"  {args.contests} concours × {args.teams} équipes, {args.writers} écrivains et "
+          f"{args.readers} lecteurs par concours, {args.duration:g} s")
+    print(f"{'=' * 70}")
+    names = list(results)
+    print(f"  {'':<26}" + ''.join(f'{n:>14}' for n in names))
+    print(f"  {'-' * (26 + 14 * len(names))}")
+    for key, label in LABELS:
+        print(f"  {label:<26}" + ''.join(f"{str(results[n].get(key, '-')):>14}" for n in names))
+    print(f"  {'Erreurs':<26}" + ''.join(f"{json.dumps(results[n]['errors']):>14}" for n in names))
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Vérification PostgreSQL et mesure SQLite / PostgreSQL au niveau SQL')
+    parser.add_argument('--postgres', help='DSN PostgreSQL (schéma poussé par npm run db:push:pg); omis: SQLite seul')
+    parser.add_argument('--sqlite', help='Fichier SQLite (schéma poussé par npm run db:push); omis: PostgreSQL seul')
+    parser.add_argument('--sqlite-baseline', action='store_true',
+                        help='Mesurer aussi le fichier SQLite sans réglages (DB_TUNING=off), avant la version réglée')
+    parser.add_argument('--contests', type=int, default=8, help='Concours simultanés (K)')
+    parser.add_argument('--teams', type=int, default=64, help='Équipes par concours')
+    parser.add_argument('--writers', type=int, default=4, help='Écrivains par concours (N)')
+    parser.add_argument('--readers', type=int, default=4, help='Lecteurs par concours (M)')
+    parser.add_argument('--duration', type=float, default=10.0, help='Durée de chaque mesure (secondes)')
+    parser.add_argument('--think-time', type=float, default=0.01, help='Délai max entre deux saisies (secondes)')
+    parser.add_argument('--poll-interval', type=float, default=0.05, help='Délai max entre deux lectures (secondes)')
+    parser.add_argument('--seed', type=int, default=42, help='Graine des choix de matchs')
+    parser.add_argument('--output', help='Fichier JSON des résultats')
+    args = parser.parse_args()
+
+    if args.contests < 2 or args.teams < 4:
+        parser.error('--contests doit être au moins 2 et --teams au moins 4')
+    if not args.postgres and not args.sqlite:
+        parser.error('--postgres ou --sqlite est requis')
+    if args.sqlite_baseline and not args.sqlite:
+        parser.error('--sqlite-baseline nécessite --sqlite')
+
+    postgres = PostgresBackend(args.postgres) if args.postgres else None
+    db_errors = (sqlite3.Error, *(postgres.errors if postgres else ()))
+
+    checks, results = {}, {}
+    try:
+        # Sans réglages d'abord: le mode WAL de la version réglée reste dans le fichier
+        if args.sqlite_baseline:
+            baseline = SqliteBaselineBackend(args.sqlite)
+            results[baseline.name] = run_load(baseline, args)
+            baseline.close()
+        if args.sqlite:
+            results['sqlite'] = run_load(SqliteBackend(args.sqlite), args)
+
+        if postgres:
+            conn = postgres.connect()
+            contests = [create_contest(postgres, conn, 4)[0] for _ in range(2)]
+            checks = {
+                'verrou du concours': check_row_lock(postgres, contests),
+                'unicité (P2002)': check_unique_violation(postgres, contests[0]),
+                'VACUUM': check_vacuum(postgres),
+            }
+            delete_contests(conn)
+            conn.close()
+            results[postgres.name] = run_load(postgres, args)
+    except db_errors as e:
+        print(f'Erreur: {e}', file=sys.stderr)
+        sys.exit(1)
+
+    # Impasses et échecs de sérialisation (P2034): aucun attendu avec le verrou du concours
+    if postgres:
+        pg_errors = results[postgres.name]['errors']
+        checks['sans impasse (P2034)'] = {
+            'deadlocks': pg_errors.get(psycopg2.errorcodes.DEADLOCK_DETECTED, 0),
+            'serialization': pg_errors.get(psycopg2.errorcodes.SERIALIZATION_FAILURE, 0),
+            'ok': not any(code in postgres.retryable for code in pg_errors),
+        }
+
+    print_report(args, checks, results)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'workload': {k: v for k, v in vars(args).items() if k not in ('postgres', 'output')},
+                       'checks': checks, 'results': results}, f, indent=2, ensure_ascii=False)
+        print(f'Résultats écrits dans {args.output}')
+
+    sys.exit(0 if all(check['ok'] for check in checks.values()) else 1)
+
+
+if __name__ == '__main__':
+    main()
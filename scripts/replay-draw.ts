@@ -0,0 +1,113 @@
+#!/usr/bin/env npx tsx
+
+/**
+ * Rejoue le tirage d'un concours à partir de sa graine et le compare au
+ * tirage enregistré (équipes mélée formées et matchs du Tour 1), par
+ * exemple pour le montrer au comité d'organisation en cas de contestation.
+ *
+ * Usage: npx tsx scripts/replay-draw.ts <contestId>
+ */
+
+import { PrismaClient } from '@prisma/client';
+import { planSeededDraw } from '../lib/draw';
+
+const prisma = new PrismaClient();
+
+type Pairing = { matchNumber: number; home: number | null; away: number | null };
+
+function formatPairing(p: Pairing): string {
+  return `Match ${p.matchNumber}: ${p.home ?? '-'} vs ${p.away ?? 'exempt'}`;
+}
+
+async function main() {
+  const contestId = process.argv[2];
+  if (!contestId) {
+    console.error('Usage: npx tsx scripts/replay-draw.ts <contestId>');
+    process.exit(1);
+  }
+
+  const contest = await prisma.contest.findUnique({
+    where: { id: contestId },
+    include: {
+      teams: { orderBy: { teamNumber: 'asc' }, include: { players: { orderBy: { order: 'asc' } } } },
+      players: { orderBy: [{ createdAt: 'asc' }, { id: 'asc' }] },
+      qualificationRounds: {
+        where: { roundNumber: 1 },
+        include: { matches: { orderBy: { matchNumber: 'asc' } } },
+      },
+    },
+  });
+
+  if (!contest) {
+    throw new Error(`Concours ${contestId} introuvable`);
+  }
+  if (contest.seed === null) {
+    throw new Error('Ce concours n\'a pas de graine: son tirage n\'est pas reproductible');
+  }
+  const round1 = contest.qualificationRounds[0];
+  if (!round1) {
+    throw new Error('Le tirage de ce concours n\'a pas encore eu lieu');
+  }
+
+  // Équipes du tirage: celles qui apparaissent au Tour 1, par numéro
+  const drawnTeamIds = new Set(round1.matches.flatMap(m => [m.homeTeamId, m.awayTeamId]));
+  const drawnTeams = contest.teams.filter(t => drawnTeamIds.has(t.id));
+  const numberById = new Map(contest.teams.map(t => [t.id, t.teamNumber]));
+
+  const replay = planSeededDraw(
+    { ...contest, seed: contest.seed, teams: drawnTeams, meleePlayers: contest.players },
+    0
+  );
+  if (!replay.plan) {
+    throw new Error('Pas assez d\'équipes pour rejouer le tirage');
+  }
+  const replayNumberById = new Map(replay.teams.map(t => [t.id, t.teamNumber]));
+
+  console.log(`🎲 ${contest.name} (graine ${contest.seed})\n`);
+  let differences = 0;
+
+  if (replay.meleeTeams) {
+    for (const team of replay.teams) {
+      const expected = team.name;
+      const actual = contest.teams.find(t => t.teamNumber === team.teamNumber)?.name ?? null;
+      if (expected !== actual) {
+        differences++;
+        console.log(`❌ Équipe ${team.teamNumber}: rejouée "${expected}", enregistrée "${actual}"`);
+      }
+    }
+  }
+
+  const expectedPairings: Pairing[] = replay.plan.qualificationMatches
+    .filter(m => m.roundId === replay.plan!.qualificationRounds[0].id)
+    .map(m => ({
+      matchNumber: m.matchNumber,
+      home: m.homeTeamId ? replayNumberById.get(m.homeTeamId) ?? null : null,
+      away: m.awayTeamId ? replayNumberById.get(m.awayTeamId) ?? null : null,
+    }));
+  const actualPairings: Pairing[] = round1.matches.map(m => ({
+    matchNumber: m.matchNumber,
+    home: m.homeTeamId ? numberById.get(m.homeTeamId) ?? null : null,
+    away: m.awayTeamId ? numberById.get(m.awayTeamId) ?? null : null,
+  }));
+
+  for (const expected of expectedPairings) {
+    const actual = actualPairings.find(p => p.matchNumber === expected.matchNumber);
+    const same = actual && actual.home === expected.home && actual.away === expected.away;
+    if (!same) differences++;
+    console.log(`${same ? '✅' : '❌'} ${formatPairing(expected)}${same || !actual ? '' : ` (enregistré: ${formatPairing(actual)})`}`);
+  }
+
+  console.log(
+    differences === 0
+      ? '\n✅ Le tirage enregistré est celui de la graine'
+      : `\n❌ ${differences} différence(s) avec le tirage rejoué`
+  );
+  process.exitCode = differences === 0 ? 0 : 2;
+}
+
+main()
+  .catch((error) => {
+    console.error(error);
+    process.exit(1);
+  })
+  .finally(() => prisma.$disconnect());
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Simulateur Monte-Carlo de concours (NumPy, vectorisé)
+
+Reprend les règles de lib/algorithms.ts et lib/draw.ts, sans passer par l'API:
+- Tour 1: tirage aléatoire, une exemption si le nombre d'équipes est impair
+- Tour 2: gagnants contre gagnants (WINNERS), perdants contre perdants
+  (LOSERS), une exemption par groupe impair; règle anti-double exemption de
+  generateGroupMatches (l'exempté du Tour 1 ne peut pas l'être au Tour 2)
+- Qualification (qualifyTeamsAfterRound2): 2 victoires → A, 1 → B, 0 →
+  éliminé; une exemption compte comme une victoire
+- Tableaux A et B: taille puissance de 2, les derniers matchs du 1er tour
+  sont des exemptions (bracketShape), progression positionnelle
+
+Chaque lot de concours est simulé d'un bloc (une ligne de tableau NumPy par
+concours). Les tailles des tableaux et leurs exemptions ne dépendent que du
+nombre d'équipes (le simulateur le vérifie à chaque lot et les compare aux
+estimations du tirage); ce qui varie d'un concours à l'autre, ce sont les
+exemptions et les matchs de chaque équipe, donnés en distribution.
+
+Usage:
+  python3 simulate-tournaments.py                                  # 3 à 1000 équipes, 10 000 concours
+  python3 simulate-tournaments.py --teams 3-128 --runs 1000000
+  python3 simulate-tournaments.py --teams 24,48,96 --strength-sd 1.0
+  python3 simulate-tournaments.py --teams 3-1000 --output tables.json --csv tables.csv
+
+Dépendance: numpy (pip install numpy)
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from datetime import datetime, timezone
+
+try:
+    import numpy as np
+except ImportError:
+    print('Ce script nécessite numpy: pip install numpy', file=sys.stderr)
+    sys.exit(1)
+
+# Cellules par tableau d'un lot (concours × équipes): borne la mémoire
+BATCH_CELLS = 4_000_000
+MAX_BYES = 4
+
+
+# ============================================================
+# RÈGLES (TAILLES ATTENDUES)
+# ============================================================
+
+
+def next_power_of_two(n):
+    power = 1
+    while power < n:
+        power *= 2
+    return power
+
+
+def expected_sizes(n):
+    """Tailles prévues par le tirage (lib/draw.ts: estimatedQualifiedA/B)"""
+    winners = n // 2 + n % 2
+    losers = n // 2
+    a = -(-winners // 2)
+    b = (winners - a) + -(-losers // 2)
+    return a, b, n - a - b
+
+
+def bracket_shape(size):
+    """(taille du tableau, exemptions du 1er tour, nombre de tours)"""
+    if size <= 2:
+        return size, 1 if size == 1 else 0, 1 if size else 0
+    power = next_power_of_two(size)
+    return power, power - size, power.bit_length() - 1
+
+
+# ============================================================
+# SIMULATION D'UN LOT
+# ============================================================
+
+
+class Batch:
+    """Un lot de `runs` concours de `n` équipes, simulés ensemble"""
+
+    def __init__(self, rng, runs, n, strength_sd, anti_double):
+        self.rng = rng
+        self.runs = runs
+        self.n = n
+        self.anti_double = anti_double
+        self.rows = np.arange(runs)[:, None]
+        self.wins = np.zeros((runs, n), dtype=np.int8)
+        self.played = np.zeros((runs, n), dtype=np.int16)
+        self.qualification_byes = np.zeros((runs, n), dtype=np.int8)
+        self.bracket_byes = np.zeros((runs, n), dtype=np.int8)
+        self.strength = rng.normal(0.0, strength_sd, (runs, n)) if strength_sd > 0 else None
+
+    def play(self, home, away):
+        """Joue les matchs home[i, j] contre away[i, j], retourne les vainqueurs"""
+        self.played[self.rows, home] += 1
+        self.played[self.rows, away] += 1
+        if self.strength is None:
+            home_wins = self.rng.random(home.shape) < 0.5
+        else:
+            gap = np.take_along_axis(self.strength, home, 1) - np.take_along_axis(self.strength, away, 1)
+            home_wins = self.rng.random(home.shape) < 1.0 / (1.0 + np.exp(-gap))
+        return np.where(home_wins, home, away), np.where(home_wins, away, home)
+
+    def bye(self, teams, counter):
+        counter[self.rows[:, 0], teams] += 1
+
+    def round1(self):
+        """Tour 1: retourne (gagnants avec l'exempté en dernière colonne, perdants, exempté)"""
+        order = self.rng.permuted(np.broadcast_to(np.arange(self.n), (self.runs, self.n)), axis=1)
+        pairs = self.n // 2
+        winners, losers = self.play(order[:, 0:2 * pairs:2], order[:, 1:2 * pairs:2])
+        self.wins[self.rows, winners] += 1
+
+        exempted = None
+        if self.n % 2:
+            exempted = order[:, -1]
+            self.wins[self.rows[:, 0], exempted] += 1
+            self.bye(exempted, self.qualification_byes)
+            winners = np.concatenate([winners, exempted[:, None]], axis=1)
+        return winners, losers, exempted
+
+    def round2_group(self, group, exempted_in_round1=None):
+        """Tour 2 d'un groupe (generateGroupMatches): une exemption si impair"""
+        size = group.shape[1]
+        if size == 0:
+            return
+        order = self.rng.permuted(group, axis=1)
+
+        if size % 2:
+            if exempted_in_round1 is not None and self.anti_double and size > 1:
+                # L'exempté du Tour 1 tiré pour l'exemption: échangé avec une autre équipe au hasard
+                clash = np.nonzero(order[:, -1] == exempted_in_round1)[0]
+                swap = self.rng.integers(0, size - 1, clash.size)
+                order[clash, -1], order[clash, swap] = order[clash, swap], order[clash, -1]
+            exempt = order[:, -1]
+            self.wins[self.rows[:, 0], exempt] += 1
+            self.bye(exempt, self.qualification_byes)
+            order = order[:, :-1]
+
+        if order.shape[1]:
+            winners, _ = self.play(order[:, 0::2], order[:, 1::2])
+            self.wins[self.rows, winners] += 1
+
+    def qualified(self, wins):
+        """Équipes ayant `wins` victoires, une ligne par concours (même nombre partout)"""
+        mask = self.wins == wins
+        counts = mask.sum(axis=1)
+        if counts.size and not (counts == counts[0]).all():
+            raise AssertionError(f'{self.n} équipes: effectif variable pour {wins} victoire(s)')
+        return np.nonzero(mask)[1].reshape(self.runs, int(counts[0]) if counts.size else 0)
+
+    def bracket(self, teams):
+        """Tableau à élimination directe (bracketShape), retourne le vainqueur"""
+        size = teams.shape[1]
+        if size == 0:
+            return None
+        if size == 1:
+            self.bye(teams[:, 0], self.bracket_byes)
+            return teams[:, 0]
+
+        power, byes, _ = bracket_shape(size)
+        order = self.rng.permuted(teams, axis=1)
+        real = power // 2 - byes
+        current, _ = self.play(order[:, 0:2 * real:2], order[:, 1:2 * real:2])
+        if byes:
+            exempted = order[:, 2 * real:]
+            self.bracket_byes[self.rows, exempted] += 1
+            # Les exemptions occupent les derniers matchs du 1er tour
+            current = np.concatenate([current, exempted], axis=1)
+        while current.shape[1] > 1:
+            current, _ = self.play(current[:, 0::2], current[:, 1::2])
+        return current[:, 0]
+
+    def run(self):
+        winners, losers, exempted = self.round1()
+        self.round2_group(winners, exempted)
+        self.round2_group(losers)
+        teams_a, teams_b = self.qualified(2), self.qualified(1)
+        self.bracket(teams_a)
+        self.bracket(teams_b)
+        return teams_a.shape[1], teams_b.shape[1], teams_a
+
+
+# ============================================================
+# AGRÉGATION
+# ============================================================
+
+
+def simulate(n, runs, seed, strength_sd, anti_double):
+    """Simule `runs` concours de `n` équipes par lots, retourne la ligne de tableau"""
+    rng = np.random.default_rng([seed, n])
+    batch_size = max(1, BATCH_CELLS // n)
+    started = time.perf_counter()
+
+    byes_histogram = np.zeros(MAX_BYES + 1, dtype=np.int64)
+    played_histogram = np.zeros(1, dtype=np.int64)
+    double_qualification_byes = 0
+    top_quarter_in_a = top_quarter = 0
+    sizes = None
+
+    done = 0
+    while done < runs:
+        count = min(batch_size, runs - done)
+        batch = Batch(rng, count, n, strength_sd, anti_double)
+        size_a, size_b, teams_a = batch.run()
+        if sizes is None:
+            sizes = (size_a, size_b)
+        elif sizes != (size_a, size_b):
+            raise AssertionError(f'{n} équipes: tailles de tableaux variables d\'un lot à l\'autre')
+
+        byes = batch.qualification_byes + batch.bracket_byes
+        byes_histogram += np.bincount(byes.ravel(), minlength=MAX_BYES + 1)[:MAX_BYES + 1]
+        played = np.bincount(batch.played.ravel())
+        if played.size > played_histogram.size:
+            played_histogram = np.pad(played_histogram, (0, played.size - played_histogram.size))
+        played_histogram[:played.size] += played
+        double_qualification_byes += int((batch.qualification_byes >= 2).sum())
+
+        if batch.strength is not None:
+            # Quart le plus fort de chaque concours: part qualifiée en A
+            quarter = max(1, n // 4)
+            strongest = np.argsort(-batch.strength, axis=1)[:, :quarter]
+            in_a = np.zeros((count, n), dtype=bool)
+            in_a[batch.rows, teams_a] = True
+            top_quarter_in_a += int(np.take_along_axis(in_a, strongest, 1).sum())
+            top_quarter += strongest.size
+
+        done += count
+
+    size_a, size_b = sizes
+    power_a, byes_a, rounds_a = bracket_shape(size_a)
+    power_b, byes_b, rounds_b = bracket_shape(size_b)
+    winners, losers = n // 2 + n % 2, n // 2
+    team_runs = runs * n
+    cumulative = np.cumsum(played_histogram) / team_runs
+
+    row = {
+        'teams': n,
+        'runs': runs,
+        'bracketA': {'teams': size_a, 'size': power_a, 'byes': byes_a, 'rounds': rounds_a},
+        'bracketB': {'teams': size_b, 'size': power_b, 'byes': byes_b, 'rounds': rounds_b},
+        'eliminated': n - size_a - size_b,
+        'qualificationByes': {'round1': n % 2, 'round2Winners': winners % 2, 'round2Losers': losers % 2},
+        'matches': {
+            'round1': n // 2,
+            'round2': winners // 2 + losers // 2,
+            # Élimination directe: un match par équipe éliminée
+            'bracketA': max(0, size_a - 1),
+            'bracketB': max(0, size_b - 1),
+        },
+        'perTeam': {
+            'byes': {str(k): round(float(v) / team_runs, 6) for k, v in enumerate(byes_histogram)},
+            'matchesPlayed': {
+                'mean': round(float((np.arange(played_histogram.size) * played_histogram).sum()) / team_runs, 4),
+                'p50': int(np.searchsorted(cumulative, 0.5)),
+                'p90': int(np.searchsorted(cumulative, 0.9)),
+                'max': int(played_histogram.size - 1),
+                'histogram': {str(k): round(float(v) / team_runs, 6) for k, v in enumerate(played_histogram)},
+            },
+        },
+        'doubleQualificationByes': double_qualification_byes,
+        'durationS': round(time.perf_counter() - started, 3),
+    }
+    row['matches']['total'] = sum(row['matches'].values())
+    if top_quarter:
+        row['topQuarterInA'] = round(top_quarter_in_a / top_quarter, 4)
+
+    expected = expected_sizes(n)
+    if (size_a, size_b, row['eliminated']) != expected:
+        row['mismatch'] = {'expected': dict(zip(('A', 'B', 'eliminated'), expected))}
+    return row
+
+
+# ============================================================
+# RAPPORT
+# ============================================================
+
+
+def parse_team_counts(spec):
+    """'3-1000', '24,48,96' ou '3-16,32,64'"""
+    counts = set()
+    for part in spec.split(','):
+        part = part.strip()
+        if '-' in part:
+            low, high = (int(x) for x in part.split('-', 1))
+            counts.update(range(low, high + 1))
+        elif part:
+            counts.add(int(part))
+    if not counts or min(counts) < 3:
+        raise ValueError('au moins 3 équipes par concours')
+    return sorted(counts)
+
+
+def print_row(row, header=False):
+    if header:
+        print(f"  {'Équipes':>7}{'A':>6}{'taille':>7}{'ex.':>5}{'B':>6}{'taille':>7}{'ex.':>5}{'élim.':>7}"
+              f"{'matchs':>8}{'≥1 ex.':>8}{'2+ ex.':>8}{'matchs/éq.':>11}{'max':>5}")
+        print(f"  {'-' * 90}")
+    a, b, per_team = row['bracketA'], row['bracketB'], row['perTeam']
+    byes = per_team['byes']
+    at_least_one = 1 - byes['0']
+    two_or_more = sum(v for k, v in byes.items() if int(k) >= 2)
+    print(f"  {row['teams']:>7}{a['teams']:>6}{a['size']:>7}{a['byes']:>5}{b['teams']:>6}{b['size']:>7}{b['byes']:>5}"
+          f"{row['eliminated']:>7}{row['matches']['total']:>8}{at_least_one:>8.1%}{two_or_more:>8.2%}"
+          f"{per_team['matchesPlayed']['mean']:>11.2f}{per_team['matchesPlayed']['max']:>5}"
+          f"{'  ≠ tirage' if 'mismatch' in row else ''}")
+
+
+CSV_COLUMNS = [
+    ('teams', lambda r: r['teams']),
+    ('runs', lambda r: r['runs']),
+    ('a_teams', lambda r: r['bracketA']['teams']),
+    ('a_size', lambda r: r['bracketA']['size']),
+    ('a_byes', lambda r: r['bracketA']['byes']),
+    ('a_rounds', lambda r: r['bracketA']['rounds']),
+    ('b_teams', lambda r: r['bracketB']['teams']),
+    ('b_size', lambda r: r['bracketB']['size']),
+    ('b_byes', lambda r: r['bracketB']['byes']),
+    ('b_rounds', lambda r: r['bracketB']['rounds']),
+    ('eliminated', lambda r: r['eliminated']),
+    ('qualification_byes', lambda r: sum(r['qualificationByes'].values())),
+    ('matches_total', lambda r: r['matches']['total']),
+    ('share_0_byes', lambda r: r['perTeam']['byes']['0']),
+    ('share_1_bye', lambda r: r['perTeam']['byes']['1']),
+    ('share_2plus_byes', lambda r: round(sum(v for k, v in r['perTeam']['byes'].items() if int(k) >= 2), 6)),
+    ('matches_per_team_mean', lambda r: r['perTeam']['matchesPlayed']['mean']),
+    ('matches_per_team_p90', lambda r: r['perTeam']['matchesPlayed']['p90']),
+    ('matches_per_team_max', lambda r: r['perTeam']['matchesPlayed']['max']),
+    ('top_quarter_in_a', lambda r: r.get('topQuarterInA', '')),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulateur Monte-Carlo de concours (NumPy)')
+    parser.add_argument('--teams', default='3-1000', help='Nombres d\'équipes: 3-1000, 24,48,96 ou 3-16,32')
+    parser.add_argument('--runs', type=int, default=10_000, help='Concours simulés par nombre d\'équipes')
+    parser.add_argument('--seed', type=int, default=42, help='Graine (résultats reproductibles)')
+    parser.add_argument('--strength-sd', type=float, default=0.0,
+                        help='Écart-type du niveau des équipes (0: chaque match à pile ou face)')
+    parser.add_argument('--no-anti-double', action='store_true',
+                        help='Désactive la règle anti-double exemption (pour mesurer son effet)')
+    parser.add_argument('--output', help='Fichier JSON des tableaux')
+    parser.add_argument('--csv', help='Fichier CSV des tableaux (une ligne par nombre d\'équipes)')
+    parser.add_argument('--quiet', action='store_true', help='N\'affiche que le résumé')
+    args = parser.parse_args()
+
+    try:
+        team_counts = parse_team_counts(args.teams)
+    except ValueError as e:
+        parser.error(f'--teams: {e}')
+    if args.runs < 1:
+        parser.error('--runs doit être au moins 1')
+
+    print(f"\n{'=' * 92}")
+    print(f"  {len(team_counts)} tailles de concours ({team_counts[0]} à {team_counts[-1]} équipes), "
+          f"{args.runs:,} concours chacune, graine {args.seed}".replace(',', ' '))
+    print(f"{'=' * 92}")
+
+    started = time.perf_counter()
+    rows = []
+    for i, n in enumerate(team_counts):
+        row = simulate(n, args.runs, args.seed, args.strength_sd, not args.no_anti_double)
+        rows.append(row)
+        if not args.quiet:
+            print_row(row, header=i == 0)
+
+    mismatches = [r['teams'] for r in rows if 'mismatch' in r]
+    doubles = sum(r['doubleQualificationByes'] for r in rows)
+    print(f"\n  {sum(r['runs'] for r in rows):,} concours simulés en {time.perf_counter() - started:.1f}s".replace(',', ' '))
+    print(f"  Tailles A/B/éliminés conformes au tirage: "
+          f"{'oui' if not mismatches else 'non pour ' + ', '.join(map(str, mismatches))}")
+    print(f"  Équipes exemptées aux deux tours de qualification: {doubles}")
+    print()
+
+    result = {
+        'meta': {
+            'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'numpy': np.__version__,
+        },
+        'config': {
+            'runs': args.runs,
+            'seed': args.seed,
+            'strengthSd': args.strength_sd,
+            'antiDoubleExemption': not args.no_anti_double,
+        },
+        'results': rows,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print(f'Tableaux écrits dans {args.output}')
+    if args.csv:
+        with open(args.csv, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(name for name, _ in CSV_COLUMNS)
+            for row in rows:
+                writer.writerow(value(row) for _, value in CSV_COLUMNS)
+        print(f'Tableaux CSV écrits dans {args.csv}')
+
+    sys.exit(2 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
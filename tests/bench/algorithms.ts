@@ -0,0 +1,314 @@
+// ============================================================
+// BENCHMARK DES ALGORITHMES DE TIRAGE (10 à 10 000 équipes)
+// ============================================================
+//
+// Mesure, pour chaque fonction de lib/algorithms.ts et chaque taille de
+// concours, le temps médian d'un appel et la mémoire allouée, puis compare
+// à tests/bench/baseline.json. Échoue (code 1) si une mesure régresse
+// au-delà du seuil, ou si la croissance entre les deux plus grandes tailles
+// n'est plus quasi linéaire.
+//
+// Usage:
+//   npm run bench                        # compare à la référence
+//   npm run bench -- --update            # enregistre une nouvelle référence
+//   npm run bench -- --sizes 10,1000     # tailles choisies
+//   npm run bench -- --threshold 40      # seuil de régression en %
+
+import fs from 'fs';
+import os from 'os';
+import type { Team } from '@prisma/client';
+import {
+  generateQualificationRound1,
+  generateQualificationRound2,
+  getRound1Results,
+  qualifyTeamsAfterRound2,
+  buildBracket,
+} from '@/lib/algorithms';
+import { createRandom } from '@/lib/random';
+
+const BASELINE_PATH = 'tests/bench/baseline.json';
+const DEFAULT_SIZES = [10, 100, 1000, 10000];
+const DEFAULT_THRESHOLD = 25; // %
+
+// En dessous de ces écarts absolus, une différence relève du bruit de mesure
+const TIME_NOISE_MS = 0.05;
+const HEAP_NOISE_BYTES = 64 * 1024;
+
+// Exposant de croissance toléré entre les deux plus grandes tailles
+// (1 = linéaire, 2 = quadratique). Le temps garde une marge pour n log n,
+// l'arrondi des brackets à la puissance de 2 et les GC sur 10 000 équipes;
+// la mémoire allouée, elle, est mesurée sans bruit.
+const MAX_TIME_GROWTH = 1.6;
+const MAX_HEAP_GROWTH = 1.2;
+const GROWTH_MIN_MS = 0.01;
+
+// Durée minimale de mesure par cas, et durée minimale d'un lot d'appels
+const MIN_SAMPLE_MS = 200;
+const MIN_BATCH_MS = 1;
+const MIN_BATCHES = 7;
+const HEAP_RUNS = 5;
+
+// Graine fixe: chaque exécution mesure exactement les mêmes tirages
+const BENCH_SEED = 20240601;
+
+interface Measure {
+  timeMs: number;
+  heapBytes: number | null;
+}
+
+type Results = Record<string, Record<string, Measure>>;
+
+interface Baseline {
+  meta: { date: string; node: string; platform: string; cpu: string };
+  results: Results;
+}
+
+// ============================================================
+// DONNÉES
+// ============================================================
+
+function createMockTeams(count: number): Team[] {
+  return Array.from({ length: count }, (_, i) => ({
+    id: `team-${i + 1}`,
+    contestId: 'contest-bench',
+    teamNumber: i + 1,
+    status: 'REGISTERED' as const,
+    createdAt: new Date(),
+    name: `Équipe ${i + 1}`,
+    club: null,
+  }));
+}
+
+function simulateResults(matches: ReturnType<typeof generateQualificationRound1>, random: () => number) {
+  return matches.map(match => {
+    const homeWins = match.isBye || random() < 0.5;
+    return {
+      homeTeamId: match.homeTeamId ?? null,
+      awayTeamId: match.awayTeamId ?? null,
+      winnerTeamId: match.isBye ? null : homeWins ? match.homeTeamId! : match.awayTeamId!,
+      loserTeamId: match.isBye ? null : homeWins ? match.awayTeamId! : match.homeTeamId!,
+      isBye: match.isBye,
+      groupType: match.groupType ?? null,
+    };
+  });
+}
+
+/**
+ * Prépare les entrées de chaque algorithme pour une taille donnée
+ * (hors mesure): chaque cas ne chronomètre que l'appel étudié.
+ */
+function buildCases(size: number): Record<string, () => unknown> {
+  const teams = createMockTeams(size);
+  const random = createRandom(BENCH_SEED + size);
+  const round1Matches = simulateResults(generateQualificationRound1(teams, random), random);
+  const round1Results = getRound1Results(round1Matches, teams);
+  const round2Matches = simulateResults(generateQualificationRound2(round1Results, random), random);
+  const results = { round1Matches, round2Matches };
+
+  return {
+    generateQualificationRound1: () => generateQualificationRound1(teams, random),
+    getRound1Results: () => getRound1Results(round1Matches, teams),
+    generateQualificationRound2: () => generateQualificationRound2(round1Results, random),
+    qualifyTeamsAfterRound2: () => qualifyTeamsAfterRound2(results, teams),
+    buildBracket: () => buildBracket(teams, random),
+  };
+}
+
+// ============================================================
+// MESURE
+// ============================================================
+
+const gc = (globalThis as { gc?: () => void }).gc;
+
+function median(values: number[]): number {
+  const sorted = [...values].sort((a, b) => a - b);
+  const mid = Math.floor(sorted.length / 2);
+  return sorted.length % 2 ? sorted[mid] : (sorted[mid - 1] + sorted[mid]) / 2;
+}
+
+/**
+ * Temps d'un appel: les appels sont groupés en lots d'au moins MIN_BATCH_MS
+ * pour rester au-dessus de la résolution de l'horloge, et on garde le lot le
+ * plus rapide (les autres ne diffèrent que par le bruit de la machine)
+ */
+function measureTime(fn: () => unknown): number {
+  gc?.();
+  for (let i = 0; i < 3; i++) fn();
+
+  let batchSize = 1;
+  for (;;) {
+    const start = performance.now();
+    for (let i = 0; i < batchSize; i++) fn();
+    if (performance.now() - start >= MIN_BATCH_MS) break;
+    batchSize *= 2;
+  }
+
+  const perCall: number[] = [];
+  let total = 0;
+  while (perCall.length < MIN_BATCHES || total < MIN_SAMPLE_MS) {
+    const start = performance.now();
+    for (let i = 0; i < batchSize; i++) fn();
+    const elapsed = performance.now() - start;
+    perCall.push(elapsed / batchSize);
+    total += elapsed;
+  }
+  return Math.min(...perCall);
+}
+
+/**
+ * Mémoire allouée par un appel: tas après GC, puis un appel isolé (la jeune
+ * génération n'est pas collectée pendant un appel de cette taille)
+ */
+function measureHeap(fn: () => unknown): number | null {
+  if (!gc) return null;
+  const deltas: number[] = [];
+  for (let i = 0; i < HEAP_RUNS; i++) {
+    gc();
+    const before = process.memoryUsage().heapUsed;
+    const result = fn();
+    deltas.push(Math.max(0, process.memoryUsage().heapUsed - before));
+    void result; // Résultat conservé jusqu'à la mesure
+  }
+  return Math.round(median(deltas));
+}
+
+// ============================================================
+// COMPARAISON
+// ============================================================
+
+function isRegression(current: number, reference: number, thresholdPct: number, noise: number): boolean {
+  return current > reference * (1 + thresholdPct / 100) && current - reference > noise;
+}
+
+function growthExponent(byTeams: Record<string, Measure>, sizes: number[], key: keyof Measure): number | null {
+  if (sizes.length < 2) return null;
+  const [small, large] = sizes.slice(-2);
+  const v1 = byTeams[small][key];
+  const v2 = byTeams[large][key];
+  if (v1 === null || v2 === null) return null;
+  if (key === 'timeMs' && v1 < GROWTH_MIN_MS) return null;
+  if (key === 'heapBytes' && v1 < HEAP_NOISE_BYTES) return null;
+  return Math.log(v2 / v1) / Math.log(large / small);
+}
+
+function formatTime(ms: number): string {
+  return ms < 1 ? `${(ms * 1000).toFixed(1)} µs` : `${ms.toFixed(2)} ms`;
+}
+
+function formatBytes(bytes: number | null): string {
+  if (bytes === null) return '-';
+  return bytes < 1024 * 1024 ? `${(bytes / 1024).toFixed(1)} Ko` : `${(bytes / 1024 / 1024).toFixed(2)} Mo`;
+}
+
+function formatDelta(current: number | null, reference: number | undefined | null): string {
+  if (current === null || reference === undefined || reference === null || reference === 0) return '';
+  const delta = ((current - reference) / reference) * 100;
+  return `${delta >= 0 ? '+' : ''}${delta.toFixed(0)}%`;
+}
+
+// ============================================================
+// EXÉCUTION
+// ============================================================
+
+function parseArgs(argv: string[]) {
+  const option = (name: string) => {
+    const index = argv.indexOf(name);
+    return index >= 0 ? argv[index + 1] : undefined;
+  };
+  const sizes = option('--sizes');
+  const threshold = option('--threshold') ?? process.env.BENCH_THRESHOLD;
+  return {
+    update: argv.includes('--update'),
+    sizes: sizes ? sizes.split(',').map(s => parseInt(s, 10)) : DEFAULT_SIZES,
+    threshold: threshold ? parseFloat(threshold) : DEFAULT_THRESHOLD,
+  };
+}
+
+function loadBaseline(): Baseline | null {
+  if (!fs.existsSync(BASELINE_PATH)) return null;
+  return JSON.parse(fs.readFileSync(BASELINE_PATH, 'utf8')) as Baseline;
+}
+
+function main() {
+  const { update, sizes, threshold } = parseArgs(process.argv.slice(2));
+  const baseline = update ? null : loadBaseline();
+  const failures: string[] = [];
+  const results: Results = {};
+
+  if (!gc) {
+    console.warn('⚠️  Lancer node avec --expose-gc pour mesurer la mémoire allouée\n');
+  }
+  const cpu = os.cpus()[0]?.model ?? 'inconnu';
+  if (baseline && baseline.meta.cpu !== cpu) {
+    console.warn(`⚠️  Référence mesurée sur une autre machine (${baseline.meta.cpu})\n`);
+  }
+
+  for (const size of sizes) {
+    const cases = buildCases(size);
+    for (const [name, fn] of Object.entries(cases)) {
+      const measure = { timeMs: Number(measureTime(fn).toPrecision(4)), heapBytes: measureHeap(fn) };
+      (results[name] ??= {})[size] = measure;
+    }
+  }
+
+  console.log(`${'Algorithme'.padEnd(30)}${'Équipes'.padStart(8)}${'Temps'.padStart(12)}${'Δ'.padStart(7)}${'Mémoire'.padStart(12)}${'Δ'.padStart(7)}`);
+  console.log('-'.repeat(76));
+
+  for (const [name, byTeams] of Object.entries(results)) {
+    for (const size of sizes) {
+      const measure = byTeams[size];
+      const reference = baseline?.results[name]?.[size];
+      console.log(
+        `${name.padEnd(30)}${String(size).padStart(8)}` +
+          `${formatTime(measure.timeMs).padStart(12)}${formatDelta(measure.timeMs, reference?.timeMs).padStart(7)}` +
+          `${formatBytes(measure.heapBytes).padStart(12)}${formatDelta(measure.heapBytes, reference?.heapBytes).padStart(7)}`
+      );
+
+      if (!reference) continue;
+      if (isRegression(measure.timeMs, reference.timeMs, threshold, TIME_NOISE_MS)) {
+        failures.push(`${name} (${size} équipes): temps ${formatTime(reference.timeMs)} → ${formatTime(measure.timeMs)}`);
+      }
+      if (
+        measure.heapBytes !== null &&
+        reference.heapBytes !== null &&
+        isRegression(measure.heapBytes, reference.heapBytes, threshold, HEAP_NOISE_BYTES)
+      ) {
+        failures.push(`${name} (${size} équipes): mémoire ${formatBytes(reference.heapBytes)} → ${formatBytes(measure.heapBytes)}`);
+      }
+    }
+
+    const timeGrowth = growthExponent(byTeams, sizes, 'timeMs');
+    if (timeGrowth !== null && timeGrowth > MAX_TIME_GROWTH) {
+      failures.push(`${name}: temps en n^${timeGrowth.toFixed(2)} (max n^${MAX_TIME_GROWTH})`);
+    }
+    const heapGrowth = growthExponent(byTeams, sizes, 'heapBytes');
+    if (heapGrowth !== null && heapGrowth > MAX_HEAP_GROWTH) {
+      failures.push(`${name}: mémoire en n^${heapGrowth.toFixed(2)} (max n^${MAX_HEAP_GROWTH})`);
+    }
+  }
+
+  if (update) {
+    const next: Baseline = {
+      meta: {
+        date: new Date().toISOString(),
+        node: process.version,
+        platform: `${os.platform()} ${os.arch()}`,
+        cpu,
+      },
+      results,
+    };
+    fs.writeFileSync(BASELINE_PATH, JSON.stringify(next, null, 2) + '\n');
+    console.log(`\n✅ Référence enregistrée dans ${BASELINE_PATH}`);
+  } else if (!baseline) {
+    console.log(`\nAucune référence (${BASELINE_PATH}): lancer avec --update pour en créer une`);
+  }
+
+  if (failures.length > 0) {
+    console.error(`\n❌ ${failures.length} régression(s) (seuil ${threshold}%):`);
+    failures.forEach(failure => console.error(`   - ${failure}`));
+    process.exit(1);
+  }
+  console.log('\n✅ Aucune régression');
+}
+
+main();
@@ -4,7 +4,8 @@ import {
   generateQualificationRound2,
   getRound1Results,
   qualifyTeamsAfterRound2,
-  buildBracket
+  buildBracket,
+  shuffleArray
 } from '@/lib/algorithms';
 
 describe('generateQualificationRound1', () => {
@@ -234,3 +235,28 @@ describe('buildBracket', () => {
     expect(bracket.rounds[2].matches).toHaveLength(1); // 1 finale
   });
 });
+
+describe('shuffleArray', () => {
+  it('should keep every element and leave the input untouched', () => {
+    const input = Array.from({ length: 50 }, (_, i) => i);
+    const shuffled = shuffleArray(input);
+
+    expect(input).toEqual(Array.from({ length: 50 }, (_, i) => i));
+    expect([...shuffled].sort((a, b) => a - b)).toEqual(input);
+  });
+
+  it('should draw every permutation with the same probability', () => {
+    const runs = 60000;
+    const counts = new Map<string, number>();
+    for (let i = 0; i < runs; i++) {
+      const key = shuffleArray(['a', 'b', 'c']).join('');
+      counts.set(key, (counts.get(key) ?? 0) + 1);
+    }
+
+    // 6 permutations attendues à 10 000 chacune (écart type ~91)
+    expect(counts.size).toBe(6);
+    for (const count of counts.values()) {
+      expect(Math.abs(count - runs / 6)).toBeLessThan(600);
+    }
+  });
+});
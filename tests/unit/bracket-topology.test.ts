@@ -0,0 +1,39 @@
+import { describe, it, expect } from 'vitest';
+import { bracketPositionKey, bracketShape, nextBracketPosition } from '@/lib/bracket-topology';
+
+describe('nextBracketPosition', () => {
+  it('devrait envoyer le match j au match floor(j/2) du tour suivant', () => {
+    expect(nextBracketPosition({ roundNumber: 1, matchNumber: 1 })).toEqual({ roundNumber: 2, matchNumber: 1, slot: 'home' });
+    expect(nextBracketPosition({ roundNumber: 1, matchNumber: 2 })).toEqual({ roundNumber: 2, matchNumber: 1, slot: 'away' });
+    expect(nextBracketPosition({ roundNumber: 1, matchNumber: 3 })).toEqual({ roundNumber: 2, matchNumber: 2, slot: 'home' });
+    expect(nextBracketPosition({ roundNumber: 3, matchNumber: 8 })).toEqual({ roundNumber: 4, matchNumber: 4, slot: 'away' });
+  });
+
+  it('devrait remplir chaque côté d\'un match suivant exactement une fois', () => {
+    const filled = new Map<string, number>();
+    for (let matchNumber = 1; matchNumber <= 64; matchNumber++) {
+      const { roundNumber, matchNumber: next, slot } = nextBracketPosition({ roundNumber: 1, matchNumber });
+      const key = `${roundNumber}:${next}:${slot}`;
+      filled.set(key, (filled.get(key) ?? 0) + 1);
+    }
+    expect(filled.size).toBe(64);
+    expect([...filled.values()].every(count => count === 1)).toBe(true);
+  });
+});
+
+describe('bracketPositionKey', () => {
+  it('devrait distinguer les brackets A et B', () => {
+    const position = { roundNumber: 2, matchNumber: 1 };
+    expect(bracketPositionKey('A', position)).not.toBe(bracketPositionKey('B', position));
+  });
+});
+
+describe('bracketShape', () => {
+  it('devrait compléter à la puissance de 2 avec des exemptions', () => {
+    expect(bracketShape(1)).toEqual({ totalRounds: 1, firstRoundMatches: 1, byes: 1 });
+    expect(bracketShape(2)).toEqual({ totalRounds: 1, firstRoundMatches: 1, byes: 0 });
+    expect(bracketShape(5)).toEqual({ totalRounds: 3, firstRoundMatches: 4, byes: 3 });
+    expect(bracketShape(64)).toEqual({ totalRounds: 6, firstRoundMatches: 32, byes: 0 });
+    expect(bracketShape(65)).toEqual({ totalRounds: 7, firstRoundMatches: 64, byes: 63 });
+  });
+});
@@ -0,0 +1,400 @@
+import { describe, it, expect } from 'vitest';
+import { Prisma, PrismaClient, Team } from '@prisma/client';
+import { planDraw } from '@/lib/draw';
+import { ContestEngine, ContestState, isEmptyDiff } from '@/lib/engine';
+import {
+  WriteConflictError,
+  commitEngineChanges,
+  completeRound2IfReady,
+  loadContestState,
+  persistContestDiff,
+  rebuildContest,
+} from '@/lib/contest-state';
+import { diffContestStates, encodeSnapshot, replayResultEvents, ResultEventEntry } from '@/lib/result-log';
+
+// ============================================================
+// BASE EN MÉMOIRE
+// ============================================================
+//
+// Reproduit le comportement de SQLite utile ici: les lectures voient les
+// données validées, un seul écrivain à la fois (verrou pris à la première
+// écriture, rendu au commit), écritures annulées si la transaction échoue,
+// contraintes d'unicité sur les tours et matchs de brackets créés.
+// Les lectures cèdent la main: des centaines d'écritures s'entrelacent.
+
+type Row = { id: string; version: number; [key: string]: any };
+
+const yieldToOthers = () => new Promise(resolve => setImmediate(resolve));
+
+class MemoryStore {
+  contest: { id: string; version: number; eventCount: number; phase?: string; finishedMatchCount?: number } =
+    { id: 'contest-test', version: 0, eventCount: 0 };
+  resultEvents: { version: number; type: string; entity: string; entityId: string; changes: string }[] = [];
+  snapshots: { version: number; state: string }[] = [];
+  teams = new Map<string, Row>();
+  qualificationRounds = new Map<string, { roundNumber: number }>();
+  qualificationMatches = new Map<string, Row>();
+  brackets = new Map<string, { type: string; size: number | null }>();
+  bracketRounds = new Map<string, { bracketId: string; roundNumber: number; roundName: string }>();
+  bracketMatches = new Map<string, Row>();
+  commits = 0;
+
+  private writer: MemoryTransaction | null = null;
+  private waiting: (() => void)[] = [];
+
+  async lock(tx: MemoryTransaction) {
+    await yieldToOthers();
+    while (this.writer && this.writer !== tx) {
+      await new Promise<void>(resolve => this.waiting.push(resolve));
+    }
+    this.writer = tx;
+  }
+
+  release(tx: MemoryTransaction) {
+    if (this.writer !== tx) return;
+    this.writer = null;
+    this.waiting.splice(0).forEach(resolve => resolve());
+  }
+
+  snapshot() {
+    const copy = (rows: Map<string, Row>) => Array.from(rows.values(), row => ({ ...row }));
+    return {
+      id: this.contest.id,
+      teams: copy(this.teams),
+      qualificationRounds: Array.from(this.qualificationRounds, ([id, round]) => ({
+        roundNumber: round.roundNumber,
+        matches: copy(this.qualificationMatches).filter(m => m.roundId === id),
+      })),
+      brackets: Array.from(this.brackets, ([bracketId, bracket]) => ({
+        id: bracketId,
+        type: bracket.type,
+        size: bracket.size,
+        rounds: Array.from(this.bracketRounds)
+          .filter(([, round]) => round.bracketId === bracketId)
+          .map(([roundId, round]) => ({
+            id: roundId,
+            roundNumber: round.roundNumber,
+            roundName: round.roundName,
+            matches: copy(this.bracketMatches).filter(m => m.roundId === roundId),
+          })),
+      })),
+      terrainAssignments: [],
+    };
+  }
+}
+
+class MemoryTransaction {
+  private readonly store: MemoryStore;
+  private pending: (() => void)[] = [];
+  readonly qualificationMatch;
+  readonly bracketMatch;
+  readonly team;
+
+  constructor(store: MemoryStore) {
+    this.store = store;
+    this.qualificationMatch = this.conditionalUpdate(store.qualificationMatches);
+    this.bracketMatch = { ...this.conditionalUpdate(store.bracketMatches), createMany: this.createBracketMatches };
+    this.team = this.conditionalUpdate(store.teams);
+  }
+
+  commit() {
+    this.pending.forEach(apply => apply());
+    if (this.pending.length > 0) this.store.commits++;
+  }
+
+  private uniqueViolation() {
+    return new Prisma.PrismaClientKnownRequestError('Unique constraint failed', {
+      code: 'P2002',
+      clientVersion: 'memory',
+    });
+  }
+
+  private createBracketMatches = async ({ data }: { data: Row[] }) => {
+    await this.store.lock(this);
+    const taken = Array.from(this.store.bracketMatches.values());
+    if (data.some(m => taken.some(t => t.roundId === m.roundId && t.matchNumber === m.matchNumber))) {
+      throw this.uniqueViolation();
+    }
+    this.pending.push(() => data.forEach(match => this.store.bracketMatches.set(match.id, { ...match })));
+    return { count: data.length };
+  };
+
+  private conditionalUpdate(rows: Map<string, Row>) {
+    return {
+      updateMany: async ({ where, data }: { where: { id: string; version: number }; data: object }) => {
+        await this.store.lock(this);
+        const row = rows.get(where.id);
+        if (!row || (where.version !== undefined && row.version !== where.version)) return { count: 0 };
+        this.pending.push(() => Object.assign(row, data));
+        return { count: 1 };
+      },
+      deleteMany: async ({ where }: { where: { id: string; version: number } }) => {
+        await this.store.lock(this);
+        const row = rows.get(where.id);
+        if (!row || (where.version !== undefined && row.version !== where.version)) return { count: 0 };
+        this.pending.push(() => rows.delete(where.id));
+        return { count: 1 };
+      },
+    };
+  }
+
+  bracket = {
+    updateMany: async ({ where, data }: { where: { id: string; size: number | null }; data: { size: number } }) => {
+      await this.store.lock(this);
+      const bracket = this.store.brackets.get(where.id);
+      if (!bracket || bracket.size !== where.size) return { count: 0 };
+      this.pending.push(() => Object.assign(bracket, data));
+      return { count: 1 };
+    },
+  };
+
+  bracketRound = {
+    createMany: async ({ data }: { data: { id: string; bracketId: string; roundNumber: number; roundName: string }[] }) => {
+      await this.store.lock(this);
+      const taken = Array.from(this.store.bracketRounds.values());
+      if (data.some(r => taken.some(t => t.bracketId === r.bracketId && t.roundNumber === r.roundNumber))) {
+        throw this.uniqueViolation();
+      }
+      this.pending.push(() => data.forEach(({ id, ...round }) => this.store.bracketRounds.set(id, round)));
+      return { count: data.length };
+    },
+  };
+
+  contest = {
+    findUnique: async () => {
+      await yieldToOthers();
+      return this.store.snapshot();
+    },
+    update: async ({ data }: { data: { eventCount?: { increment: number }; version?: unknown } }) => {
+      await this.store.lock(this);
+      if (data.eventCount) {
+        const eventCount = this.store.contest.eventCount + data.eventCount.increment;
+        this.pending.push(() => { this.store.contest.eventCount = eventCount; });
+        return { eventCount };
+      }
+      const { version: _increment, ...counters } = data;
+      const version = this.store.contest.version + 1;
+      this.pending.push(() => Object.assign(this.store.contest, counters, { version }));
+      return { version };
+    },
+    findUniqueOrThrow: async () => ({ status: 'IN_PROGRESS' }),
+  };
+
+  contestTombstone = {
+    createMany: async ({ data }: { data: unknown[] }) => ({ count: data.length }),
+  };
+
+  resultEvent = {
+    findMany: async ({ where }: { where: { version: { gt: number } } }) =>
+      this.store.resultEvents.filter(e => e.version > where.version.gt),
+    createMany: async ({ data }: { data: MemoryStore['resultEvents'] }) => {
+      this.pending.push(() => this.store.resultEvents.push(...data));
+      return { count: data.length };
+    },
+  };
+
+  contestSnapshot = {
+    create: async ({ data }: { data: { version: number; state: string } }) => {
+      this.pending.push(() => this.store.snapshots.push(data));
+      return data;
+    },
+    findFirst: async () => {
+      await yieldToOthers();
+      return this.store.snapshots.reduce<{ version: number; state: string } | null>(
+        (latest, s) => (!latest || s.version > latest.version ? s : latest), null
+      );
+    },
+  };
+
+  // Concours sans terrains: pas d'attribution
+  terrain = {
+    findMany: async () => [],
+  };
+}
+
+function createMemoryDb(store: MemoryStore): PrismaClient {
+  const db = {
+    $transaction: async <T>(fn: (tx: MemoryTransaction) => Promise<T>) => {
+      const tx = new MemoryTransaction(store);
+      try {
+        const result = await fn(tx);
+        tx.commit();
+        return result;
+      } finally {
+        store.release(tx);
+      }
+    },
+    contest: {
+      findUnique: async () => store.snapshot(),
+    },
+    qualificationMatch: {
+      count: async () =>
+        Array.from(store.qualificationMatches.values()).filter(
+          m => store.qualificationRounds.get(m.roundId)!.roundNumber === 1 && m.status !== 'FINISHED'
+        ).length,
+    },
+  };
+  return db as unknown as PrismaClient;
+}
+
+// ============================================================
+// UTILITAIRES DE TEST
+// ============================================================
+
+function createMockTeams(count: number): Team[] {
+  return Array.from({ length: count }, (_, i) => ({
+    id: `team-${i + 1}`,
+    contestId: 'contest-test',
+    teamNumber: i + 1,
+    status: 'REGISTERED' as const,
+    createdAt: new Date(),
+    name: `Équipe ${i + 1}`,
+    club: null,
+  }));
+}
+
+function createStore(teamCount: number): MemoryStore {
+  const store = new MemoryStore();
+  const teams = createMockTeams(teamCount);
+  const plan = planDraw(store.contest.id, teams);
+
+  const row = (data: object) => ({ winnerTeamId: null, loserTeamId: null, homeTeamId: null, awayTeamId: null, ...data });
+  for (const team of teams) store.teams.set(team.id, { id: team.id, status: team.status, version: 0 });
+  for (const round of plan.qualificationRounds) store.qualificationRounds.set(round.id!, { roundNumber: round.roundNumber });
+  for (const match of plan.qualificationMatches) {
+    store.qualificationMatches.set(match.id!, row({ status: 'SCHEDULED', isBye: false, groupType: null, ...match, version: 0 }) as Row);
+  }
+  // Brackets sans tours ni matchs: créés au fil des qualifications
+  for (const bracket of plan.brackets) store.brackets.set(bracket.id!, { type: bracket.type, size: null });
+  return store;
+}
+
+function isPlayable(match: Row) {
+  return match.status !== 'FINISHED' && !match.isBye && match.homeTeamId && match.awayTeamId;
+}
+
+// ============================================================
+// TESTS
+// ============================================================
+
+describe('Concurrence optimiste', () => {
+  it('devrait détecter une ligne modifiée entre la lecture et l\'écriture', async () => {
+    const store = createStore(8);
+    const db = createMemoryDb(store);
+    const state = (await loadContestState(db, store.contest.id)) as ContestState;
+    const [first, second] = state.qualificationMatches.filter(m => m.roundNumber === 1);
+
+    // Deux postes lisent le même état et choisissent le même premier slot libre
+    const engineA = new ContestEngine(state, { random: () => 0 });
+    const engineB = new ContestEngine(state, { random: () => 0 });
+    engineA.recordQualificationResult(first.id, first.homeTeamId);
+    engineB.recordQualificationResult(second.id, second.homeTeamId);
+
+    await db.$transaction(tx => persistContestDiff(tx, store.contest.id, engineA.getDiff(), 1));
+    await expect(
+      db.$transaction(tx => persistContestDiff(tx, store.contest.id, engineB.getDiff(), 2))
+    ).rejects.toThrow(WriteConflictError);
+
+    // La transaction en conflit n'a rien écrit
+    expect(store.qualificationMatches.get(second.id)!.status).toBe('SCHEDULED');
+  });
+
+  it('devrait rester cohérent sous des centaines de saisies simultanées', async () => {
+    const store = createStore(128);
+    const db = createMemoryDb(store);
+    const contestId = store.contest.id;
+    const initial = (await loadContestState(db, contestId)) as ContestState;
+    let submitted = 0;
+    let retries = 0;
+
+    const playAll = async (matches: Row[], phase: 'QUALIFICATION' | 'BRACKET') => {
+      submitted += matches.length;
+      await Promise.all(matches.map(async match => {
+        const commit = phase === 'QUALIFICATION'
+          ? await commitEngineChanges(db, contestId, engine => engine.recordQualificationResult(match.id, match.homeTeamId))
+          : await commitEngineChanges(db, contestId, engine => engine.recordBracketResult(match.id, match.awayTeamId));
+        retries += commit.attempts - 1;
+        if (phase === 'QUALIFICATION') {
+          await completeRound2IfReady(db, contestId);
+        }
+      }));
+    };
+
+    const qualification = (roundNumber: number) =>
+      Array.from(store.qualificationMatches.values()).filter(
+        m => store.qualificationRounds.get(m.roundId)!.roundNumber === roundNumber
+      );
+
+    // Tour 1 en entier, en parallèle
+    await playAll(qualification(1).filter(isPlayable), 'QUALIFICATION');
+
+    // Chaque équipe du Tour 1 est placée exactement une fois dans le Tour 2
+    const round2Teams = qualification(2).flatMap(m => [m.homeTeamId, m.awayTeamId]).filter(Boolean);
+    expect(new Set(round2Teams).size).toBe(round2Teams.length);
+    expect(round2Teams).toHaveLength(128);
+
+    // Tour 2 en entier, puis les brackets tour par tour
+    await playAll(qualification(2).filter(isPlayable), 'QUALIFICATION');
+    for (let guard = 0; guard < 20; guard++) {
+      const playable = Array.from(store.bracketMatches.values()).filter(isPlayable);
+      if (playable.length === 0) break;
+      await playAll(playable, 'BRACKET');
+    }
+
+    expect(submitted).toBeGreaterThan(200);
+    // Les conflits ont bien eu lieu, et ont tous été résolus par un nouvel essai
+    expect(retries).toBeGreaterThan(0);
+
+    // Chaque équipe est dans un seul bracket, une seule fois par tour, ou éliminée
+    const state = (await loadContestState(db, contestId)) as ContestState;
+    const bracketOf = new Map<string, string>();
+    const seen = new Set<string>();
+    for (const match of state.bracketMatches) {
+      for (const teamId of [match.homeTeamId, match.awayTeamId]) {
+        if (!teamId) continue;
+        const key = `${match.bracketType}:${match.roundNumber}:${teamId}`;
+        expect(seen.has(key)).toBe(false);
+        seen.add(key);
+        expect(bracketOf.get(teamId) ?? match.bracketType).toBe(match.bracketType);
+        bracketOf.set(teamId, match.bracketType);
+      }
+    }
+    const eliminated = state.teams.filter(t => t.status === 'ELIMINATED');
+    expect(bracketOf.size + eliminated.length).toBe(128);
+
+    // Tous les matchs jouables ont été joués, chaque écriture a sa version
+    expect(state.bracketMatches.filter(m => isPlayable(m as unknown as Row))).toHaveLength(0);
+    expect(store.contest.version).toBe(store.commits);
+
+    // Le journal, rejoué dans l'ordre des commits, redonne l'état final
+    const events = store.resultEvents.map(e => ({ ...e, changes: JSON.parse(e.changes) })) as ResultEventEntry[];
+    const { diff, missingQualificationMatches } = diffContestStates(state, replayResultEvents(initial, events));
+    expect(isEmptyDiff(diff)).toBe(true);
+    expect(missingQualificationMatches).toHaveLength(0);
+    expect(store.contest.eventCount).toBe(events.length);
+  }, 60000);
+
+  it('devrait recalculer les compteurs du concours lors d\'une reconstruction', async () => {
+    const store = createStore(8);
+    const db = createMemoryDb(store);
+    const contestId = store.contest.id;
+    const initial = (await loadContestState(db, contestId)) as ContestState;
+    store.snapshots.push({ version: 0, state: encodeSnapshot(initial) });
+
+    const round1 = Array.from(store.qualificationMatches.values()).filter(isPlayable);
+    for (const match of round1) {
+      await commitEngineChanges(db, contestId, engine => engine.recordQualificationResult(match.id, match.homeTeamId));
+    }
+    expect(store.contest).toMatchObject({ phase: 'QUALIFICATION_ROUND_2', finishedMatchCount: round1.length });
+
+    // Table altérée: un résultat effacé, compteurs faussés
+    const erased = store.qualificationMatches.get(round1[0].id)!;
+    Object.assign(erased, { winnerTeamId: null, loserTeamId: null, status: 'SCHEDULED' });
+    Object.assign(store.contest, { phase: 'QUALIFICATION_ROUND_1', finishedMatchCount: 0 });
+
+    const result = await rebuildContest(db, contestId);
+    expect(result!.version).toBe(store.contest.version);
+    expect(erased.status).toBe('FINISHED');
+    expect(store.contest).toMatchObject({ phase: 'QUALIFICATION_ROUND_2', finishedMatchCount: round1.length });
+  });
+});
@@ -0,0 +1,72 @@
+import { describe, it, expect } from 'vitest';
+import { ContestCache, matchesEtag } from '@/lib/contest-cache';
+
+describe('Cache des lectures de concours', () => {
+  it('devrait servir l\'entrée jusqu\'à son invalidation', () => {
+    const cache = new ContestCache();
+    cache.set('c1', cache.ticket(), 3, '{"id":"c1"}');
+
+    expect(cache.get('c1')?.body).toBe('{"id":"c1"}');
+    cache.invalidate('c1');
+    expect(cache.get('c1')).toBeUndefined();
+    expect(cache.hits).toBe(1);
+    expect(cache.misses).toBe(1);
+  });
+
+  it('devrait évincer le concours le moins récemment lu', () => {
+    const cache = new ContestCache(2);
+    cache.set('c1', cache.ticket(), 1, '1');
+    cache.set('c2', cache.ticket(), 1, '2');
+    cache.get('c1');
+    cache.set('c3', cache.ticket(), 1, '3');
+
+    expect(cache.size).toBe(2);
+    expect(cache.get('c2')).toBeUndefined();
+    expect(cache.get('c1')).toBeDefined();
+    expect(cache.get('c3')).toBeDefined();
+  });
+
+  it('ne devrait pas mettre en cache une lecture commencée avant une écriture', () => {
+    const cache = new ContestCache();
+    const staleTicket = cache.ticket();
+    cache.invalidate('c1'); // écriture validée pendant la lecture
+
+    const entry = cache.set('c1', staleTicket, 4, '{"version":4}');
+    expect(entry.body).toBe('{"version":4}');
+    expect(cache.get('c1')).toBeUndefined();
+
+    // Une lecture commencée après l'écriture est mise en cache
+    cache.set('c1', cache.ticket(), 5, '{"version":5}');
+    expect(cache.get('c1')?.version).toBe(5);
+
+    // L'invalidation d'un autre concours ne bloque pas celui-ci
+    const ticket = cache.ticket();
+    cache.invalidate('c2');
+    cache.set('c1', ticket, 6, '{"version":6}');
+    expect(cache.get('c1')?.version).toBe(6);
+  });
+
+  it('devrait changer d\'ETag quand le contenu change à version égale', () => {
+    const cache = new ContestCache();
+    const a = cache.set('c1', cache.ticket(), 2, '{"players":[]}');
+    const b = cache.set('c1', cache.ticket(), 2, '{"players":["Paul"]}');
+
+    expect(a.etag).toMatch(/^"2-/);
+    expect(a.etag).not.toBe(b.etag);
+  });
+});
+
+describe('If-None-Match', () => {
+  const etag = '"7-abc"';
+
+  it.each([
+    ['"7-abc"', true],
+    ['W/"7-abc"', true],
+    ['"6-xyz", "7-abc"', true],
+    ['*', true],
+    ['"6-xyz"', false],
+    [null, false],
+  ])('%s → %s', (header, expected) => {
+    expect(matchesEtag(header, etag)).toBe(expected);
+  });
+});
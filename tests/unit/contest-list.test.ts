@@ -0,0 +1,88 @@
+import { describe, it, expect } from 'vitest';
+import { PrismaClient } from '@prisma/client';
+import {
+  contestListQuerySchema,
+  contestListWhere,
+  decodeCursor,
+  encodeCursor,
+  InvalidCursorError,
+  listContests,
+} from '@/lib/contest-list';
+
+function createContests(count: number) {
+  // Du plus récent au plus ancien, comme l'ordre de la requête
+  return Array.from({ length: count }, (_, i) => ({
+    id: `contest-${count - i}`,
+    name: `Concours ${count - i}`,
+    createdAt: new Date(Date.UTC(2025, 0, count - i)),
+  }));
+}
+
+function createListDb(rows: object[]) {
+  const calls: any[] = [];
+  const db = {
+    contest: {
+      findMany: async (args: any) => {
+        calls.push(args);
+        return rows.slice(0, args.take);
+      },
+    },
+  };
+  return { db: db as unknown as PrismaClient, calls };
+}
+
+describe('Liste paginée des concours', () => {
+  it('devrait encoder et décoder un curseur', () => {
+    const contest = { id: 'abc', createdAt: new Date('2025-06-01T10:00:00.000Z') };
+    expect(decodeCursor(encodeCursor(contest))).toEqual(contest);
+    expect(() => decodeCursor('pas-un-curseur')).toThrow(InvalidCursorError);
+  });
+
+  it('devrait appliquer les valeurs par défaut et valider les paramètres', () => {
+    expect(contestListQuerySchema.parse({}).limit).toBe(24);
+    expect(contestListQuerySchema.parse({ limit: '10', status: 'FINISHED' })).toMatchObject({
+      limit: 10,
+      status: 'FINISHED',
+    });
+    expect(() => contestListQuerySchema.parse({ limit: '1000' })).toThrow();
+    expect(() => contestListQuerySchema.parse({ gameMode: 'AUTRE' })).toThrow();
+  });
+
+  it('devrait combiner filtres et curseur', () => {
+    const createdAt = new Date('2025-03-01T00:00:00.000Z');
+    const from = new Date('2025-01-01');
+    const where = contestListWhere({
+      status: 'FINISHED',
+      gameMode: 'MELEE',
+      from,
+      cursor: encodeCursor({ id: 'c9', createdAt }),
+      limit: 24,
+    });
+
+    expect(where).toEqual({
+      AND: [
+        { status: 'FINISHED' },
+        { gameMode: 'MELEE' },
+        { createdAt: { gte: from } },
+        { OR: [{ createdAt: { lt: createdAt } }, { createdAt, id: { lt: 'c9' } }] },
+      ],
+    });
+    expect(contestListWhere({ limit: 24 })).toEqual({});
+  });
+
+  it('devrait renvoyer un curseur tant qu\'il reste des concours', async () => {
+    const contests = createContests(5);
+    const { db, calls } = createListDb(contests);
+
+    const page = await listContests(db, { limit: 3 });
+
+    expect(calls[0].take).toBe(4);
+    expect(calls[0].orderBy).toEqual([{ createdAt: 'desc' }, { id: 'desc' }]);
+    expect(page.items.map(c => c.id)).toEqual(['contest-5', 'contest-4', 'contest-3']);
+    expect(decodeCursor(page.nextCursor!)).toEqual({ id: 'contest-3', createdAt: contests[2].createdAt });
+
+    const last = await listContests(createListDb(contests.slice(3)).db, { limit: 3 });
+    expect(last.items).toHaveLength(2);
+    expect(last.nextCursor).toBeNull();
+  });
+});
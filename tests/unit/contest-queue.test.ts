@@ -0,0 +1,135 @@
+import { describe, it, expect } from 'vitest';
+import { NextRequest } from 'next/server';
+import { ContestQueue, QueueFullError, contestQueue, withContestQueue } from '@/lib/contest-queue';
+
+// ============================================================
+// UTILITAIRES DE TEST
+// ============================================================
+
+const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
+
+/**
+ * Tâche qui se termine quand le test le décide
+ */
+function deferred() {
+  let release!: () => void;
+  const done = new Promise<void>(resolve => { release = resolve; });
+  return { done, release };
+}
+
+// ============================================================
+// TESTS
+// ============================================================
+
+describe('ContestQueue', () => {
+  it('devrait exécuter les écritures d\'un concours une à une, dans l\'ordre', async () => {
+    const queue = new ContestQueue();
+    const log: string[] = [];
+    let running = 0;
+
+    const write = (name: string, ms: number) => queue.run('contest-a', async () => {
+      running++;
+      expect(running).toBe(1);
+      log.push(`début ${name}`);
+      await sleep(ms);
+      log.push(`fin ${name}`);
+      running--;
+      return name;
+    });
+
+    const results = await Promise.all([write('1', 15), write('2', 5), write('3', 0)]);
+
+    expect(results).toEqual(['1', '2', '3']);
+    expect(log).toEqual(['début 1', 'fin 1', 'début 2', 'fin 2', 'début 3', 'fin 3']);
+  });
+
+  it('ne devrait pas retarder un concours derrière un autre', async () => {
+    const queue = new ContestQueue();
+    const slowDraw = deferred();
+
+    const draw = queue.run('contest-a', () => slowDraw.done);
+    const resultB = await queue.run('contest-b', async () => 'résultat B');
+
+    expect(resultB).toBe('résultat B');
+    expect(queue.depth('contest-a')).toBe(1);
+    expect(queue.depth('contest-b')).toBe(0);
+
+    slowDraw.release();
+    await draw;
+    expect(queue.depth('contest-a')).toBe(0);
+  });
+
+  it('devrait poursuivre la file après une écriture en échec', async () => {
+    const queue = new ContestQueue();
+
+    const failing = queue.run('contest-a', async () => { throw new Error('Conflit'); });
+    const next = queue.run('contest-a', async () => 'suivante');
+
+    await expect(failing).rejects.toThrow('Conflit');
+    await expect(next).resolves.toBe('suivante');
+  });
+
+  it('devrait refuser une écriture quand la file est pleine', async () => {
+    const queue = new ContestQueue(2);
+    const blocker = deferred();
+
+    const first = queue.run('contest-a', () => blocker.done);
+    const second = queue.run('contest-a', async () => 'ok');
+    await expect(queue.run('contest-a', async () => 'de trop')).rejects.toBeInstanceOf(QueueFullError);
+
+    blocker.release();
+    await Promise.all([first, second]);
+    expect(queue.snapshot()[0]).toMatchObject({ contestId: 'contest-a', processed: 2, rejected: 1, maxDepth: 2 });
+  });
+
+  it('devrait mesurer la profondeur et l\'attente par concours', async () => {
+    const queue = new ContestQueue();
+    const blocker = deferred();
+
+    const first = queue.run('contest-a', () => blocker.done);
+    const waiting = queue.run('contest-a', async () => undefined);
+    await queue.run('contest-b', async () => undefined);
+
+    const active = queue.snapshot();
+    expect(active.map(s => [s.contestId, s.depth])).toEqual([['contest-a', 2], ['contest-b', 0]]);
+
+    await sleep(20);
+    blocker.release();
+    await Promise.all([first, waiting]);
+
+    const [a] = queue.snapshot().filter(s => s.contestId === 'contest-a');
+    expect(a.waitMs.count).toBe(2);
+    expect(a.waitMs.maxMs).toBeGreaterThanOrEqual(15);
+    expect(a.runMs.count).toBe(2);
+  });
+
+  it('devrait oublier les plus anciennes files inactives', async () => {
+    const queue = new ContestQueue(200, 2);
+
+    for (const id of ['contest-a', 'contest-b', 'contest-c']) {
+      await queue.run(id, async () => undefined);
+    }
+
+    expect(queue.snapshot().map(s => s.contestId).sort()).toEqual(['contest-b', 'contest-c']);
+  });
+});
+
+describe('withContestQueue', () => {
+  it('devrait répondre 503 quand la file du concours est pleine', async () => {
+    const contestId = `contest-${Date.now()}`;
+    const blockers = Array.from({ length: 200 }, () => deferred());
+    const queued = blockers.map(b => contestQueue.run(contestId, () => b.done));
+
+    const handler = withContestQueue<{ id: string }>(async () => new Response('ok'));
+    const response = await handler(
+      new NextRequest(`http://localhost/api/contests/${contestId}/draw`, { method: 'POST' }),
+      { params: Promise.resolve({ id: contestId }) }
+    );
+
+    expect(response.status).toBe(503);
+    expect(response.headers.get('Retry-After')).toBe('1');
+
+    blockers.forEach(b => b.release());
+    await Promise.all(queued);
+  });
+});
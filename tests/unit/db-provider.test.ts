@@ -0,0 +1,77 @@
+import { describe, it, expect } from 'vitest';
+import { readFileSync } from 'fs';
+import path from 'path';
+import { Prisma } from '@prisma/client';
+import { databaseProvider, lockContestRow } from '@/lib/db-provider';
+
+// ============================================================
+// UTILITAIRES DE TEST
+// ============================================================
+
+/**
+ * Transaction factice qui enregistre les requêtes SQL brutes
+ */
+function createRecordingTx() {
+  const queries: { sql: string; values: unknown[] }[] = [];
+  const tx = {
+    $queryRaw: async (strings: TemplateStringsArray, ...values: unknown[]) => {
+      queries.push({ sql: strings.join('?'), values });
+      return [];
+    },
+  } as unknown as Prisma.TransactionClient;
+  return { tx, queries };
+}
+
+/**
+ * Modèles d'un schéma Prisma, sans commentaires de ligne ni source de données
+ */
+function schemaModels(file: string): string {
+  return readFileSync(path.join(process.cwd(), 'prisma', file), 'utf8')
+    .replace(/datasource db \{[^}]*\}/, '')
+    .split('\n')
+    .filter(line => !line.trim().startsWith('//'))
+    .join('\n')
+    .trim();
+}
+
+// ============================================================
+// TESTS
+// ============================================================
+
+describe('databaseProvider', () => {
+  it('devrait reconnaître PostgreSQL à son URL', () => {
+    expect(databaseProvider({ DATABASE_URL: 'postgresql://petanque@localhost:5432/concours' })).toBe('postgresql');
+    expect(databaseProvider({ DATABASE_URL: 'postgres://petanque@localhost/concours' })).toBe('postgresql');
+  });
+
+  it('devrait utiliser SQLite par défaut', () => {
+    expect(databaseProvider({ DATABASE_URL: 'file:./dev.db' })).toBe('sqlite');
+    expect(databaseProvider({})).toBe('sqlite');
+  });
+});
+
+describe('lockContestRow', () => {
+  it('devrait verrouiller la ligne du concours sous PostgreSQL', async () => {
+    const { tx, queries } = createRecordingTx();
+
+    await lockContestRow(tx, 'contest-1', 'postgresql');
+
+    expect(queries).toHaveLength(1);
+    expect(queries[0].sql).toContain('FOR UPDATE');
+    expect(queries[0].values).toEqual(['contest-1']);
+  });
+
+  it('ne devrait rien exécuter sous SQLite', async () => {
+    const { tx, queries } = createRecordingTx();
+
+    await lockContestRow(tx, 'contest-1', 'sqlite');
+
+    expect(queries).toHaveLength(0);
+  });
+});
+
+describe('Schéma PostgreSQL', () => {
+  it('devrait déclarer les mêmes modèles que le schéma SQLite', () => {
+    expect(schemaModels('postgresql/schema.prisma')).toBe(schemaModels('schema.prisma'));
+  });
+});
@@ -0,0 +1,122 @@
+import { describe, it, expect } from 'vitest';
+import { MeleePlayer, Team } from '@prisma/client';
+import { planDraw, planSeededDraw, countDrawRows, drawState, DrawPlan, SeededDrawInput } from '@/lib/draw';
+
+function createMockTeams(count: number): Team[] {
+  return Array.from({ length: count }, (_, i) => ({
+    id: `team-${i + 1}`,
+    contestId: 'contest-test',
+    teamNumber: i + 1,
+    status: 'REGISTERED' as const,
+    createdAt: new Date(),
+    name: `Équipe ${i + 1}`,
+    club: null,
+  }));
+}
+
+describe('planDraw', () => {
+  it.each([3, 4, 7, 16, 33, 120])('devrait planifier un tirage cohérent pour %i équipes', (teamCount) => {
+    const plan = planDraw('contest-test', createMockTeams(teamCount));
+
+    expect(plan.qualificationRounds).toHaveLength(2);
+    expect(plan.summary.tour1Matches).toBe(Math.ceil(teamCount / 2));
+
+    // Chaque équipe apparaît exactement une fois au Tour 1
+    const round1Id = plan.qualificationRounds.find(r => r.roundNumber === 1)!.id;
+    const round1 = plan.qualificationMatches.filter(m => m.roundId === round1Id);
+    const teamIds = round1.flatMap(m => [m.homeTeamId, m.awayTeamId]).filter(Boolean);
+    expect(new Set(teamIds).size).toBe(teamCount);
+
+    expect(countDrawRows(plan)).toBe(2 + plan.qualificationMatches.length + 2);
+  });
+
+  it('devrait placer l\'exempté du Tour 1 dans un slot des gagnants du Tour 2', () => {
+    const plan = planDraw('contest-test', createMockTeams(9));
+
+    const round1Id = plan.qualificationRounds.find(r => r.roundNumber === 1)!.id;
+    const bye = plan.qualificationMatches.find(m => m.roundId === round1Id && m.isBye)!;
+    expect(bye.status).toBe('FINISHED');
+    expect(bye.winnerTeamId).toBe(bye.homeTeamId);
+
+    const round2Id = plan.qualificationRounds.find(r => r.roundNumber === 2)!.id;
+    const placed = plan.qualificationMatches.filter(
+      m => m.roundId === round2Id && (m.homeTeamId === bye.homeTeamId || m.awayTeamId === bye.homeTeamId)
+    );
+    expect(placed).toHaveLength(1);
+    expect(placed[0].groupType).toBe('WINNERS');
+  });
+
+  it('devrait créer les brackets A et B sans tours ni matchs (taille fixée à la fin du Tour 1)', () => {
+    const teams = createMockTeams(64);
+    const plan = planDraw('contest-test', teams);
+
+    expect(plan.brackets.map(b => b.type)).toEqual(['A', 'B']);
+    expect(plan.summary.estimatedQualifiedA).toBe(16);
+    expect(plan.summary.estimatedQualifiedB).toBe(32);
+
+    const state = drawState('contest-test', plan, teams);
+    expect(state.bracketMatches).toHaveLength(0);
+    expect(state.brackets).toEqual(
+      plan.brackets.map(b => ({ id: b.id, type: b.type, size: null, rounds: [] }))
+    );
+  });
+
+  it('devrait planifier 500 équipes sans accès base de données', () => {
+    const start = performance.now();
+    const plan = planDraw('contest-test', createMockTeams(500));
+    const duration = performance.now() - start;
+
+    expect(plan.summary.tour1Matches).toBe(250);
+    expect(duration).toBeLessThan(100);
+  });
+});
+
+describe('planSeededDraw', () => {
+  // Tour 1 exprimé en numéros d'équipe (les IDs générés changent à chaque appel)
+  function round1Pairings(plan: DrawPlan, teams: Team[]) {
+    const numberById = new Map(teams.map(t => [t.id, t.teamNumber]));
+    const round1Id = plan.qualificationRounds.find(r => r.roundNumber === 1)!.id;
+    return plan.qualificationMatches
+      .filter(m => m.roundId === round1Id)
+      .map(m => [m.matchNumber, numberById.get(m.homeTeamId!), m.awayTeamId ? numberById.get(m.awayTeamId) : null]);
+  }
+
+  const monte = (seed: number): SeededDrawInput => ({
+    id: 'contest-test',
+    gameMode: 'MONTE',
+    teamType: 'DOUBLETTE',
+    seed,
+    teams: createMockTeams(33),
+    meleePlayers: [],
+  });
+
+  it('devrait redonner le même tirage pour la même graine', () => {
+    const first = planSeededDraw(monte(2024), 1);
+    const second = planSeededDraw(monte(2024), 1);
+    const other = planSeededDraw(monte(2025), 1);
+
+    expect(round1Pairings(first.plan!, first.teams)).toEqual(round1Pairings(second.plan!, second.teams));
+    expect(round1Pairings(first.plan!, first.teams)).not.toEqual(round1Pairings(other.plan!, other.teams));
+  });
+
+  it('devrait reformer les mêmes équipes mélée pour la même graine', () => {
+    const meleePlayers: MeleePlayer[] = Array.from({ length: 31 }, (_, i) => ({
+      id: `p${i}`,
+      contestId: 'contest-test',
+      name: `Joueur ${i}`,
+      createdAt: new Date(),
+    }));
+    const input: SeededDrawInput = { ...monte(99), gameMode: 'MELEE', teams: [], meleePlayers };
+
+    const first = planSeededDraw(input, 1);
+    const second = planSeededDraw(input, 1);
+
+    expect(first.teams).toHaveLength(15);
+    expect(first.teams.map(t => t.name)).toEqual(second.teams.map(t => t.name));
+    expect(round1Pairings(first.plan!, first.teams)).toEqual(round1Pairings(second.plan!, second.teams));
+  });
+
+  it('ne devrait pas planifier de tirage avec moins de 3 équipes', () => {
+    expect(planSeededDraw({ ...monte(1), teams: createMockTeams(2) }, 1).plan).toBeNull();
+  });
+});
@@ -0,0 +1,538 @@
+import { describe, it, expect } from 'vitest';
+import { Team } from '@prisma/client';
+import { drawState, planDraw, DrawPlan } from '@/lib/draw';
+import { BracketMatchState, ContestEngine, ContestState, ResultError, isEmptyDiff } from '@/lib/engine';
+import { bracketShape, nextBracketPosition } from '@/lib/bracket-topology';
+
+// ============================================================
+// UTILITAIRES DE TEST
+// ============================================================
+
+function createMockTeams(count: number): Team[] {
+  return Array.from({ length: count }, (_, i) => ({
+    id: `team-${i + 1}`,
+    contestId: 'contest-test',
+    teamNumber: i + 1,
+    status: 'REGISTERED' as const,
+    createdAt: new Date(),
+    name: `Équipe ${i + 1}`,
+    club: null,
+  }));
+}
+
+/**
+ * Convertit un plan de tirage en état initial pour le moteur
+ */
+function stateFromPlan(plan: DrawPlan, teams: Team[]): ContestState {
+  return drawState('contest-test', plan, teams);
+}
+
+/**
+ * Joue toute la qualification (gagnant = équipe home), brackets non joués
+ */
+function playQualification(engine: ContestEngine) {
+  for (let guard = 0; guard < 10000; guard++) {
+    const match = engine.getState().qualificationMatches.find(
+      m => m.status !== 'FINISHED' && !m.isBye && m.homeTeamId && m.awayTeamId
+    );
+    if (!match) return;
+    engine.recordQualificationResult(match.id, match.homeTeamId);
+  }
+}
+
+/**
+ * Joue tous les matchs prêts (gagnant = équipe home) jusqu'à la fin du concours
+ */
+function playWholeContest(engine: ContestEngine) {
+  for (let guard = 0; guard < 10000; guard++) {
+    const state = engine.getState();
+    const qualification = state.qualificationMatches.find(
+      m => m.status !== 'FINISHED' && !m.isBye && m.homeTeamId && m.awayTeamId
+    );
+    if (qualification) {
+      engine.recordQualificationResult(qualification.id, qualification.homeTeamId);
+      continue;
+    }
+    const bracket = state.bracketMatches.find(
+      m => m.status !== 'FINISHED' && !m.isBye && m.homeTeamId && m.awayTeamId
+    );
+    if (bracket) {
+      engine.recordBracketResult(bracket.id, bracket.homeTeamId);
+      continue;
+    }
+    return;
+  }
+}
+
+// ============================================================
+// TESTS
+// ============================================================
+
+describe('ContestEngine', () => {
+  it('ne devrait pas modifier l\'état fourni', () => {
+    const teams = createMockTeams(8);
+    const state = stateFromPlan(planDraw('contest-test', teams), teams);
+    const snapshot = JSON.stringify(state);
+
+    const engine = new ContestEngine(state);
+    const match = state.qualificationMatches.find(m => m.roundNumber === 1)!;
+    engine.recordQualificationResult(match.id, match.homeTeamId);
+
+    expect(JSON.stringify(state)).toBe(snapshot);
+  });
+
+  it('devrait produire un diff minimal pour un résultat du Tour 1', () => {
+    const teams = createMockTeams(8);
+    const state = stateFromPlan(planDraw('contest-test', teams), teams);
+    const engine = new ContestEngine(state);
+
+    const match = state.qualificationMatches.find(m => m.roundNumber === 1)!;
+    engine.recordQualificationResult(match.id, match.awayTeamId);
+    const diff = engine.getDiff();
+
+    // Le match joué + au plus 2 slots du Tour 2
+    expect(diff.qualificationMatches.length).toBeGreaterThanOrEqual(2);
+    expect(diff.qualificationMatches.length).toBeLessThanOrEqual(3);
+    expect(diff.qualificationMatches.find(d => d.id === match.id)!.changes).toEqual({
+      winnerTeamId: match.awayTeamId,
+      loserTeamId: match.homeTeamId,
+      status: 'FINISHED',
+    });
+    expect(diff.bracketMatches).toHaveLength(0);
+    expect(diff.teams).toHaveLength(0);
+  });
+
+  it('devrait rejeter un gagnant qui ne fait pas partie du match', () => {
+    const teams = createMockTeams(6);
+    const state = stateFromPlan(planDraw('contest-test', teams), teams);
+    const engine = new ContestEngine(state);
+    const match = state.qualificationMatches.find(m => m.roundNumber === 1)!;
+
+    expect(() => engine.recordQualificationResult(match.id, 'team-inconnue')).toThrow(ResultError);
+    expect(() => engine.recordQualificationResult('match-inconnu', 'team-1')).toThrow('Match non trouvé');
+    expect(isEmptyDiff(engine.getDiff())).toBe(true);
+  });
+
+  it('devrait rejeter un deuxième résultat sur un match terminé', () => {
+    const teams = createMockTeams(6);
+    const state = stateFromPlan(planDraw('contest-test', teams), teams);
+    const engine = new ContestEngine(state);
+    const match = state.qualificationMatches.find(m => m.roundNumber === 1)!;
+
+    engine.recordQualificationResult(match.id, match.homeTeamId);
+    expect(() => engine.recordQualificationResult(match.id, match.awayTeamId)).toThrow('Ce match est déjà terminé');
+  });
+
+  it.each([3, 5, 8, 13, 16, 27, 32, 64, 101])('devrait mener un concours de %i équipes jusqu\'aux finales', (teamCount) => {
+    const teams = createMockTeams(teamCount);
+    const engine = new ContestEngine(stateFromPlan(planDraw('contest-test', teams), teams));
+
+    playWholeContest(engine);
+    const state = engine.getState();
+
+    // Toute la qualification est terminée
+    expect(state.qualificationMatches.every(m => m.status === 'FINISHED')).toBe(true);
+
+    // Chaque équipe est dans un seul bracket, ou éliminée
+    const inBracket = new Map<string, string>();
+    for (const match of state.bracketMatches) {
+      for (const teamId of [match.homeTeamId, match.awayTeamId]) {
+        if (!teamId) continue;
+        const previous = inBracket.get(teamId);
+        expect(previous === undefined || previous === match.bracketType).toBe(true);
+        inBracket.set(teamId, match.bracketType);
+      }
+    }
+    const eliminated = state.teams.filter(t => t.status === 'ELIMINATED');
+    expect(inBracket.size + eliminated.length).toBe(teamCount);
+
+    for (const type of ['A', 'B']) {
+      // Taille exacte: chaque qualifié a sa place au premier tour, chaque position a sa ligne
+      const { size } = state.brackets!.find(b => b.type === type)!;
+      const rounds = state.bracketMatches.filter(m => m.bracketType === type);
+      const firstRoundTeams = rounds.filter(m => m.roundNumber === 1).flatMap(m => [m.homeTeamId, m.awayTeamId]);
+      expect(firstRoundTeams.filter(Boolean)).toHaveLength(size!);
+      if (size === 0) continue;
+      expect(rounds).toHaveLength(bracketShape(size!).firstRoundMatches * 2 - 1);
+
+      // Chaque finale jouable est terminée
+      const final = rounds.find(m => m.roundNumber === bracketShape(size!).totalRounds)!;
+      if (!final.isBye) {
+        expect(final.status).toBe('FINISHED');
+      }
+    }
+  });
+
+  it('devrait gérer une saisie groupée avec une seule passe de complétion', () => {
+    const teams = createMockTeams(11);
+    const state = stateFromPlan(planDraw('contest-test', teams), teams);
+    const engine = new ContestEngine(state);
+
+    const round1 = state.qualificationMatches.filter(m => m.roundNumber === 1 && !m.isBye);
+    for (const match of round1) {
+      engine.recordQualificationResult(match.id, match.homeTeamId, { deferCompletion: true });
+    }
+
+    // Tant que la passe de complétion n'a pas eu lieu, aucun bye n'est créé au Tour 2
+    expect(engine.getState().qualificationMatches.some(m => m.roundNumber === 2 && m.isBye)).toBe(false);
+
+    engine.completeRound2();
+    const round2 = engine.getState().qualificationMatches.filter(m => m.roundNumber === 2);
+    expect(round2.every(m => m.homeTeamId)).toBe(true);
+    expect(round2.filter(m => m.isBye).every(m => m.winnerTeamId === m.homeTeamId)).toBe(true);
+  });
+
+  it('devrait aiguiller un résultat groupé vers la bonne phase sans effet en cas d\'erreur', () => {
+    const teams = createMockTeams(8);
+    const state = stateFromPlan(planDraw('contest-test', teams), teams);
+    const engine = new ContestEngine(state);
+    const match = state.qualificationMatches.find(m => m.roundNumber === 1)!;
+
+    expect(engine.recordResult(match.id, match.homeTeamId, { deferCompletion: true })).toBe('QUALIFICATION');
+
+    const before = JSON.stringify(engine.getDiff());
+    expect(() => engine.recordResult('match-inconnu', 'team-1')).toThrow('Match non trouvé');
+    expect(JSON.stringify(engine.getDiff())).toBe(before);
+
+    // Matchs de bracket: créés une fois la qualification jouée
+    const qualified = new ContestEngine(state);
+    playQualification(qualified);
+    const bracketState = qualified.getState();
+    const bracketMatch = bracketState.bracketMatches.find(m => !m.isBye && m.homeTeamId && m.awayTeamId)!;
+    const bracketEngine = new ContestEngine(bracketState);
+    expect(() => bracketEngine.recordResult(bracketMatch.id, 'team-inconnue')).toThrow(ResultError);
+    expect(isEmptyDiff(bracketEngine.getDiff())).toBe(true);
+    expect(bracketEngine.recordResult(bracketMatch.id, bracketMatch.homeTeamId)).toBe('BRACKET');
+  });
+
+  it('devrait suivre la phase et le nombre de matchs joués', () => {
+    const teams = createMockTeams(9);
+    const engine = new ContestEngine(stateFromPlan(planDraw('contest-test', teams), teams));
+    expect(engine.getProgress()).toEqual({ phase: 'QUALIFICATION_ROUND_1', finishedMatchCount: 0 });
+
+    for (const match of engine.getState().qualificationMatches.filter(m => m.roundNumber === 1 && !m.isBye)) {
+      engine.recordQualificationResult(match.id, match.homeTeamId);
+    }
+    // 4 matchs joués, l'exemption du Tour 1 n'est pas comptée
+    expect(engine.getProgress()).toEqual({ phase: 'QUALIFICATION_ROUND_2', finishedMatchCount: 4 });
+
+    playWholeContest(engine);
+    const state = engine.getState();
+    const played = [...state.qualificationMatches, ...state.bracketMatches].filter(
+      m => m.status === 'FINISHED' && !m.isBye
+    );
+    expect(engine.getProgress()).toEqual({ phase: 'BRACKETS_GENERATED', finishedMatchCount: played.length });
+  });
+
+  it('devrait placer les qualifiés de la même façon pour la même graine et la même version', () => {
+    const teams = createMockTeams(13);
+    const state = { ...stateFromPlan(planDraw('contest-test', teams), teams), seed: 77, version: 3 };
+
+    const placements = (engine: ContestEngine) => {
+      for (const match of engine.getState().qualificationMatches.filter(m => m.roundNumber === 1 && !m.isBye)) {
+        engine.recordQualificationResult(match.id, match.homeTeamId);
+      }
+      return engine.getState().qualificationMatches
+        .filter(m => m.roundNumber === 2)
+        .map(m => [m.homeTeamId, m.awayTeamId]);
+    };
+
+    const first = placements(new ContestEngine(state));
+    expect(placements(new ContestEngine(state))).toEqual(first);
+    expect(placements(new ContestEngine({ ...state, version: 4 }))).not.toEqual(first);
+  });
+});
+
+describe('Brackets créés à la demande', () => {
+  it('devrait fixer la taille exacte des brackets à la fin du Tour 1', () => {
+    const teams = createMockTeams(13);
+    const state = stateFromPlan(planDraw('contest-test', teams), teams);
+    expect(state.bracketMatches).toHaveLength(0);
+    expect(state.brackets!.map(b => b.size)).toEqual([null, null]);
+
+    const engine = new ContestEngine(state);
+    const round1 = state.qualificationMatches.filter(m => m.roundNumber === 1 && !m.isBye);
+    for (const match of round1.slice(0, -1)) {
+      engine.recordQualificationResult(match.id, match.homeTeamId);
+    }
+    // Tour 1 en cours: ni taille, ni ligne de bracket
+    expect(engine.getState().brackets!.map(b => b.size)).toEqual([null, null]);
+    expect(engine.getState().bracketMatches).toHaveLength(0);
+
+    const last = round1[round1.length - 1];
+    engine.recordQualificationResult(last.id, last.homeTeamId);
+    const after = engine.getState();
+    const round2 = after.qualificationMatches.filter(m => m.roundNumber === 2);
+    const winners = round2.filter(m => m.groupType === 'WINNERS');
+    const sizeOf = (type: string) => after.brackets!.find(b => b.type === type)!.size;
+    expect(sizeOf('A')).toBe(winners.length);
+    expect(sizeOf('B')).toBe(
+      winners.filter(m => !m.isBye).length + round2.filter(m => m.groupType === 'LOSERS').length
+    );
+
+    // Seules les exemptions du Tour 2, déjà qualifiées, ont une ligne
+    const diff = engine.getDiff();
+    expect(diff.brackets.map(b => b.changes.size)).toEqual([sizeOf('A'), sizeOf('B')]);
+    const byeTeams = round2.filter(m => m.isBye).map(m => m.homeTeamId);
+    const placed = diff.createdBracketMatches.filter(m => m.roundNumber === 1).flatMap(m => [m.homeTeamId, m.awayTeamId]);
+    expect(placed.filter(Boolean).sort()).toEqual(byeTeams.sort());
+  });
+
+  it('devrait créer le match suivant avec le premier vainqueur qui l\'alimente', () => {
+    const teams = createMockTeams(32);
+    const engine = new ContestEngine(stateFromPlan(planDraw('contest-test', teams), teams));
+    playQualification(engine);
+    const state = engine.getState();
+    expect(state.bracketMatches.every(m => m.roundNumber === 1)).toBe(true);
+
+    const match = state.bracketMatches.find(m => m.bracketType === 'A' && !m.isBye)!;
+    const next = new ContestEngine(state);
+    next.recordBracketResult(match.id, match.awayTeamId);
+    const diff = next.getDiff();
+
+    const { roundNumber, matchNumber, slot } = nextBracketPosition(match);
+    expect(diff.createdBracketRounds).toEqual([
+      expect.objectContaining({ roundNumber, roundName: 'Demi-finales' }),
+    ]);
+    expect(diff.createdBracketMatches).toHaveLength(1);
+    const created = diff.createdBracketMatches[0];
+    expect(created).toMatchObject({ bracketType: 'A', roundNumber, matchNumber, roundId: diff.createdBracketRounds[0].id });
+    expect(slot === 'home' ? created.homeTeamId : created.awayTeamId).toBe(match.awayTeamId);
+    // Le match joué est une mise à jour, pas une création
+    expect(diff.bracketMatches.map(d => d.id)).toEqual([match.id]);
+  });
+});
+
+describe('Progression positionnelle des brackets', () => {
+  it('devrait placer le vainqueur du match j côté home si j est pair, quel que soit l\'ordre de fin', () => {
+    const teams = createMockTeams(32);
+    const engine = new ContestEngine(stateFromPlan(planDraw('contest-test', teams), teams));
+    for (let guard = 0; guard < 1000; guard++) {
+      const match = engine.getState().qualificationMatches.find(
+        m => m.status !== 'FINISHED' && !m.isBye && m.homeTeamId && m.awayTeamId
+      );
+      if (!match) break;
+      engine.recordQualificationResult(match.id, match.homeTeamId);
+    }
+
+    // Premier tour du bracket A joué dans l'ordre inverse des numéros
+    const state = engine.getState();
+    const firstRound = state.bracketMatches
+      .filter(m => m.bracketType === 'A' && m.roundNumber === 1 && !m.isBye && m.homeTeamId && m.awayTeamId)
+      .sort((a, b) => b.matchNumber - a.matchNumber);
+    expect(firstRound.length).toBeGreaterThan(1);
+    for (const match of firstRound) {
+      engine.recordBracketResult(match.id, match.awayTeamId);
+    }
+
+    const after = engine.getState();
+    for (const match of firstRound) {
+      const { roundNumber, matchNumber, slot } = nextBracketPosition(match);
+      const next = after.bracketMatches.find(
+        m => m.bracketType === 'A' && m.roundNumber === roundNumber && m.matchNumber === matchNumber
+      )!;
+      expect(slot === 'home' ? next.homeTeamId : next.awayTeamId).toBe(match.awayTeamId);
+    }
+  });
+});
+
+describe('Correction des résultats', () => {
+  const isPlayable = (m: { status: string; isBye: boolean; homeTeamId: string | null; awayTeamId: string | null }) =>
+    m.status !== 'FINISHED' && !m.isBye && m.homeTeamId && m.awayTeamId;
+
+  /**
+   * Joue tout le Tour 1 (gagnant = home) et retourne l'état obtenu
+   */
+  function afterRound1(teamCount: number): ContestState {
+    const teams = createMockTeams(teamCount);
+    const engine = new ContestEngine(stateFromPlan(planDraw('contest-test', teams), teams));
+    for (const match of engine.getState().qualificationMatches.filter(m => m.roundNumber === 1 && !m.isBye)) {
+      engine.recordQualificationResult(match.id, match.homeTeamId);
+    }
+    return engine.getState();
+  }
+
+  /**
+   * Joue tous les matchs prêts jusqu'aux brackets compris, sauf ceux que `skip` retient
+   */
+  function playUntil(state: ContestState, skip: (m: { roundNumber: number; bracketType?: string }) => boolean): ContestState {
+    const engine = new ContestEngine(state);
+    for (let guard = 0; guard < 1000; guard++) {
+      const current = engine.getState();
+      const qualification = current.qualificationMatches.find(m => isPlayable(m) && !skip(m));
+      if (qualification) {
+        engine.recordQualificationResult(qualification.id, qualification.homeTeamId);
+        continue;
+      }
+      const bracket = current.bracketMatches.find(m => isPlayable(m) && !skip(m));
+      if (!bracket) break;
+      engine.recordBracketResult(bracket.id, bracket.homeTeamId);
+    }
+    return engine.getState();
+  }
+
+  const teamsOf = (m: { homeTeamId: string | null; awayTeamId: string | null }) => [m.homeTeamId, m.awayTeamId];
+  const nextOf = (state: ContestState, match: BracketMatchState) => {
+    const { roundNumber, matchNumber } = nextBracketPosition(match);
+    return state.bracketMatches.find(
+      m => m.bracketType === match.bracketType && m.roundNumber === roundNumber && m.matchNumber === matchNumber
+    );
+  };
+
+  it('devrait échanger les places du Tour 2 après correction d\'un match du Tour 1', () => {
+    const teams = createMockTeams(16);
+    const state = stateFromPlan(planDraw('contest-test', teams), teams);
+    const first = new ContestEngine(state);
+    const match = state.qualificationMatches.find(m => m.roundNumber === 1 && !m.isBye)!;
+    first.recordQualificationResult(match.id, match.homeTeamId);
+    const played = first.getState();
+
+    const engine = new ContestEngine(played);
+    expect(engine.correctResult(match.id, match.awayTeamId)).toBe('QUALIFICATION');
+    const corrected = engine.getState();
+
+    const round2 = (groupType: string) =>
+      corrected.qualificationMatches.filter(m => m.roundNumber === 2 && m.groupType === groupType).flatMap(teamsOf);
+    expect(round2('WINNERS')).toContain(match.awayTeamId);
+    expect(round2('WINNERS')).not.toContain(match.homeTeamId);
+    expect(round2('LOSERS')).toContain(match.homeTeamId);
+    expect(round2('LOSERS')).not.toContain(match.awayTeamId);
+
+    // Le match corrigé et les deux slots du Tour 2, rien d'autre
+    const diff = engine.getDiff();
+    expect(diff.qualificationMatches).toHaveLength(3);
+    expect(diff.qualificationMatches.find(d => d.id === match.id)!.changes).toEqual({
+      winnerTeamId: match.awayTeamId,
+      loserTeamId: match.homeTeamId,
+    });
+    expect(diff.bracketMatches).toHaveLength(0);
+    expect(diff.teams).toHaveLength(0);
+  });
+
+  it('devrait suivre une exemption du Tour 2 jusque dans le bracket', () => {
+    // Premier concours dont une exemption du Tour 2 vient d'un match joué au Tour 1
+    for (let teamCount = 5; teamCount <= 40; teamCount++) {
+      const state = afterRound1(teamCount);
+      const round1 = state.qualificationMatches.filter(m => m.roundNumber === 1 && !m.isBye);
+      const bye = state.qualificationMatches.find(
+        m => m.roundNumber === 2 && m.isBye && round1.some(r => teamsOf(r).includes(m.homeTeamId))
+      );
+      if (!bye) continue;
+
+      const match = round1.find(r => teamsOf(r).includes(bye.homeTeamId))!;
+      const moved = bye.homeTeamId!;
+      const replacement = match.homeTeamId === moved ? match.awayTeamId! : match.homeTeamId!;
+      const bracketType = bye.groupType === 'WINNERS' ? 'A' : 'B';
+
+      const engine = new ContestEngine(state);
+      engine.correctResult(match.id, match.winnerTeamId === moved ? replacement : moved);
+      const corrected = engine.getState();
+
+      const byeAfter = corrected.qualificationMatches.find(m => m.id === bye.id)!;
+      expect(byeAfter.homeTeamId).toBe(replacement);
+      expect(byeAfter.winnerTeamId).toBe(replacement);
+      const bracket = corrected.bracketMatches.filter(m => m.bracketType === bracketType).flatMap(teamsOf);
+      expect(bracket).toContain(replacement);
+      expect(bracket).not.toContain(moved);
+      return;
+    }
+    throw new Error('Aucune exemption du Tour 2 issue d\'un match joué');
+  });
+
+  it('devrait refuser la correction si un match en aval a été joué', () => {
+    const state = afterRound1(16);
+    const round1 = state.qualificationMatches.find(m => m.roundNumber === 1 && !m.isBye)!;
+    const winnersMatch = state.qualificationMatches.find(
+      m => m.roundNumber === 2 && m.groupType === 'WINNERS' && teamsOf(m).includes(round1.winnerTeamId)
+    )!;
+    const engine = new ContestEngine(state);
+    engine.recordQualificationResult(winnersMatch.id, winnersMatch.homeTeamId);
+
+    const next = new ContestEngine(engine.getState());
+    expect(() => next.correctResult(round1.id, round1.loserTeamId)).toThrow(/déjà été joué/);
+    try {
+      next.correctResult(round1.id, round1.loserTeamId);
+    } catch (error) {
+      expect((error as ResultError).status).toBe(409);
+    }
+    expect(isEmptyDiff(next.getDiff())).toBe(true);
+  });
+
+  it('devrait échanger les brackets A et B après correction d\'un match WINNERS du Tour 2', () => {
+    const state = afterRound1(16);
+    const engine = new ContestEngine(state);
+    const match = state.qualificationMatches.find(m => m.roundNumber === 2 && m.groupType === 'WINNERS' && isPlayable(m))!;
+    engine.recordQualificationResult(match.id, match.homeTeamId);
+
+    const next = new ContestEngine(engine.getState());
+    next.correctResult(match.id, match.awayTeamId);
+    const corrected = next.getState();
+
+    const bracketTeams = (type: string) => corrected.bracketMatches.filter(m => m.bracketType === type).flatMap(teamsOf);
+    expect(bracketTeams('A')).toContain(match.awayTeamId);
+    expect(bracketTeams('A')).not.toContain(match.homeTeamId);
+    expect(bracketTeams('B')).toContain(match.homeTeamId);
+    expect(bracketTeams('B')).not.toContain(match.awayTeamId);
+  });
+
+  it('devrait rendre l\'élimination au nouveau perdant d\'un match LOSERS', () => {
+    const state = afterRound1(16);
+    const engine = new ContestEngine(state);
+    const match = state.qualificationMatches.find(m => m.roundNumber === 2 && m.groupType === 'LOSERS' && isPlayable(m))!;
+    engine.recordQualificationResult(match.id, match.homeTeamId);
+
+    const next = new ContestEngine(engine.getState());
+    next.correctResult(match.id, match.awayTeamId);
+    const corrected = next.getState();
+    const statusOf = (id: string | null) => corrected.teams.find(t => t.id === id)!.status;
+
+    expect(statusOf(match.awayTeamId)).toBe('REGISTERED');
+    expect(statusOf(match.homeTeamId)).toBe('ELIMINATED');
+    const bracketB = corrected.bracketMatches.filter(m => m.bracketType === 'B').flatMap(teamsOf);
+    expect(bracketB).toContain(match.awayTeamId);
+    expect(bracketB).not.toContain(match.homeTeamId);
+    expect(next.getDiff().teams).toHaveLength(2);
+  });
+
+  it('devrait remplacer le vainqueur dans le match suivant d\'un bracket', () => {
+    // Premier tour des brackets joué, tours suivants en attente
+    const state = playUntil(afterRound1(32), m => m.bracketType !== undefined && m.roundNumber > 1);
+    const match = state.bracketMatches.find(m => {
+      const next = nextOf(state, m);
+      return m.status === 'FINISHED' && !m.isBye && next && next.status !== 'FINISHED';
+    })!;
+    expect(match).toBeDefined();
+
+    const engine = new ContestEngine(state);
+    expect(engine.correctResult(match.id, match.loserTeamId)).toBe('BRACKET');
+    const corrected = engine.getState();
+    const next = nextOf(corrected, match)!;
+
+    expect(teamsOf(next)).toContain(match.loserTeamId);
+    expect(teamsOf(next)).not.toContain(match.winnerTeamId);
+    expect(engine.getDiff().bracketMatches).toHaveLength(2);
+  });
+
+  it('devrait refuser de corriger un match de bracket dont le suivant est joué', () => {
+    const state = playUntil(afterRound1(16), () => false);
+    const match = state.bracketMatches.find(m => nextOf(state, m)?.status === 'FINISHED' && !m.isBye)!;
+
+    const engine = new ContestEngine(state);
+    expect(() => engine.correctResult(match.id, match.loserTeamId)).toThrow(/déjà été joué/);
+  });
+
+  it('devrait valider la correction demandée', () => {
+    const state = afterRound1(9);
+    const engine = new ContestEngine(state);
+    const played = state.qualificationMatches.find(m => m.roundNumber === 1 && !m.isBye)!;
+    const bye = state.qualificationMatches.find(m => m.roundNumber === 1 && m.isBye)!;
+    const pending = state.qualificationMatches.find(m => m.roundNumber === 2 && isPlayable(m))!;
+
+    expect(() => engine.correctResult('inconnu', 'team-1')).toThrow('Match non trouvé');
+    expect(() => engine.correctResult(bye.id, bye.homeTeamId)).toThrow(/exemption/);
+    expect(() => engine.correctResult(pending.id, pending.homeTeamId)).toThrow(/pas encore terminé/);
+    expect(() => engine.correctResult(played.id, played.winnerTeamId)).toThrow(/déjà le vainqueur/);
+    expect(() => engine.correctResult(played.id, 'team-999')).toThrow(/faire partie du match/);
+  });
+});
+
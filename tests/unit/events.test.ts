@@ -0,0 +1,121 @@
+import { describe, it, expect } from 'vitest';
+import { Team } from '@prisma/client';
+import { planDraw } from '@/lib/draw';
+import { ContestEngine, ContestState } from '@/lib/engine';
+import { buildContestEvents, contestEvents, ContestEvent } from '@/lib/events';
+
+function createMockTeams(count: number): Team[] {
+  return Array.from({ length: count }, (_, i) => ({
+    id: `team-${i + 1}`,
+    contestId: 'contest-test',
+    teamNumber: i + 1,
+    status: 'REGISTERED' as const,
+    createdAt: new Date(),
+    name: `Équipe ${i + 1}`,
+    club: null,
+  }));
+}
+
+function createState(teams: Team[]): ContestState {
+  const plan = planDraw('contest-test', teams);
+  const roundNumbers = new Map(plan.qualificationRounds.map(r => [r.id!, r.roundNumber]));
+  return {
+    contestId: 'contest-test',
+    teams: teams.map(t => ({ id: t.id, status: t.status, version: 0 })),
+    qualificationMatches: plan.qualificationMatches.map(m => ({
+      id: m.id!,
+      roundId: m.roundId,
+      roundNumber: roundNumbers.get(m.roundId)!,
+      matchNumber: m.matchNumber,
+      groupType: m.groupType ?? null,
+      homeTeamId: m.homeTeamId ?? null,
+      awayTeamId: m.awayTeamId ?? null,
+      winnerTeamId: m.winnerTeamId ?? null,
+      loserTeamId: m.loserTeamId ?? null,
+      status: m.status ?? 'SCHEDULED',
+      isBye: m.isBye ?? false,
+      version: 0,
+    })),
+    bracketMatches: [],
+  };
+}
+
+describe('buildContestEvents', () => {
+  it('devrait produire le résultat puis les placements du Tour 2', () => {
+    const state = createState(createMockTeams(8));
+    const engine = new ContestEngine(state);
+    const match = state.qualificationMatches.find(m => m.roundNumber === 1)!;
+
+    engine.recordQualificationResult(match.id, match.homeTeamId);
+    const events = buildContestEvents('contest-test', engine, 7);
+
+    expect(events[0].type).toBe('match-finished');
+    expect(events.every(e => e.version === 7)).toBe(true);
+
+    // Chaque placement concerne le gagnant ou le perdant du match joué
+    const slots = events.slice(1);
+    expect(slots.length).toBeGreaterThan(0);
+    for (const event of slots) {
+      expect(event.type).toBe('slot-assigned');
+      if (event.type !== 'slot-assigned') continue;
+      const placed = [event.match.homeTeamId, event.match.awayTeamId];
+      expect(placed.includes(match.homeTeamId) || placed.includes(match.awayTeamId)).toBe(true);
+    }
+  });
+
+  it('devrait signaler les éliminations du Tour 2', () => {
+    const state = createState(createMockTeams(8));
+    const engine = new ContestEngine(state);
+
+    for (const match of state.qualificationMatches.filter(m => m.roundNumber === 1)) {
+      engine.recordQualificationResult(match.id, match.homeTeamId);
+    }
+    const round2 = engine.getState().qualificationMatches.find(
+      m => m.roundNumber === 2 && m.groupType === 'LOSERS' && !m.isBye
+    )!;
+    // Nouveau moteur: seuls les événements de ce résultat sont produits
+    const next = new ContestEngine(engine.getState());
+    next.recordQualificationResult(round2.id, round2.homeTeamId);
+
+    const eliminated = buildContestEvents('contest-test', next, 9).filter(e => e.type === 'team-eliminated');
+    expect(eliminated).toHaveLength(1);
+  });
+
+  it('devrait signaler une correction et le changement de statut des équipes', () => {
+    const state = createState(createMockTeams(8));
+    const engine = new ContestEngine(state);
+
+    for (const match of state.qualificationMatches.filter(m => m.roundNumber === 1)) {
+      engine.recordQualificationResult(match.id, match.homeTeamId);
+    }
+    const round2 = engine.getState().qualificationMatches.find(
+      m => m.roundNumber === 2 && m.groupType === 'LOSERS' && !m.isBye
+    )!;
+    engine.recordQualificationResult(round2.id, round2.homeTeamId);
+
+    const next = new ContestEngine(engine.getState());
+    next.correctResult(round2.id, round2.awayTeamId);
+    const events = buildContestEvents('contest-test', next, 10);
+
+    expect(events[0]).toMatchObject({ type: 'match-corrected', phase: 'QUALIFICATION' });
+    expect(events.filter(e => e.type === 'team-eliminated')).toHaveLength(1);
+    expect(events.filter(e => e.type === 'team-updated')).toHaveLength(1);
+  });
+});
+
+describe('contestEvents', () => {
+  it('ne devrait notifier que les abonnés du concours concerné', () => {
+    const received: ContestEvent[] = [];
+    const unsubscribe = contestEvents.subscribe('contest-a', e => received.push(e));
+
+    contestEvents.publish([
+      { type: 'contest-updated', contestId: 'contest-a', version: 1, status: 'IN_PROGRESS' },
+      { type: 'contest-updated', contestId: 'contest-b', version: 1, status: 'IN_PROGRESS' },
+    ]);
+    unsubscribe();
+    contestEvents.publish([{ type: 'contest-updated', contestId: 'contest-a', version: 2, status: 'FINISHED' }]);
+
+    expect(received).toHaveLength(1);
+    expect(contestEvents.subscriberCount('contest-a')).toBe(0);
+  });
+});
@@ -0,0 +1,134 @@
+import { describe, it, expect } from 'vitest';
+import { applyContestChanges, applyContestEvent, ContestChanges, LiveContest } from '@/lib/live';
+
+function createContest(): LiveContest {
+  const teams = [1, 2, 3, 4].map(n => ({ id: `team-${n}`, teamNumber: n, status: 'REGISTERED', players: [] }));
+  return {
+    id: 'contest-test',
+    status: 'IN_PROGRESS',
+    version: 3,
+    teams,
+    qualificationRounds: [
+      {
+        id: 'round-1',
+        matches: [
+          { id: 'q1', roundId: 'round-1', matchNumber: 1, homeTeamId: 'team-1', awayTeamId: 'team-2', homeTeam: teams[0], awayTeam: teams[1] },
+          { id: 'q2', roundId: 'round-1', matchNumber: 2, homeTeamId: 'team-3', awayTeamId: 'team-4', homeTeam: teams[2], awayTeam: teams[3] },
+        ],
+      },
+      {
+        id: 'round-2',
+        matches: [
+          { id: 'q3', roundId: 'round-2', matchNumber: 1, homeTeamId: null, awayTeamId: null },
+          { id: 'q4', roundId: 'round-2', matchNumber: 2, homeTeamId: null, awayTeamId: null },
+        ],
+      },
+    ],
+    brackets: [
+      { rounds: [{ id: 'bracket-round-1', matches: [{ id: 'b1', roundId: 'bracket-round-1', matchNumber: 1 }] }] },
+    ],
+  };
+}
+
+function emptyChanges(version: number): ContestChanges {
+  return {
+    version,
+    status: 'IN_PROGRESS',
+    teams: [],
+    qualificationMatches: [],
+    bracketMatches: [],
+    deleted: { qualificationMatches: [], teams: [] },
+  };
+}
+
+describe('applyContestChanges', () => {
+  it('devrait fusionner un match modifié et résoudre ses équipes', () => {
+    const contest = createContest();
+    const changes = emptyChanges(4);
+    changes.qualificationMatches.push({
+      id: 'q1', roundId: 'round-1', matchNumber: 1,
+      homeTeamId: 'team-1', awayTeamId: 'team-2', winnerTeamId: 'team-2', loserTeamId: 'team-1', status: 'FINISHED',
+    });
+    changes.qualificationMatches.push({ id: 'q3', roundId: 'round-2', matchNumber: 1, homeTeamId: 'team-2', awayTeamId: null });
+
+    const merged = applyContestChanges(contest, changes)!;
+
+    expect(merged.version).toBe(4);
+    const q1 = merged.qualificationRounds[0].matches.find(m => m.id === 'q1')!;
+    expect(q1.status).toBe('FINISHED');
+    expect(q1.winnerTeam.id).toBe('team-2');
+    expect(q1.loserTeam.id).toBe('team-1');
+    expect(merged.qualificationRounds[1].matches[0].homeTeam.id).toBe('team-2');
+
+    // Les parties non modifiées gardent leur référence
+    expect(merged.brackets[0]).toBe(contest.brackets[0]);
+  });
+
+  it('devrait retirer les matchs supprimés', () => {
+    const changes = emptyChanges(4);
+    changes.deleted.qualificationMatches.push('q4');
+
+    const merged = applyContestChanges(createContest(), changes)!;
+
+    expect(merged.qualificationRounds[1].matches.map(m => m.id)).toEqual(['q3']);
+  });
+
+  it('devrait ignorer des modifications plus anciennes que la version connue', () => {
+    const contest = createContest();
+    expect(applyContestChanges(contest, emptyChanges(2))).toBe(contest);
+  });
+
+  it('devrait demander un rechargement complet pour un round inconnu', () => {
+    const changes = emptyChanges(4);
+    changes.bracketMatches.push({ id: 'b9', roundId: 'round-inconnu', matchNumber: 1 });
+
+    expect(applyContestChanges(createContest(), changes)).toBeNull();
+  });
+});
+
+describe('applyContestEvent', () => {
+  const finishQ1 = (version: number) => ({
+    type: 'match-finished' as const,
+    contestId: 'contest-test',
+    version,
+    phase: 'QUALIFICATION' as const,
+    match: {
+      id: 'q1', roundId: 'round-1', matchNumber: 1, groupType: null,
+      homeTeamId: 'team-1', awayTeamId: 'team-2', winnerTeamId: 'team-1', loserTeamId: 'team-2',
+      status: 'FINISHED', isBye: false, version,
+    },
+  });
+
+  it('devrait appliquer les événements successifs d\'une même écriture', () => {
+    const contest = createContest();
+
+    const afterFinish = applyContestEvent(contest, finishQ1(4))!;
+    const afterSlot = applyContestEvent(afterFinish, {
+      ...finishQ1(4),
+      type: 'slot-assigned',
+      match: { ...finishQ1(4).match, id: 'q3', roundId: 'round-2', homeTeamId: 'team-1', awayTeamId: null, winnerTeamId: null, loserTeamId: null, status: 'SCHEDULED' },
+    })!;
+
+    expect(afterSlot.version).toBe(4);
+    expect(afterSlot.qualificationRounds[0].matches[0].winnerTeam.id).toBe('team-1');
+    expect(afterSlot.qualificationRounds[1].matches[0].homeTeam.id).toBe('team-1');
+    expect(afterSlot.brackets[0]).toBe(contest.brackets[0]);
+    expect(afterSlot.teams).toBe(contest.teams);
+  });
+
+  it('devrait marquer une équipe éliminée', () => {
+    const merged = applyContestEvent(createContest(), {
+      type: 'team-eliminated', contestId: 'contest-test', version: 4,
+      team: { id: 'team-2', status: 'ELIMINATED', version: 4 },
+    })!;
+
+    expect(merged.teams.find(t => t.id === 'team-2')!.status).toBe('ELIMINATED');
+    expect(merged.teams.map(t => t.teamNumber)).toEqual([1, 2, 3, 4]);
+  });
+
+  it('devrait ignorer un événement périmé et signaler un trou de version', () => {
+    const contest = createContest();
+    expect(applyContestEvent(contest, finishQ1(2))).toBe(contest);
+    expect(applyContestEvent(contest, finishQ1(6))).toBeNull();
+  });
+});
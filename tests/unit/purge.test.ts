@@ -0,0 +1,122 @@
+import { describe, it, expect } from 'vitest';
+import { PrismaClient } from '@prisma/client';
+import { purgeContests } from '@/lib/purge';
+
+// ============================================================
+// UTILITAIRES DE TEST
+// ============================================================
+
+type Call = { table: string; op: string; args: any; inTransaction: boolean };
+
+/**
+ * Client factice: enregistre chaque requête et renvoie un nombre de lignes fixe
+ */
+function createRecordingDb(contestIds: string[], rowsPerTable = 3) {
+  const calls: Call[] = [];
+  let inTransaction = false;
+
+  const table = (name: string) => ({
+    findMany: async (args: any) => {
+      calls.push({ table: name, op: 'findMany', args, inTransaction });
+      return contestIds.map(id => ({ id }));
+    },
+    updateMany: async (args: any) => {
+      calls.push({ table: name, op: 'updateMany', args, inTransaction });
+      return { count: rowsPerTable };
+    },
+    deleteMany: async (args: any) => {
+      calls.push({ table: name, op: 'deleteMany', args, inTransaction });
+      return { count: name === 'contest' ? contestIds.length : rowsPerTable };
+    },
+  });
+
+  const tables = [
+    'contest', 'team', 'player', 'meleePlayer', 'qualificationRound', 'qualificationMatch',
+    'bracket', 'bracketRound', 'bracketMatch', 'contestTombstone', 'resultEvent', 'contestSnapshot',
+    'terrainAssignment', 'terrain',
+  ];
+  const db: any = Object.fromEntries(tables.map(name => [name, table(name)]));
+  db.$transaction = async (fn: (tx: unknown) => Promise<unknown>) => {
+    inTransaction = true;
+    try {
+      return await fn(db);
+    } finally {
+      inTransaction = false;
+    }
+  };
+  db.$executeRawUnsafe = async (sql: string) => {
+    calls.push({ table: '', op: sql, args: null, inTransaction });
+    return 0;
+  };
+
+  return { db: db as PrismaClient, calls };
+}
+
+// ============================================================
+// TESTS
+// ============================================================
+
+describe('Purge groupée', () => {
+  it('devrait combiner les critères de sélection', async () => {
+    const { db, calls } = createRecordingDb(['c1']);
+    const olderThan = new Date('2025-01-01');
+
+    await purgeContests(db, { ids: ['c1', 'c2'], status: 'FINISHED', olderThan });
+
+    expect(calls[0].args.where).toEqual({
+      id: { in: ['c1', 'c2'] },
+      status: 'FINISHED',
+      createdAt: { lt: olderThan },
+    });
+  });
+
+  it('devrait supprimer une fois par table, dans l\'ordre des clés étrangères', async () => {
+    const { db, calls } = createRecordingDb(['c1', 'c2', 'c3']);
+
+    const result = await purgeContests(db, { status: 'FINISHED' });
+
+    const deletes = calls.filter(c => c.op === 'deleteMany').map(c => c.table);
+    expect(deletes).toEqual([
+      'bracketMatch', 'bracketRound', 'bracket',
+      'qualificationMatch', 'qualificationRound',
+      'meleePlayer', 'player', 'team', 'contestTombstone',
+      'resultEvent', 'contestSnapshot',
+      'terrainAssignment', 'terrain',
+      'contest',
+    ]);
+    // Aucune référence entre matchs à lever: suppressions seules
+    expect(calls.some(c => c.op === 'updateMany')).toBe(false);
+    expect(calls.every(c => c.inTransaction)).toBe(true);
+
+    // Même requête quel que soit le nombre de concours
+    expect(calls.find(c => c.table === 'team')!.args.where).toEqual({
+      contestId: { in: ['c1', 'c2', 'c3'] },
+    });
+
+    expect(result.contestIds).toEqual(['c1', 'c2', 'c3']);
+    expect(result.rows.contest).toBe(3);
+    expect(result.totalRows).toBe(13 * 3 + 3);
+    expect(result.compacted).toBe(false);
+  });
+
+  it('devrait compacter la base hors transaction', async () => {
+    const { db, calls } = createRecordingDb(['c1']);
+
+    const result = await purgeContests(db, { ids: ['c1'] }, { compact: true });
+
+    const vacuum = calls.find(c => c.op === 'VACUUM');
+    expect(vacuum).toBeDefined();
+    expect(vacuum!.inTransaction).toBe(false);
+    expect(result.compacted).toBe(true);
+  });
+
+  it('ne devrait rien supprimer si aucun concours ne correspond', async () => {
+    const { db, calls } = createRecordingDb([]);
+
+    const result = await purgeContests(db, { status: 'FINISHED' }, { compact: true });
+
+    expect(calls.map(c => c.op)).toEqual(['findMany']);
+    expect(result.totalRows).toBe(0);
+    expect(result.compacted).toBe(false);
+  });
+});
@@ -0,0 +1,34 @@
+import { describe, it, expect } from 'vitest';
+import { contestRandom, createRandom, generateSeed } from '@/lib/random';
+
+const take = (random: () => number, count: number) => Array.from({ length: count }, () => random());
+
+describe('Hasard reproductible', () => {
+  it('devrait redonner la même suite pour la même graine', () => {
+    expect(take(createRandom(42), 100)).toEqual(take(createRandom(42), 100));
+    expect(take(createRandom(42), 10)).not.toEqual(take(createRandom(43), 10));
+  });
+
+  it('devrait produire des nombres répartis dans [0, 1)', () => {
+    const values = take(createRandom(7), 100000);
+    expect(values.every(v => v >= 0 && v < 1)).toBe(true);
+
+    // 10 classes de 10 000 valeurs attendues (écart type ~95)
+    const buckets = new Array(10).fill(0);
+    values.forEach(v => buckets[Math.floor(v * 10)]++);
+    buckets.forEach(count => expect(Math.abs(count - 10000)).toBeLessThan(500));
+  });
+
+  it('devrait dériver une suite différente pour chaque version du concours', () => {
+    const seed = 123456;
+    expect(take(contestRandom(seed, 5), 10)).toEqual(take(contestRandom(seed, 5), 10));
+    expect(take(contestRandom(seed, 5), 10)).not.toEqual(take(contestRandom(seed, 6), 10));
+  });
+
+  it('devrait tirer des graines entières positives', () => {
+    const seed = generateSeed();
+    expect(Number.isInteger(seed)).toBe(true);
+    expect(seed).toBeGreaterThanOrEqual(0);
+    expect(seed).toBeLessThan(2 ** 31);
+  });
+});
@@ -0,0 +1,241 @@
+import { describe, it, expect } from 'vitest';
+import { Team } from '@prisma/client';
+import { drawState, planDraw } from '@/lib/draw';
+import { ContestEngine, ContestState, isEmptyDiff } from '@/lib/engine';
+import { createRandom } from '@/lib/random';
+import {
+  ResultEventEntry,
+  decodeSnapshot,
+  diffContestStates,
+  encodeSnapshot,
+  replayResultEvents,
+  resultEventsFromDiff,
+  snapshotInterval,
+} from '@/lib/result-log';
+
+// ============================================================
+// UTILITAIRES DE TEST
+// ============================================================
+
+function createMockTeams(count: number): Team[] {
+  return Array.from({ length: count }, (_, i) => ({
+    id: `team-${i + 1}`,
+    contestId: 'contest-test',
+    teamNumber: i + 1,
+    status: 'REGISTERED' as const,
+    createdAt: new Date(),
+    name: `Équipe ${i + 1}`,
+    club: null,
+  }));
+}
+
+function initialState(teamCount: number, seed = 42): ContestState {
+  const teams = createMockTeams(teamCount);
+  return drawState('contest-test', planDraw('contest-test', teams, createRandom(seed)), teams);
+}
+
+// Contenu comparable (le moteur ne conserve pas l'ordre des matchs de bracket)
+const byId = <T extends { id: string }>(rows: T[]) => [...rows].sort((x, y) => x.id.localeCompare(y.id));
+const withoutVersions = (state: ContestState) => ({
+  qualificationMatches: byId(state.qualificationMatches.map(({ version: _v, ...m }) => m)),
+  bracketMatches: byId(state.bracketMatches.map(({ version: _v, ...m }) => m)),
+  teams: byId(state.teams.map(({ version: _v, ...t }) => t)),
+  brackets: state.brackets?.map(b => ({ ...b, rounds: [...b.rounds].sort((x, y) => x.roundNumber - y.roundNumber) })),
+});
+
+/**
+ * Une écriture = un moteur (comme une route): applique `write` à l'état,
+ * ajoute ses événements au journal et retourne le nouvel état
+ */
+function commit(state: ContestState, journal: ResultEventEntry[], write: (engine: ContestEngine) => void): ContestState {
+  const engine = new ContestEngine(state, { random: createRandom(journal.length + 1) });
+  write(engine);
+  const next = engine.getState();
+  journal.push(...resultEventsFromDiff(engine.getDiff(), next));
+  return next;
+}
+
+/**
+ * Joue tout le concours, une écriture par résultat (gagnant au hasard)
+ */
+function playWholeContest(state: ContestState, journal: ResultEventEntry[]): ContestState {
+  const random = createRandom(7);
+  const playable = (m: { status: string; isBye: boolean; homeTeamId: string | null; awayTeamId: string | null }) =>
+    m.status !== 'FINISHED' && !m.isBye && m.homeTeamId && m.awayTeamId;
+
+  for (let guard = 0; guard < 10000; guard++) {
+    const qualification = state.qualificationMatches.find(playable);
+    if (qualification) {
+      const winner = random() < 0.5 ? qualification.homeTeamId : qualification.awayTeamId;
+      state = commit(state, journal, engine => engine.recordQualificationResult(qualification.id, winner));
+      if (qualification.roundNumber === 1 && !state.qualificationMatches.some(m => m.roundNumber === 1 && m.status !== 'FINISHED')) {
+        state = commit(state, journal, engine => engine.completeRound2());
+      }
+      continue;
+    }
+    const bracket = state.bracketMatches.find(playable);
+    if (bracket) {
+      const winner = random() < 0.5 ? bracket.homeTeamId : bracket.awayTeamId;
+      state = commit(state, journal, engine => engine.recordBracketResult(bracket.id, winner));
+      continue;
+    }
+    return state;
+  }
+  return state;
+}
+
+// ============================================================
+// TESTS
+// ============================================================
+
+describe('Instantanés', () => {
+  it('devrait redonner le même état après encodage et décodage', () => {
+    const state = initialState(37);
+    const decoded = decodeSnapshot('contest-test', encodeSnapshot(state));
+
+    expect(withoutVersions(decoded)).toEqual(withoutVersions(state));
+    expect(decoded.contestId).toBe('contest-test');
+  });
+
+  it('devrait conserver la taille et les tours créés des brackets', () => {
+    const final = playWholeContest(initialState(37), []);
+    const decoded = decodeSnapshot('contest-test', encodeSnapshot(final));
+
+    expect(final.brackets!.every(b => b.size !== null && b.rounds.length > 0)).toBe(true);
+    expect(withoutVersions(decoded)).toEqual(withoutVersions(final));
+  });
+
+  it('devrait être plus compact que l\'état en JSON', () => {
+    const state = initialState(256);
+    expect(encodeSnapshot(state).length).toBeLessThan(JSON.stringify(state).length / 2);
+  });
+
+  it('devrait refuser un format inconnu', () => {
+    expect(() => decodeSnapshot('contest-test', JSON.stringify({ format: 99, q: [], b: [], t: [] }))).toThrow();
+  });
+});
+
+describe('resultEventsFromDiff', () => {
+  it('devrait classer un résultat et le placement qui en découle', () => {
+    const journal: ResultEventEntry[] = [];
+    const state = initialState(8);
+    const match = state.qualificationMatches.find(m => m.roundNumber === 1 && !m.isBye)!;
+
+    commit(state, journal, engine => engine.recordQualificationResult(match.id, match.homeTeamId));
+
+    expect(journal[0]).toMatchObject({ type: 'RESULT', entity: 'QUALIFICATION_MATCH', entityId: match.id });
+    expect(journal[0].changes).toMatchObject({ winnerTeamId: match.homeTeamId, status: 'FINISHED' });
+    expect(journal.filter(e => e.type === 'SLOT_ASSIGNED').length).toBeGreaterThan(0);
+    expect(journal.every(e => e.entity !== 'TEAM')).toBe(true);
+  });
+
+  it('devrait journaliser les éliminations des équipes', () => {
+    const journal: ResultEventEntry[] = [];
+    playWholeContest(initialState(13), journal);
+
+    const types = new Set(journal.map(e => e.type));
+    expect(types.has('RESULT')).toBe(true);
+    expect(types.has('ELIMINATION')).toBe(true);
+    expect(journal.filter(e => e.type === 'ELIMINATION').every(e => e.entity === 'TEAM')).toBe(true);
+  });
+
+  it('devrait journaliser la taille des brackets et les lignes créées avant leurs écritures', () => {
+    const journal: ResultEventEntry[] = [];
+    const final = playWholeContest(initialState(13), journal);
+
+    expect(journal.filter(e => e.type === 'BRACKET_SIZED').map(e => e.entity)).toEqual(['BRACKET', 'BRACKET']);
+    const rounds = final.brackets!.flatMap(b => b.rounds);
+    expect(journal.filter(e => e.type === 'ROUND_CREATED')).toHaveLength(rounds.length);
+    const created = journal.filter(e => e.type === 'MATCH_CREATED');
+    expect(created).toHaveLength(final.bracketMatches.length);
+
+    // Une ligne est créée avant tout résultat la concernant
+    for (const { entityId } of created) {
+      expect(journal.find(e => e.entityId === entityId)!.type).toBe('MATCH_CREATED');
+    }
+  });
+});
+
+describe('Rejeu du journal', () => {
+  it('devrait reconstruire un concours de 256 équipes depuis l\'instantané du tirage', () => {
+    const journal: ResultEventEntry[] = [];
+    const initial = initialState(256);
+    const snapshot = encodeSnapshot(initial);
+
+    const final = playWholeContest(initial, journal);
+    const rebuilt = replayResultEvents(decodeSnapshot('contest-test', snapshot), journal);
+
+    expect(final.bracketMatches.every(m => m.status === 'FINISHED' || !m.homeTeamId || !m.awayTeamId)).toBe(true);
+    expect(withoutVersions(rebuilt)).toEqual(withoutVersions(final));
+  });
+
+  it('devrait reprendre depuis un instantané intermédiaire', () => {
+    const journal: ResultEventEntry[] = [];
+    let state = initialState(32);
+    const match = state.qualificationMatches.find(m => m.roundNumber === 1 && !m.isBye)!;
+    state = commit(state, journal, engine => engine.recordQualificationResult(match.id, match.awayTeamId));
+
+    const middle = encodeSnapshot(state);
+    const eventsBefore = journal.length;
+    const final = playWholeContest(state, journal);
+
+    const rebuilt = replayResultEvents(decodeSnapshot('contest-test', middle), journal.slice(eventsBefore));
+    expect(withoutVersions(rebuilt)).toEqual(withoutVersions(final));
+  });
+
+  it('ne devrait pas modifier l\'état de départ', () => {
+    const journal: ResultEventEntry[] = [];
+    const initial = initialState(16);
+    const before = JSON.stringify(initial);
+    playWholeContest(initial, journal);
+
+    replayResultEvents(initial, journal);
+    expect(JSON.stringify(initial)).toBe(before);
+  });
+});
+
+describe('diffContestStates', () => {
+  it('ne devrait rien écrire quand les tables sont à jour', () => {
+    const journal: ResultEventEntry[] = [];
+    const final = playWholeContest(initialState(24), journal);
+
+    const { diff, missingQualificationMatches } = diffContestStates(final, replayResultEvents(final, []));
+    expect(isEmptyDiff(diff)).toBe(true);
+    expect(missingQualificationMatches).toHaveLength(0);
+  });
+
+  it('devrait réparer uniquement les lignes altérées', () => {
+    const journal: ResultEventEntry[] = [];
+    const initial = initialState(16);
+    const final = playWholeContest(initial, journal);
+    const rebuilt = replayResultEvents(initial, journal);
+
+    // Tables altérées: un résultat effacé, un match supprimé, une équipe réintégrée
+    const [erased, removed] = final.qualificationMatches.filter(m => !m.isBye);
+    const eliminated = final.teams.find(t => t.status === 'ELIMINATED')!;
+    const corrupted: ContestState = {
+      ...final,
+      qualificationMatches: final.qualificationMatches
+        .filter(m => m.id !== removed.id)
+        .map(m => m.id === erased.id ? { ...m, winnerTeamId: null, status: 'SCHEDULED', version: 12 } : m),
+      teams: final.teams.map(t => t.id === eliminated.id ? { ...t, status: 'REGISTERED' } : t),
+    };
+
+    const { diff, missingQualificationMatches } = diffContestStates(corrupted, rebuilt);
+    expect(diff.qualificationMatches).toEqual([
+      { id: erased.id, version: 12, changes: { winnerTeamId: erased.winnerTeamId, status: 'FINISHED' } },
+    ]);
+    expect(diff.bracketMatches).toHaveLength(0);
+    expect(diff.teams).toEqual([{ id: eliminated.id, version: eliminated.version, changes: { status: 'ELIMINATED' } }]);
+    expect(missingQualificationMatches.map(m => m.id)).toEqual([removed.id]);
+  });
+});
+
+describe('snapshotInterval', () => {
+  it('devrait lire RESULT_SNAPSHOT_INTERVAL', () => {
+    expect(snapshotInterval({})).toBe(200);
+    expect(snapshotInterval({ RESULT_SNAPSHOT_INTERVAL: '50' })).toBe(50);
+    expect(snapshotInterval({ RESULT_SNAPSHOT_INTERVAL: '0' })).toBe(200);
+    expect(snapshotInterval({ RESULT_SNAPSHOT_INTERVAL: 'abc' })).toBe(200);
+  });
+});
@@ -0,0 +1,340 @@
+import { describe, it, expect } from 'vitest';
+import { Team } from '@prisma/client';
+import { drawState, planDraw } from '@/lib/draw';
+import { BracketMatchState, ContestEngine, ContestState, QualificationMatchState, ResultError } from '@/lib/engine';
+import { createRandom } from '@/lib/random';
+import {
+  AssignmentState,
+  isMatchReady,
+  previewNextMatches,
+  PriorityQueue,
+  scheduleMatches,
+  TerrainState,
+} from '@/lib/scheduler';
+import { terrainStats } from '@/lib/terrains';
+
+// ============================================================
+// UTILITAIRES DE TEST
+// ============================================================
+
+function createMockTeams(count: number): Team[] {
+  return Array.from({ length: count }, (_, i) => ({
+    id: `team-${i + 1}`,
+    contestId: 'contest-test',
+    teamNumber: i + 1,
+    status: 'REGISTERED' as const,
+    createdAt: new Date(),
+    name: `Équipe ${i + 1}`,
+    club: null,
+  }));
+}
+
+function createTerrains(count: number, mainNumber?: number): TerrainState[] {
+  return Array.from({ length: count }, (_, i) => ({
+    id: `terrain-${i + 1}`,
+    number: i + 1,
+    isMain: i + 1 === mainNumber,
+    position: (i + 1) * 10,
+  }));
+}
+
+function qualificationMatch(id: string, overrides: Partial<QualificationMatchState> = {}): QualificationMatchState {
+  return {
+    id,
+    roundId: 'round-1',
+    roundNumber: 1,
+    matchNumber: 1,
+    groupType: null,
+    homeTeamId: `${id}-home`,
+    awayTeamId: `${id}-away`,
+    winnerTeamId: null,
+    loserTeamId: null,
+    status: 'SCHEDULED',
+    isBye: false,
+    version: 1,
+    ...overrides,
+  };
+}
+
+function bracketMatch(id: string, overrides: Partial<BracketMatchState> = {}): BracketMatchState {
+  return {
+    id,
+    roundId: 'bracket-round',
+    bracketType: 'A',
+    roundNumber: 1,
+    matchNumber: 1,
+    homeTeamId: `${id}-home`,
+    awayTeamId: `${id}-away`,
+    winnerTeamId: null,
+    loserTeamId: null,
+    status: 'SCHEDULED',
+    isBye: false,
+    version: 1,
+    ...overrides,
+  };
+}
+
+function createState(
+  qualificationMatches: QualificationMatchState[],
+  bracketMatches: BracketMatchState[] = []
+): ContestState {
+  return { contestId: 'contest-test', qualificationMatches, bracketMatches, teams: [] };
+}
+
+function applySchedule(assignments: AssignmentState[], schedule: ReturnType<typeof scheduleMatches>) {
+  const released = new Set(schedule.released);
+  return [
+    ...assignments.map(a => (released.has(a.matchId) ? { ...a, released: true } : a)),
+    ...schedule.assigned.map(a => ({ ...a, released: false })),
+  ];
+}
+
+// ============================================================
+// TESTS
+// ============================================================
+
+describe('PriorityQueue', () => {
+  it('devrait rendre les éléments dans l\'ordre de priorité', () => {
+    const queue = new PriorityQueue<number>((a, b) => a - b);
+    const random = createRandom(7);
+    const values = Array.from({ length: 200 }, () => Math.floor(random() * 1000));
+    values.forEach(v => queue.push(v));
+
+    const popped: number[] = [];
+    while (queue.size > 0) popped.push(queue.pop()!);
+
+    expect(popped).toEqual([...values].sort((a, b) => a - b));
+    expect(queue.pop()).toBeUndefined();
+  });
+});
+
+describe('scheduleMatches', () => {
+  it('devrait appeler les matchs prêts depuis le plus longtemps en premier', () => {
+    const state = createState([
+      qualificationMatch('recent', { matchNumber: 1, version: 5 }),
+      qualificationMatch('ancien', { matchNumber: 2, version: 2 }),
+      qualificationMatch('incomplet', { matchNumber: 3, version: 1, awayTeamId: null }),
+      qualificationMatch('bye', { matchNumber: 4, version: 1, awayTeamId: null, isBye: true }),
+    ]);
+
+    const schedule = scheduleMatches(state, createTerrains(1), []);
+
+    expect(schedule.assigned).toEqual([{ matchId: 'ancien', terrainId: 'terrain-1', phase: 'QUALIFICATION' }]);
+    expect(isMatchReady(state.qualificationMatches[2])).toBe(false);
+    expect(isMatchReady(state.qualificationMatches[3])).toBe(false);
+  });
+
+  it('devrait libérer le terrain d\'un match terminé et y appeler le suivant', () => {
+    const terrains = createTerrains(1);
+    const state = createState([
+      qualificationMatch('m1', { status: 'FINISHED' }),
+      qualificationMatch('m2', { matchNumber: 2 }),
+    ]);
+    const assignments: AssignmentState[] = [
+      { terrainId: 'terrain-1', matchId: 'm1', phase: 'QUALIFICATION', released: false },
+    ];
+
+    const schedule = scheduleMatches(state, terrains, assignments);
+
+    expect(schedule.released).toEqual(['m1']);
+    expect(schedule.assigned.map(a => a.matchId)).toEqual(['m2']);
+  });
+
+  it('ne devrait pas réattribuer un match déjà sur un terrain', () => {
+    const state = createState([qualificationMatch('m1'), qualificationMatch('m2', { matchNumber: 2 })]);
+    const assignments: AssignmentState[] = [
+      { terrainId: 'terrain-1', matchId: 'm1', phase: 'QUALIFICATION', released: false },
+    ];
+
+    const schedule = scheduleMatches(state, createTerrains(3), assignments);
+
+    expect(schedule.released).toEqual([]);
+    expect(schedule.assigned).toHaveLength(1);
+    expect(schedule.assigned[0]).toMatchObject({ matchId: 'm2' });
+    expect(schedule.assigned[0].terrainId).not.toBe('terrain-1');
+  });
+
+  it('devrait rappeler un match libéré redevenu prêt', () => {
+    // Reconstruction depuis le journal: m1, terminé et libéré, est de nouveau à jouer
+    const state = createState([qualificationMatch('m1'), qualificationMatch('m2', { matchNumber: 2, status: 'FINISHED' })]);
+    const assignments: AssignmentState[] = [
+      { terrainId: 'terrain-1', matchId: 'm1', phase: 'QUALIFICATION', released: true },
+      { terrainId: 'terrain-2', matchId: 'm2', phase: 'QUALIFICATION', released: true },
+    ];
+
+    const schedule = scheduleMatches(state, createTerrains(2), assignments);
+
+    expect(schedule.released).toEqual([]);
+    expect(schedule.assigned.map(a => a.matchId)).toEqual(['m1']);
+    expect(previewNextMatches(state, createTerrains(2), applySchedule(assignments, schedule)).size).toBe(0);
+  });
+
+  it('devrait réserver le terrain d\'honneur à la finale du tableau A', () => {
+    const terrains = createTerrains(3, 1);
+    const state = createState(
+      [qualificationMatch('q1', { version: 1 })],
+      [
+        bracketMatch('demi', { roundNumber: 1, version: 1, status: 'FINISHED' }),
+        bracketMatch('finale', { roundNumber: 2, version: 9 }),
+        bracketMatch('finale-b', { bracketType: 'B', roundNumber: 1, version: 2 }),
+      ]
+    );
+
+    // Terrain d'honneur occupé: la finale attend, les autres matchs prennent les autres terrains
+    const busy: AssignmentState[] = [
+      { terrainId: 'terrain-1', matchId: 'autre', phase: 'BRACKET', released: false },
+    ];
+    const waiting = scheduleMatches(
+      createState(state.qualificationMatches, [...state.bracketMatches, bracketMatch('autre', { bracketType: 'B', roundNumber: 5, matchNumber: 9 })]),
+      terrains,
+      busy
+    );
+    expect(waiting.assigned.map(a => a.matchId).sort()).toEqual(['finale-b', 'q1']);
+
+    // Terrain d'honneur libre: la finale y passe en premier, malgré sa version plus récente
+    const schedule = scheduleMatches(state, terrains, []);
+    expect(schedule.assigned[0]).toEqual({ matchId: 'finale', terrainId: 'terrain-1', phase: 'BRACKET' });
+    expect(schedule.assigned.slice(1).every(a => a.terrainId !== 'terrain-1')).toBe(true);
+  });
+
+  it('devrait garder le terrain d\'honneur pour la fin quand les distances sont égales', () => {
+    const schedule = scheduleMatches(createState([qualificationMatch('m1')]), createTerrains(2, 1), []);
+    expect(schedule.assigned[0].terrainId).toBe('terrain-2');
+  });
+
+  it('devrait limiter la marche des équipes depuis leur dernier terrain', () => {
+    const terrains = createTerrains(6);
+    const state = createState([
+      qualificationMatch('t1', { homeTeamId: 'a', awayTeamId: 'b', status: 'FINISHED' }),
+      qualificationMatch('t2', { matchNumber: 2, homeTeamId: 'c', awayTeamId: 'd', status: 'FINISHED' }),
+      qualificationMatch('r2', { roundNumber: 2, homeTeamId: 'a', awayTeamId: 'c' }),
+    ]);
+    const assignments: AssignmentState[] = [
+      { terrainId: 'terrain-5', matchId: 't1', phase: 'QUALIFICATION', released: true },
+      { terrainId: 'terrain-6', matchId: 't2', phase: 'QUALIFICATION', released: true },
+    ];
+
+    const schedule = scheduleMatches(state, terrains, assignments);
+
+    // Terrains 5 et 6: 10 m de marche au total, contre 30 m ou plus ailleurs
+    expect(['terrain-5', 'terrain-6']).toContain(schedule.assigned[0].terrainId);
+  });
+
+  it('ne devrait pas appeler une équipe déjà sur un terrain', () => {
+    const state = createState([
+      qualificationMatch('m1', { homeTeamId: 'a', awayTeamId: 'b' }),
+      qualificationMatch('m2', { matchNumber: 2, homeTeamId: 'a', awayTeamId: 'c' }),
+    ]);
+    const assignments: AssignmentState[] = [
+      { terrainId: 'terrain-1', matchId: 'm1', phase: 'QUALIFICATION', released: false },
+    ];
+
+    expect(scheduleMatches(state, createTerrains(2), assignments).assigned).toEqual([]);
+  });
+
+  it('devrait prévoir le prochain match de chaque terrain occupé', () => {
+    const state = createState([
+      qualificationMatch('m1'),
+      qualificationMatch('m2', { matchNumber: 2 }),
+      qualificationMatch('m3', { matchNumber: 3, version: 2 }),
+    ]);
+    const assignments: AssignmentState[] = [
+      { terrainId: 'terrain-1', matchId: 'm1', phase: 'QUALIFICATION', released: false },
+      { terrainId: 'terrain-2', matchId: 'm2', phase: 'QUALIFICATION', released: false },
+    ];
+
+    const next = previewNextMatches(state, createTerrains(2), assignments);
+
+    expect(Array.from(next.values())).toEqual(['m3']);
+  });
+
+  it('devrait faire jouer tout un concours sur un nombre fixe de terrains', () => {
+    const teams = createMockTeams(37);
+    let state = drawState('contest-test', planDraw('contest-test', teams, createRandom(11)), teams);
+    const terrains = createTerrains(6, 1);
+    let assignments: AssignmentState[] = [];
+
+    for (let version = 1; version < 1000; version++) {
+      assignments = applySchedule(assignments, scheduleMatches(state, terrains, assignments));
+      const playing = assignments.filter(a => !a.released);
+
+      // Jamais deux matchs sur un terrain
+      expect(new Set(playing.map(a => a.terrainId)).size).toBe(playing.length);
+      if (playing.length === 0) break;
+
+      // Le match appelé depuis le plus longtemps se termine (comme commitEngineChanges:
+      // un moteur par écriture, lignes modifiées portées à la nouvelle version)
+      const match = [...state.qualificationMatches, ...state.bracketMatches].find(m => m.id === playing[0].matchId)!;
+      const engine = new ContestEngine({ ...state, seed: 11, version });
+      engine.recordResult(match.id, match.homeTeamId);
+      const changed = engine.getChangedMatches();
+      const changedIds = new Set([...changed.qualificationMatches, ...changed.bracketMatches].map(m => m.id));
+      state = engine.getState();
+      for (const m of [...state.qualificationMatches, ...state.bracketMatches]) {
+        if (changedIds.has(m.id)) m.version = version;
+      }
+    }
+
+    const final = state;
+    const played = [...final.qualificationMatches, ...final.bracketMatches].filter(m => !m.isBye);
+    expect(played.every(m => m.status === 'FINISHED')).toBe(true);
+    expect(new Set(assignments.map(a => a.matchId)).size).toBe(played.length);
+
+    const finalA = final.bracketMatches
+      .filter(m => m.bracketType === 'A')
+      .reduce((last, m) => (m.roundNumber > last.roundNumber ? m : last));
+    expect(assignments.find(a => a.matchId === finalA.id)!.terrainId).toBe('terrain-1');
+  });
+
+  it('devrait refuser la correction d\'un match dont l\'aval est en cours sur un terrain', () => {
+    const teams = createMockTeams(16);
+    const engine = new ContestEngine(drawState('contest-test', planDraw('contest-test', teams, createRandom(5)), teams));
+    for (const m of engine.getState().qualificationMatches) {
+      if (m.roundNumber === 1 && !m.isBye) engine.recordResult(m.id, m.homeTeamId);
+    }
+    const state = engine.getState();
+    const schedule = scheduleMatches(state, createTerrains(2), []);
+
+    // Match du Tour 1 dont une équipe joue maintenant sur un terrain
+    const called = state.qualificationMatches.find(m => m.id === schedule.assigned[0].matchId)!;
+    const round1 = state.qualificationMatches.find(
+      m => m.roundNumber === 1 && !m.isBye && [m.winnerTeamId, m.loserTeamId].includes(called.homeTeamId)
+    )!;
+
+    const playing = new ContestEngine({ ...state, calledMatchIds: schedule.assigned.map(a => a.matchId) });
+    expect(() => playing.correctResult(round1.id, round1.loserTeamId)).toThrow(/en cours sur un terrain/);
+    try {
+      playing.correctResult(round1.id, round1.loserTeamId);
+    } catch (error) {
+      expect((error as ResultError).status).toBe(409);
+    }
+
+    // Terrain libéré: la correction passe
+    const released = new ContestEngine({ ...state, calledMatchIds: [] });
+    expect(released.correctResult(round1.id, round1.loserTeamId)).toBe('QUALIFICATION');
+  });
+});
+
+describe('terrainStats', () => {
+  it('devrait mesurer le débit et l\'occupation des terrains', () => {
+    const at = (minutes: number) => new Date(Date.UTC(2026, 5, 1, 9, minutes));
+    const stats = terrainStats(
+      [
+        { assignedAt: at(0), releasedAt: at(30) },
+        { assignedAt: at(0), releasedAt: at(45) },
+        { assignedAt: at(30), releasedAt: null },
+      ],
+      2,
+      at(60)
+    );
+
+    expect(stats.playedMatches).toBe(2);
+    expect(stats.matchesPerHour).toBe(2);
+    // 30 + 45 + 30 minutes occupées sur 2 × 60
+    expect(stats.utilisation).toBe(0.875);
+  });
+
+  it('devrait renvoyer des zéros sans attribution', () => {
+    expect(terrainStats([], 4)).toEqual({ playedMatches: 0, matchesPerHour: 0, utilisation: 0 });
+  });
+});
@@ -0,0 +1,108 @@
+import { describe, it, expect } from 'vitest';
+import { RandomSet, SlotIndex, SlotMatch } from '@/lib/slot-index';
+
+interface TestMatch extends SlotMatch {
+  group: string;
+}
+
+function createMatch(id: string, overrides: Partial<TestMatch> = {}): TestMatch {
+  return {
+    id,
+    group: 'A',
+    roundNumber: 1,
+    homeTeamId: null,
+    awayTeamId: null,
+    status: 'SCHEDULED',
+    isBye: false,
+    ...overrides,
+  };
+}
+
+describe('RandomSet', () => {
+  it('devrait rester cohérent après des retraits au milieu', () => {
+    const set = new RandomSet<number>();
+    for (let i = 0; i < 10; i++) set.add(i);
+
+    set.delete(3);
+    set.delete(0);
+    set.delete(9);
+    set.delete(42);
+
+    expect(set.size).toBe(7);
+    expect(set.has(3)).toBe(false);
+    expect(set.has(8)).toBe(true);
+
+    // Chaque élément restant peut être tiré
+    const picked = new Set<number>();
+    for (let i = 0; i < set.size; i++) {
+      picked.add(set.pick(() => (i + 0.5) / set.size)!);
+    }
+    expect(Array.from(picked).sort()).toEqual([1, 2, 4, 5, 6, 7, 8]);
+  });
+
+  it('devrait renvoyer undefined quand il est vide', () => {
+    expect(new RandomSet<string>().pick(Math.random)).toBeUndefined();
+  });
+});
+
+describe('SlotIndex', () => {
+  it('devrait indexer les slots libres par groupe et par tour', () => {
+    const index = new SlotIndex<TestMatch>(m => m.group);
+    index.add(createMatch('m1'));
+    index.add(createMatch('m2', { homeTeamId: 'team-1' }));
+    index.add(createMatch('m3', { group: 'B' }));
+    index.add(createMatch('m4', { roundNumber: 2 }));
+    index.add(createMatch('m5', { status: 'FINISHED', homeTeamId: 'team-2', awayTeamId: 'team-3' }));
+
+    expect(index.openSlotCount('A', 1)).toBe(3);
+    expect(index.openSlotCount('B', 1)).toBe(2);
+    expect(index.openSlotCount('A', 2)).toBe(2);
+    expect(index.isPlaced('A', 'team-1')).toBe(true);
+    expect(index.isPlaced('B', 'team-1')).toBe(false);
+  });
+
+  it('devrait suivre une modification (retrait, modification, ajout)', () => {
+    const index = new SlotIndex<TestMatch>(m => m.group);
+    const match = createMatch('m1');
+    index.add(match);
+
+    const chosen = index.pickSlot('A', 1, () => 0)!;
+    index.remove(match);
+    chosen.match[chosen.slot === 'home' ? 'homeTeamId' : 'awayTeamId'] = 'team-1';
+    index.add(match);
+
+    expect(index.openSlotCount('A', 1)).toBe(1);
+    expect(index.positionsOf('A', 'team-1')).toEqual(['m1']);
+  });
+
+  it('devrait garder une équipe placée à la fois dans un bye et le match suivant', () => {
+    const index = new SlotIndex<TestMatch>(m => m.group);
+    const bye = createMatch('bye', { isBye: true });
+    const next = createMatch('next', { roundNumber: 2 });
+    index.add(bye);
+    index.add(next);
+
+    expect(index.pickBye('A', 1, () => 0)).toBe(bye);
+
+    for (const match of [bye, next]) {
+      index.remove(match);
+      match.homeTeamId = 'team-1';
+      index.add(match);
+    }
+    expect(index.pickBye('A', 1, () => 0)).toBeNull();
+
+    // Le match suivant est rejoué: l'équipe reste connue grâce au bye
+    index.remove(next);
+    next.homeTeamId = null;
+    index.add(next);
+    expect(index.isPlaced('A', 'team-1')).toBe(true);
+    expect(index.positionsOf('A', 'team-1')).toEqual(['bye']);
+  });
+
+  it('devrait ignorer les matchs hors groupe', () => {
+    const index = new SlotIndex<TestMatch>(m => (m.roundNumber === 2 ? m.group : null));
+    index.add(createMatch('m1'));
+    expect(index.openSlotCount('A', 1)).toBe(0);
+    expect(index.pickSlot('A', 1, Math.random)).toBeNull();
+  });
+});
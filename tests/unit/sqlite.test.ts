@@ -0,0 +1,64 @@
+import { describe, it, expect } from 'vitest';
+import { DbStats, readSqliteConfig, sqliteUrl, writerPragmas } from '@/lib/sqlite';
+
+describe('Configuration SQLite', () => {
+  it('devrait activer les réglages pour une base fichier', () => {
+    const config = readSqliteConfig({ DATABASE_URL: 'file:./dev.db' });
+
+    expect(config.enabled).toBe(true);
+    expect(config.synchronous).toBe('NORMAL');
+    expect(writerPragmas(config)).toEqual([
+      'PRAGMA journal_mode = WAL',
+      'PRAGMA busy_timeout = 10000',
+      'PRAGMA synchronous = NORMAL',
+    ]);
+  });
+
+  it('devrait pouvoir être désactivée (mesure de référence) ou ignorée hors SQLite', () => {
+    expect(readSqliteConfig({ DATABASE_URL: 'file:./dev.db', DB_TUNING: 'off' }).enabled).toBe(false);
+    expect(readSqliteConfig({ DATABASE_URL: 'postgresql://localhost/petanque' }).enabled).toBe(false);
+  });
+
+  it('devrait ignorer un niveau synchronous inconnu', () => {
+    const config = readSqliteConfig({ DATABASE_URL: 'file:./dev.db', DB_SYNCHRONOUS: 'full' });
+    expect(config.synchronous).toBe('FULL');
+    expect(readSqliteConfig({ DATABASE_URL: 'file:./dev.db', DB_SYNCHRONOUS: 'fast' }).synchronous).toBe('NORMAL');
+  });
+
+  it('devrait ajouter les paramètres de connexion à l\'URL', () => {
+    expect(sqliteUrl('file:./dev.db', 1, 10000)).toBe('file:./dev.db?connection_limit=1&socket_timeout=10');
+    expect(sqliteUrl('file:./dev.db?connection_limit=9', 4, 2500)).toBe(
+      'file:./dev.db?connection_limit=4&socket_timeout=3'
+    );
+  });
+});
+
+describe('Statistiques du stockage', () => {
+  it('devrait agréger les durées par client', () => {
+    const stats = new DbStats();
+    for (let i = 1; i <= 100; i++) stats.recordQuery('read', i);
+    stats.recordQuery('write', 250);
+    stats.recordLockWait(12);
+    stats.recordRetry();
+
+    const snapshot = stats.snapshot();
+    expect(snapshot.queries.read.count).toBe(100);
+    expect(snapshot.queries.read.p50Ms).toBe(51);
+    expect(snapshot.queries.read.p95Ms).toBe(96);
+    expect(snapshot.queries.read.slow).toBe(1);
+    expect(snapshot.queries.write.maxMs).toBe(250);
+    expect(snapshot.writeLockWait.meanMs).toBe(12);
+    expect(snapshot.retries).toBe(1);
+  });
+
+  it('devrait ne garder que les derniers échantillons pour les percentiles', () => {
+    const stats = new DbStats();
+    for (let i = 0; i < 1000; i++) stats.recordQuery('write', 1000);
+    for (let i = 0; i < 1000; i++) stats.recordQuery('write', 1);
+
+    const snapshot = stats.snapshot().queries.write;
+    expect(snapshot.count).toBe(2000);
+    expect(snapshot.p99Ms).toBe(1);
+    expect(snapshot.maxMs).toBe(1000);
+  });
+});
@@ -0,0 +1,181 @@
+import { describe, it, expect } from 'vitest';
+import { MeleePlayer, Prisma } from '@prisma/client';
+import {
+  collectTeamRows,
+  formMeleeTeams,
+  insertTeams,
+  parseCsvLine,
+  parseTeamRows,
+  readLines,
+  RegistrationClosedError,
+  TeamImportFormat,
+} from '@/lib/teams';
+
+// ============================================================
+// UTILITAIRES DE TEST
+// ============================================================
+
+async function* chunks(...parts: string[]) {
+  const encoder = new TextEncoder();
+  for (const part of parts) yield encoder.encode(part);
+}
+
+async function collect<T>(iterable: AsyncIterable<T>): Promise<T[]> {
+  const items: T[] = [];
+  for await (const item of iterable) items.push(item);
+  return items;
+}
+
+function importRows(content: string, format: TeamImportFormat, teamType = 'DOUBLETTE') {
+  return collectTeamRows(parseTeamRows(readLines(chunks(content)), format), teamType);
+}
+
+/**
+ * Transaction factice: enregistre les insertions groupées
+ */
+function createRecordingTx(status = 'DRAFT', lastTeamNumber: number | null = 4) {
+  const calls: { op: string; args: any }[] = [];
+  const tx = {
+    contest: {
+      update: async (args: any) => {
+        calls.push({ op: 'contest.update', args });
+        return { version: 8, status };
+      },
+    },
+    team: {
+      findFirst: async (args: any) => {
+        calls.push({ op: 'team.findFirst', args });
+        return lastTeamNumber === null ? null : { teamNumber: lastTeamNumber };
+      },
+      createMany: async (args: any) => {
+        calls.push({ op: 'team.createMany', args });
+        return { count: args.data.length };
+      },
+    },
+    player: {
+      createMany: async (args: any) => {
+        calls.push({ op: 'player.createMany', args });
+        return { count: args.data.length };
+      },
+    },
+  };
+  return { tx: tx as unknown as Prisma.TransactionClient, calls };
+}
+
+// ============================================================
+// TESTS
+// ============================================================
+
+describe('Import d\'équipes', () => {
+  it('devrait découper les lignes à cheval sur plusieurs morceaux', async () => {
+    const lines = await collect(readLines(chunks('a,b\r\nc', 'd\n\né', '\n', 'f')));
+    expect(lines).toEqual(['a,b', 'cd', '', 'é', 'f']);
+  });
+
+  it('devrait lire les champs CSV entre guillemets', () => {
+    expect(parseCsvLine('"Les ""Pointeurs""", "Club, Nice" ,Ana', ',')).toEqual([
+      'Les "Pointeurs"',
+      'Club, Nice',
+      'Ana',
+    ]);
+  });
+
+  it('devrait importer un CSV avec en-têtes français et séparateur ;', async () => {
+    const csv = '\uFEFFNom;Club;Joueur 1;Joueur 2\nLes Carreaux;Boule Niçoise;Ana;Léo\n\n;;Max;Zoé\n';
+    const { teams, errors } = await importRows(csv, 'csv');
+
+    expect(errors).toEqual([]);
+    expect(teams).toEqual([
+      {
+        name: 'Les Carreaux',
+        club: 'Boule Niçoise',
+        players: [{ name: 'Ana', order: 1 }, { name: 'Léo', order: 2 }],
+      },
+      { players: [{ name: 'Max', order: 1 }, { name: 'Zoé', order: 2 }] },
+    ]);
+  });
+
+  it('devrait signaler chaque ligne invalide avec son numéro', async () => {
+    const ndjson = [
+      JSON.stringify({ players: [{ name: 'Ana', order: 1 }, { name: 'Léo', order: 2 }] }),
+      '{ pas du json',
+      JSON.stringify({ players: [{ name: 'Max', order: 1 }] }),
+      JSON.stringify({ players: [{ name: '', order: 1 }, { name: 'Zoé', order: 2 }] }),
+    ].join('\n');
+    const { teams, errors } = await importRows(ndjson, 'ndjson');
+
+    expect(teams).toHaveLength(1);
+    expect(errors.map(e => e.line)).toEqual([2, 3, 4]);
+    expect(errors[0].error).toBe('JSON invalide');
+    expect(errors[1].error).toBe('Une équipe DOUBLETTE doit avoir 2 joueur(s)');
+    expect(errors[2].error).toContain('players.0.name');
+  });
+
+  it('devrait refuser un CSV sans colonne de joueur', async () => {
+    const { teams, errors } = await importRows('equipe,ville\nA,Nice\n', 'csv');
+    expect(teams).toEqual([]);
+    expect(errors).toEqual([{ line: 1, error: 'En-tête CSV sans colonne de joueur (player1 ou joueur1)' }]);
+  });
+
+  it('devrait insérer par lots avec une plage de numéros consécutifs', async () => {
+    const teams = Array.from({ length: 1200 }, (_, i) => ({
+      players: [{ name: `A${i}`, order: 1 }, { name: `B${i}`, order: 2 }],
+    }));
+    const { tx, calls } = createRecordingTx();
+
+    const range = await insertTeams(tx, 'contest-1', teams);
+
+    expect(range).toEqual({ firstTeamNumber: 5, lastTeamNumber: 1204 });
+    // Le concours est écrit avant la lecture du dernier numéro
+    expect(calls[0].op).toBe('contest.update');
+    expect(calls[0].args.data.teamCount).toEqual({ increment: 1200 });
+    expect(calls[1].op).toBe('team.findFirst');
+
+    const teamBatches = calls.filter(c => c.op === 'team.createMany');
+    const playerBatches = calls.filter(c => c.op === 'player.createMany');
+    expect(teamBatches.map(c => c.args.data.length)).toEqual([500, 500, 200]);
+    expect(playerBatches.map(c => c.args.data.length)).toEqual([1000, 1000, 400]);
+
+    const inserted = teamBatches.flatMap(c => c.args.data);
+    expect(inserted[0]).toMatchObject({ contestId: 'contest-1', teamNumber: 5, version: 8 });
+    expect(inserted[1199].teamNumber).toBe(1204);
+    expect(playerBatches[0].args.data[1]).toEqual({
+      teamId: inserted[0].id,
+      firstName: 'B0',
+      lastName: '',
+      order: 2,
+    });
+  });
+
+  it('devrait refuser l\'import si le tirage a eu lieu', async () => {
+    const { tx } = createRecordingTx('IN_PROGRESS');
+    await expect(insertTeams(tx, 'contest-1', [{ players: [{ name: 'Ana', order: 1 }] }])).rejects.toThrow(
+      RegistrationClosedError
+    );
+  });
+
+  it('devrait former les équipes mélée sans réutiliser de joueur', () => {
+    const players: MeleePlayer[] = Array.from({ length: 20 }, (_, i) => ({
+      id: `p${i}`,
+      contestId: 'contest-1',
+      name: `Joueur ${i}`,
+      createdAt: new Date(),
+    }));
+
+    const formation = formMeleeTeams('contest-1', players, 3, 2);
+
+    expect(formation.teams).toHaveLength(6);
+    expect(formation.teams.map(t => t.teamNumber)).toEqual([1, 2, 3, 4, 5, 6]);
+    expect(formation.teams.every(t => t.version === 2 && t.status === 'REGISTERED')).toBe(true);
+    expect(formation.players).toHaveLength(18);
+    expect(formation.unassignedPlayers).toHaveLength(2);
+
+    const used = [...formation.players.map(p => p.firstName), ...formation.unassignedPlayers.map(p => p.name)];
+    expect(new Set(used).size).toBe(20);
+
+    const first = formation.teams[0];
+    const members = formation.players.filter(p => p.teamId === first.id);
+    expect(members.map(p => p.order)).toEqual([1, 2, 3]);
+    expect(first.name).toBe(members.map(p => p.firstName).join(' & '));
+  });
+});
@@ -0,0 +1,28 @@
+import { describe, it, expect } from 'vitest';
+import { visibleRange } from '@/lib/virtual-window';
+
+describe('visibleRange', () => {
+  it('devrait rendre les éléments visibles en haut de la liste', () => {
+    expect(visibleRange(0, 500, 100, 1000, 0)).toEqual({ start: 0, end: 5 });
+    expect(visibleRange(0, 500, 100, 1000, 2)).toEqual({ start: 0, end: 7 });
+  });
+
+  it('devrait suivre le défilement', () => {
+    expect(visibleRange(1050, 500, 100, 1000, 0)).toEqual({ start: 10, end: 16 });
+    expect(visibleRange(1050, 500, 100, 1000, 2)).toEqual({ start: 8, end: 18 });
+  });
+
+  it('devrait s\'arrêter au dernier élément', () => {
+    expect(visibleRange(99_000, 2000, 100, 1000, 3)).toEqual({ start: 987, end: 1000 });
+  });
+
+  it('devrait tout rendre quand la liste est plus courte que la zone', () => {
+    expect(visibleRange(0, 720, 168, 2)).toEqual({ start: 0, end: 2 });
+  });
+
+  it('devrait gérer une liste vide ou un défilement hors limites', () => {
+    expect(visibleRange(0, 500, 100, 0)).toEqual({ start: 0, end: 0 });
+    expect(visibleRange(-40, 500, 100, 10, 0)).toEqual({ start: 0, end: 5 });
+    expect(visibleRange(5000, 500, 100, 10, 0)).toEqual({ start: 10, end: 10 });
+  });
+});